@@ -0,0 +1,211 @@
+"""
+Генераторы синтетических исходных данных для бенчмарков.
+
+Все генераторы детерминированы (random.Random с фиксированным seed)
+и повторяют форматы исходных данных проекта: словари компонентов задания 1,
+данные CostCalculator (pract_part/task_21.py), объекты Project
+(pract_part/task_22.py) и таблицы дополнений (dopolneniya_tables/*.csv).
+"""
+
+import csv
+import os
+import random
+
+MAIN_MATERIALS = ["стальной прокат", "трубы стальные", "прокат цветных металлов", "другие материалы"]
+
+
+def make_components(n_components, seed=0):
+    """
+    Словари materials_main, materials_purchased и prices в формате задания 1
+    с общим числом компонентов n_components (не меньше 4).
+
+    Первые четыре компонента - основные материалы (как в generate_output_for_item),
+    остальные - покупные полуфабрикаты и комплектующие; половина из них
+    с нормами расхода ('material'), половина с фиксированной стоимостью ('fixed').
+    """
+    rnd = random.Random(seed)
+    materials_main = {
+        "стальной прокат": {"type": "material",
+                            "A": {"rasxod": 0.45, "otxod": 0.0675}, "B": {"rasxod": 0.05, "otxod": 0.005}},
+        "трубы стальные": {"type": "material",
+                           "A": {"rasxod": 0.04, "otxod": 0.0028}, "B": {"rasxod": 0.005, "otxod": 0.0003}},
+        "прокат цветных металлов": {"type": "fixed", "A": 2900, "B": 3000},
+        "другие материалы": {"type": "fixed", "A": 1800, "B": 1700},
+    }
+    prices = {
+        "стальной прокат_материал": 12800, "стальной прокат_отходы": 7500,
+        "трубы стальные_материал": 18500, "трубы стальные_отходы": 6300,
+    }
+
+    materials_purchased = {}
+    for i in range(max(n_components - len(MAIN_MATERIALS), 0)):
+        name = f"компонент {i}"
+        if i % 2 == 0:
+            materials_purchased[name] = {
+                "type": "material",
+                "A": {"rasxod": rnd.uniform(0.01, 5), "otxod": rnd.uniform(0, 0.5)},
+                "B": {"rasxod": rnd.uniform(0.01, 5), "otxod": rnd.uniform(0, 0.5)},
+            }
+            prices[f"{name}_материал"] = rnd.randint(5000, 25000)
+            prices[f"{name}_отходы"] = rnd.randint(1000, 5000)
+        else:
+            materials_purchased[name] = {"type": "fixed", "A": rnd.randint(100, 10000), "B": rnd.randint(100, 10000)}
+
+    return materials_main, materials_purchased, prices
+
+
+def make_task1_inputs(n_components, seed=0):
+    """Полный набор аргументов generate_full_output (изделия А и Б) с n_components компонентами."""
+    materials_main, materials_purchased, prices = make_components(n_components, seed)
+    return {
+        "Q_base_data": {"A": 195, "B": 60},
+        "Ka": 1.06, "Kj": 0.92, "Ktr": 1.15,
+        "materials_main": materials_main,
+        "materials_purchased": materials_purchased,
+        "prices": prices,
+        "fuel_energy": {"A": 1, "B": 0.9},
+        "labor": {"labor_hours": {"A": 1000, "B": 171}, "hourly_rate": {"A": 41.50, "B": 35.60}},
+        "rates": {"доп_зарплата": 40, "отчисления": 22, "РСЭО": 87, "ОПР": 85, "ОХР": 98,
+                  "ВПР": 5, "рентабельность": 20},
+    }
+
+
+def make_cost_calculators(n_projects, calculator_cls, seed=0):
+    """
+    Список экземпляров CostCalculator, в сумме на n_projects проектов
+    (по два проекта на экземпляр, как в calculate_all_costs).
+
+    Нормы расхода и трудоемкость каждого проекта случайно изменены в пределах +-10 %.
+    """
+    rnd = random.Random(seed)
+    perturbed = ("steel_rolling_consumption", "steel_pipes_consumption", "castings_black_consumption",
+                 "castings_color_consumption", "purchased_components", "labor_intensity")
+    calculators = []
+    for _ in range(max(n_projects // 2, 1)):
+        calc = calculator_cls()
+        for data in calc.cost_calculation_data.values():
+            for key in perturbed:
+                data[key] *= rnd.uniform(0.9, 1.1)
+        calculators.append(calc)
+    return calculators
+
+
+def make_chain_inputs(n_projects, record, seed=0):
+    """
+    Исходные данные cost_chain (словарь массивов) для n_projects проектов:
+    запись record с нормами расхода и трудоемкостью, измененными в пределах +-10 %.
+    """
+    rnd = random.Random(seed)
+    perturbed = ("steel_rolling_consumption", "steel_pipes_consumption", "castings_black_consumption",
+                 "castings_color_consumption", "purchased_components", "labor_intensity")
+    return {key: [value * rnd.uniform(0.9, 1.1) if key in perturbed else value for _ in range(n_projects)]
+            for key, value in record.items()}
+
+
+def make_projects(n_projects, seed=0):
+    """Список объектов Project (задание 2.2) со случайными исходными данными таблицы 2.5."""
+    from pract_part.task_22 import random_projects
+    return list(random_projects(n_projects, seed))
+
+
+def write_report_csv(path, n_rows, seed=0):
+    """Таблица для create_docx_from_csv: статья расходов и 4 числовых столбца, разделитель ';'."""
+    rnd = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(["Наименование статей расходов", "Изделие А на единицу, руб", "Изделие А на годовой выпуск, тыс.руб",
+                         "Изделие Б на единицу, руб", "Изделие Б на годовой выпуск, тыс.руб"])
+        for i in range(n_rows):
+            writer.writerow([f"{i + 1}. Статья {i + 1}", round(rnd.uniform(10, 1e5), 2), round(rnd.uniform(10, 1e5), 2),
+                             round(rnd.uniform(10, 1e5), 2), float(rnd.randint(1, 1000))])
+    return path
+
+
+def write_dop_tables(directory, n_variants, seed=0):
+    """
+    Синтетические таблицы дополнений с n_variants вариантами в форматах
+    dopolneniya_tables: dop_B, dop_J_hours, dop_J_grades, dop_V (варианты - столбцы),
+    dop_L (транспонированная, ';'), dop_P и dop_N_corrected (';').
+    """
+    rnd = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    variants = range(1, n_variants + 1)
+
+    def path(name):
+        return os.path.join(directory, name)
+
+    with open(path('dop_B.csv'), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Вариант", "Изделие", "Стальной_прокат_кг", "Стальной_прокат_%", "Трубы_стальные_кг",
+                         "Трубы_стальные_%", "Прокат_цветных_руб", "Другие_материалы_руб", "Отливки_черных_кг",
+                         "Отливки_черных_%", "Отливки_цветных_кг", "Отливки_цветных_%"])
+        for v in variants:
+            for item in ("А", "Б"):
+                writer.writerow([v, item, rnd.randint(20, 600), rnd.randint(5, 20), rnd.randint(2, 50), rnd.randint(5, 15),
+                                 rnd.randint(500, 3000), rnd.randint(500, 3000), rnd.randint(500, 5000), rnd.randint(10, 25),
+                                 rnd.randint(50, 400), rnd.randint(10, 25)])
+
+    with open(path('dop_J_hours.csv'), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Вид_работ", "Изделие", *variants])
+        for work in ("1.1. Заготовительные", "1.2. Механообработка", "1.3. Сборочные", "1.4. Другое"):
+            for item in ("А", "Б"):
+                writer.writerow([work, item, *(rnd.randint(10, 800) for _ in variants)])
+
+    with open(path('dop_J_grades.csv'), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Изделие", *variants])
+        for item in ("А", "Б"):
+            writer.writerow([item, *(rnd.randint(3, 5) for _ in variants)])
+
+    with open(path('dop_V.csv'), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Наименование", "Изделие", *variants])
+        for name in ("Электромоторы", "Шкаф управления или пульт", "Гидроаппаратура", "Подшипники"):
+            for item in ("А", "Б"):
+                writer.writerow([name, item, *(rnd.randint(500, 80000) for _ in variants)])
+
+    with open(path('dop_L.csv'), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        groups = ["здания", "сооружения", "силовые машины", "вычислительная техника"]
+        writer.writerow(["Наименование исходных данных", *(f"Вариант {v}" for v in variants)])
+        writer.writerow(["1. Стоимость рабочих машин и оборудования (тыс. руб.)",
+                         *(rnd.randint(15000, 45000) for _ in variants)])
+        writer.writerow(["2. Группа введенных основных фондов", *(rnd.choice(groups) for _ in variants)])
+        writer.writerow(["3. Группа выведенных из эксплуатации основных фондов", *(rnd.choice(groups) for _ in variants)])
+        writer.writerow(["4. Введенные фонды (% от первоначальной стоимости)",
+                         *(f"{rnd.uniform(1, 3.5):.1f}".replace('.', ',') for _ in variants)])
+        writer.writerow(["4. Выведенные фонды (% от первоначальной стоимости)",
+                         *(f"{rnd.uniform(1, 3.5):.1f}".replace('.', ',') for _ in variants)])
+        writer.writerow(["5. Месяц введения основных фондов", *(rnd.randint(1, 12) for _ in variants)])
+        writer.writerow(["5. Месяц выведения основных фондов", *(rnd.randint(1, 12) for _ in variants)])
+
+    with open(path('dop_P.csv'), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(["Вариант задания", "Вариант проекта развития предприятия",
+                         "Снижение норм расходов стального проката, %", "Снижение норм расходов стальных труб, %",
+                         "Снижение норм расходов отливок черных и цветных металлов, %",
+                         "Снижение расходов и стоимости других материалов и комплектующих, %",
+                         "Снижение трудоемкости, %"])
+        for v in variants:
+            for project in (1, 2):
+                writer.writerow([v, project, *(rnd.randint(5, 20) for _ in range(5))])
+
+    with open(path('dop_N_corrected.csv'), 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(["Вариант задания", "Наименование изделия", "Вариант развития",
+                         "Норма запаса основных материалов (дн.)", "Норма запаса полуфабрикатов и комплектующих (дн.)",
+                         "Годовые расходы вспомогательных материалов (тыс. руб.)",
+                         "Норма запаса вспомогательных материалов (дн.)",
+                         "Норматив прочих производственных запасов (тыс. руб.)",
+                         "Длительность производственного цикла (дн.)",
+                         "Норма запасов на складе готовой продукции (дн.)",
+                         "Норматив оборотных средств на расходы будущих периодов (тыс. руб.)"])
+        for v in variants:
+            for item, stage in (("А", "действующее производство"), ("А", "1 вариант развития"),
+                                ("А", "2 вариант развития"), ("Б", "действующее производство")):
+                writer.writerow([v, item, stage, rnd.randint(10, 30), rnd.randint(4, 20), rnd.randint(800, 2000),
+                                 rnd.randint(8, 12), rnd.randint(300, 900), rnd.randint(4, 10), rnd.randint(1, 3),
+                                 rnd.randint(300, 900)])
+
+    return directory
@@ -0,0 +1,319 @@
+"""
+Бенчмарки горячих участков расчетов курсовой работы.
+
+Замеряются:
+  - calculate_total_material_costs / calculate_costs_split (task1/funcs.py) - масштаб по числу компонентов;
+  - BillOfMaterials.material_costs (task1/bom.py) - то же на разреженных матрицах;
+  - generate_full_output (task1/funcs.py) - масштаб по числу компонентов;
+  - CostCalculator.calculate_all_costs (pract_part/task_21.py) - масштаб по числу проектов;
+  - calculate_project (pract_part/task_22.py) - масштаб по числу проектов;
+  - cost_chain / cost_chain_kopecks (task1/cost_chain.py) - то же в float и в копейках (money);
+  - create_docx_from_csv (csv_to_docx.py) - масштаб по числу строк таблицы;
+  - экстракторы dopolneniya_tables - масштаб по числу вариантов.
+
+Каждый бенчмарк запускается на масштабах 10, 1 000 и 100 000 (по умолчанию).
+Если оценка времени следующего масштаба (линейная экстраполяция) превышает
+бюджет --budget, масштаб пропускается и в результатах отмечается как skipped.
+Результаты пишутся в JSON вместе с коммитом git, чтобы сравнивать прогоны
+между коммитами (--compare).
+
+Запуск из корня проекта:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scales 10 1000 --only generate_full_output
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<предыдущий>.json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks import generators
+
+DEFAULT_SCALES = (10, 1000, 100000)
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+@contextlib.contextmanager
+def quiet():
+    """Подавляет вывод print в замеряемом коде (расчеты печатают промежуточные результаты)."""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+@contextlib.contextmanager
+def working_dir(path):
+    """Временно делает path текущим каталогом (прежний восстанавливается и при исключении)."""
+    cwd = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def load_module(name, path):
+    """Загружает модуль из файла (экстракторы выполняют пример использования при импорте)."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    with quiet():
+        spec.loader.exec_module(module)
+    return module
+
+
+# --- Подготовка данных и замеряемые функции ---
+# Каждая функция setup_* получает масштаб и временный каталог и возвращает
+# функцию без аргументов, время выполнения которой замеряется.
+
+def setup_total_material_costs(n, tmp_dir):
+    from task1.funcs import calculate_total_material_costs
+    main, purchased, prices = generators.make_components(n)
+    components = {**main, **purchased}
+    return lambda: calculate_total_material_costs(components, prices, 1.15, 'A')
+
+
+def setup_costs_split(n, tmp_dir):
+    from task1.funcs import calculate_costs_split
+    main, purchased, prices = generators.make_components(n)
+    components = {**main, **purchased}
+    return lambda: calculate_costs_split(components, prices, 1.15, 'A')
+
+
+def setup_bom_material_costs(n, tmp_dir):
+    from task1.bom import from_components
+    main, purchased, prices = generators.make_components(n)
+    with quiet():
+        bom = from_components({**main, **purchased}, prices)
+    return lambda: bom.material_costs(["A", "B"], 1.15, by_group=True)
+
+
+def setup_full_output(n, tmp_dir):
+    from task1.funcs import generate_full_output
+    inputs = generators.make_task1_inputs(n)
+    return lambda: generate_full_output(**inputs)
+
+
+def setup_calculate_all_costs(n, tmp_dir):
+    from pract_part.task_21 import CostCalculator
+    calculators = generators.make_cost_calculators(n, CostCalculator)
+
+    def run():
+        for calc in calculators:
+            calc.calculate_all_costs()
+    return run
+
+
+def setup_calculate_project(n, tmp_dir):
+    import memo
+    from pract_part.task_22 import calculate_project
+    projects = generators.make_projects(n)
+
+    def run():
+        # Замеряется расчет без кеша (все проекты различны, повторы не должны попадать в кеш)
+        memo.clear_all()
+        for project in projects:
+            calculate_project(project)
+    return run
+
+
+def _chain_setup(kopecks):
+    def setup(n, tmp_dir):
+        import numpy as np
+        from pract_part.task_21 import CostCalculator
+        from task1.cost_chain import cost_chain, cost_chain_kopecks, inputs_from_calculator
+        with quiet():
+            record = inputs_from_calculator(CostCalculator(), "project_1")
+        x = {k: np.asarray(v, dtype=float) for k, v in generators.make_chain_inputs(n, record).items()}
+        if kopecks:
+            return lambda: cost_chain_kopecks(x)
+        return lambda: cost_chain(x)
+    return setup
+
+
+def setup_create_docx(n, tmp_dir):
+    from csv_to_docx import create_docx_from_csv
+    csv_path = generators.write_report_csv(os.path.join(tmp_dir, "report.csv"), n)
+    docx_path = os.path.join(tmp_dir, "report.docx")
+    return lambda: create_docx_from_csv(csv_path, docx_path)
+
+
+def _extractor_setup(module_file, call):
+    """
+    Готовит таблицы дополнений во временном каталоге 'dopolneniya_tables'.
+    Импорт модуля и каждый замеряемый вызов выполняются с этим каталогом
+    в качестве текущего (working_dir), чтобы пути '../dopolneniya_tables/...'
+    в экстракторах указывали на синтетические данные; после вызова текущий
+    каталог восстанавливается.
+    """
+    def setup(n, tmp_dir):
+        tables_dir = generators.write_dop_tables(os.path.join(tmp_dir, "dopolneniya_tables"), max(n, 2))
+        with working_dir(tables_dir):
+            module = load_module(f"bench_{os.path.splitext(module_file)[0]}",
+                                 os.path.join(ROOT, "dopolneniya_tables", module_file))
+
+        def run():
+            with working_dir(tables_dir):
+                call(module, max(n, 2))
+        return run
+    return setup
+
+
+BENCHMARKS = {
+    "calculate_total_material_costs": setup_total_material_costs,
+    "calculate_costs_split": setup_costs_split,
+    "BillOfMaterials.material_costs": setup_bom_material_costs,
+    "generate_full_output": setup_full_output,
+    "CostCalculator.calculate_all_costs": setup_calculate_all_costs,
+    "calculate_project": setup_calculate_project,
+    "cost_chain": _chain_setup(kopecks=False),
+    "cost_chain_kopecks": _chain_setup(kopecks=True),
+    "create_docx_from_csv": setup_create_docx,
+    # Экстракторы: запрос последнего варианта (худший случай для фильтрации)
+    "extract_materials_data": _extractor_setup(
+        "exstractor_B.py", lambda m, v: m.extract_materials_data(v, pretty_print=False)),
+    "extract_labor_data": _extractor_setup(
+        "exstractor_J.py", lambda m, v: m.extract_labor_data(v, pretty_print=False)),
+    "extract_purchased_sums": _extractor_setup(
+        "exstractor_V.py", lambda m, v: m.extract_purchased_sums(v, pretty_print=False)),
+    "get_reduction_data": _extractor_setup(
+        "extractor_P.py", lambda m, v: m.get_reduction_data(v, pretty_print=False)),
+    "get_variant_data": _extractor_setup(
+        "exstractor_L.py", lambda m, v: m.get_variant_data("dop_L.csv", v)),
+    "show_variant_data_as_list": _extractor_setup(
+        "n_vyvod.py", lambda m, v: m.show_variant_data_as_list(v, "dop_N_corrected.csv")),
+}
+
+
+def time_call(func, repeat):
+    """Замер времени: repeat запусков (один, если запуск дольше секунды)."""
+    times = []
+    for i in range(repeat):
+        with quiet():
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        if times[-1] > 1.0:
+            break
+    return times
+
+
+def run_benchmark(name, setup, scales, repeat, budget):
+    """
+    Запускает один бенчмарк на всех масштабах.
+
+    Returns:
+        list: Записи {'name', 'scale', 'min_s', 'median_s', 'runs', 'per_item_us'}
+              или {'name', 'scale', 'skipped', 'estimated_s'}.
+    """
+    records = []
+    prev = None  # (масштаб, время)
+    for scale in scales:
+        if prev is not None:
+            estimated = prev[1] * scale / prev[0]
+            if estimated > budget:
+                records.append({"name": name, "scale": scale, "skipped": True, "estimated_s": round(estimated, 3)})
+                print(f"  {name} [{scale}]: пропущен (оценка {estimated:.1f} с > бюджета {budget} с)")
+                continue
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            func = setup(scale, tmp_dir)
+            times = time_call(func, repeat)
+
+        best = min(times)
+        records.append({
+            "name": name,
+            "scale": scale,
+            "min_s": best,
+            "median_s": statistics.median(times),
+            "runs": len(times),
+            "per_item_us": best / scale * 1e6,
+        })
+        print(f"  {name} [{scale}]: {best:.6f} с ({best / scale * 1e6:.2f} мкс на элемент)")
+        prev = (scale, best)
+    return records
+
+
+def git_commit():
+    """Текущий коммит git (с пометкой -dirty при незакоммиченных изменениях) или None."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(old, new):
+    """Печатает сравнение двух прогонов (отношение минимальных времен new/old)."""
+    old_map = {(r["name"], r["scale"]): r for r in old["results"] if not r.get("skipped")}
+    print(f"\nСравнение с {old.get('commit')}:")
+    for r in new["results"]:
+        prev = old_map.get((r["name"], r["scale"]))
+        if r.get("skipped") or prev is None:
+            continue
+        ratio = r["min_s"] / prev["min_s"] if prev["min_s"] else float("inf")
+        mark = "  <-- замедление" if ratio > 1.2 else ""
+        print(f"  {r['name']} [{r['scale']}]: {prev['min_s']:.6f} -> {r['min_s']:.6f} с (x{ratio:.2f}){mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки расчетов курсовой работы")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="Масштабы (по умолчанию: 10 1000 100000)")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Запустить только указанные бенчмарки")
+    parser.add_argument("--repeat", type=int, default=3, help="Число повторов замера (по умолчанию: 3)")
+    parser.add_argument("--budget", type=float, default=60.0,
+                        help="Максимальное оценочное время одного замера, с (по умолчанию: 60)")
+    parser.add_argument("-o", "--output", help="Файл результатов JSON (по умолчанию: benchmarks/results/...)")
+    parser.add_argument("--compare", help="JSON предыдущего прогона для сравнения")
+    args = parser.parse_args()
+
+    names = args.only or list(BENCHMARKS)
+    scales = sorted(args.scales)
+
+    commit = git_commit()
+    print(f"Коммит: {commit}")
+    results = []
+    for name in names:
+        print(f"{name}:")
+        results.extend(run_benchmark(name, BENCHMARKS[name], scales, args.repeat, args.budget))
+
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": scales,
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"bench_{(commit or 'nogit')[:12]}_{stamp}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=4)
+    print(f"\nРезультаты сохранены в {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare_results(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+"""
+Постоянно работающий процесс расчетов (демон) и клиент к нему.
+
+Каждый запуск скрипта (csv_to_docx.py, скрипты заданий, digest.py) тратит
+больше времени на запуск интерпретатора и импорт pandas, numpy, python-docx
+и matplotlib, чем на сам расчет. Демон импортирует эти модули и читает
+таблицы дополнений один раз, а затем выполняет задания, присылаемые через
+Unix-сокет:
+
+    python calc_daemon.py serve &                       # запуск демона
+    python calc_daemon.py ping
+    python calc_daemon.py run task4/task4.py            # скрипт в уже "прогретом" процессе
+    python calc_daemon.py docx task1/sebestoimost_structure.csv
+    python calc_daemon.py job cost_chain '{"inputs": {...}}'
+    python calc_daemon.py stats
+    python calc_daemon.py stop
+
+Протокол: на каждое задание - одна строка JSON {"job": имя, "args": {...}},
+ответ - одна строка JSON {"ok": true/false, "result"/"error": ..., "elapsed": с}.
+В одном соединении можно отправить несколько заданий подряд.
+
+Клиентская часть использует только стандартную библиотеку, поэтому ее
+запуск почти ничего не стоит.
+
+Скрипты выполняются через runpy в каталоге скрипта (они открывают файлы по
+относительным путям) по одному за раз; модули проекта, импортированные
+скриптом (например, funcs из task1 и task5 - одноименные), после выполнения
+выгружаются, чтобы следующий скрипт получил свои модули и свежие изменения.
+"""
+
+import argparse
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOCKET_ENV = "CALC_DAEMON_SOCKET"
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"course-calc-{os.getuid()}.sock")
+PRELOAD = ("numpy", "pandas", "scipy.sparse", "docx", "matplotlib")
+
+
+def socket_path(path=None):
+    return path or os.environ.get(SOCKET_ENV) or DEFAULT_SOCKET
+
+
+# --- Клиент ---
+
+class Client:
+    """Соединение с демоном; можно отправлять несколько заданий подряд"""
+
+    def __init__(self, path=None, timeout=None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(socket_path(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            self.sock.close()
+            raise ConnectionError(f"Демон не запущен (сокет {socket_path(path)}). "
+                                  f"Запустите: python calc_daemon.py serve") from None
+        self.reader = self.sock.makefile("r", encoding="utf-8")
+
+    def call(self, job, **args):
+        """
+        Отправляет задание и ждет ответ.
+
+        Returns:
+            dict: Ответ демона {'ok', 'result' или 'error', 'elapsed'}.
+        """
+        self.sock.sendall((json.dumps({"job": job, "args": args}, ensure_ascii=False) + "\n").encode("utf-8"))
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Демон закрыл соединение.")
+        return json.loads(line)
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def call(job, path=None, **args):
+    """Одно задание в отдельном соединении."""
+    with Client(path) as client:
+        return client.call(job, **args)
+
+
+# --- Демон ---
+
+def _json_default(obj):
+    """numpy/pandas -> JSON."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict(orient="records")
+    return str(obj)
+
+
+class Daemon:
+    """Задания и их состояние (кеш таблиц, статистика)"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.jobs = {}
+        self.counters = {}
+        self.script_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.server = None
+        for name in dir(self):
+            if name.startswith("job_"):
+                self.jobs[name[4:]] = getattr(self, name)
+
+    def preload(self):
+        """Импорт тяжелых модулей и модулей проекта, чтение таблиц дополнений."""
+        import importlib
+
+        if ROOT not in sys.path:
+            sys.path.insert(0, ROOT)
+        os.environ.setdefault("MPLBACKEND", "Agg")
+        loaded = []
+        for name in PRELOAD:
+            try:
+                importlib.import_module(name)
+                loaded.append(name)
+            except ImportError:
+                pass
+        self.tables()
+        importlib.import_module("csv_to_docx")
+        importlib.import_module("task1.goal_seek")
+        # Модули, загруженные до первого задания, остаются в памяти демона
+        self.resident = set(sys.modules)
+        return loaded
+
+    def tables(self):
+        """Таблицы дополнений (кешируются, перечитываются при изменении файлов)."""
+        import memo
+        from dopolneniya_tables.shared_tables import TABLES_DIR, _READERS, load_tables
+
+        key = tuple(memo.file_key(os.path.join(TABLES_DIR, f"{name}.csv")) for name in _READERS)
+        if getattr(self, "_tables_key", None) != key:
+            self._tables = load_tables(TABLES_DIR)
+            self._tables_key = key
+        return self._tables
+
+    def handle(self, request):
+        start = time.perf_counter()
+        job = request.get("job")
+        try:
+            if job not in self.jobs:
+                raise ValueError(f"Неизвестное задание: {job}. Доступны: {', '.join(sorted(self.jobs))}")
+            result = self.jobs[job](**(request.get("args") or {}))
+            response = {"ok": True, "result": result}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+        elapsed = time.perf_counter() - start
+        response["elapsed"] = round(elapsed, 6)
+        with self.stats_lock:
+            count, total = self.counters.get(job, (0, 0.0))
+            self.counters[job] = (count + 1, total + elapsed)
+        return response
+
+    def _unload_project_modules(self):
+        for name, module in list(sys.modules.items()):
+            if name in self.resident:
+                continue
+            path = getattr(module, "__file__", None) or ""
+            if os.path.abspath(path).startswith(ROOT + os.sep):
+                del sys.modules[name]
+
+    def _isolated(self, cwd, argv, func):
+        """Выполнение func в каталоге cwd с argv и перехватом вывода (по одному заданию)."""
+        out, err = io.StringIO(), io.StringIO()
+        with self.script_lock:
+            saved = os.getcwd(), list(sys.argv), list(sys.path)
+            try:
+                os.chdir(cwd)
+                sys.argv = list(argv)
+                sys.path.insert(0, cwd)
+                code = 0
+                with redirect_stdout(out), redirect_stderr(err):
+                    try:
+                        func()
+                    except SystemExit as e:
+                        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                        if not isinstance(e.code, (int, type(None))):
+                            print(e.code, file=sys.stderr)
+                    except Exception:
+                        traceback.print_exc()
+                        code = 1
+            finally:
+                os.chdir(saved[0])
+                sys.argv, sys.path[:] = saved[1], saved[2]
+                self._unload_project_modules()
+        return {"exit_code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+    # --- Задания ---
+
+    def job_ping(self):
+        return {"pid": os.getpid(), "uptime": round(time.time() - self.started, 3)}
+
+    def job_stats(self):
+        import memo
+        with self.stats_lock:
+            jobs = {name: {"count": c, "total_s": round(t, 6), "mean_ms": round(t / c * 1000, 3)}
+                    for name, (c, t) in sorted(self.counters.items())}
+        return {"uptime": round(time.time() - self.started, 3), "jobs": jobs, "memo": memo.format_stats()}
+
+    def job_run(self, script, argv=(), cwd=None):
+        """Запуск скрипта как __main__ (аналог python script argv...)."""
+        import runpy
+
+        script = os.path.abspath(script)
+        if not os.path.isfile(script):
+            raise ValueError(f"Скрипт не найден: {script}")
+        return self._isolated(cwd or os.path.dirname(script), [script, *argv],
+                              lambda: runpy.run_path(script, run_name="__main__"))
+
+    def job_docx(self, csv_file, output_file=None):
+        """Таблица DOCX из CSV (csv_to_docx.create_docx_from_csv)."""
+        import csv_to_docx
+
+        csv_file = os.path.abspath(csv_file)
+        output_file = os.path.abspath(output_file) if output_file else None
+        result = {}
+        run = self._isolated(os.path.dirname(csv_file), ["csv_to_docx.py", csv_file],
+                             lambda: result.update(path=csv_to_docx.create_docx_from_csv(csv_file, output_file)))
+        run.update(result)
+        return run
+
+    def job_tables(self, name=None, limit=None):
+        """Список таблиц дополнений или строки одной таблицы."""
+        tables = self.tables()
+        if name is None:
+            return {n: list(t.shape) for n, t in tables.items()}
+        if name not in tables:
+            raise ValueError(f"Таблица {name} не загружена.")
+        frame = tables[name] if limit is None else tables[name].head(limit)
+        return frame.to_dict(orient="records")
+
+    def job_cost_chain(self, inputs):
+        """Цепочка калькуляции (task1/cost_chain) для словаря или списка записей."""
+        import numpy as np
+        from task1.cost_chain import cost_chain, stack_inputs
+
+        if isinstance(inputs, list):
+            inputs = stack_inputs(inputs)
+        return cost_chain({k: np.asarray(v, dtype=float) for k, v in inputs.items()})
+
+    def job_goal_seek(self, inputs, field, target, indicator="wholesale_price", bounds=None, method="auto"):
+        """Подбор параметра (task1/goal_seek)."""
+        from task1.goal_seek import goal_seek
+
+        return goal_seek(inputs, field, target, indicator=indicator, bounds=bounds, method=method)
+
+    def job_shutdown(self):
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return "Демон остановлен"
+
+
+def serve(path=None, quiet=False):
+    """Запуск демона (блокирует до задания shutdown или Ctrl+C)."""
+    import socketserver
+
+    path = socket_path(path)
+    if os.path.exists(path):
+        try:
+            call("ping", path)
+            raise SystemExit(f"Демон уже запущен (сокет {path}).")
+        except ConnectionError:
+            os.unlink(path)
+
+    daemon = Daemon()
+    start = time.perf_counter()
+    loaded = daemon.preload()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    response = {"ok": False, "error": f"Некорректный JSON: {e}"}
+                else:
+                    response = daemon.handle(request)
+                data = json.dumps(response, ensure_ascii=False, default=_json_default)
+                self.wfile.write((data + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    old_umask = os.umask(0o177)  # сокет доступен только владельцу
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+    daemon.server = server
+    if not quiet:
+        print(f"Демон запущен: {path} (pid {os.getpid()}), подготовка {time.perf_counter() - start:.2f} с, "
+              f"модули: {', '.join(loaded)}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def _print_response(response, raw=False):
+    if raw:
+        print(json.dumps(response, ensure_ascii=False, indent=2))
+        return 0 if response.get("ok") else 1
+    if not response.get("ok"):
+        print(f"Ошибка: {response.get('error')}", file=sys.stderr)
+        return 1
+    result = response["result"]
+    if isinstance(result, dict) and "exit_code" in result:
+        sys.stdout.write(result["stdout"])
+        sys.stderr.write(result["stderr"])
+        return result["exit_code"]
+    print(result if isinstance(result, str) else json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Демон расчетов и клиент к нему")
+    parser.add_argument("--socket", default=None, help=f"Путь к сокету (по умолчанию: ${SOCKET_ENV} или {DEFAULT_SOCKET})")
+    parser.add_argument("--json", action="store_true", help="Вывести полный ответ демона в JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("serve", help="Запустить демон")
+    sub.add_parser("ping", help="Проверить, что демон работает")
+    sub.add_parser("stats", help="Статистика заданий и кешей")
+    sub.add_parser("stop", help="Остановить демон")
+    run = sub.add_parser("run", help="Выполнить скрипт в демоне")
+    run.add_argument("script")
+    run.add_argument("argv", nargs=argparse.REMAINDER)
+    docx = sub.add_parser("docx", help="Таблица DOCX из CSV")
+    docx.add_argument("csv_file")
+    docx.add_argument("-o", "--output", default=None)
+    job = sub.add_parser("job", help="Произвольное задание с аргументами JSON")
+    job.add_argument("name")
+    job.add_argument("args", nargs="?", default="{}")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket)
+        return 0
+    try:
+        if args.command == "ping":
+            response = call("ping", args.socket)
+        elif args.command == "stats":
+            response = call("stats", args.socket)
+        elif args.command == "stop":
+            response = call("shutdown", args.socket)
+        elif args.command == "run":
+            response = call("run", args.socket, script=os.path.abspath(args.script), argv=args.argv)
+        elif args.command == "docx":
+            response = call("docx", args.socket, csv_file=os.path.abspath(args.csv_file),
+                            output_file=os.path.abspath(args.output) if args.output else None)
+        else:
+            response = call(args.name, args.socket, **json.loads(args.args))
+    except ConnectionError as e:
+        print(e, file=sys.stderr)
+        return 2
+    return _print_response(response, args.json)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
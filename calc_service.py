@@ -0,0 +1,283 @@
+"""
+Локальный HTTP/JSON-сервис расчетов с объединением запросов в пакеты.
+
+Инструменты планирования присылают много мелких одновременных запросов.
+Сервис (asyncio, только стандартная библиотека) складывает запросы к одному
+расчету в очередь и передает их векторному расчету одним вызовом, как только
+набралось max_batch запросов или прошло max_wait с момента первого запроса
+в пакете:
+
+    cost_chain       - цепочка калькуляции (task1/cost_chain);
+    working_capital  - норматив оборотных средств (pract_part/task_22.calculate_norms_batch);
+    fixed_assets     - среднегодовая стоимость основных фондов (task2, формула 1.9);
+    indicators       - показатели использования ресурсов (task5/funcs.compute_indicators).
+
+Запросы:
+    POST /v1/<расчет>   тело - запись {поле: число} или список записей;
+    GET  /v1/engines    поля исходных данных каждого расчета;
+    GET  /stats         число запросов и пакетов, средний размер пакета;
+    GET  /health
+
+Запуск:
+    python calc_service.py --port 8765 --max-batch 256 --max-wait-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http import HTTPStatus
+
+import numpy as np
+
+from pract_part.task_22 import PROJECT_INPUTS, calculate_norms_batch
+from task1.cost_chain import INPUT_FIELDS, cost_chain
+from task2.task2_course import average_annual_value
+from task5.funcs import INDICATOR_INPUTS, compute_indicators
+
+MAX_BATCH = 256
+MAX_WAIT_MS = 2.0
+MAX_BODY = 16 * 1024 * 1024
+
+FIXED_ASSET_INPUTS = ('F_n', 'F_vv', 'F_vyv', 'mes_vvoda', 'mes_vyvoda')
+
+# Расчет: (поля исходных данных, функция {поле: массив} -> {показатель: массив})
+ENGINES = {
+    "cost_chain": (INPUT_FIELDS, cost_chain),
+    "working_capital": (PROJECT_INPUTS, lambda x: calculate_norms_batch(**x)),
+    "fixed_assets": (FIXED_ASSET_INPUTS, lambda x: {"F_sr_g": average_annual_value(**x)}),
+    "indicators": (INDICATOR_INPUTS, compute_indicators),
+}
+
+
+class RequestError(ValueError):
+    """Некорректный запрос (ответ 400)"""
+
+
+def validate(fields, record):
+    """
+    Проверка записи исходных данных.
+
+    Returns:
+        dict: {поле: float}.
+
+    Raises:
+        RequestError: Если запись не словарь, поля отсутствуют/лишние или значения не числа.
+    """
+    if not isinstance(record, dict):
+        raise RequestError("Запись исходных данных должна быть объектом JSON.")
+    missing = [f for f in fields if f not in record]
+    unknown = sorted(set(record) - set(fields))
+    if missing or unknown:
+        parts = []
+        if missing:
+            parts.append(f"не заданы поля: {', '.join(missing)}")
+        if unknown:
+            parts.append(f"неизвестные поля: {', '.join(unknown)}")
+        message = "; ".join(parts)
+        raise RequestError(message[0].upper() + message[1:])
+    values = {}
+    for f in fields:
+        value = record[f]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise RequestError(f"Поле {f}: ожидается число, получено {value!r}")
+        values[f] = float(value)
+    return values
+
+
+class MicroBatcher:
+    """Очередь запросов к одному расчету с выполнением пакетами"""
+
+    def __init__(self, name, fields, func, max_batch=MAX_BATCH, max_wait=MAX_WAIT_MS / 1000):
+        self.name = name
+        self.fields = fields
+        self.func = func
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max_wait
+        self.pending = []
+        self.timer = None
+        self.requests = 0
+        self.batches = 0
+        self.compute_time = 0.0
+        self._time_lock = threading.Lock()  # _evaluate выполняется в потоках пула
+
+    async def submit(self, record):
+        """Добавляет запись в очередь и ждет результат расчета для нее."""
+        values = validate(self.fields, record)
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((values, future))
+        self.requests += 1
+        if len(self.pending) >= self.max_batch:
+            self._flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        while self.pending:
+            batch, self.pending = self.pending[:self.max_batch], self.pending[self.max_batch:]
+            asyncio.get_running_loop().create_task(self._execute(batch))
+
+    async def _execute(self, batch):
+        loop = asyncio.get_running_loop()
+        records = [values for values, _ in batch]
+        try:
+            results = await loop.run_in_executor(None, self._evaluate, records)
+        except Exception:
+            # Ошибка в пакете: считаем записи по одной, чтобы ошибка досталась только своему запросу
+            results = []
+            for values in records:
+                try:
+                    results.append((await loop.run_in_executor(None, self._evaluate, [values]))[0])
+                except Exception as e:
+                    results.append(e)
+        self.batches += 1
+        for (_, future), result in zip(batch, results):
+            if future.cancelled():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _evaluate(self, records):
+        start = time.perf_counter()
+        n = len(records)
+        arrays = {f: np.fromiter((r[f] for r in records), dtype=float, count=n) for f in self.fields}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = self.func(arrays)
+        columns = {k: np.broadcast_to(np.asarray(v, dtype=float), (n,)).tolist() for k, v in out.items()}
+        with self._time_lock:
+            self.compute_time += time.perf_counter() - start
+        return [{k: _finite(v[i]) for k, v in columns.items()} for i in range(n)]
+
+    def stats(self):
+        with self._time_lock:
+            compute_time = self.compute_time
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch": round(self.requests / self.batches, 2) if self.batches else 0,
+            "compute_s": round(compute_time, 6),
+        }
+
+
+def _finite(value):
+    """inf/nan не представимы в JSON -> None."""
+    return value if np.isfinite(value) else None
+
+
+class CalcService:
+    """HTTP-сервер: разбор запросов и передача записей в MicroBatcher"""
+
+    def __init__(self, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.batchers = {name: MicroBatcher(name, fields, func, max_batch, max_wait_ms / 1000)
+                         for name, (fields, func) in ENGINES.items()}
+        self.started = time.time()
+
+    async def route(self, method, path, body):
+        """Returns: (HTTPStatus, объект для ответа JSON)."""
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {"status": "ok"}
+        if method == "GET" and path == "/stats":
+            return HTTPStatus.OK, {"uptime": round(time.time() - self.started, 3),
+                                   "engines": {n: b.stats() for n, b in self.batchers.items()}}
+        if method == "GET" and path == "/v1/engines":
+            return HTTPStatus.OK, {n: list(b.fields) for n, b in self.batchers.items()}
+        if path.startswith("/v1/"):
+            batcher = self.batchers.get(path[4:])
+            if batcher is None:
+                return HTTPStatus.NOT_FOUND, {"error": f"Неизвестный расчет: {path[4:]}"}
+            if method != "POST":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Используйте POST"}
+            try:
+                payload = json.loads(body or b"null")
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                return HTTPStatus.BAD_REQUEST, {"error": f"Некорректный JSON: {e}"}
+            try:
+                if isinstance(payload, list):
+                    results = await asyncio.gather(*(batcher.submit(r) for r in payload))
+                    return HTTPStatus.OK, {"results": results}
+                return HTTPStatus.OK, {"result": await batcher.submit(payload)}
+            except RequestError as e:
+                return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+            except Exception as e:
+                return HTTPStatus.UNPROCESSABLE_ENTITY, {"error": f"{type(e).__name__}: {e}"}
+        return HTTPStatus.NOT_FOUND, {"error": f"Нет ресурса {path}"}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._send(writer, HTTPStatus.BAD_REQUEST, {"error": "Некорректная строка запроса"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY:
+                    await self._send(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Слишком большой запрос"},
+                                     False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version.upper() == "HTTP/1.1")
+                status, payload = await self.route(method.upper(), target.split("?", 1)[0], body)
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, status, payload, keep_alive):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8765, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+    service = CalcService(max_batch, max_wait_ms)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Сервис расчетов: http://{host}:{port} (пакет до {max_batch} запросов, ожидание {max_wait_ms} мс)",
+          flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP-сервис расчетов с пакетной обработкой запросов")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH,
+                        help=f"Наибольший размер пакета (по умолчанию: {MAX_BATCH})")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS,
+                        help=f"Наибольшее ожидание пополнения пакета, мс (по умолчанию: {MAX_WAIT_MS})")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.max_wait_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
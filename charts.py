@@ -0,0 +1,266 @@
+"""
+Пакетное построение графиков для приложений курсовой работы без GUI (backend Agg).
+
+Поддерживаются три вида графиков:
+  - 'break_even'     - график безубыточности (pract_part/breakeven.plot_break_even);
+  - 'cost_structure' - структура себестоимости (данные save_structure_table_to_json);
+  - 'fixed_assets'   - структура основных производственных фондов (таблица задания 5).
+
+Графики строятся параллельно в пуле процессов. Каждый процесс держит по одной
+фигуре на вид графика и переиспользует ее между заданиями. Результаты
+кешируются по хешу входных данных: повторный запуск с теми же данными
+не перерисовывает график, а копирует готовый файл из кеша.
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from pract_part.breakeven import plot_break_even
+
+# Версия шаблонов: при изменении оформления графиков увеличить, чтобы сбросить кеш
+TEMPLATE_VERSION = 1
+CACHE_DIR_NAME = ".chart_cache"
+
+FIGURE_SIZES = {
+    "break_even": (12, 8),
+    "cost_structure": (12, 7),
+    "fixed_assets": (12, 7),
+}
+
+# Фигуры-шаблоны текущего процесса: {вид графика: Figure}
+_FIGURES = {}
+
+
+def chart_hash(kind, data, fmt, dpi):
+    """Хеш входных данных графика (ключ кеша)."""
+    payload = json.dumps({"kind": kind, "data": data, "format": fmt, "dpi": dpi,
+                          "template": TEMPLATE_VERSION},
+                         sort_keys=True, ensure_ascii=False, default=float)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _get_figure(kind):
+    """Возвращает очищенную фигуру-шаблон для вида графика (создается один раз на процесс)."""
+    fig = _FIGURES.get(kind)
+    if fig is None:
+        fig = Figure(figsize=FIGURE_SIZES[kind], facecolor='white')
+        FigureCanvasAgg(fig)
+        _FIGURES[kind] = fig
+    else:
+        fig.clear()
+    return fig
+
+
+def draw_cost_structure(ax, rows):
+    """
+    Столбчатая диаграмма структуры себестоимости.
+
+    Args:
+        ax: Оси matplotlib.
+        rows (list): Строки таблицы в формате save_structure_table_to_json.
+    """
+    # Берем только статьи калькуляции (1-10), без итогов, прибыли и цены
+    items = [r for r in rows
+             if r["Наименование статей расходов"][0].isdigit()
+             and r.get("Структура расходов,%") is not None
+             and not r["Наименование статей расходов"].startswith(("11.", "12."))]
+
+    labels = [r["Наименование статей расходов"] for r in items]
+    values = [r["Структура расходов,%"] for r in items]
+
+    positions = range(len(items))
+    bars = ax.barh(positions, values, color='white', edgecolor='black', hatch='//')
+    ax.set_yticks(list(positions))
+    ax.set_yticklabels(labels, fontsize=9)
+    ax.invert_yaxis()
+    for bar, value in zip(bars, values):
+        ax.text(bar.get_width() + 0.3, bar.get_y() + bar.get_height() / 2, f"{value:.2f}%",
+                va='center', fontsize=9)
+
+    ax.set_title('Структура себестоимости продукции', fontsize=16, pad=20)
+    ax.set_xlabel('Удельный вес, %', fontsize=12)
+    ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+
+
+def draw_fixed_assets(ax, rows):
+    """
+    Диаграмма структуры основных производственных фондов на начало и конец года.
+
+    Args:
+        ax: Оси matplotlib.
+        rows (list): Строки таблицы 'Структура_основных_производственных_фондов_%.csv'
+                     (ключи '№', 'Группы основных производственных фондов',
+                     'На начало года', 'На конец года').
+    """
+    # Группы 1-6 и подгруппы 4.x, без суммарной строки 4 и итогов 7.x
+    items = [r for r in rows if r["№"].strip() not in ("4.",) and not r["№"].startswith("7")]
+
+    labels = [f'{r["№"]} {r["Группы основных производственных фондов"]}' for r in items]
+    begin = [float(r["На начало года"]) for r in items]
+    end = [float(r["На конец года"]) for r in items]
+
+    width = 0.4
+    positions = list(range(len(items)))
+    ax.barh([p - width / 2 for p in positions], begin, height=width,
+            color='white', edgecolor='black', hatch='..', label='На начало года')
+    ax.barh([p + width / 2 for p in positions], end, height=width,
+            color='gray', edgecolor='black', label='На конец года')
+    ax.set_yticks(positions)
+    ax.set_yticklabels(labels, fontsize=9)
+    ax.invert_yaxis()
+
+    ax.set_title('Структура основных производственных фондов', fontsize=16, pad=20)
+    ax.set_xlabel('Удельный вес, %', fontsize=12)
+    ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+    ax.legend(loc='lower right')
+
+
+def render_chart(kind, data, output_file, fmt="png", dpi=150):
+    """
+    Строит один график и сохраняет его в файл (выполняется в процессе пула).
+
+    Args:
+        kind (str): Вид графика ('break_even', 'cost_structure', 'fixed_assets').
+        data: Исходные данные графика.
+        output_file (str): Путь к файлу результата.
+        fmt (str): Формат файла ('png' или 'svg').
+        dpi (int): Разрешение для растровых форматов.
+
+    Returns:
+        str: Путь к сохраненному файлу.
+    """
+    fig = _get_figure(kind)
+    ax = fig.add_subplot(111)
+
+    if kind == "break_even":
+        plot_break_even(data["CF"], data["cv_total"], data["price"], data["Q_max"], ax=ax)
+    elif kind == "cost_structure":
+        draw_cost_structure(ax, data)
+    elif kind == "fixed_assets":
+        draw_fixed_assets(ax, data)
+    else:
+        raise ValueError(f"Неизвестный вид графика: {kind}")
+
+    fig.tight_layout()
+    # Запись во временный файл и os.replace: прерванный или параллельный запуск
+    # не оставит в кеше недописанный файл
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(output_file) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            fig.savefig(f, format=fmt, dpi=dpi)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+    return output_file
+
+
+def render_charts(jobs, output_dir, formats=("png",), dpi=150, workers=None):
+    """
+    Строит набор графиков параллельно с кешированием по хешу входных данных.
+
+    Args:
+        jobs (list): Список заданий {'name': имя файла без расширения,
+                     'kind': вид графика, 'data': исходные данные}.
+        output_dir (str): Каталог для готовых графиков.
+        formats (tuple): Форматы файлов ('png', 'svg').
+        dpi (int): Разрешение для растровых форматов.
+        workers (int, optional): Число процессов (по умолчанию - число ядер).
+
+    Returns:
+        dict: {'files': список путей, 'rendered': число построенных (одинаковые графики
+              строятся один раз), 'cached': число взятых из кеша}
+    """
+    output_dir = Path(output_dir)
+    cache_dir = output_dir / CACHE_DIR_NAME
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    files = []
+    pending = {}  # путь в кеше -> (задание, формат, пути результата); одинаковые графики строятся один раз
+    for job in jobs:
+        for fmt in formats:
+            key = chart_hash(job["kind"], job["data"], fmt, dpi)
+            cached = cache_dir / f"{key}.{fmt}"
+            target = output_dir / f"{job['name']}.{fmt}"
+            files.append(str(target))
+            if cached in pending:
+                pending[cached][2].append(target)
+            elif cached.exists():
+                shutil.copyfile(cached, target)
+            else:
+                pending[cached] = (job, fmt, [target])
+
+    if pending:
+        if len(pending) == 1 or workers == 1:
+            for cached, (job, fmt, _) in pending.items():
+                render_chart(job["kind"], job["data"], str(cached), fmt, dpi)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(render_chart, job["kind"], job["data"], str(cached), fmt, dpi)
+                           for cached, (job, fmt, _) in pending.items()]
+                for future in futures:
+                    future.result()
+        for cached, (_, _, targets) in pending.items():
+            for target in targets:
+                shutil.copyfile(cached, target)
+
+    return {"files": files, "rendered": len(pending), "cached": len(files) - sum(len(p[2]) for p in pending.values())}
+
+
+def load_fixed_assets_rows(csv_path):
+    """Читает таблицу структуры основных фондов (задание 5) в список словарей."""
+    with open(csv_path, encoding='utf-8-sig') as f:
+        return list(csv.DictReader(f, delimiter=';'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетное построение графиков для приложений (без GUI)")
+    parser.add_argument("--structure", nargs="*", default=[],
+                        help="JSON-файлы структуры себестоимости (save_structure_table_to_json)")
+    parser.add_argument("--fixed-assets", nargs="*", default=[],
+                        help="CSV-файлы структуры основных фондов (задание 5)")
+    parser.add_argument("--break-even", nargs="*", default=[],
+                        help="JSON-файлы со списком сценариев {name, CF, cv_total, price, Q_max}")
+    parser.add_argument("-o", "--output", default="figures", help="Каталог для графиков (по умолчанию: figures)")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=["png", "svg"], help="Форматы файлов")
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--workers", type=int, default=None, help="Число процессов")
+    args = parser.parse_args()
+
+    jobs = []
+    for path in args.structure:
+        with open(path, 'r', encoding='utf-8') as f:
+            jobs.append({"name": f"structure_{Path(path).stem}", "kind": "cost_structure", "data": json.load(f)})
+    for path in args.fixed_assets:
+        jobs.append({"name": f"fixed_assets_{Path(path).stem}", "kind": "fixed_assets",
+                     "data": load_fixed_assets_rows(path)})
+    for path in args.break_even:
+        with open(path, 'r', encoding='utf-8') as f:
+            for scenario in json.load(f):
+                data = {k: scenario[k] for k in ("CF", "cv_total", "price", "Q_max")}
+                jobs.append({"name": f"break_even_{scenario['name']}", "kind": "break_even", "data": data})
+
+    if not jobs:
+        parser.error("не задано ни одного графика")
+
+    os.makedirs(args.output, exist_ok=True)
+    result = render_charts(jobs, args.output, formats=tuple(args.format), dpi=args.dpi, workers=args.workers)
+    print(f"Построено графиков: {result['rendered']}, взято из кеша: {result['cached']}")
+    for path in result["files"]:
+        print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
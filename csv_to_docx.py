@@ -2,9 +2,13 @@ import pandas as pd
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.style import WD_STYLE_TYPE
+import os
 import sys
 import numpy as np
 
+import instrumentation as instr
+import profiling
+
 
 def create_custom_style(doc):
     """Создает изолированный стиль для таблицы без отступов"""
@@ -71,51 +75,63 @@ def create_docx_from_csv(csv_file, output_file=None):
         str: Путь к сохранённому файлу.
     """
     # Шаг 1: Читаем CSV
-    df = pd.read_csv(csv_file, sep=';')
+    with instr.span("Чтение CSV", file=csv_file), profiling.stage("Чтение CSV", trace=False):
+        df = pd.read_csv(csv_file, sep=';')
+    if instr.is_enabled():
+        instr.count("rows_read", len(df))
+        instr.count("bytes_read", os.path.getsize(csv_file))
 
     # Шаг 2: Генерируем имя выходного файла, если не указано
     if output_file is None:
         output_file = csv_file.replace('.csv', '_table.docx')
 
     # Шаг 3: Создаём DOCX
-    doc = Document()
-
-    table_style_name = create_custom_style(doc)
-
-    # Шаг 4: Добавляем таблицу
-    table = doc.add_table(rows=len(df) + 1, cols=len(df.columns))
-    table.style = 'Table Grid'  # Рамки
-
-    # Шаг 5: Заполняем заголовки
-    for j, column in enumerate(df.columns):
-        cell = table.cell(0, j)
-        cell.text = str(column)
-        # !!! 2. Применяем стиль
-        cell.paragraphs[0].style = doc.styles[table_style_name]
-        cell.paragraphs[0].runs[0].bold = True
-
-    # Шаг 6: Заполняем данные (NaN -> пустая ячейка)
-    for i, row in df.iterrows():
-        for j, value in enumerate(row):
-            cell = table.cell(i + 1, j)
-            clean_value = str(value).strip() if pd.notna(value) else ""
-            cell.text = clean_value
-            # !!! 2. Применяем стиль к каждой ячейке
-            cell.text = value_to_string(value)
+    with instr.span("Построение таблицы DOCX", rows=len(df), cols=len(df.columns)), \
+            profiling.stage("Построение таблицы DOCX", trace=False):
+        doc = Document()
+
+        table_style_name = create_custom_style(doc)
+
+        # Шаг 4: Добавляем таблицу
+        table = doc.add_table(rows=len(df) + 1, cols=len(df.columns))
+        table.style = 'Table Grid'  # Рамки
+
+        # Шаг 5: Заполняем заголовки
+        for j, column in enumerate(df.columns):
+            cell = table.cell(0, j)
+            cell.text = str(column)
+            # !!! 2. Применяем стиль
             cell.paragraphs[0].style = doc.styles[table_style_name]
+            cell.paragraphs[0].runs[0].bold = True
+
+        # Шаг 6: Заполняем данные (NaN -> пустая ячейка)
+        for i, row in df.iterrows():
+            for j, value in enumerate(row):
+                cell = table.cell(i + 1, j)
+                clean_value = str(value).strip() if pd.notna(value) else ""
+                cell.text = clean_value
+                # !!! 2. Применяем стиль к каждой ячейке
+                cell.text = value_to_string(value)
+                cell.paragraphs[0].style = doc.styles[table_style_name]
+
+        # Шаг 7: Настраиваем ширину столбцов
+        table.columns[0].width = Inches(2.5)  # Шире для названий
+        for j in range(1, len(table.columns)):
+            table.columns[j].width = Inches(1.2)
 
-    # Шаг 7: Настраиваем ширину столбцов
-    table.columns[0].width = Inches(2.5)  # Шире для названий
-    for j in range(1, len(table.columns)):
-        table.columns[j].width = Inches(1.2)
+    instr.count("cells_written", (len(df) + 1) * len(df.columns))
 
     # Шаг 8: Сохраняем
-    doc.save(output_file)
+    with instr.span("Сохранение DOCX", file=output_file), profiling.stage("Сохранение DOCX", trace=False):
+        doc.save(output_file)
+    if instr.is_enabled():
+        instr.count("bytes_written", os.path.getsize(output_file))
     print(f"Таблица сохранена в {output_file}")
     return output_file
 
 
 if __name__ == "__main__":
+    profiling.setup("csv_to_docx")
     # Парсим аргументы из командной строки
     if len(sys.argv) != 2:
         print("Использование: python csv_to_docx.py <путь_к_csv_файлу>")
@@ -1,4 +1,22 @@
+"""
+Сборка всего проекта в один текстовый файл (структура + содержимое файлов).
+
+Инкрементальный режим: рядом с результатом хранится манифест
+(параметры сборки; для файлов - путь, размер, mtime, sha256 прочитанных
+байт, смещение в файле результата). При повторном запуске с теми же
+параметрами (max_size, игнорируемые папки и файлы) файлы с неизменными
+размером и mtime не перечитываются - их содержимое копируется из
+предыдущего файла результата по смещению. Если изменился только mtime
+(например, после git checkout), файл хешируется и при совпадении sha256
+тоже не декодируется заново. Изменившиеся файлы читаются параллельно,
+запись идет через буфер ограниченного размера.
+"""
+
+import argparse
+import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Папки и файлы, которые нужно игнорировать
 IGNORE_DIRS = {'.git', '.idea', '__pycache__', 'venv', 'env', '.venv', 'migrations', 'static', 'assets'}
@@ -6,41 +24,265 @@ IGNORE_FILES = {'digest.py', 'db.sqlite3', '.DS_Store', 'poetry.lock', 'package-
 # Расширения файлов, которые нам нужны (код)
 ALLOWED_EXTENSIONS = {'.py', '.html', '.css', '.js', '.json', '.yaml', '.yml', '.ini', '.txt', '.md', '.dockerfile'}
 
-output_file = 'project_context.txt'
+OUTPUT_FILE = 'project_context.txt'
+MANIFEST_SUFFIX = '.manifest.json'
+MANIFEST_VERSION = 2
 
-with open(output_file, 'w', encoding='utf-8') as outfile:
-    # Записываем дерево проекта для наглядности
-    outfile.write("=== STRUCTURE ===\n")
-    for root, dirs, files in os.walk('.'):
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
-        level = root.replace('.', '').count(os.sep)
-        indent = ' ' * 4 * (level)
-        outfile.write(f"{indent}{os.path.basename(root)}/\n")
-        subindent = ' ' * 4 * (level + 1)
-        for f in files:
-            if f not in IGNORE_FILES:
-                outfile.write(f"{subindent}{f}\n")
+# Размер буфера записи и блока копирования, байт
+BUFFER_SIZE = 1024 * 1024
 
-    outfile.write("\n=== FILE CONTENTS ===\n")
 
-    # Записываем содержимое файлов
-    for root, dirs, files in os.walk('.'):
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]  # Исключаем папки на лету
+def is_allowed(file_name):
+    """Проверяет, нужно ли включать содержимое файла в результат."""
+    ext = os.path.splitext(file_name)[1].lower()
+    return ext in ALLOWED_EXTENSIONS or file_name == 'Dockerfile'
 
+
+def scan_tree(root_dir, ignore_dirs, ignore_files):
+    """
+    Один проход os.walk: строки дерева проекта и список файлов для содержимого.
+
+    Returns:
+        tuple: (строки структуры, список (путь, os.stat_result))
+    """
+    tree_lines = []
+    files_to_read = []
+    for root, dirs, files in os.walk(root_dir):
+        dirs[:] = [d for d in dirs if d not in ignore_dirs]  # Исключаем папки на лету
+        level = os.path.relpath(root, root_dir).count(os.sep) + (root != root_dir)
+        indent = ' ' * 4 * level
+        tree_lines.append(f"{indent}{os.path.basename(root) or root}/\n")
+        subindent = ' ' * 4 * (level + 1)
         for file in files:
-            if file in IGNORE_FILES:
+            if file in ignore_files:
                 continue
-
-            # Проверяем расширение
-            ext = os.path.splitext(file)[1].lower()
-            if ext in ALLOWED_EXTENSIONS or file == 'Dockerfile':
+            tree_lines.append(f"{subindent}{file}\n")
+            if is_allowed(file):
                 file_path = os.path.join(root, file)
+                files_to_read.append((file_path, os.stat(file_path)))
+    return tree_lines, files_to_read
+
+
+def read_head(file_path, max_size=None):
+    """
+    Читает из файла не более max_size байт (None - весь файл).
+
+    Returns:
+        tuple: (прочитанные байты, размер файла, sha256 прочитанных байт)
+    """
+    hasher = hashlib.sha256()
+    head = bytearray()
+    with open(file_path, 'rb') as infile:
+        total = os.fstat(infile.fileno()).st_size
+        while max_size is None or len(head) < max_size:
+            chunk = infile.read(BUFFER_SIZE if max_size is None else min(BUFFER_SIZE, max_size - len(head)))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            head.extend(chunk)
+    return bytes(head), total, hasher.hexdigest()
+
+
+def file_digest(file_path, max_size=None):
+    """sha256 байт файла, попадающих в результат (None при ошибке чтения)."""
+    try:
+        return read_head(file_path, max_size)[2]
+    except OSError:
+        return None
+
+
+def read_file(file_path, max_size=None):
+    """
+    Читает файл для записи в результат.
+
+    Args:
+        file_path (str): Путь к файлу.
+        max_size (int, optional): Максимальный размер содержимого, байт.
+                                  Более длинные файлы обрезаются (дальше max_size не читаются).
+
+    Returns:
+        tuple: (содержимое в UTF-8, sha256 прочитанных байт или None при ошибке)
+    """
+    digest = None
+    try:
+        head, total, digest = read_head(file_path, max_size)
+        if max_size is not None and total > max_size:
+            text = head.decode('utf-8', errors='ignore')
+            text += f"\n... [обрезано, размер файла {total} байт]"
+        else:
+            text = head.decode('utf-8')
+        # Как при чтении в текстовом режиме: универсальные переводы строк
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    except Exception as e:
+        text = f"Error reading file: {e}"
+    return text.encode('utf-8'), digest
+
+
+def read_files_bounded(pool, paths, max_size, window):
+    """
+    Параллельно читает файлы, сохраняя порядок и держа в памяти
+    не более window прочитанных, но еще не записанных файлов.
+    """
+    pending = []
+    paths = iter(paths)
+    for path in paths:
+        pending.append(pool.submit(read_file, path, max_size))
+        if len(pending) >= window:
+            break
+    while pending:
+        result = pending.pop(0).result()
+        next_path = next(paths, None)
+        if next_path is not None:
+            pending.append(pool.submit(read_file, next_path, max_size))
+        yield result
+
+
+def build_settings(max_size, ignore_dirs, ignore_files):
+    """Параметры сборки, от которых зависит содержимое результата (хранятся в манифесте)."""
+    return {"max_size": max_size, "ignore_dirs": sorted(ignore_dirs), "ignore_files": sorted(ignore_files)}
+
+
+def load_manifest(manifest_path, output_path, settings):
+    """
+    Загружает манифест предыдущего запуска.
+
+    Манифест считается действительным, только если файл результата
+    не менялся после его записи (совпадают размер и mtime) и сборка
+    шла с теми же параметрами settings (build_settings).
+
+    Returns:
+        dict: {путь: запись манифеста} или пустой словарь.
+    """
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        st = os.stat(output_path)
+    except (OSError, ValueError):
+        return {}
+    if (manifest.get("version") != MANIFEST_VERSION
+            or manifest.get("output_size") != st.st_size
+            or manifest.get("output_mtime_ns") != st.st_mtime_ns
+            or manifest.get("settings") != settings):
+        return {}
+    return manifest.get("files", {})
+
+
+def copy_range(src, dst, offset, length):
+    """Копирует length байт из src (с позиции offset) в dst блоками BUFFER_SIZE."""
+    src.seek(offset)
+    while length > 0:
+        chunk = src.read(min(BUFFER_SIZE, length))
+        if not chunk:
+            raise OSError("Файл результата короче, чем указано в манифесте")
+        dst.write(chunk)
+        length -= len(chunk)
+
+
+def build_digest(root_dir='.', output_file=OUTPUT_FILE, ignore_dirs=IGNORE_DIRS, ignore_files=IGNORE_FILES,
+                 max_size=None, workers=None, incremental=True):
+    """
+    Собирает проект в один текстовый файл.
+
+    Args:
+        root_dir (str): Корень проекта.
+        output_file (str): Файл результата.
+        ignore_dirs (set): Игнорируемые папки.
+        ignore_files (set): Игнорируемые файлы.
+        max_size (int, optional): Ограничение размера содержимого одного файла, байт.
+        workers (int, optional): Число потоков чтения (по умолчанию - как в ThreadPoolExecutor).
+        incremental (bool): Использовать манифест предыдущего запуска.
+
+    Returns:
+        dict: Статистика: 'files', 'reread', 'reused' (в том числе 'rehashed' - с новым mtime,
+              но тем же sha256).
+    """
+    manifest_path = output_file + MANIFEST_SUFFIX
+    # Сам результат и манифест в результат не включаем
+    ignore_files = set(ignore_files) | {os.path.basename(output_file), os.path.basename(manifest_path)}
+    settings = build_settings(max_size, ignore_dirs, ignore_files)
+
+    old_files = load_manifest(manifest_path, output_file, settings) if incremental else {}
+    tree_lines, files_to_read = scan_tree(root_dir, ignore_dirs, ignore_files)
+
+    new_files = {}
+    tmp_file = output_file + '.tmp'
+    old_output = open(output_file, 'rb') if old_files else None
+    try:
+        with open(tmp_file, 'wb', buffering=BUFFER_SIZE) as outfile, \
+                ThreadPoolExecutor(max_workers=workers) as pool:
+            # Файлы с прежними размером и mtime берем из старого результата без чтения;
+            # при новом mtime и том же размере сверяем sha256 прочитанных байт
+            olds = [old_files.get(path) for path, _ in files_to_read]
+            to_hash = [path for (path, st), old in zip(files_to_read, olds)
+                       if old is not None and old["size"] == st.st_size and old["mtime_ns"] != st.st_mtime_ns]
+            hashes = dict(zip(to_hash, pool.map(lambda p: file_digest(p, max_size), to_hash)))
+            plan = []
+            to_read = []
+            rehashed = 0
+            for (file_path, st), old in zip(files_to_read, olds):
+                same = old is not None and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns
+                if not same and file_path in hashes and old["sha256"] is not None:
+                    same = hashes[file_path] == old["sha256"]
+                    rehashed += same
+                if same:
+                    plan.append((file_path, st, old))
+                else:
+                    plan.append((file_path, st, None))
+                    to_read.append(file_path)
+
+            # Записываем дерево проекта для наглядности
+            outfile.write("=== STRUCTURE ===\n".encode('utf-8'))
+            outfile.write(''.join(tree_lines).encode('utf-8'))
+            outfile.write("\n=== FILE CONTENTS ===\n".encode('utf-8'))
+
+            # Чтение изменившихся файлов идет параллельно, порядок сохраняется
+            read_results = read_files_bounded(pool, to_read, max_size, window=2 * (workers or os.cpu_count() or 1))
+
+            for file_path, st, old in plan:
+                outfile.write(f"\n\n{'=' * 20}\nFILE: {file_path}\n{'=' * 20}\n".encode('utf-8'))
+                offset = outfile.tell()
+                if old is not None:
+                    copy_range(old_output, outfile, old["offset"], old["length"])
+                    length, digest = old["length"], old["sha256"]
+                else:
+                    content, digest = next(read_results)
+                    outfile.write(content)
+                    length = len(content)
+                new_files[file_path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                                        "sha256": digest, "offset": offset, "length": length}
+    finally:
+        if old_output is not None:
+            old_output.close()
+
+    os.replace(tmp_file, output_file)
+    st = os.stat(output_file)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": MANIFEST_VERSION, "output_size": st.st_size, "output_mtime_ns": st.st_mtime_ns,
+                   "settings": settings, "files": new_files}, f, ensure_ascii=False, indent=1)
+
+    return {"files": len(plan), "reread": len(to_read), "reused": len(plan) - len(to_read), "rehashed": rehashed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сборка проекта в один текстовый файл")
+    parser.add_argument("root", nargs="?", default=".", help="Корень проекта (по умолчанию: текущая папка)")
+    parser.add_argument("-o", "--output", default=OUTPUT_FILE, help=f"Файл результата (по умолчанию: {OUTPUT_FILE})")
+    parser.add_argument("--ignore-dir", action="append", default=[], help="Дополнительно игнорируемая папка")
+    parser.add_argument("--ignore-file", action="append", default=[], help="Дополнительно игнорируемый файл")
+    parser.add_argument("--max-size", type=int, default=None, help="Ограничение размера одного файла, байт")
+    parser.add_argument("--workers", type=int, default=None, help="Число потоков чтения")
+    parser.add_argument("--full", action="store_true", help="Полная пересборка без манифеста")
+    args = parser.parse_args()
+
+    stats = build_digest(args.root, args.output,
+                         ignore_dirs=IGNORE_DIRS | set(args.ignore_dir),
+                         ignore_files=IGNORE_FILES | set(args.ignore_file),
+                         max_size=args.max_size, workers=args.workers, incremental=not args.full)
+
+    print(f"Готово! Весь проект собран в {args.output} "
+          f"(файлов: {stats['files']}, перечитано: {stats['reread']}, из прошлой сборки: {stats['reused']}, "
+          f"сверено по sha256: {stats['rehashed']})")
 
-                outfile.write(f"\n\n{'=' * 20}\nFILE: {file_path}\n{'=' * 20}\n")
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as infile:
-                        outfile.write(infile.read())
-                except Exception as e:
-                    outfile.write(f"Error reading file: {e}")
 
-print(f"Готово! Весь проект собран в {output_file}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
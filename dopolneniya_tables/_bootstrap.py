@@ -0,0 +1,18 @@
+"""
+Корень репозитория в sys.path для скриптов, запущенных из этой папки
+(cd <папка> && python script.py): общие модули (instrumentation, profiling,
+memo, table_schema) и модули других папок импортируются от корня
+(task1.cost_chain, pract_part.task_21, dopolneniya_tables.shared_tables).
+
+Подключается только точками входа, до импортов модулей проекта:
+
+    if __name__ == "__main__":
+        import _bootstrap  # noqa: F401
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
@@ -1,6 +1,10 @@
-import pandas as pd
 from pprint import pprint  # Импортируем для красивой печати
 
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from dopolneniya_tables.shared_tables import load_table
+
 
 def extract_materials_data(variant: int, pretty_print: bool = True):
     """
@@ -12,16 +16,17 @@ def extract_materials_data(variant: int, pretty_print: bool = True):
 
     Returns:
         tuple: Кортеж из двух словарей - materials_main и materials_purchased (если pretty_print=False).
+
+    Raises:
+        ValueError: Если вариант отсутствует или в таблице ошибки.
     """
-    # Читаем CSV файл
-    df = pd.read_csv('../dopolneniya_tables/dop_B.csv')
+    # Проверенная таблица (один раз за запуск): у каждого варианта есть строки А и Б
+    df = load_table('dop_B', '../dopolneniya_tables/dop_B.csv')
 
     # Фильтруем по варианту
     variant_df = df[df['Вариант'] == variant]
-
-    # Проверяем наличие данных
-    if len(variant_df) != 2:
-        raise ValueError(f"Для варианта {variant} не найдено ровно 2 записи (А и Б).")
+    if variant_df.empty:
+        raise ValueError(f"Вариант {variant} не найден в таблице.")
 
     # Извлекаем данные для А и Б
     row_a = variant_df[variant_df['Изделие'] == 'А'].iloc[0]
@@ -100,8 +105,9 @@ def extract_materials_data(variant: int, pretty_print: bool = True):
         return materials_main, materials_purchased
 
 
-# Пример использования с красивой печатью (по умолчанию):
-extract_materials_data(2)
+if __name__ == "__main__":
+    # Пример использования с красивой печатью (по умолчанию):
+    extract_materials_data(2)
 
-# Если хочешь просто вернуть словари (без печати):
-# materials_main, materials_purchased = extract_materials_data(2, pretty_print=False)
\ No newline at end of file
+    # Если хочешь просто вернуть словари (без печати):
+    # materials_main, materials_purchased = extract_materials_data(2, pretty_print=False)
@@ -1,7 +1,7 @@
 import pandas as pd
 from pprint import pprint
 
-# Словарь разрядов -> ставки
+# Словарь разрядов -> ставки (единственная тарифная сетка курсовой: task1/payroll, task4/routing)
 GRADE_TO_RATE = {3: 30.25, 4: 35.60, 5: 41.50}
 
 
@@ -52,11 +52,12 @@ def extract_labor_data(variant: int, pretty_print: bool = True):
         return result
 
 
-# Пример использования с красивой печатью (по умолчанию):
-extract_labor_data(1)
+if __name__ == "__main__":
+    # Пример использования с красивой печатью (по умолчанию):
+    extract_labor_data(1)
 
-# С Кж=1.2, например:
-# extract_labor_data(1, k_zh=1.2)
+    # С Кж=1.2, например:
+    # extract_labor_data(1, k_zh=1.2)
 
-# Просто вернуть словарь:
-# labor_data = extract_labor_data(1, pretty_print=False)
\ No newline at end of file
+    # Просто вернуть словарь:
+    # labor_data = extract_labor_data(1, pretty_print=False)
\ No newline at end of file
@@ -1,52 +1,35 @@
-import pandas as pd
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from dopolneniya_tables.shared_tables import load_table
 
 
 def get_variant_data(file_path, variant_number):
     """
     Считывает данные из CSV для указанного варианта.
-    """
-    # Считываем CSV, указывая разделитель "точка с запятой"
-    try:
-        df = pd.read_csv(file_path, sep=';')
-    except FileNotFoundError:
-        return "Файл не найден. Проверьте путь."
-
-    # Формируем имя колонки (например, "Вариант 2")
-    col_name = f'Вариант {variant_number}'
-
-    # Проверяем, есть ли такой вариант в таблице
-    if col_name not in df.columns:
-        return f"Вариант {variant_number} не найден в таблице."
-
-    # Извлекаем данные по строкам (индексация начинается с 0)
-    # Строка 0: Стоимость (преобразуем в целое число)
-    stoimost_rmo_nachalo = int(df[col_name].iloc[0])
 
-    # Строка 1: Группа ввода (строка)
-    gruppa_vvod = str(df[col_name].iloc[1]).strip()
+    Таблица читается, проверяется и приводится к типам один раз
+    (shared_tables.load_table, validation.SCHEMAS['dop_L']): десятичная запятая
+    в процентах, целые стоимость и месяцы.
 
-    # Строка 2: Группа вывода (строка)
-    gruppa_vyvod = str(df[col_name].iloc[2]).strip()
-
-    # Строка 3: Процент ввода (заменяем запятую на точку для float)
-    procent_vvoda = float(str(df[col_name].iloc[3]).replace(',', '.'))
-
-    # Строка 4: Процент вывода (заменяем запятую на точку для float)
-    procent_vyvoda = float(str(df[col_name].iloc[4]).replace(',', '.'))
-
-    # Строка 5: Месяц ввода (целое число)
-    mes_vvoda = int(df[col_name].iloc[5])
+    Raises:
+        ValueError: Если файл не найден, вариант отсутствует или в таблице ошибки.
+    """
+    table = load_table('dop_L', file_path)
 
-    # Строка 6: Месяц вывода (целое число)
-    mes_vyvoda = int(df[col_name].iloc[6])
+    # Строка варианта (например, "Вариант 2" исходной таблицы)
+    rows = table[table['Вариант'] == variant_number]
+    if rows.empty:
+        raise ValueError(f"Вариант {variant_number} не найден в таблице.")
+    row = rows.iloc[0]
 
     # Возвращаем словарь для удобства
     return {
-        'stoimost_rmo_nachalo': stoimost_rmo_nachalo,
-        'gruppa_vvod': gruppa_vvod,
-        'gruppa_vyvod': gruppa_vyvod,
-        'procent_vvoda': procent_vvoda,
-        'procent_vyvoda': procent_vyvoda,
-        'mes_vvoda': mes_vvoda,
-        'mes_vyvoda': mes_vyvoda
-    }
\ No newline at end of file
+        'stoimost_rmo_nachalo': int(row['stoimost_rmo_nachalo']),
+        'gruppa_vvod': row['gruppa_vvod'],
+        'gruppa_vyvod': row['gruppa_vyvod'],
+        'procent_vvoda': float(row['procent_vvoda']),
+        'procent_vyvoda': float(row['procent_vyvoda']),
+        'mes_vvoda': int(row['mes_vvoda']),
+        'mes_vyvoda': int(row['mes_vyvoda'])
+    }
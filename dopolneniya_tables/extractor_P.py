@@ -1,6 +1,10 @@
-import pandas as pd
 from pprint import pprint  # Импортируем для красивой печати
 
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from dopolneniya_tables.shared_tables import load_table
+
 
 def get_reduction_data(variant: int, pretty_print: bool = True):
     """
@@ -12,16 +16,17 @@ def get_reduction_data(variant: int, pretty_print: bool = True):
 
     Returns:
         dict: Словарь с данными для вариантов проекта 1 и 2 (если pretty_print=False).
+
+    Raises:
+        ValueError: Если вариант задания отсутствует или в таблице ошибки.
     """
-    # Читаем CSV файл
-    df = pd.read_csv('../dopolneniya_tables/dop_P.csv', sep=';')  # Указываем разделитель ';', так как в данных используются ';'
+    # Проверенная таблица (один раз за запуск): у каждого варианта есть проекты 1 и 2
+    df = load_table('dop_P', '../dopolneniya_tables/dop_P.csv')
 
     # Фильтруем по варианту задания
     variant_df = df[df['Вариант задания'] == variant]
-
-    # Проверяем наличие данных
-    if len(variant_df) != 2:
-        raise ValueError(f"Для варианта задания {variant} не найдено ровно 2 записи (варианты проекта 1 и 2).")
+    if variant_df.empty:
+        raise ValueError(f"Вариант задания {variant} не найден в таблице.")
 
     # Извлекаем данные для вариантов проекта 1 и 2
     row_1 = variant_df[variant_df['Вариант проекта развития предприятия'] == 1].iloc[0]
@@ -53,8 +58,9 @@ def get_reduction_data(variant: int, pretty_print: bool = True):
         return reduction_data
 
 
-# Пример использования с красивой печатью (по умолчанию):
-get_reduction_data(2)
+if __name__ == "__main__":
+    # Пример использования с красивой печатью (по умолчанию):
+    get_reduction_data(2)
 
-# Если хочешь просто вернуть словарь (без печати):
-# reduction_data = get_reduction_data(2, pretty_print=False)
\ No newline at end of file
+    # Если хочешь просто вернуть словарь (без печати):
+    # reduction_data = get_reduction_data(2, pretty_print=False)
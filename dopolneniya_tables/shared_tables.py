@@ -0,0 +1,388 @@
+"""
+Таблицы дополнений в общей памяти для процессов-обработчиков.
+
+Таблицы dop_B, dop_J_hours, dop_J_grades, dop_V, dop_N, dop_N_corrected, dop_P,
+dop_R, dop_T и dop_L (а также дополнительные таблицы, например цены)
+один раз читаются, проверяются (validation), приводятся к "длинному" виду (одна строка - один
+вариант/изделие/позиция) и упаковываются в один блок
+multiprocessing.shared_memory:
+  - числовые столбцы - массивы int64/float64;
+  - строковые столбцы - словарное кодирование: коды int32 в общей памяти,
+    словарь значений - в описании (descriptor).
+
+Процессы-обработчики получают только небольшое описание (имя блока
+и раскладку столбцов) и подключаются к блоку без копирования данных:
+память не растет с числом процессов, запуск обработчика почти мгновенный.
+
+Пример:
+    from concurrent.futures import ProcessPoolExecutor
+    from dopolneniya_tables import shared_tables
+
+    with shared_tables.SharedTables.create('dopolneniya_tables') as tables:
+        with ProcessPoolExecutor(initializer=shared_tables.init_worker,
+                                 initargs=(tables.descriptor,)) as pool:
+            results = list(pool.map(calculate_variant, range(1, 11)))
+
+    def calculate_variant(variant):
+        tables = shared_tables.worker_tables()
+        row = tables.select('dop_B', Вариант=variant, Изделие='А')
+        ...
+"""
+
+import functools
+import os
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from dopolneniya_tables import validation
+
+TABLES_DIR = os.path.dirname(os.path.abspath(__file__))
+ALIGN = 64  # выравнивание столбцов в блоке, байт
+
+# Нормализованный вид dop_L: строка таблицы -> столбец (как в exstractor_L.get_variant_data)
+DOP_L_COLUMNS = ('stoimost_rmo_nachalo', 'gruppa_vvod', 'gruppa_vyvod',
+                 'procent_vvoda', 'procent_vyvoda', 'mes_vvoda', 'mes_vyvoda')
+
+_attach_lock = threading.Lock()
+_worker_tables = None
+
+
+# --- Чтение и нормализация таблиц ---
+
+def _melt_variants(df, id_vars, value_name):
+    """Широкая таблица (варианты - столбцы '1', '2', ...) -> длинная со столбцом 'Вариант'."""
+    long = df.melt(id_vars=id_vars, var_name='Вариант', value_name=value_name)
+    long['Вариант'] = long['Вариант'].astype(int)
+    return long[['Вариант', *id_vars, value_name]]
+
+
+def _read_dop_l(path):
+    """Транспонированная dop_L ('Вариант N' - столбцы) -> строка на вариант (значения - текст)."""
+    df = pd.read_csv(path, sep=';', dtype=str)
+    values = df.iloc[:, 1:].T
+    if values.shape[1] < len(DOP_L_COLUMNS):
+        raise ValueError(f"В {path} ожидается {len(DOP_L_COLUMNS)} строк данных, найдено {values.shape[1]}.")
+    values = values.iloc[:, :len(DOP_L_COLUMNS)]
+    values.columns = DOP_L_COLUMNS
+    values.insert(0, 'Вариант', [int(str(c).split()[-1]) for c in values.index])
+    return values.reset_index(drop=True)
+
+
+# Таблицы читаются как текст: приведение типов и десятичных разделителей - в validation
+_READERS = {
+    'dop_B': lambda p: pd.read_csv(p, dtype=str),
+    'dop_J_hours': lambda p: _melt_variants(pd.read_csv(p, dtype=str), ['Вид_работ', 'Изделие'], 'Часы'),
+    'dop_J_grades': lambda p: _melt_variants(pd.read_csv(p, dtype=str), ['Изделие'], 'Разряд'),
+    'dop_V': lambda p: _melt_variants(pd.read_csv(p, dtype=str), ['Наименование', 'Изделие'], 'Сумма_руб'),
+    'dop_N': lambda p: pd.read_csv(p, sep=';', dtype=str),
+    'dop_N_corrected': lambda p: pd.read_csv(p, sep=';', dtype=str),
+    'dop_P': lambda p: pd.read_csv(p, sep=';', dtype=str),
+    'dop_R': lambda p: pd.read_csv(p, sep=';', dtype=str),
+    'dop_T': lambda p: pd.read_csv(p, sep=';', dtype=str),
+    'dop_L': _read_dop_l,
+}
+
+
+def read_tables(directory=TABLES_DIR, names=None):
+    """
+    Читает таблицы дополнений в длинном виде без проверки (значения - текст).
+
+    Args:
+        directory (str): Каталог с файлами dop_*.csv.
+        names (list, optional): Имена таблиц (по умолчанию - все известные).
+
+    Returns:
+        dict: {имя таблицы: DataFrame}. Отсутствующие файлы пропускаются.
+    """
+    tables = {}
+    for name in names or _READERS:
+        path = os.path.join(directory, f"{name}.csv")
+        if not os.path.exists(path):
+            print(f"Предупреждение: файл {path} не найден, таблица {name} пропущена.")
+            continue
+        tables[name] = _READERS[name](path)
+    return tables
+
+
+def load_tables(directory=TABLES_DIR, names=None, validate=True):
+    """
+    Читает таблицы дополнений, приводит их к длинному виду и проверяет (validation).
+
+    Args:
+        directory (str): Каталог с файлами dop_*.csv.
+        names (list, optional): Имена таблиц (по умолчанию - все известные).
+        validate (bool): Ошибки в данных - исключение; False - только предупреждения.
+
+    Returns:
+        dict: {имя таблицы: DataFrame} с числовыми столбцами. Отсутствующие файлы пропускаются.
+
+    Raises:
+        ValidationError: Ошибки типов, диапазонов или полноты ключей (при validate=True).
+    """
+    tables, problems = validation.validate_tables(read_tables(directory, names))
+    if problems:
+        if validate:
+            raise validation.ValidationError(problems)
+        for problem in problems:
+            print(f"Предупреждение: {problem}")
+    return tables
+
+
+@functools.lru_cache(maxsize=32)
+def _load_table_cached(name, path, mtime_ns, size):
+    table, problems = validation.validate_table(name, _READERS[name](path))
+    if problems:
+        raise validation.ValidationError(problems)
+    return table
+
+
+def load_table(name, path=None):
+    """
+    Одна проверенная таблица дополнений (для экстракторов отдельных вариантов).
+
+    Таблица читается и проверяется один раз: результат кешируется по пути,
+    размеру и mtime файла. Возвращаемый DataFrame общий для всех вызовов -
+    не изменяйте его.
+
+    Args:
+        name (str): Имя таблицы (dop_B, dop_L, ...).
+        path (str, optional): Путь к файлу (по умолчанию - <TABLES_DIR>/<name>.csv).
+
+    Returns:
+        pd.DataFrame: Таблица в длинном виде с числовыми столбцами.
+
+    Raises:
+        ValueError: Если таблица неизвестна или файл не найден.
+        ValidationError: Ошибки в данных таблицы.
+    """
+    if name not in _READERS:
+        raise ValueError(f"Неизвестная таблица дополнений: {name}.")
+    path = os.path.abspath(path or os.path.join(TABLES_DIR, f"{name}.csv"))
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise ValueError(f"Файл {path} не найден. Проверьте путь.") from None
+    return _load_table_cached(name, path, st.st_mtime_ns, st.st_size)
+
+
+# --- Упаковка в общую память ---
+
+def _encode_column(series):
+    """
+    Столбец -> (тип, массив, словарь значений).
+
+    Returns:
+        tuple: ('num', ndarray, None) или ('str', коды int32, список значений).
+    """
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return 'num', series.to_numpy(dtype=np.int64), None
+    if pd.api.types.is_numeric_dtype(series):
+        return 'num', series.to_numpy(dtype=np.float64), None
+    codes, uniques = pd.factorize(series.astype(str), sort=True)
+    return 'str', codes.astype(np.int32), list(uniques)
+
+
+def _open_existing(name):
+    """
+    Подключается к существующему блоку без регистрации в resource_tracker
+    (иначе завершение обработчика удалит блок, которым владеет родитель).
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedTables:
+    """Таблицы дополнений в одном блоке общей памяти с представлениями NumPy"""
+
+    def __init__(self, shm, layout, owner):
+        """
+        Args:
+            shm (SharedMemory): Блок общей памяти.
+            layout (dict): {таблица: {'rows': n, 'columns': {столбец: (тип, dtype, смещение, словарь)}}}.
+            owner (bool): Создатель блока (только он удаляет блок при закрытии).
+        """
+        self._shm = shm
+        self.layout = layout
+        self.owner = owner
+        self._columns = {}
+        for table, info in layout.items():
+            for col, (kind, dtype, offset, _) in info['columns'].items():
+                array = np.ndarray((info['rows'],), dtype=dtype, buffer=shm.buf, offset=offset)
+                array.flags.writeable = owner
+                self._columns[table, col] = array
+
+    @classmethod
+    def create(cls, directory=TABLES_DIR, names=None, extra=None):
+        """
+        Читает таблицы и упаковывает их в новый блок общей памяти.
+
+        Args:
+            directory (str): Каталог с файлами dop_*.csv.
+            names (list, optional): Имена таблиц dop_* (по умолчанию - все).
+            extra (dict, optional): Дополнительные таблицы {имя: DataFrame}
+                                    (например, цены материалов).
+
+        Returns:
+            SharedTables: Таблицы (владелец блока).
+        """
+        tables = load_tables(directory, names)
+        for name, df in (extra or {}).items():
+            tables[name] = df.reset_index(drop=True)
+
+        encoded = {}
+        layout = {}
+        offset = 0
+        for table, df in tables.items():
+            columns = {}
+            for col in df.columns:
+                kind, array, categories = _encode_column(df[col])
+                encoded[table, str(col)] = array
+                columns[str(col)] = (kind, array.dtype.str, offset, categories)
+                offset += -(-array.nbytes // ALIGN) * ALIGN
+            layout[table] = {'rows': len(df), 'columns': columns}
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        tables = cls(shm, layout, owner=True)
+        for key, array in encoded.items():
+            tables._columns[key][:] = array
+        return tables
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Подключается к блоку, созданному create() в другом процессе (без копирования).
+
+        Args:
+            descriptor (tuple): Описание блока (SharedTables.descriptor).
+        """
+        name, layout = descriptor
+        return cls(_open_existing(name), layout, owner=False)
+
+    @property
+    def descriptor(self):
+        """Небольшое описание блока для передачи обработчикам: (имя блока, раскладка)."""
+        return self._shm.name, self.layout
+
+    @property
+    def nbytes(self):
+        return self._shm.size
+
+    def names(self):
+        return list(self.layout)
+
+    def column(self, table, col):
+        """Столбец как представление NumPy (для строковых столбцов - коды)."""
+        try:
+            return self._columns[table, col]
+        except KeyError:
+            raise ValueError(f"Столбец '{col}' не найден в таблице '{table}'.") from None
+
+    def categories(self, table, col):
+        """Словарь значений строкового столбца (индекс - код)."""
+        return self.layout[table]['columns'][col][3]
+
+    def code(self, table, col, value):
+        """Код значения строкового столбца (-1, если значения нет в словаре)."""
+        categories = self.categories(table, col)
+        try:
+            return categories.index(value)
+        except ValueError:
+            return -1
+
+    def mask(self, table, **conditions):
+        """Логическая маска строк по условиям равенства (строки сравниваются по кодам)."""
+        result = np.ones(self.layout[table]['rows'], dtype=bool)
+        for col, value in conditions.items():
+            kind = self.layout[table]['columns'][col][0]
+            if kind == 'str':
+                value = self.code(table, col, value)
+            result &= self.column(table, col) == value
+        return result
+
+    def frame(self, table, rows=None):
+        """
+        Таблица как DataFrame (строковые столбцы декодируются).
+
+        Args:
+            table (str): Имя таблицы.
+            rows (ndarray, optional): Маска или индексы строк.
+        """
+        if table not in self.layout:
+            raise ValueError(f"Таблица '{table}' не найдена.")
+        data = {}
+        for col, (kind, _, _, categories) in self.layout[table]['columns'].items():
+            values = self._columns[table, col]
+            if rows is not None:
+                values = values[rows]
+            if kind == 'str':
+                values = np.asarray(categories, dtype=object)[values]
+            data[col] = values
+        return pd.DataFrame(data)
+
+    def select(self, table, **conditions):
+        """Строки таблицы, удовлетворяющие условиям (например, Вариант=3, Изделие='А')."""
+        return self.frame(table, self.mask(table, **conditions))
+
+    def close(self):
+        """Отключается от блока; владелец также удаляет блок."""
+        self._columns.clear()
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+# --- Обработчики пула процессов ---
+
+def init_worker(descriptor):
+    """Инициализатор ProcessPoolExecutor/Pool: подключение к общим таблицам."""
+    global _worker_tables
+    _worker_tables = SharedTables.attach(descriptor)
+
+
+def worker_tables():
+    """Общие таблицы текущего обработчика (после init_worker)."""
+    if _worker_tables is None:
+        raise ValueError("Общие таблицы не подключены: передайте init_worker как инициализатор пула.")
+    return _worker_tables
+
+
+def _example_task(variant):
+    tables = worker_tables()
+    rows = tables.select('dop_B', Вариант=variant, Изделие='А')
+    return variant, os.getpid(), int(rows['Стальной_прокат_кг'].iloc[0]) if len(rows) else None
+
+
+def main():
+    from concurrent.futures import ProcessPoolExecutor
+
+    with SharedTables.create() as tables:
+        print(f"Таблицы в общей памяти ({tables.nbytes} байт): {', '.join(tables.names())}")
+        print(tables.select('dop_L', Вариант=3).to_string(index=False))
+        with ProcessPoolExecutor(max_workers=4, initializer=init_worker, initargs=(tables.descriptor,)) as pool:
+            for variant, pid, steel in pool.map(_example_task, range(1, 11)):
+                print(f"Вариант {variant} (процесс {pid}): стальной прокат изделия А = {steel} кг")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,22 +2,126 @@
 import os
 import sys
 import argparse
+import codecs
+import fnmatch
+import io
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Файлы больше этого размера не читаются в память целиком: проверяются и пишутся блоками
+LARGE_FILE_SIZE = 4 * 1024 * 1024
+SAMPLE_SIZE = 8192
+CHUNK_SIZE = 1024 * 1024
 
-def is_text_file(filepath, sample_size=1024):
-    """Простая проверка, является ли файл текстовым (не бинарным)"""
+
+def sniff_bytes(sample, final=False):
+    """
+    Проверка фрагмента файла на текст: нет нулевых байтов и это корректный UTF-8.
+
+    Args:
+        sample (bytes): Начало файла.
+        final (bool): True, если sample - весь файл (иначе обрезанный в конце
+                      многобайтовый символ не считается ошибкой).
+    """
+    if b'\x00' in sample:
+        return False
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            f.read(sample_size)
-            return True
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=final)
+        return True
     except UnicodeDecodeError:
         return False
+
+
+def is_text_file(filepath, sample_size=SAMPLE_SIZE):
+    """Простая проверка, является ли файл текстовым (не бинарным)"""
+    try:
+        with open(filepath, 'rb') as f:
+            sample = f.read(sample_size)
+            return sniff_bytes(sample, final=len(sample) < sample_size)
     except Exception:
         return False
 
 
-def merge_directory_to_txt(source_dir: str, output_file: str, recursive=True):
+def read_text_file(file_path, large_file_size=LARGE_FILE_SIZE):
+    """
+    Читает файл за одно открытие: проверка на текст и чтение содержимого.
+
+    Returns:
+        tuple: ('text', содержимое в UTF-8) - обычный текстовый файл;
+               ('large', None) - большой файл, начало которого похоже на текст:
+               в память не читается, целиком проверяется при копировании (copy_text_file);
+               ('binary', None) - бинарный/нечитаемый файл;
+               ('error', сообщение) - ошибка чтения.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            sample = f.read(SAMPLE_SIZE)
+            if not sniff_bytes(sample, final=len(sample) < SAMPLE_SIZE):
+                return 'binary', None
+            if size > large_file_size:
+                return 'large', None
+
+            data = sample + f.read()
+        # Как при чтении в текстовом режиме: проверка UTF-8 и универсальные переводы строк
+        content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        return 'text', content.encode('utf-8')
+    except UnicodeDecodeError:
+        return 'binary', None
+    except Exception as e:
+        return 'error', str(e)
+
+
+def copy_text_file(file_path, outfile):
+    """
+    Копирует большой файл в outfile за одно открытие и один проход через mmap.
+
+    Каждый блок проверяется инкрементальным декодером UTF-8 и сразу пишется:
+    пока в файле не встретился '\\r', пишутся те же байты, дальше - текст с заменой
+    '\\r\\n' и '\\r' на '\\n' (как при чтении в текстовом режиме).
+
+    Returns:
+        bool: Заканчивается ли файл переводом строки.
+
+    Raises:
+        UnicodeDecodeError: Если файл не в UTF-8 (начало файла уже может быть записано).
+    """
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    newlines = io.IncrementalNewlineDecoder(utf8, translate=True)
+    translating = False
+    with open(file_path, 'rb') as infile:
+        size = os.fstat(infile.fileno()).st_size
+        if size == 0:
+            return True
+        with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, size, CHUNK_SIZE):
+                chunk = mm[start:start + CHUNK_SIZE]
+                if not translating and b'\r' not in chunk:
+                    utf8.decode(chunk)
+                    outfile.write(chunk)
+                    continue
+                # Байты незавершенного символа из предыдущего блока уже записаны как есть
+                written = 0 if translating else len(utf8.getstate()[0])
+                translating = True
+                outfile.write(newlines.decode(chunk).encode('utf-8')[written:])
+            outfile.write(newlines.decode(b'', final=True).encode('utf-8'))
+            return mm[size - 1:size] in (b'\n', b'\r')
+
+
+def matches_filters(rel_path, include=None, exclude=None):
+    """Проверка относительного пути по шаблонам include/exclude (fnmatch, по пути и по имени)."""
+    path = rel_path.as_posix()
+    name = rel_path.name
+    if include and not any(fnmatch.fnmatch(path, p) or fnmatch.fnmatch(name, p) for p in include):
+        return False
+    if exclude and any(fnmatch.fnmatch(path, p) or fnmatch.fnmatch(name, p) for p in exclude):
+        return False
+    return True
+
+
+def merge_directory_to_txt(source_dir: str, output_file: str, recursive=True, include=None, exclude=None,
+                           workers=None, large_file_size=LARGE_FILE_SIZE):
     source_path = Path(source_dir)
     if not source_path.is_dir():
         print(f"Ошибка: {source_dir} не является каталогом или не существует!")
@@ -25,43 +129,73 @@ def merge_directory_to_txt(source_dir: str, output_file: str, recursive=True):
 
     output_path = Path(output_file)
 
-    with open(output_path, 'w', encoding='utf-8') as outfile:
-        outfile.write(f"=== Содержимое каталога: {source_path.resolve()} ===\n")
-        outfile.write(f"=== Объединено: {os.path.getmtime(source_dir)} ===\n\n")
+    # Список файлов собирается заранее, чтобы порядок в результате был детерминированным
+    candidates = sorted(source_path.rglob('*') if recursive else source_path.glob('*'))
+    files = []
+    for file_path in candidates:
+        if not file_path.is_file():
+            continue
+        # Не включаем в результат сам выходной файл
+        if output_path.exists() and file_path.resolve() == output_path.resolve():
+            continue
+        rel_path = file_path.relative_to(source_path)
+        if matches_filters(rel_path, include, exclude):
+            files.append((file_path, rel_path))
+
+    with open(output_path, 'wb') as outfile, ThreadPoolExecutor(max_workers=workers) as pool:
+        outfile.write(f"=== Содержимое каталога: {source_path.resolve()} ===\n".encode('utf-8'))
+        outfile.write(f"=== Объединено: {os.path.getmtime(source_dir)} ===\n\n".encode('utf-8'))
 
         files_processed = 0
         files_skipped = 0
 
-        # Обходим все файлы (рекурсивно или только в текущем каталоге)
-        for file_path in source_path.rglob('*') if recursive else source_path.glob('*'):
-            if file_path.is_file():
-                rel_path = file_path.relative_to(source_path)
+        # Чтение идет параллельно порциями, запись - в исходном порядке файлов
+        batch_size = 4 * (workers or os.cpu_count() or 1)
+        for start in range(0, len(files), batch_size):
+            batch = files[start:start + batch_size]
+            results = pool.map(lambda item: read_text_file(item[0], large_file_size), batch)
 
-                if not is_text_file(file_path):
+            for (file_path, rel_path), result in zip(batch, results):
+                kind = result[0]
+                if kind == 'binary':
                     files_skipped += 1
                     print(f"Пропущен (бинарный/нечитаемый): {rel_path}")
                     continue
+                if kind == 'error':
+                    print(f"Ошибка при чтении {rel_path}: {result[1]}")
+                    files_skipped += 1
+                    continue
 
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as infile:
-                        content = infile.read()
-
-                    outfile.write(f"{'=' * 20} ФАЙЛ: {rel_path} {'=' * 20}\n")
+                header_pos = outfile.tell()
+                outfile.write(f"{'=' * 20} ФАЙЛ: {rel_path} {'=' * 20}\n".encode('utf-8'))
+                if kind == 'large':
+                    # Файл проверяется при копировании: если он не в UTF-8,
+                    # уже записанная часть вместе с заголовком отбрасывается
+                    try:
+                        ends_with_newline = copy_text_file(file_path, outfile)
+                    except Exception as e:
+                        outfile.seek(header_pos)
+                        outfile.truncate()
+                        files_skipped += 1
+                        if isinstance(e, UnicodeDecodeError):
+                            print(f"Пропущен (бинарный/нечитаемый): {rel_path}")
+                        else:
+                            print(f"Ошибка при чтении {rel_path}: {e}")
+                        continue
+                else:
+                    content = result[1]
                     outfile.write(content)
-                    if not content.endswith('\n'):
-                        outfile.write('\n')
-                    outfile.write(f"\n{'-' * 60}\n\n")
+                    ends_with_newline = content.endswith(b'\n')
+                if not ends_with_newline:
+                    outfile.write(b'\n')
+                outfile.write(f"\n{'-' * 60}\n\n".encode('utf-8'))
 
-                    files_processed += 1
-                    print(f"Добавлен: {rel_path}")
-
-                except Exception as e:
-                    print(f"Ошибка при чтении {rel_path}: {e}")
-                    files_skipped += 1
+                files_processed += 1
+                print(f"Добавлен: {rel_path}")
 
-        outfile.write(f"\n=== ГОТОВО ===\n")
-        outfile.write(f"Обработано файлов: {files_processed}\n")
-        outfile.write(f"Пропущено файлов: {files_skipped}\n")
+        outfile.write("\n=== ГОТОВО ===\n".encode('utf-8'))
+        outfile.write(f"Обработано файлов: {files_processed}\n".encode('utf-8'))
+        outfile.write(f"Пропущено файлов: {files_skipped}\n".encode('utf-8'))
 
     print(f"\nГотово! Результат записан в: {output_path.resolve()}")
 
@@ -72,6 +206,13 @@ def main():
     parser.add_argument("-o", "--output", default="merged_output.txt",
                         help="Имя выходного файла (по умолчанию: merged_output.txt)")
     parser.add_argument("--no-recursive", action="store_true", help="Не заходить в подкаталоги")
+    parser.add_argument("--include", action="append", default=None,
+                        help="Шаблон включаемых файлов, например '*.csv' (можно несколько)")
+    parser.add_argument("--exclude", action="append", default=None,
+                        help="Шаблон исключаемых файлов (можно несколько)")
+    parser.add_argument("--workers", type=int, default=None, help="Число потоков чтения")
+    parser.add_argument("--large-size", type=int, default=LARGE_FILE_SIZE,
+                        help=f"Порог 'большого' файла в байтах (по умолчанию: {LARGE_FILE_SIZE})")
 
     args = parser.parse_args()
 
@@ -83,9 +224,13 @@ def main():
     merge_directory_to_txt(
         source_dir=directory,
         output_file=args.output,
-        recursive=not args.no_recursive
+        recursive=not args.no_recursive,
+        include=args.include,
+        exclude=args.exclude,
+        workers=args.workers,
+        large_file_size=args.large_size
     )
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,294 @@
+"""
+Проверка таблиц дополнений при загрузке.
+
+Для каждой таблицы (в длинном виде shared_tables.load_tables) описаны
+столбцы: тип, допустимый диапазон или набор значений, и ключ строки
+(вариант, изделие, проект). Полнота проверяется по всем вариантам,
+найденным в таблице. Проверка выполняется один раз при загрузке
+операциями над целыми столбцами:
+  - десятичная запятая и лишняя точка ('2,6', '12.') приводятся к числу;
+  - нечисловые, пустые и дробные (для целых столбцов) значения;
+  - выход за диапазон и недопустимые значения;
+  - повторы ключа и полнота сетки ключей (все варианты x изделия x проекты).
+
+После проверки столбцы имеют числовые типы, поэтому расчетам не нужны
+проверки и преобразования строк при каждом обращении.
+
+Пример:
+    python validation.py            # отчет по всем таблицам каталога
+"""
+
+import itertools
+
+import pandas as pd
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from dopolneniya_tables.exstractor_J import GRADE_TO_RATE
+
+PRODUCTS = ('А', 'Б')
+PROJECTS = (1, 2)
+STAGES = ('действующее производство', '1 вариант развития', '2 вариант развития')
+GRADES = tuple(sorted(GRADE_TO_RATE))  # разряды с тарифными ставками
+MAX_EXAMPLES = 3  # строк в примере для одной ошибки
+
+
+class ValidationError(ValueError):
+    """Ошибки в таблицах дополнений (список сообщений - в problems)."""
+
+    def __init__(self, problems):
+        self.problems = list(problems)
+        super().__init__("Ошибки в таблицах дополнений:\n" + "\n".join(f"- {p}" for p in self.problems))
+
+
+class Field:
+    """
+    Описание столбца.
+
+    Args:
+        kind (str): 'int', 'float' или 'str'.
+        min (float, optional): Нижняя граница (включительно).
+        max (float, optional): Верхняя граница (включительно).
+        values (tuple, optional): Допустимые значения (для ключей - ожидаемая сетка).
+    """
+
+    def __init__(self, kind, min=None, max=None, values=None):
+        if kind not in ('int', 'float', 'str'):
+            raise ValueError(f"Неизвестный тип столбца: {kind!r}.")
+        self.kind = kind
+        self.min = min
+        self.max = max
+        self.values = values
+
+
+class Schema:
+    """
+    Описание таблицы.
+
+    Args:
+        keys (tuple): Столбцы ключа строки.
+        fields (dict): {столбец: Field}.
+        default (Field, optional): Описание остальных столбцов (None - лишние столбцы - ошибка).
+        grids (list, optional): Сетки ключей, которые должны присутствовать полностью:
+                                [{столбец ключа: значения}, ...]. По умолчанию - одна
+                                сетка из values ключевых столбцов (None - значения из таблицы).
+    """
+
+    def __init__(self, keys, fields, default=None, grids=None):
+        self.keys = tuple(keys)
+        self.fields = dict(fields)
+        self.default = default
+        self.grids = grids
+
+    def field(self, column):
+        return self.fields.get(column, self.default)
+
+
+VARIANT = Field('int', min=1)  # сетка - номера вариантов, найденные в таблице
+TASK_PARITY = Field('int', values=(1, 2))  # dop_N: нечетные варианты -> 1, четные -> 2
+PRODUCT = Field('str', values=PRODUCTS)
+PROJECT = Field('int', values=PROJECTS)
+NAME = Field('str')
+AMOUNT = Field('int', min=0)
+PERCENT = Field('float', min=0, max=100)
+DAYS = Field('int', min=0, max=366)
+
+SCHEMAS = {
+    'dop_B': Schema(('Вариант', 'Изделие'), {
+        'Вариант': VARIANT, 'Изделие': PRODUCT,
+        **{f"{m}_%": Field('int', min=0, max=100)
+           for m in ('Стальной_прокат', 'Трубы_стальные', 'Отливки_черных', 'Отливки_цветных')},
+    }, default=AMOUNT),
+    'dop_J_hours': Schema(('Вариант', 'Вид_работ', 'Изделие'), {
+        'Вариант': VARIANT, 'Вид_работ': NAME, 'Изделие': PRODUCT, 'Часы': AMOUNT,
+    }),
+    'dop_J_grades': Schema(('Вариант', 'Изделие'), {
+        'Вариант': VARIANT, 'Изделие': PRODUCT, 'Разряд': Field('int', values=GRADES),
+    }),
+    'dop_V': Schema(('Вариант', 'Наименование', 'Изделие'), {
+        'Вариант': VARIANT, 'Наименование': NAME, 'Изделие': PRODUCT, 'Сумма_руб': AMOUNT,
+    }),
+    'dop_N': Schema(('Вариант задания', 'Изделие'), {
+        'Вариант задания': TASK_PARITY, 'Изделие': PRODUCT,
+        'N_om': DAYS, 'N_pok': DAYS, 'N_vm': DAYS, 'T_c': DAYS, 'N_gp': DAYS,
+    }, default=AMOUNT),
+    'dop_N_corrected': Schema(('Вариант задания', 'Наименование изделия', 'Вариант развития'), {
+        'Вариант задания': TASK_PARITY, 'Наименование изделия': PRODUCT,
+        'Вариант развития': Field('str', values=STAGES),
+        'Норма запаса основных материалов (дн.)': DAYS,
+        'Норма запаса полуфабрикатов и комплектующих (дн.)': DAYS,
+        'Норма запаса вспомогательных материалов (дн.)': DAYS,
+        'Длительность производственного цикла (дн.)': DAYS,
+        'Норма запасов на складе готовой продукции (дн.)': DAYS,
+    }, default=AMOUNT, grids=[
+        # Действующее производство - для обоих изделий, проекты - для изделия А
+        {'Вариант задания': (1, 2), 'Наименование изделия': PRODUCTS, 'Вариант развития': STAGES[:1]},
+        {'Вариант задания': (1, 2), 'Наименование изделия': ('А',), 'Вариант развития': STAGES},
+    ]),
+    'dop_P': Schema(('Вариант задания', 'Вариант проекта развития предприятия'), {
+        'Вариант задания': VARIANT, 'Вариант проекта развития предприятия': PROJECT,
+    }, default=PERCENT),
+    'dop_R': Schema(('Вариант задания', 'Вариант проекта развития'), {
+        'Вариант задания': VARIANT, 'Вариант проекта развития': PROJECT, 'Кл %': PERCENT,
+    }, default=AMOUNT),
+    'dop_T': Schema(('Вариант задания', 'Вариант проекта развития'), {
+        'Вариант задания': VARIANT, 'Вариант проекта развития': PROJECT,
+    }, default=PERCENT),
+    'dop_L': Schema(('Вариант',), {
+        'Вариант': VARIANT,
+        'stoimost_rmo_nachalo': Field('int', min=0),
+        'gruppa_vvod': NAME, 'gruppa_vyvod': NAME,
+        'procent_vvoda': PERCENT, 'procent_vyvoda': PERCENT,
+        'mes_vvoda': Field('int', min=1, max=12), 'mes_vyvoda': Field('int', min=1, max=12),
+    }),
+}
+
+
+# --- Проверки столбцов ---
+
+def normalize_decimal(series):
+    """
+    Текстовый столбец -> числа: десятичная запятая ('2,6'), лишняя точка ('12.'), пробелы.
+
+    Returns:
+        tuple: (числа float, маска значений, которые не удалось разобрать).
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float), pd.Series(False, index=series.index)
+    text = series.astype('string').str.strip().str.replace(',', '.', regex=False)
+    numbers = pd.to_numeric(text, errors='coerce').astype(float)
+    return numbers, (numbers.isna() & text.notna() & (text != '')).to_numpy(dtype=bool)
+
+
+def _where(df, keys, mask, column):
+    """Пример строк с ошибкой: 'значение (ключ=..., ...)'."""
+    rows = df.loc[mask]
+    examples = []
+    for _, row in rows.head(MAX_EXAMPLES).iterrows():
+        key = ", ".join(f"{k}={row[k]}" for k in keys if k in row.index and k != column)
+        examples.append(f"{row[column]!r}" + (f" ({key})" if key else ""))
+    more = f" и еще {len(rows) - MAX_EXAMPLES}" if len(rows) > MAX_EXAMPLES else ""
+    return "; ".join(examples) + more
+
+
+def _check_column(df, name, column, field, keys, problems):
+    """Приведение и проверка одного столбца; возвращает приведенный столбец."""
+    raw = df[column]
+    prefix = f"{name}, столбец '{column}'"
+    if field.kind == 'str':
+        values = raw.where(raw.isna(), raw.astype(str).str.strip())
+        bad = (values.isna() | (values == '')).to_numpy()
+        if bad.any():
+            problems.append(f"{prefix}: пустые значения: {_where(df, keys, bad, column)}")
+    else:
+        values, unparsed = normalize_decimal(raw)
+        if unparsed.any():
+            problems.append(f"{prefix}: не число: {_where(df, keys, unparsed, column)}")
+        empty = values.isna().to_numpy() & ~unparsed
+        if empty.any():
+            problems.append(f"{prefix}: пустые значения: {_where(df, keys, empty, column)}")
+        if field.kind == 'int':
+            fractional = (values.notna() & (values % 1 != 0)).to_numpy()
+            if fractional.any():
+                problems.append(f"{prefix}: ожидается целое число: {_where(df, keys, fractional, column)}")
+            elif not values.isna().any():
+                values = values.astype('int64')
+        if field.min is not None or field.max is not None:
+            low = -float('inf') if field.min is None else field.min
+            high = float('inf') if field.max is None else field.max
+            out = (values.lt(low) | values.gt(high)).to_numpy()
+            if out.any():
+                problems.append(f"{prefix}: значения вне диапазона [{low:g}, {high:g}]: "
+                                f"{_where(df, keys, out, column)}")
+    if field.values is not None:
+        bad = (values.notna() & ~values.isin(field.values)).to_numpy()
+        if bad.any():
+            problems.append(f"{prefix}: недопустимые значения (ожидается {', '.join(map(str, field.values))}): "
+                            f"{_where(df, keys, bad, column)}")
+    return values
+
+
+def _check_keys(df, name, schema, problems):
+    """Повторы ключа и полнота сеток ключей."""
+    keys = list(schema.keys)
+    duplicated = df.duplicated(subset=keys, keep=False).to_numpy()
+    if duplicated.any():
+        rows = df.loc[duplicated, keys].drop_duplicates().head(MAX_EXAMPLES)
+        problems.append(f"{name}: повторяющиеся ключи: " +
+                        "; ".join(", ".join(f"{k}={v}" for k, v in zip(keys, r)) for r in rows.itertuples(index=False)))
+
+    grids = schema.grids or [{k: schema.fields[k].values for k in keys}]
+    present = pd.MultiIndex.from_frame(df[keys])
+    for grid in grids:
+        levels = [grid.get(k) if grid.get(k) is not None else sorted(df[k].dropna().unique()) for k in keys]
+        missing = pd.MultiIndex.from_tuples(itertools.product(*levels), names=keys).difference(present)
+        if len(missing):
+            examples = "; ".join(", ".join(f"{k}={v}" for k, v in zip(keys, m)) for m in missing[:MAX_EXAMPLES])
+            more = f" и еще {len(missing) - MAX_EXAMPLES}" if len(missing) > MAX_EXAMPLES else ""
+            problems.append(f"{name}: нет строк для {len(missing)} сочетаний ключа: {examples}{more}")
+
+
+def validate_table(name, df, schema=None):
+    """
+    Приводит столбцы таблицы к типам схемы и проверяет значения и ключи.
+
+    Args:
+        name (str): Имя таблицы (dop_B, ...).
+        df (pd.DataFrame): Таблица в длинном виде (значения могут быть строками).
+        schema (Schema, optional): Описание таблицы (по умолчанию - SCHEMAS[name]).
+
+    Returns:
+        tuple: (приведенная таблица, список сообщений об ошибках).
+    """
+    schema = schema or SCHEMAS.get(name)
+    if schema is None:
+        return df, []
+    problems = []
+    missing = [c for c in (*schema.keys, *schema.fields) if c not in df.columns]
+    if missing:
+        return df, [f"{name}: нет столбцов {', '.join(missing)}"]
+
+    result = {}
+    for column in df.columns:
+        field = schema.field(column)
+        if field is None:
+            problems.append(f"{name}: неизвестный столбец '{column}'")
+            result[column] = df[column]
+            continue
+        result[column] = _check_column(df, name, column, field, schema.keys, problems)
+    result = pd.DataFrame(result, index=df.index)
+    _check_keys(result, name, schema, problems)
+    return result, problems
+
+
+def validate_tables(tables):
+    """
+    Проверка набора таблиц (результат shared_tables.load_tables).
+
+    Returns:
+        tuple: ({имя: приведенная таблица}, список сообщений об ошибках).
+    """
+    checked, problems = {}, []
+    for name, df in tables.items():
+        checked[name], table_problems = validate_table(name, df)
+        problems.extend(table_problems)
+    return checked, problems
+
+
+if __name__ == "__main__":
+    import sys
+
+    from dopolneniya_tables.shared_tables import TABLES_DIR, read_tables
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else TABLES_DIR
+    tables = read_tables(directory)
+    for name, df in tables.items():
+        print(f"{name}: {len(df)} строк, {len(df.columns)} столбцов")
+    _, found = validate_tables(tables)
+    if found:
+        print(f"\nНайдено ошибок: {len(found)}")
+        for problem in found:
+            print(f"- {problem}")
+        sys.exit(1)
+    print("\nОшибок не найдено.")
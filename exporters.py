@@ -0,0 +1,252 @@
+"""
+Потоковая выгрузка результатов расчетов (NDJSON / CSV, при необходимости gzip).
+
+В отличие от save_structure_table_to_json и генераторов CSV через io.StringIO,
+записи пишутся по одной по мере получения: выгрузка миллионов сценариев
+идет в постоянной памяти. Числа записываются компактно: целые значения
+float без дробной части, остальные - кратчайшим точным представлением
+(или с округлением до digits знаков).
+
+Формат определяется по расширению файла:
+    результаты.ndjson / .jsonl     - одна JSON-запись на строку;
+    результаты.csv                 - CSV с разделителем ';' (как остальные таблицы проекта);
+    результаты.csv.gz, .ndjson.gz  - то же со сжатием gzip.
+
+Пример:
+    import exporters
+
+    with exporters.open_writer("сценарии.ndjson.gz", digits=3) as writer:
+        for scenario in sweep():
+            writer.write(scenario)
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import math
+import os
+from abc import ABC, abstractmethod
+
+import instrumentation as instr
+
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+CSV_SUFFIXES = (".csv",)
+
+
+def compact_number(value, digits=None):
+    """
+    Компактное представление числа для выгрузки.
+
+    Args:
+        value: Число (int, float, числа NumPy) или любое другое значение.
+        digits (int, optional): Число знаков после запятой для округления float.
+
+    Returns:
+        int/float/None или исходное значение: целые float -> int, NaN/inf -> None.
+    """
+    if isinstance(value, bool) or value is None:
+        return value
+    if hasattr(value, "item") and hasattr(value, "dtype"):  # числа NumPy
+        value = value.item()
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        if digits is not None:
+            value = round(value, digits)
+        if value.is_integer() and abs(value) < 1e16:
+            return int(value)
+    return value
+
+
+def flatten(record, prefix=""):
+    """Вложенные словари -> плоский словарь с ключами вида 'project_1.commodity_output'."""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        else:
+            flat[name] = value
+    return flat
+
+
+def _compact_record(record, digits):
+    if isinstance(record, dict):
+        return {k: _compact_record(v, digits) for k, v in record.items()}
+    if isinstance(record, (list, tuple)):
+        return [_compact_record(v, digits) for v in record]
+    return compact_number(record, digits)
+
+
+def detect_format(path):
+    """
+    Формат и сжатие по расширению файла.
+
+    Returns:
+        tuple: ('ndjson' или 'csv', сжатие gzip - bool).
+
+    Raises:
+        ValueError: Если расширение не поддерживается.
+    """
+    name = path.lower()
+    compress = name.endswith(".gz")
+    if compress:
+        name = name[:-3]
+    if name.endswith(NDJSON_SUFFIXES):
+        return "ndjson", compress
+    if name.endswith(CSV_SUFFIXES):
+        return "csv", compress
+    raise ValueError(f"Не удалось определить формат выгрузки по имени файла '{path}' "
+                     f"(ожидается .ndjson, .jsonl или .csv, возможно с .gz).")
+
+
+class RecordWriter(ABC):
+    """Базовый потоковый писатель записей (словарей)"""
+
+    def __init__(self, path, compress=False, digits=None, encoding="utf-8", compresslevel=6):
+        self.path = path
+        self.digits = digits
+        self.rows = 0
+        if compress:
+            self._file = gzip.open(path, "wt", encoding=encoding, newline="", compresslevel=compresslevel)
+        else:
+            self._file = open(path, "w", encoding=encoding, newline="")
+
+    @abstractmethod
+    def write(self, record):
+        """Записывает одну запись."""
+
+    def write_many(self, records):
+        """Записывает все записи итерируемого объекта (генератора). Возвращает их число."""
+        start = self.rows
+        for record in records:
+            self.write(record)
+        return self.rows - start
+
+    def close(self):
+        """Закрывает файл; счетчики инструментации обновляются один раз (а не на каждую запись)."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if instr.is_enabled():
+            instr.count("rows_written", self.rows)
+            instr.count("bytes_written", os.path.getsize(self.path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class NDJSONWriter(RecordWriter):
+    """Одна JSON-запись на строку (без отступов, кириллица как есть)"""
+
+    def write(self, record):
+        self._file.write(json.dumps(_compact_record(record, self.digits), ensure_ascii=False,
+                                    separators=(",", ":")))
+        self._file.write("\n")
+        self.rows += 1
+
+
+class CSVWriter(RecordWriter):
+    """
+    CSV с разделителем ';'. Заголовок берется из fieldnames или из первой записи;
+    вложенные словари разворачиваются (flatten).
+    """
+
+    def __init__(self, path, compress=False, digits=None, encoding=None, fieldnames=None, sep=";", **kwargs):
+        # utf-8-sig для несжатых файлов - как у остальных таблиц проекта (открываются в Excel)
+        encoding = encoding or ("utf-8" if compress else "utf-8-sig")
+        super().__init__(path, compress, digits, encoding, **kwargs)
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self._writer = csv.writer(self._file, delimiter=sep)
+        if self.fieldnames:
+            self._writer.writerow(self.fieldnames)
+
+    def write(self, record):
+        record = flatten(record)
+        if self.fieldnames is None:
+            self.fieldnames = list(record)
+            self._writer.writerow(self.fieldnames)
+        extra = record.keys() - set(self.fieldnames)
+        if extra:
+            raise ValueError(f"Поля {sorted(extra)} отсутствуют в заголовке CSV {self.path}.")
+        row = []
+        for name in self.fieldnames:
+            value = compact_number(record.get(name), self.digits)
+            row.append("" if value is None else value)
+        self._writer.writerow(row)
+        self.rows += 1
+
+
+def open_writer(path, fmt=None, compress=None, digits=None, **kwargs):
+    """
+    Открывает потоковый писатель записей.
+
+    Args:
+        path (str): Файл выгрузки.
+        fmt (str, optional): 'ndjson' или 'csv' (по умолчанию - по расширению).
+        compress (bool, optional): Сжатие gzip (по умолчанию - по расширению .gz).
+        digits (int, optional): Округление float до digits знаков.
+        **kwargs: Параметры писателя (fieldnames, sep, encoding для CSV).
+
+    Returns:
+        RecordWriter: Писатель (контекстный менеджер).
+    """
+    if fmt is None or compress is None:
+        detected_fmt, detected_compress = detect_format(path)
+        fmt = fmt or detected_fmt
+        compress = detected_compress if compress is None else compress
+    if fmt == "ndjson":
+        return NDJSONWriter(path, compress, digits, **kwargs)
+    if fmt == "csv":
+        return CSVWriter(path, compress, digits, **kwargs)
+    raise ValueError(f"Неизвестный формат выгрузки: {fmt}")
+
+
+def export_records(records, path, **kwargs):
+    """
+    Выгружает записи итерируемого объекта (генератора) в файл.
+
+    Returns:
+        int: Число записанных записей.
+    """
+    with open_writer(path, **kwargs) as writer:
+        return writer.write_many(records)
+
+
+def working_capital_sweep(n, seed=0):
+    """
+    Пример потока сценариев: норматив оборотных средств (задание 2.2)
+    для n случайных наборов исходных данных (task_22.random_projects).
+    Записи создаются по одной.
+    """
+    from pract_part.task_22 import PROJECT_INPUTS, calculate_project, random_projects
+
+    for i, project in enumerate(random_projects(n, seed, name="Сценарий")):
+        results = calculate_project(project)
+        record = {"scenario": i + 1}
+        record.update({name: getattr(project, name) for name in PROJECT_INPUTS})
+        record.update({k: v for k, v in results.items() if not k.endswith("_calc")})
+        yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Потоковая выгрузка сценариев расчета норматива оборотных средств")
+    parser.add_argument("-n", "--scenarios", type=int, default=100000, help="Число сценариев (по умолчанию: 100000)")
+    parser.add_argument("-o", "--output", default="сценарии_оборотные_средства.csv.gz",
+                        help="Файл выгрузки (.ndjson/.jsonl/.csv, возможно с .gz)")
+    parser.add_argument("--digits", type=int, default=3, help="Знаков после запятой (по умолчанию: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = export_records(working_capital_sweep(args.scenarios, args.seed), args.output, digits=args.digits)
+    print(f"Выгружено {rows} сценариев в {args.output} ({os.path.getsize(args.output)} байт)")
+
+
+if __name__ == "__main__":
+    main()
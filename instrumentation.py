@@ -0,0 +1,223 @@
+"""
+Легковесная инструментация этапов расчета: интервалы (span), счетчики и
+экспорт в JSON-трассу формата Chrome Trace (открывается в chrome://tracing
+или https://ui.perfetto.dev).
+
+По умолчанию выключена и почти ничего не стоит: span() возвращает общий
+пустой контекстный менеджер, count() сразу выходит. Аргументы count(),
+которые дорого вычислять (размер файла, длина строки), вычисляются под
+проверкой is_enabled(). Включается:
+  - переменной окружения COURSE_TRACE=<путь к trace.json> (трасса
+    записывается автоматически при завершении программы);
+  - или вызовом enable(path) из кода.
+
+Пример:
+    import instrumentation as instr
+
+    with instr.span("Чтение CSV", file=path):
+        df = pd.read_csv(path, sep=';')
+        if instr.is_enabled():
+            instr.count("bytes_read", os.path.getsize(path))
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+
+ENV_VAR = "COURSE_TRACE"
+
+_enabled = False
+_trace_path = None
+_events = []
+_counters = {}
+_dirty = set()  # счетчики, изменившиеся после последней записи в трассу
+_span_totals = {}  # {имя: [число вызовов, суммарное время, с]}
+_lock = threading.Lock()
+_t0 = time.perf_counter()
+_NOOP = nullcontext()
+
+
+def _now_us():
+    return (time.perf_counter() - _t0) * 1e6
+
+
+def enable(path=None):
+    """
+    Включает сбор трассы.
+
+    Args:
+        path (str, optional): Файл трассы, записываемый при завершении программы.
+                              Если None, трассу нужно сохранить вызовом export_trace.
+    """
+    global _enabled, _trace_path
+    _enabled = True
+    if path:
+        _trace_path = path
+
+
+def disable():
+    """Выключает сбор трассы (накопленные данные сохраняются)."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """True, если сбор трассы включен (для проверки перед дорогими аргументами count)."""
+    return _enabled
+
+
+def _flush_counters(ts):
+    """Записывает в трассу значения изменившихся счетчиков (вызывается под _lock)."""
+    pid = os.getpid()
+    for name in sorted(_dirty):
+        _events.append({"name": name, "ph": "C", "ts": ts, "pid": pid, "args": {name: _counters[name]}})
+    _dirty.clear()
+
+
+def reset():
+    """Очищает накопленные события, счетчики и итоги."""
+    with _lock:
+        _events.clear()
+        _counters.clear()
+        _dirty.clear()
+        _span_totals.clear()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _now_us()
+        event = {"name": self.name, "ph": "X", "ts": self.start, "dur": end - self.start,
+                 "pid": os.getpid(), "tid": threading.get_ident()}
+        if self.args:
+            event["args"] = {k: str(v) for k, v in self.args.items()}
+        if exc_type is not None:
+            event.setdefault("args", {})["error"] = exc_type.__name__
+        with _lock:
+            _events.append(event)
+            _flush_counters(end)
+            total = _span_totals.setdefault(self.name, [0, 0.0])
+            total[0] += 1
+            total[1] += (end - self.start) / 1e6
+        return False
+
+
+def span(name, **args):
+    """
+    Интервал выполнения этапа (контекстный менеджер).
+
+    Args:
+        name (str): Имя этапа.
+        **args: Дополнительные сведения для трассы (файл, проект и т.п.).
+    """
+    if not _enabled:
+        return _NOOP
+    return _Span(name, args)
+
+
+def traced(name=None):
+    """Декоратор: оборачивает вызов функции в span (имя по умолчанию - имя функции)."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, value=1):
+    """
+    Увеличивает счетчик (строки, байты, попадания в кеш, вычисленные формулы и т.п.).
+
+    Событие в трассу не добавляется на каждый вызов: значения изменившихся
+    счетчиков записываются по одному разу при завершении span и при экспорте.
+
+    Args:
+        name (str): Имя счетчика.
+        value (int/float): Приращение.
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+        _dirty.add(name)
+
+
+def counters():
+    """Текущие значения счетчиков."""
+    with _lock:
+        return dict(_counters)
+
+
+def summary():
+    """
+    Итоги по этапам и счетчикам.
+
+    Returns:
+        dict: {'spans': {имя: {'calls', 'total_s'}}, 'counters': {имя: значение}}
+    """
+    with _lock:
+        return {
+            "spans": {k: {"calls": v[0], "total_s": round(v[1], 6)} for k, v in _span_totals.items()},
+            "counters": dict(_counters),
+        }
+
+
+def format_summary():
+    """Итоги в текстовом виде (этапы по убыванию суммарного времени)."""
+    data = summary()
+    lines = ["Этапы:"]
+    for name, info in sorted(data["spans"].items(), key=lambda kv: -kv[1]["total_s"]):
+        lines.append(f"  {name}: {info['total_s']:.6f} с ({info['calls']} вызовов)")
+    lines.append("Счетчики:")
+    for name, value in sorted(data["counters"].items()):
+        lines.append(f"  {name}: {value}")
+    return "\n".join(lines)
+
+
+def export_trace(path):
+    """
+    Сохраняет трассу в формате Chrome Trace (JSON Object Format).
+
+    Args:
+        path (str): Путь к файлу трассы.
+
+    Returns:
+        str: Путь к сохраненному файлу.
+    """
+    with _lock:
+        _flush_counters(_now_us())
+        data = {"traceEvents": list(_events), "displayTimeUnit": "ms",
+                "otherData": {"counters": dict(_counters)}}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    return path
+
+
+@atexit.register
+def _export_at_exit():
+    if _trace_path and (_events or _counters):
+        export_trace(_trace_path)
+        print(f"Трасса сохранена в {_trace_path}")
+
+
+if os.environ.get(ENV_VAR):
+    enable(os.environ[ENV_VAR])
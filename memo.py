@@ -0,0 +1,161 @@
+"""
+Мемоизация расчетов по эффективным исходным данным.
+
+Многие варианты задания сводятся к одним и тем же исходным данным
+(например, task3 берет строку dop_N по четности варианта), поэтому
+результат расчета кешируется по кортежу эффективных входов, а не по
+номеру варианта. Кеш ограничен (вытеснение давно не использованных
+записей, LRU) и ведет статистику попаданий и промахов.
+
+Пример:
+    import memo
+
+    @memo.memoize(maxsize=128, key=lambda path, variant: (memo.file_key(path), variant % 2))
+    def load(path, variant):
+        ...
+
+    load.cache_info()   # {'hits': ..., 'misses': ..., 'size': ..., 'maxsize': ...}
+    memo.stats()        # статистика всех мемоизированных функций
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import instrumentation as instr
+
+_registry = {}
+
+
+def freeze(obj):
+    """
+    Приводит исходные данные к хешируемому виду для ключа кеша.
+
+    dict -> отсортированный кортеж пар, list/tuple -> кортеж, set -> frozenset,
+    массивы NumPy и pandas -> (тип, форма, байты); остальное - как есть.
+    """
+    if isinstance(obj, dict):
+        return tuple(sorted((freeze(k), freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    if isinstance(obj, (set, frozenset)):
+        return frozenset(freeze(v) for v in obj)
+    if hasattr(obj, "to_numpy") and hasattr(obj, "columns"):  # DataFrame
+        return ("DataFrame", tuple(map(str, obj.columns)), freeze(obj.to_numpy()))
+    if hasattr(obj, "tobytes") and hasattr(obj, "dtype") and hasattr(obj, "shape"):  # ndarray
+        if obj.dtype == object:
+            return ("ndarray", obj.shape, tuple(freeze(v) for v in obj.ravel().tolist()))
+        return ("ndarray", obj.dtype.str, obj.shape, obj.tobytes())
+    return obj
+
+
+def file_key(path):
+    """Ключ файла исходных данных: путь, время изменения и размер (изменение файла сбрасывает кеш)."""
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return path, None, None
+    return path, st.st_mtime_ns, st.st_size
+
+
+class LRUCache:
+    """Ограниченный кеш с вытеснением давно не использованных записей и статистикой"""
+
+    def __init__(self, maxsize=256):
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("maxsize должен быть положительным или None (без ограничения).")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return True, self._data[key]
+            self.misses += 1
+            return False, default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._data), "maxsize": self.maxsize,
+                    "hit_rate": self.hits / total if total else 0.0}
+
+
+def memoize(maxsize=256, key=None, name=None):
+    """
+    Декоратор мемоизации с ограниченным LRU-кешем.
+
+    Args:
+        maxsize (int, optional): Максимальное число записей (None - без ограничения).
+        key (callable, optional): Функция от тех же аргументов, возвращающая
+                                  эффективный ключ (по умолчанию - freeze всех аргументов).
+        name (str, optional): Имя в статистике (по умолчанию - имя функции).
+
+    Результат функции возвращается из кеша как есть (общий объект), поэтому
+    изменяемые результаты вызывающий код должен копировать перед изменением.
+    """
+    def decorator(func):
+        cache = LRUCache(maxsize)
+        cache_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key is not None else freeze((args, kwargs))
+            found, value = cache.get(cache_key)
+            if found:
+                instr.count("memo_hits")
+                return value
+            instr.count("memo_misses")
+            value = func(*args, **kwargs)
+            cache.put(cache_key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        _registry[cache_name] = cache
+        return wrapper
+    return decorator
+
+
+def stats():
+    """Статистика всех мемоизированных функций: {имя: cache_info()}."""
+    return {name: cache.info() for name, cache in _registry.items()}
+
+
+def format_stats():
+    """Статистика кешей в текстовом виде."""
+    lines = ["Кеши расчетов:"]
+    for name, info in stats().items():
+        lines.append(f"  {name}: попаданий {info['hits']}, промахов {info['misses']}, "
+                     f"вытеснено {info['evictions']}, записей {info['size']}/{info['maxsize']} "
+                     f"({info['hit_rate']:.0%} попаданий)")
+    return "\n".join(lines)
+
+
+def clear_all():
+    """Очищает все кеши."""
+    for cache in _registry.values():
+        cache.clear()
@@ -0,0 +1,219 @@
+"""
+Денежные суммы в копейках (int64) для векторизованных расчетов.
+
+Суммы хранятся целыми числами копеек в массивах NumPy: сложение и
+суммирование точные и воспроизводимые (не зависят от порядка слагаемых),
+а по скорости на порядки быстрее Decimal. Округление выполняется только
+явно - при переводе из рублей (to_kopecks), при умножении на ставку или
+объем (scale, percent_of, mul_div) и на границе таблицы (to_rubles,
+to_thousands) - по выбранному правилу:
+  - HALF_UP   - математическое (половина копейки - от нуля), по умолчанию;
+  - HALF_EVEN - банковское (половина - к четному);
+  - DOWN      - отбрасывание дробной части (к нулю);
+  - FLOOR / CEILING - вниз / вверх.
+
+Коэффициенты и проценты переводятся в целые с COEF_DIGITS знаками после
+запятой, поэтому умножение выполняется в целых числах без двоичной
+погрешности float. Дробь коэффициентов сокращается, а сумма делится на
+знаменатель до умножения, поэтому запас по разрядам не расходуется на
+масштаб коэффициентов. Пределы: суммы из float (to_kopecks) - до 2**53
+копеек (около 90 трлн руб., дальше float не хранит копейки точно);
+результаты в int64 - до 2**63 - 1 копеек (около 92 квадрлн руб.).
+Выход за пределы - ValueError.
+
+Пример:
+    import money
+
+    k = money.to_kopecks([1234.565, 10.005])           # [123457, 1001]
+    salary = money.percent_of(k, 14.5)                 # 14,5 % с округлением до копейки
+    money.to_thousands(money.total(k), digits=2)       # 1.24 (тыс. руб.)
+"""
+
+import numpy as np
+
+HALF_UP = "half_up"
+HALF_EVEN = "half_even"
+DOWN = "down"
+FLOOR = "floor"
+CEILING = "ceiling"
+ROUNDING = (HALF_UP, HALF_EVEN, DOWN, FLOOR, CEILING)
+
+KOPECKS_PER_RUBLE = 100
+COEF_DIGITS = 6  # знаков после запятой в коэффициентах и процентах
+SNAP_DIGITS = 6  # рубли -> копейки: отбрасывается двоичная погрешность float (2.675 * 100 = 267.4999...)
+INT64_MAX = np.iinfo(np.int64).max
+_FLOAT_LIMIT = 2.0 ** 53  # больше - float уже не хранит копейки точно
+
+
+def _check_rounding(rounding):
+    if rounding not in ROUNDING:
+        raise ValueError(f"Неизвестное правило округления: {rounding!r}. Доступны: {', '.join(ROUNDING)}")
+
+
+def _result(array):
+    """Скаляр для скалярных аргументов, массив - для массивов."""
+    array = np.asarray(array)
+    return array.item() if array.ndim == 0 else array
+
+
+def _round_float(values, rounding):
+    if rounding == HALF_UP:
+        return np.sign(values) * np.floor(np.abs(values) + 0.5)
+    if rounding == HALF_EVEN:
+        return np.rint(values)
+    if rounding == DOWN:
+        return np.trunc(values)
+    if rounding == FLOOR:
+        return np.floor(values)
+    return np.ceil(values)
+
+
+def _fixed(values, scale, what):
+    """Дробные значения -> целые в единицах 1/scale (с проверкой диапазона)."""
+    scaled = np.round(np.asarray(values, dtype=float) * scale, SNAP_DIGITS)
+    if not np.all(np.isfinite(scaled)):
+        raise ValueError(f"{what}: нечисловые значения (NaN или бесконечность).")
+    if np.any(np.abs(scaled) >= _FLOAT_LIMIT):
+        raise ValueError(f"{what}: значения вне допустимого диапазона.")
+    return scaled
+
+
+def _multiply(a, b):
+    """Точное произведение int64 с проверкой переполнения."""
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    limit = INT64_MAX // np.maximum(np.abs(b), 1)
+    if np.any(np.abs(a) > limit):
+        raise ValueError("Переполнение int64 при умножении денежных сумм.")
+    return a * b
+
+
+def round_div(numerator, denominator, rounding=HALF_UP):
+    """
+    Целочисленное деление с округлением по правилу rounding.
+
+    Args:
+        numerator: Делимое (int64, массив или скаляр).
+        denominator: Делитель (положительный).
+        rounding (str): Правило округления.
+
+    Returns:
+        np.ndarray: Частное (int64).
+
+    Raises:
+        ValueError: Если делитель не положительный.
+    """
+    _check_rounding(rounding)
+    num = np.asarray(numerator, dtype=np.int64)
+    den = np.asarray(denominator, dtype=np.int64)
+    if np.any(den <= 0):
+        raise ValueError("Делитель должен быть положительным.")
+    q, r = np.divmod(num, den)  # q - вниз, 0 <= r < den
+    return _round_quotient(q, r, den, rounding)
+
+
+def _round_quotient(q, r, den, rounding):
+    """Округление частного q + r / den (q - целая часть вниз, 0 <= r < den)."""
+    if rounding == FLOOR:
+        return q
+    if rounding == CEILING:
+        return q + (r > 0)
+    if rounding == DOWN:
+        return q + ((r > 0) & (q < 0))
+    twice = 2 * r
+    if rounding == HALF_UP:
+        up = (twice > den) | ((twice == den) & (q >= 0))
+    else:
+        up = (twice > den) | ((twice == den) & (q % 2 == 1))
+    return q + up
+
+
+def to_kopecks(rubles, rounding=HALF_UP):
+    """
+    Рубли (float) -> копейки (int64).
+
+    Raises:
+        ValueError: Для NaN, бесконечности и сумм вне диапазона.
+    """
+    _check_rounding(rounding)
+    kopecks = _round_float(_fixed(rubles, KOPECKS_PER_RUBLE, "Суммы в рублях"), rounding)
+    return _result(kopecks.astype(np.int64))
+
+
+def from_kopecks(kopecks):
+    """Копейки -> рубли (float) без округления."""
+    return _result(np.asarray(kopecks, dtype=np.int64) / KOPECKS_PER_RUBLE)
+
+
+def mul_div(kopecks, numerator, denominator, rounding=HALF_UP):
+    """
+    kopecks * numerator / denominator с одним округлением до копейки.
+
+    Коэффициенты numerator и denominator (float, например β и 100 - β)
+    переводятся в целые с COEF_DIGITS знаками, поэтому результат точный.
+    Дробь num / den сокращается, а произведение раскладывается как
+    (k // den) * num + (k % den) * num / den: переполнение возможно, только
+    если не помещается в int64 сам результат.
+
+    Raises:
+        ValueError: Если знаменатель не положительный или результат вне int64.
+    """
+    _check_rounding(rounding)
+    scale = 10 ** COEF_DIGITS
+    num = _fixed(numerator, scale, "Коэффициенты").astype(np.int64)
+    den = _fixed(denominator, scale, "Коэффициенты").astype(np.int64)
+    if np.any(den <= 0):
+        raise ValueError("Делитель должен быть положительным.")
+    divisor = np.gcd(num, den)
+    num, den = num // divisor, den // divisor
+    q, r = np.divmod(np.asarray(kopecks, dtype=np.int64), den)
+    # k * num / den = q * num + r * num / den, где 0 <= r < den
+    q2, r2 = np.divmod(_multiply(r, num), den)
+    whole = _multiply(q, num)
+    with np.errstate(over="ignore"):
+        quotient = whole + q2
+    # Сложение переполнилось, если знаки слагаемых совпадают, а у суммы - другой
+    if np.any(((whole ^ quotient) & (q2 ^ quotient)) < 0):
+        raise ValueError("Переполнение int64 при умножении денежных сумм.")
+    return _result(_round_quotient(quotient, r2, den, rounding))
+
+
+def scale(kopecks, factor, rounding=HALF_UP):
+    """Сумма, умноженная на коэффициент (объем выпуска, Ктр), с округлением до копейки."""
+    return mul_div(kopecks, factor, 1, rounding)
+
+
+def percent_of(kopecks, percent, rounding=HALF_UP):
+    """percent % от суммы с округлением до копейки."""
+    return mul_div(kopecks, percent, 100, rounding)
+
+
+def total(kopecks, axis=None):
+    """
+    Точная сумма копеек (int64).
+
+    Raises:
+        ValueError: При переполнении int64.
+    """
+    values = np.asarray(kopecks, dtype=np.int64)
+    result = values.sum(axis=axis)
+    # Оценка в float: при переполнении int64 точная сумма по модулю превышает INT64_MAX
+    if np.any(np.abs(values.sum(axis=axis, dtype=float)) >= INT64_MAX):
+        raise ValueError("Переполнение int64 при суммировании денежных сумм.")
+    return _result(result)
+
+
+def to_rubles(kopecks, digits=2, rounding=HALF_UP):
+    """Копейки -> рубли (float) с округлением до digits знаков (0..2) - для таблиц."""
+    if not 0 <= digits <= 2:
+        raise ValueError(f"Знаков после запятой в рублях: 0..2, получено {digits}.")
+    unit = 10 ** (2 - digits)
+    return _result(round_div(kopecks, unit, rounding) / 10 ** digits)
+
+
+def to_thousands(kopecks, digits=2, rounding=HALF_UP):
+    """Копейки -> тыс. руб. (float) с округлением до digits знаков (0..5) - для таблиц."""
+    if not 0 <= digits <= 5:
+        raise ValueError(f"Знаков после запятой в тыс. руб.: 0..5, получено {digits}.")
+    unit = 10 ** (5 - digits)
+    return _result(round_div(kopecks, unit, rounding) / 10 ** digits)
@@ -0,0 +1,171 @@
+"""
+Анализ безубыточности для множества сценариев одновременно.
+
+Все функции принимают массивы NumPy (или скаляры) постоянных расходов,
+переменных расходов, цен и объемов производства и считают показатели
+для всех сценариев одной векторной операцией. Построение графика вынесено
+в отдельную функцию plot_break_even и не требуется для расчета.
+"""
+
+import numpy as np
+
+# Статьи калькуляции, относимые к постоянным расходам (остальные - переменные)
+FIXED_COST_ITEMS = ("equipment_maintenance", "overhead_production", "general_business", "non_production")
+VARIABLE_COST_ITEMS = ("material", "semi_components", "fuel_energy",
+                       "basic_salary", "additional_salary", "social_insurance")
+
+
+def calculate_break_even(CF, cv_total, price, Q_max, round_up=True):
+    """
+    Расчет точки безубыточности и сопутствующих показателей.
+
+    Qбу = CF / (Ц - Сv), где Сv = Сv.общ / Qmax - переменные расходы на единицу.
+
+    Args:
+        CF (array_like): Постоянные расходы, тыс. руб.
+        cv_total (array_like): Общие переменные расходы на годовой выпуск, тыс. руб.
+        price (array_like): Цена единицы продукции, тыс. руб.
+        Q_max (array_like): Годовой объем производства, шт.
+        round_up (bool): Округлять точку безубыточности вверх до целого изделия.
+
+    Returns:
+        dict: Массивы показателей по сценариям:
+              'cv_unit' - переменные расходы на единицу, тыс. руб.;
+              'margin_unit' - маржинальный доход на единицу, тыс. руб.;
+              'Q_be' - точка безубыточности, шт. (inf, если Ц <= Сv);
+              'revenue_be' - выручка в точке безубыточности, тыс. руб.;
+              'profit_at_capacity' - прибыль при Qmax, тыс. руб.;
+              'safety_margin_units' - запас финансовой прочности, шт.;
+              'safety_margin_pct' - запас финансовой прочности, %;
+              'operating_leverage' - операционный рычаг (маржинальный доход / прибыль).
+    """
+    CF, cv_total, price, Q_max = np.broadcast_arrays(
+        np.asarray(CF, dtype=float), np.asarray(cv_total, dtype=float),
+        np.asarray(price, dtype=float), np.asarray(Q_max, dtype=float)
+    )
+
+    cv_unit = cv_total / Q_max
+    margin_unit = price - cv_unit
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Q_be = np.where(margin_unit > 0, CF / margin_unit, np.inf)
+        if round_up:
+            Q_be = np.ceil(Q_be)
+
+        margin_total = margin_unit * Q_max
+        profit_at_capacity = margin_total - CF
+        safety_margin_units = Q_max - Q_be
+        safety_margin_pct = safety_margin_units / Q_max * 100
+        operating_leverage = np.where(profit_at_capacity != 0,
+                                      margin_total / profit_at_capacity, np.inf)
+
+    return {
+        "cv_unit": cv_unit,
+        "margin_unit": margin_unit,
+        "Q_be": Q_be,
+        "revenue_be": price * Q_be,
+        "profit_at_capacity": profit_at_capacity,
+        "safety_margin_units": safety_margin_units,
+        "safety_margin_pct": safety_margin_pct,
+        "operating_leverage": operating_leverage,
+    }
+
+
+def scenarios_from_cost_results(calculation_results, projects_data, fixed_items=FIXED_COST_ITEMS,
+                                variable_items=VARIABLE_COST_ITEMS):
+    """
+    Формирует входные массивы для calculate_break_even из результатов
+    CostCalculator.calculate_all_costs (по одному сценарию на проект).
+
+    Args:
+        calculation_results (dict): CostCalculator.calculation_results.
+        projects_data (dict): CostCalculator.projects_data (годовые объемы).
+        fixed_items (tuple): Ключи annual_costs, относимые к постоянным расходам.
+        variable_items (tuple): Ключи annual_costs, относимые к переменным расходам.
+
+    Returns:
+        dict: 'names', 'CF', 'cv_total', 'price' (тыс. руб.), 'Q_max' (шт.).
+    """
+    keys = list(calculation_results.keys())
+    annual = [calculation_results[k]["annual_costs"] for k in keys]
+
+    return {
+        "names": [projects_data[k]["name"] for k in keys],
+        "CF": np.array([sum(a[item] for item in fixed_items) for a in annual], dtype=float),
+        "cv_total": np.array([sum(a[item] for item in variable_items) for a in annual], dtype=float),
+        "price": np.array([calculation_results[k]["wholesale_price"] / 1000 for k in keys], dtype=float),
+        "Q_max": np.array([projects_data[k]["annual_volume_corrected"] for k in keys], dtype=float),
+    }
+
+
+def plot_break_even(CF, cv_total, price, Q_max, ax=None, fontsize=9.4):
+    """
+    Строит график безубыточности для одного сценария (в стиле для Ч/Б печати).
+
+    Args:
+        CF, cv_total, price, Q_max (float): Исходные данные сценария.
+        ax (matplotlib.axes.Axes, optional): Оси для построения. Если None,
+                                              создается новая фигура.
+        fontsize (float): Размер шрифта подписей.
+
+    Returns:
+        matplotlib.axes.Axes: Оси с построенным графиком.
+    """
+    import matplotlib.pyplot as plt
+
+    if ax is None:
+        _, ax = plt.subplots(figsize=(12, 8), facecolor='white')
+
+    result = calculate_break_even(CF, cv_total, price, Q_max)
+    cv_unit = float(result["cv_unit"])
+    Q_be = float(result["Q_be"])
+    profit_at_max = float(result["profit_at_capacity"])
+
+    # Создание массива объемов производства
+    Q = np.linspace(0, Q_max * 1.2, 100)
+    revenue = price * Q  # выручка
+    variable_costs = cv_unit * Q  # переменные затраты
+    fixed_costs_line = np.ones_like(Q) * CF  # постоянные затраты
+    total_costs = CF + variable_costs  # общие затраты
+
+    # Основные линии с различными стилями для Ч/Б печати
+    ax.plot(Q, revenue, 'k-', linewidth=2.5)  # Выручка - сплошная линия
+    ax.plot(Q, total_costs, 'k--', linewidth=2.5)  # Общие затраты - пунктир
+    ax.plot(Q, variable_costs, 'k-.', linewidth=2)  # Переменные затраты - штрих-пунктир
+    ax.plot(Q, fixed_costs_line, 'k:', linewidth=2)  # Постоянные затраты - точечная линия
+
+    # Точка безубыточности
+    ax.axvline(x=Q_be, color='k', linestyle='-', linewidth=1.5)
+    ax.plot(Q_be, price * Q_be, 'ko', markersize=8)
+    ax.plot(Q_be, CF + cv_unit * Q_be, 'ko', markersize=8)
+
+    box = dict(facecolor='white', alpha=0.8, edgecolor='gray')
+    ax.text(Q_max * 0.7, price * Q_max * 0.8, 'Выручка', fontsize=fontsize, bbox=box)
+    ax.text(Q_max * 0.9, cv_unit * Q_max * 0.9, 'Переменные затраты', fontsize=fontsize, bbox=box)
+    ax.text(Q_max * 0.1, CF * 1.05, 'Постоянные затраты', fontsize=fontsize, bbox=box)
+    ax.text(Q_be + 5, price * Q_be + 10000,
+            f'Точка безубыточности\n({Q_be:.1f} шт.; {(price * Q_be):.1f} тыс. руб.)',
+            fontsize=fontsize, bbox=dict(facecolor='white', alpha=0.9, edgecolor='gray'))
+    ax.text(Q_max * 1.1, (CF + cv_unit * Q_max * 1.5) * 0.8, 'Себестоимость', fontsize=fontsize, bbox=box)
+
+    # Отметка годового объема производства
+    ax.axvline(x=Q_max, color='k', linestyle='-', linewidth=1, alpha=0.7)
+    ax.text(Q_max + 5, 5000, f'Годовой объем\nпроизводства\n({Q_max:.0f} шт.)', fontsize=fontsize, bbox=box)
+    ax.text(Q_max - 40, price * Q_max - 10000,
+            f'Прибыль при Q={Q_max:.0f} шт.:\n{profit_at_max:.2f} тыс. руб.', fontsize=fontsize, bbox=box)
+
+    # Настройка графика
+    ax.set_title('График безубыточности производства', fontsize=16, pad=20)
+    ax.set_xlabel('Объем производства, шт.', fontsize=14, labelpad=10)
+    ax.set_ylabel('Денежные средства, тыс. руб.', fontsize=14, labelpad=10)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.minorticks_on()
+    ax.grid(which='minor', linestyle=':', alpha=0.4)
+
+    y_max = max(revenue[-1], total_costs[-1])
+    ax.set_xlim(0, Q_max * 1.2)
+    ax.set_ylim(0, y_max * 1.1)
+    ax.set_xticks(np.arange(0, Q_max * 1.3, 50))
+    ax.set_yticks(np.arange(0, y_max * 1.2, 20000))
+
+    return ax
@@ -0,0 +1,235 @@
+"""
+Факторный анализ изменения себестоимости, цены и прибыли
+(метод цепных подстановок и интегральный метод).
+
+Изменение показателя между базовым и новым вариантом (базовое изделие
+задания 1 -> проект, проект 1 -> проект 2 и т.п.) раскладывается по группам
+факторов:
+  - нормы расхода материалов и стоимостные нормы;
+  - цены материалов, отходов, Ктр и часовая тарифная ставка;
+  - трудоемкость;
+  - нормативы (проценты доп. зарплаты, отчислений, накладных расходов, рентабельности);
+  - объем выпуска.
+
+Метод цепных подстановок: факторы последовательно заменяются базовыми
+значениями на новые в заданном порядке (результат зависит от порядка).
+Интегральный метод: вклад фактора - интеграл частной производной по
+прямолинейному пути от базовых значений к новым; от порядка не зависит,
+взаимодействие факторов распределяется между ними. Производные считаются
+комплексным шагом, интеграл - квадратурой Гаусса-Лежандра.
+
+Расчет векторизован: все изделия и пары вариантов обрабатываются одним
+вызовом task1/cost_chain.cost_chain.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from task1.cost_chain import (INPUT_FIELDS, LABOR_FIELDS, NORM_FIELDS, PRICE_FIELDS, RATE_FIELDS,
+                              VOLUME_FIELDS, cost_chain, inputs_from_calculator, inputs_from_task1,
+                              stack_inputs)
+
+# (ключ, наименование, поля исходных данных); порядок - порядок цепных подстановок
+# (сначала количественный фактор, затем качественные)
+FACTORS = (
+    ("volume", "Объем выпуска", VOLUME_FIELDS),
+    ("norms", "Нормы расхода материалов", NORM_FIELDS),
+    ("labor", "Трудоемкость", LABOR_FIELDS),
+    ("prices", "Цены и тарифы", PRICE_FIELDS),
+    ("rates", "Нормативы", RATE_FIELDS),
+)
+
+INDICATORS = {
+    "full_cost": "Полная себестоимость единицы, руб.",
+    "wholesale_price": "Оптовая цена единицы, руб.",
+    "profit": "Прибыль на единицу, руб.",
+    "annual_full_cost": "Годовая полная себестоимость, тыс. руб.",
+    "annual_profit": "Годовая прибыль, тыс. руб.",
+}
+
+GAUSS_NODES = 16
+COMPLEX_STEP = 1e-20
+
+
+def _as_arrays(inputs, n=None):
+    """Словарь исходных данных (скаляры/массивы или список записей) -> массивы одной длины."""
+    if isinstance(inputs, (list, tuple)):
+        inputs = stack_inputs(inputs)
+    arrays = {f: np.asarray(inputs[f], dtype=float) for f in INPUT_FIELDS}
+    n = n or max(a.size for a in arrays.values())
+    return {f: np.broadcast_to(a, (n,)) for f, a in arrays.items()}, n
+
+
+def _check_factors(factors):
+    fields = [f for _, _, group in factors for f in group]
+    if sorted(fields) != sorted(INPUT_FIELDS):
+        raise ValueError("Группы факторов должны покрывать все исходные данные ровно один раз.")
+
+
+def chain_substitution(base, new, factors=FACTORS, indicators=tuple(INDICATORS)):
+    """
+    Метод цепных подстановок.
+
+    Args:
+        base, new (dict или list): Исходные данные базового и нового вариантов
+                                   ({поле: массив} или список записей одинаковой длины).
+        factors (tuple): Группы факторов в порядке подстановки.
+        indicators (tuple): Анализируемые показатели (ключи результата cost_chain).
+
+    Returns:
+        dict: {'base': {показатель: массив}, 'new': {...},
+               'factors': {фактор: {показатель: массив влияния}}}.
+    """
+    _check_factors(factors)
+    base, n = _as_arrays(base)
+    new, _ = _as_arrays(new, n)
+
+    x = dict(base)
+    prev = cost_chain(x)
+    result = {"base": {i: prev[i] for i in indicators}, "factors": {}}
+    for key, _, fields in factors:
+        for field in fields:
+            x[field] = new[field]
+        cur = cost_chain(x)
+        result["factors"][key] = {i: cur[i] - prev[i] for i in indicators}
+        prev = cur
+    result["new"] = {i: prev[i] for i in indicators}
+    return result
+
+
+def integral_method(base, new, factors=FACTORS, indicators=tuple(INDICATORS), nodes=GAUSS_NODES):
+    """
+    Интегральный метод: ΔY_k = ∫₀¹ Σ_{j∈k} ∂Y/∂x_j (x₀ + tΔx) Δx_j dt.
+
+    Сумма влияний равна общему изменению показателя с точностью квадратуры
+    (остаток возвращается в 'residual').
+
+    Args:
+        nodes (int): Число узлов квадратуры Гаусса-Лежандра.
+
+    Returns:
+        dict: Как в chain_substitution, плюс 'residual': {показатель: массив}.
+    """
+    _check_factors(factors)
+    base, n = _as_arrays(base)
+    new, _ = _as_arrays(new, n)
+    delta = {f: new[f] - base[f] for f in INPUT_FIELDS}
+
+    xi, wi = np.polynomial.legendre.leggauss(nodes)
+    ts, ws = (xi + 1) / 2, wi / 2
+
+    contributions = {key: {i: np.zeros(n) for i in indicators} for key, _, _ in factors}
+    for t, w in zip(ts, ws):
+        point = {f: base[f] + t * delta[f] for f in INPUT_FIELDS}
+        for key, _, fields in factors:
+            # Производная по направлению Δx группы: Im f(x + ihΔx_k) / h
+            x = dict(point)
+            for field in fields:
+                x[field] = point[field] + 1j * COMPLEX_STEP * delta[field]
+            out = cost_chain(x)
+            for i in indicators:
+                contributions[key][i] += w * out[i].imag / COMPLEX_STEP
+
+    base_out, new_out = cost_chain(base), cost_chain(new)
+    result = {"base": {i: base_out[i] for i in indicators},
+              "new": {i: new_out[i] for i in indicators},
+              "factors": contributions}
+    result["residual"] = {i: new_out[i] - base_out[i] - sum(contributions[k][i] for k in contributions)
+                          for i in indicators}
+    return result
+
+
+def to_frame(result, labels=None, factors=FACTORS):
+    """
+    Результат анализа -> таблица: строка на (позицию, показатель), столбцы - влияние факторов.
+
+    Args:
+        result (dict): Результат chain_substitution или integral_method.
+        labels (list, optional): Наименования позиций (изделий/пар вариантов).
+    """
+    rows = []
+    for indicator, base in result["base"].items():
+        for j in range(base.size):
+            row = {
+                "Позиция": labels[j] if labels is not None else j + 1,
+                "Показатель": INDICATORS.get(indicator, indicator),
+                "Базовое значение": base[j],
+                "Новое значение": result["new"][indicator][j],
+                "Изменение": result["new"][indicator][j] - base[j],
+            }
+            for key, name, _ in factors:
+                row[name] = result["factors"][key][indicator][j]
+            rows.append(row)
+    return pd.DataFrame(rows).round(2)
+
+
+def _task1_base_item_a():
+    """Базовое изделие А задания 1 (данные варианта 3 из task1/test.py)."""
+    materials_main = {
+        "стальной прокат": {"type": "material", "A": {"rasxod": 0.45, "otxod": 0.0675}},
+        "трубы стальные": {"type": "material", "A": {"rasxod": 0.04, "otxod": 0.0028}},
+        "прокат цветных металлов": {"type": "fixed", "A": 2900},
+        "другие материалы": {"type": "fixed", "A": 1800},
+    }
+    materials_purchased = {
+        "отливки черных металлов": {"type": "material", "A": {"rasxod": 4.5, "otxod": 0.675}},
+        "отливки цветных металлов": {"type": "material", "A": {"rasxod": 0.3, "otxod": 0.075}},
+        "покупные комплектующие изделия": {"type": "fixed", "A": 142800},
+    }
+    prices = {
+        "стальной прокат_материал": 12800, "стальной прокат_отходы": 7500,
+        "трубы стальные_материал": 18500, "трубы стальные_отходы": 6300,
+        "отливки черных металлов_материал": 10500, "отливки черных металлов_отходы": 7200,
+        "отливки цветных металлов_материал": 22600, "отливки цветных металлов_отходы": 16900,
+    }
+    rates = {"доп_зарплата": 40, "отчисления": 22, "РСЭО": 87, "ОПР": 85, "ОХР": 98, "ВПР": 5, "рентабельность": 20}
+    return inputs_from_task1("A", materials_main, materials_purchased, prices, {"A": 1},
+                             {"labor_hours": {"A": 1000}, "hourly_rate": {"A": 41.50}}, rates,
+                             volume=int(195 * 1.06), Ktr=1.15)
+
+
+def main():
+    from pract_part.task_21 import CostCalculator
+
+    calculator = CostCalculator()
+    base_a = _task1_base_item_a()
+    p1 = inputs_from_calculator(calculator, "project_1")
+    p2 = inputs_from_calculator(calculator, "project_2")
+
+    labels = ["Изделие А -> Проект 1", "Изделие А -> Проект 2", "Проект 1 -> Проект 2"]
+    base, new = [base_a, base_a, p1], [p1, p2, p2]
+
+    chain = to_frame(chain_substitution(base, new), labels)
+    integral = integral_method(base, new)
+    integral_table = to_frame(integral, labels)
+
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_columns", 20)
+    print("МЕТОД ЦЕПНЫХ ПОДСТАНОВОК")
+    print(chain.to_string(index=False))
+    print("\nИНТЕГРАЛЬНЫЙ МЕТОД")
+    print(integral_table.to_string(index=False))
+    residual = max(float(np.abs(r).max()) for r in integral["residual"].values())
+    print(f"\nНаибольший остаток интегрального метода: {residual:.2e}")
+
+    chain.to_csv("факторный_анализ_цепные_подстановки.csv", index=False, encoding="utf-8-sig", sep=";")
+    integral_table.to_csv("факторный_анализ_интегральный.csv", index=False, encoding="utf-8-sig", sep=";")
+
+    # Масштаб: 500 позиций с нормами и трудоемкостью, измененными в пределах +-10 %
+    rng = np.random.default_rng(0)
+    base_many = {f: np.full(500, p1[f], dtype=float) for f in INPUT_FIELDS}
+    new_many = dict(base_many)
+    for field in NORM_FIELDS + LABOR_FIELDS:
+        new_many[field] = base_many[field] * rng.uniform(0.9, 1.1, 500)
+    start = time.perf_counter()
+    integral_method(base_many, new_many)
+    print(f"Интегральный метод для 500 позиций: {time.perf_counter() - start:.3f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Помесячный прогноз себестоимости, прибыли и денежных потоков на несколько лет.
+
+Расчеты заданий - снимок одного года: объем Q * Ka, среднегодовая
+стоимость фондов Фср.г, нормативы оборотных средств. Здесь для каждого
+сценария (вариант, проект, темпы роста цен и т.п.) строится помесячная
+модель на горизонт в несколько лет:
+
+    q[t]      = Q / 12 * освоение[t] * (1 + g)^год(t)          - выпуск, шт.;
+    Ц[t], Сv[t] - цена и переменные расходы на единицу с ежемесячной индексацией;
+    К[t]      = К * доля года (dop_T) / 12                      - капитальные вложения;
+    F[t]      = F0 + Σ К[≤t]                                    - стоимость основных фондов;
+    А[t]      = F[t-1] * На / 12                                - амортизация;
+    ОС[t]     = Коб * годовые расходы в темпе месяца t          - потребность в оборотных средствах;
+    Пр[t]     = Ц * q - (Сv * q + CF / 12) - А                  - прибыль до налога;
+    ДП[t]     = Пр - Н + А - К - ΔОС                            - денежный поток.
+
+Все показатели - массивы (сценарии x месяцы), рассчитываемые
+векторными операциями без цикла по месяцам.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from dopolneniya_tables.shared_tables import load_tables
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MONTHS = 60
+TAX_RATE = 20  # налог на прибыль, %
+
+# Параметры сценария и значения по умолчанию (каждый - скаляр или массив по сценариям)
+SCENARIO_DEFAULTS = {
+    "annual_volume": None,           # годовой выпуск при полном освоении, шт.
+    "price": None,                   # цена единицы в первом месяце, тыс. руб.
+    "unit_variable_cost": None,      # переменные расходы на единицу, тыс. руб.
+    "annual_fixed_cost": None,       # постоянные расходы (без амортизации новых фондов), тыс. руб./год
+    "capital": 0.0,                  # капитальные вложения по проекту, тыс. руб.
+    "fixed_assets": 0.0,             # стоимость действующих основных фондов на начало, тыс. руб.
+    "depreciation_percent": 10.0,    # норма амортизации, % в год
+    "working_capital_ratio": 0.0,    # оборотные средства / годовые текущие расходы
+    "volume_growth_percent": 0.0,    # прирост выпуска, % в год
+    "price_growth_percent": 0.0,     # индексация цены, % в год
+    "cost_growth_percent": 0.0,      # индексация переменных и постоянных расходов, % в год
+    "ramp_up_months": 0,             # срок освоения (линейный рост выпуска до полного), мес.
+    "discount_percent": 10.0,        # ставка дисконтирования, % в год
+    "tax_percent": TAX_RATE,
+}
+
+
+def capital_schedule(capital, yearly_shares, months=MONTHS):
+    """
+    Распределение капитальных вложений по месяцам.
+
+    Args:
+        capital (array_like): Капитальные вложения по сценариям, тыс. руб. (S,).
+        yearly_shares (array_like): Доли по годам, % (S, лет) - строки dop_T.
+        months (int): Горизонт, мес.
+
+    Returns:
+        np.ndarray: Вложения (S, months), равномерно внутри года.
+
+    Raises:
+        ValueError: Если доли по годам не дают 100 %.
+    """
+    shares = np.atleast_2d(np.asarray(yearly_shares, dtype=float))
+    if not np.allclose(shares.sum(axis=1), 100):
+        raise ValueError("Доли капитальных вложений по годам должны в сумме давать 100 %.")
+    monthly = np.repeat(shares / 100 / 12, 12, axis=1)
+    if monthly.shape[1] < months:
+        monthly = np.pad(monthly, ((0, 0), (0, months - monthly.shape[1])))
+    elif monthly.shape[1] > months:
+        # Вложения за пределами горизонта переносятся на последний месяц
+        monthly[:, months - 1] += monthly[:, months:].sum(axis=1)
+        monthly = monthly[:, :months]
+    return np.asarray(capital, dtype=float).reshape(-1, 1) * monthly
+
+
+def dop_t_shares(pairs, tables=None, directory=None):
+    """
+    Доли капитальных вложений по годам из dop_T.
+
+    Args:
+        pairs (list): [(вариант задания, вариант проекта), ...].
+
+    Returns:
+        np.ndarray: Доли, % (len(pairs), лет).
+    """
+    tables = tables or load_tables(directory or os.path.join(ROOT, "dopolneniya_tables"), ["dop_T"])
+    t = tables["dop_T"].set_index(["Вариант задания", "Вариант проекта развития"])
+    shares = t.reindex(pd.MultiIndex.from_tuples(pairs))
+    if shares.isna().any().any():
+        raise ValueError("В dop_T нет распределения вложений для части сочетаний вариантов.")
+    return shares.to_numpy(dtype=float)
+
+
+def _scenario_arrays(scenarios):
+    missing = [k for k, v in SCENARIO_DEFAULTS.items() if v is None and k not in scenarios]
+    if missing:
+        raise ValueError(f"Не заданы параметры сценариев: {', '.join(missing)}")
+    unknown = set(scenarios) - set(SCENARIO_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Неизвестные параметры сценариев: {', '.join(sorted(unknown))}")
+    values = {k: np.asarray(scenarios.get(k, v), dtype=float) for k, v in SCENARIO_DEFAULTS.items()}
+    n = max(v.size for v in values.values())
+    return {k: np.broadcast_to(v.reshape(-1), (n,))[:, None] for k, v in values.items()}, n
+
+
+def _growth(percent, t):
+    """Ежемесячная индексация с годовым темпом percent: (1 + p)^(t / 12)."""
+    return (1 + percent / 100) ** (t / 12)
+
+
+def project(scenarios, capital_shares=None, months=MONTHS):
+    """
+    Помесячный прогноз по сценариям.
+
+    Args:
+        scenarios (dict): Параметры SCENARIO_DEFAULTS (скаляры или массивы длины S).
+        capital_shares (array_like, optional): Доли вложений по годам, % (S, лет)
+                                               или (лет,); по умолчанию все вложения в 1-й месяц.
+        months (int): Горизонт прогноза, мес.
+
+    Returns:
+        dict: Массивы (S, months): volume, revenue, variable_cost, fixed_cost, depreciation,
+              profit_before_tax, tax, net_profit, capex, fixed_assets, working_capital,
+              working_capital_change, cash_flow, cumulative_cash_flow, discounted_cash_flow;
+              по сценариям (S,): npv, payback_month (-1, если не окупается в горизонте).
+    """
+    p, n = _scenario_arrays(scenarios)
+    t = np.arange(months)[None, :]
+    year = t // 12
+
+    ramp = np.where(p["ramp_up_months"] > 0,
+                    np.minimum((t + 1) / np.maximum(p["ramp_up_months"], 1), 1.0), 1.0)
+    volume = p["annual_volume"] / 12 * ramp * (1 + p["volume_growth_percent"] / 100) ** year
+    cost_index = _growth(p["cost_growth_percent"], t)
+
+    r = {"volume": volume}
+    r["revenue"] = volume * p["price"] * _growth(p["price_growth_percent"], t)
+    r["variable_cost"] = volume * p["unit_variable_cost"] * cost_index
+    r["fixed_cost"] = np.broadcast_to(p["annual_fixed_cost"] / 12 * cost_index, (n, months))
+
+    if capital_shares is None:
+        capex = np.zeros((n, months))
+        capex[:, 0] = p["capital"][:, 0]
+    else:
+        shares = np.broadcast_to(np.atleast_2d(np.asarray(capital_shares, dtype=float)),
+                                 (n, np.shape(capital_shares)[-1]))
+        capex = capital_schedule(p["capital"][:, 0], shares, months)
+    r["capex"] = capex
+    r["fixed_assets"] = p["fixed_assets"] + np.cumsum(capex, axis=1)
+    # Амортизация начисляется со следующего месяца после ввода фондов
+    opening = np.concatenate([np.broadcast_to(p["fixed_assets"], (n, 1)), r["fixed_assets"][:, :-1]], axis=1)
+    r["depreciation"] = opening * p["depreciation_percent"] / 100 / 12
+
+    current_cost = r["variable_cost"] + r["fixed_cost"]
+    r["working_capital"] = p["working_capital_ratio"] * current_cost * 12
+    r["working_capital_change"] = np.diff(r["working_capital"], axis=1, prepend=0.0)
+
+    r["profit_before_tax"] = r["revenue"] - current_cost - r["depreciation"]
+    r["tax"] = np.maximum(r["profit_before_tax"], 0) * p["tax_percent"] / 100
+    r["net_profit"] = r["profit_before_tax"] - r["tax"]
+    r["cash_flow"] = r["net_profit"] + r["depreciation"] - capex - r["working_capital_change"]
+    r["cumulative_cash_flow"] = np.cumsum(r["cash_flow"], axis=1)
+    r["discounted_cash_flow"] = r["cash_flow"] / _growth(p["discount_percent"], t + 1)
+    r["npv"] = r["discounted_cash_flow"].sum(axis=1)
+
+    # Окупаемость: первый месяц, после которого накопленный поток больше не отрицателен
+    negative = r["cumulative_cash_flow"] < 0
+    last_negative = months - 1 - np.argmax(negative[:, ::-1], axis=1)
+    r["payback_month"] = np.where(~negative.any(axis=1), 0,
+                                  np.where(negative[:, -1], -1, last_negative + 1))
+    return r
+
+
+def annual_summary(result, labels=None, keys=("revenue", "variable_cost", "fixed_cost", "depreciation",
+                                              "net_profit", "capex", "cash_flow")):
+    """
+    Свод помесячного прогноза по годам: строка на (сценарий, год).
+
+    Returns:
+        pd.DataFrame: Суммы показателей за год, тыс. руб.
+    """
+    n, months = result["revenue"].shape
+    years = -(-months // 12)
+    data = {}
+    for key in keys:
+        padded = np.pad(result[key], ((0, 0), (0, years * 12 - months)))
+        data[key] = padded.reshape(n, years, 12).sum(axis=2).ravel()
+    frame = pd.DataFrame({
+        "Сценарий": np.repeat(labels if labels is not None else np.arange(1, n + 1), years),
+        "Год": np.tile(np.arange(1, years + 1), n),
+    })
+    names = {"revenue": "Выручка", "variable_cost": "Переменные расходы", "fixed_cost": "Постоянные расходы",
+             "depreciation": "Амортизация", "net_profit": "Чистая прибыль", "capex": "Кап. вложения",
+             "cash_flow": "Денежный поток"}
+    for key in keys:
+        frame[names.get(key, key)] = data[key]
+    return frame
+
+
+def main():
+    from pract_part.breakeven import FIXED_COST_ITEMS
+    from pract_part.reduced_costs import variant_project_grid
+    from pract_part.task_21 import CostCalculator
+    from task1.cost_chain import cost_chain, inputs_from_calculator
+
+    calculator = CostCalculator()
+    base = inputs_from_calculator(calculator, "project_1")
+    template = {
+        "base": base,
+        "volumes": [calculator.projects_data[k]["annual_volume_corrected"] for k in ("project_1", "project_2")],
+    }
+    grid = variant_project_grid(template)
+
+    # Доля постоянных расходов в полной себестоимости (РСЭО, ОПР, ОХР, ВПР)
+    chain = cost_chain(base)
+    fixed_share = sum(float(chain[k]) for k in FIXED_COST_ITEMS if k in chain) / float(chain["full_cost"])
+
+    pairs = list(zip(grid["Вариант"], grid["Проект"]))
+    unit_cost = grid["Сj, руб"].to_numpy() / 1000
+    volume = grid["Q, шт"].to_numpy()
+    annual_cost = grid["С, тыс. руб"].to_numpy()
+    scenarios = {
+        "annual_volume": volume,
+        "price": unit_cost * 1.2,
+        "unit_variable_cost": unit_cost * (1 - fixed_share),
+        "annual_fixed_cost": annual_cost * fixed_share,
+        "capital": grid["К, тыс. руб"].to_numpy() - grid["ОС, тыс. руб"].to_numpy(),
+        "working_capital_ratio": grid["ОС, тыс. руб"].to_numpy() / annual_cost,
+        "ramp_up_months": 6,
+        "volume_growth_percent": 5,
+        "price_growth_percent": 6,
+        "cost_growth_percent": 8,
+    }
+    shares = dop_t_shares(pairs)
+    result = project(scenarios, shares)
+
+    labels = [f"{v}-{p}" for v, p in pairs]
+    summary = annual_summary(result, labels)
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_columns", 12)
+    print("ПРОГНОЗ НА 5 ЛЕТ ПО ВАРИАНТАМ И ПРОЕКТАМ (тыс. руб.)")
+    print(summary[summary["Сценарий"].isin(labels[:4])].round(1).to_string(index=False))
+    print("\nЧДД и срок окупаемости:")
+    for label, npv, month in zip(labels, result["npv"], result["payback_month"]):
+        payback = f"{month} мес." if month >= 0 else "не окупается"
+        print(f"  {label}: ЧДД {npv:,.1f} тыс. руб., окупаемость {payback}")
+
+    summary.round(2).to_csv("прогноз_по_годам.csv", index=False, encoding="utf-8-sig", sep=";")
+    print("\nСвод сохранен в прогноз_по_годам.csv")
+
+    # Масштаб: 20 сочетаний вариантов x 500 сценариев индексации цен и расходов
+    rng = np.random.default_rng(0)
+    k = 500
+    many = {key: np.repeat(np.broadcast_to(value, (len(pairs),)), k) for key, value in scenarios.items()}
+    many["price_growth_percent"] = rng.uniform(0, 12, many["price"].size)
+    many["cost_growth_percent"] = rng.uniform(0, 12, many["price"].size)
+    start = time.perf_counter()
+    big = project(many, np.repeat(shares, k, axis=0))
+    elapsed = time.perf_counter() - start
+    print(f"{big['npv'].size:,} сценариев x {MONTHS} мес.: {elapsed:.3f} с, "
+          f"доля с положительным ЧДД {np.mean(big['npv'] > 0) * 100:.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Сравнение проектов развития по приведенным затратам
+для всех вариантов задания сразу.
+
+    К   = Кпир + Косн + Косв + Кл% / 100 * Ф + ОС           - капитальные вложения, тыс. руб.;
+    Зпр = С + Ен * К                                      - приведенные затраты, тыс. руб.;
+    зпр = Зпр / Q * 1000                                  - приведенные затраты на единицу, руб.;
+    Э   = (Сб - Сj) * Qj / 1000 - Ен * Кj                 - годовой экономический эффект, тыс. руб.;
+    Ток = Кj / ((Сб - Сj) * Qj / 1000)                    - срок окупаемости, лет,
+
+где С - годовая полная себестоимость проекта, Ф - стоимость рабочих машин
+и оборудования (dop_L), ОС - норматив оборотных средств проекта, Сб и Сj -
+полная себестоимость единицы в действующем производстве и по проекту,
+Ен = 0,15 - нормативный коэффициент эффективности. Объемы выпуска проектов
+различаются, поэтому проект выбирается по минимуму приведенных затрат на
+единицу продукции зпр (а не годовых Зпр, которые меньше у проекта с меньшим
+выпуском).
+
+Все функции работают с массивами любой формы (обычно варианты x проекты).
+variant_project_grid() собирает исходные данные всех вариантов из таблиц
+дополнений (dop_B, dop_V, dop_J_hours, dop_P, dop_R, dop_L, dop_N_corrected)
+и считает себестоимость (task1/cost_chain) и оборотные средства в памяти,
+без запуска task_21.py / task_22.py для каждого варианта.
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from dopolneniya_tables.shared_tables import load_tables
+from task1.cost_chain import (INPUT_FIELDS, cost_chain, cost_chain_kopecks, from_kopecks as chain_from_kopecks,
+                              inputs_from_calculator)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_FILE = os.path.join(ROOT, "pract_part", "приведенные_затраты.csv")
+
+EN = 0.15  # нормативный коэффициент эффективности капитальных вложений
+PROJECTS = (1, 2)
+
+
+def capital_investment(K_pir, K_osn, K_osv, K_l_percent, fixed_assets=0.0, working_capital=0.0):
+    """
+    Капитальные вложения по проекту: К = Кпир + Косн + Косв + Кл%/100 * Ф + ОС, тыс. руб.
+
+    Args:
+        K_pir: Расходы на проектно-изыскательские работы, тыс. руб.
+        K_osn: Капитальные вложения в основные фонды, тыс. руб.
+        K_osv: Расходы на пуск, наладку и освоение производства, тыс. руб.
+        K_l_percent: Остаточная стоимость фондов, идущих на слом, % от Ф.
+        fixed_assets: Стоимость действующих основных фондов Ф, тыс. руб.
+        working_capital: Норматив оборотных средств ОС, тыс. руб.
+    """
+    return (np.asarray(K_pir, dtype=float) + K_osn + K_osv
+            + np.asarray(K_l_percent, dtype=float) / 100 * fixed_assets + working_capital)
+
+
+def working_capital(S_om, S_pok, S_vm, N_om, N_pok, N_vm, OS_prz, S, S_m, S_r, T_c, Q_t, N_gp, OS_rbp):
+    """
+    Норматив оборотных средств (формулы task_22.calculate_project, без промежуточных округлений).
+
+    Returns:
+        np.ndarray: ОС = ОСпз + ОСнп + ОСгп + ОСрбп, тыс. руб.
+    """
+    OS_pz = S_om / 360 * N_om + S_pok / 360 * N_pok + S_vm / 360 * N_vm + OS_prz
+    K_nz = (S_m + 0.5 * (S - S_m)) / S
+    OS_np = S_r / 360 * T_c * K_nz
+    OS_gp = Q_t * N_gp / 360
+    return OS_pz + OS_np + OS_gp + OS_rbp
+
+
+def compare_projects(annual_cost, capital, unit_cost, base_unit_cost, volume, En=EN):
+    """
+    Приведенные затраты, годовой эффект и окупаемость; выбор проекта.
+
+    Args:
+        annual_cost: Годовая полная себестоимость проектов С, тыс. руб. (..., проекты).
+        capital: Капитальные вложения К, тыс. руб. (..., проекты).
+        unit_cost: Полная себестоимость единицы по проектам Сj, руб. (..., проекты).
+        base_unit_cost: Полная себестоимость единицы в действующем производстве Сб, руб. (...,)
+                        или (..., 1).
+        volume: Годовой объем выпуска по проектам Qj, шт. (..., проекты).
+        En (float): Нормативный коэффициент эффективности.
+
+    Returns:
+        dict: reduced_costs, unit_reduced_costs (руб. на единицу), annual_savings,
+              economic_effect, payback_years, efficiency (массивы той же формы)
+              и best_project (индекс проекта с минимальными приведенными затратами
+              на единицу продукции по последней оси).
+    """
+    annual_cost, capital, unit_cost, volume = (np.asarray(a, dtype=float)
+                                               for a in (annual_cost, capital, unit_cost, volume))
+    base_unit_cost = np.asarray(base_unit_cost, dtype=float)
+    if base_unit_cost.ndim == annual_cost.ndim - 1:
+        base_unit_cost = base_unit_cost[..., None]
+
+    reduced = annual_cost + En * capital
+    savings = (base_unit_cost - unit_cost) * volume / 1000
+    with np.errstate(divide="ignore", invalid="ignore"):
+        unit_reduced = np.where(volume > 0, reduced / volume * 1000, np.inf)
+        payback = np.where(savings > 0, capital / savings, np.inf)
+        efficiency = np.where(capital > 0, savings / capital, np.inf)
+    return {
+        "reduced_costs": reduced,
+        "unit_reduced_costs": unit_reduced,
+        "annual_savings": savings,
+        "economic_effect": savings - En * capital,
+        "payback_years": payback,
+        "efficiency": efficiency,
+        "best_project": np.argmin(unit_reduced, axis=-1),
+    }
+
+
+def _by_variant(df, variant_col, value_col, variants, **conditions):
+    """Значения value_col по вариантам (сумма строк, удовлетворяющих условиям)."""
+    mask = np.ones(len(df), dtype=bool)
+    for col, value in conditions.items():
+        mask &= (df[col] == value).to_numpy()
+    sums = df[mask].groupby(variant_col)[value_col].sum()
+    missing = sorted(set(variants) - set(sums.index))
+    if missing:
+        raise ValueError(f"Нет данных '{value_col}' для вариантов {missing}.")
+    return sums.reindex(variants).to_numpy(dtype=float)
+
+
+def variant_project_grid(template, tables=None, directory=None, item="А", details=False, rounding=None):
+    """
+    Исходные данные и результаты расчета для всех вариантов x проектов.
+
+    Нормы действующего производства берутся из dop_B (материалы), dop_V
+    (комплектующие) и dop_J_hours (трудоемкость); нормы проектов - с учетом
+    снижения из dop_P (как в tet.apply_reductions, плюс снижение трудоемкости).
+    Цены, тарифы, нормативы и объемы выпуска проектов общие для всех вариантов
+    и берутся из template (запись inputs_from_calculator и объемы проектов).
+
+    Args:
+        template (dict): {'base': запись INPUT_FIELDS, 'volumes': (Q1, Q2)}.
+        tables (dict, optional): Таблицы load_tables() (по умолчанию читаются из directory).
+        directory (str, optional): Каталог таблиц дополнений.
+        item (str): Изделие ('А').
+        details (bool): Вернуть также статьи калькуляции (результаты cost_chain).
+        rounding (str, optional): Правило округления money (money.HALF_UP, ...): статьи
+                                  считаются в копейках с округлением каждой статьи
+                                  (cost_chain_kopecks); None - без промежуточных округлений.
+
+    Returns:
+        pd.DataFrame: Строка на (вариант, проект); при details=True - кортеж
+                      (таблица, {'variants', 'base', 'projects', 'inputs'}), где
+                      base - статьи действующего производства (варианты,),
+                      projects и inputs - статьи и исходные данные проектов (варианты x проекты).
+    """
+    tables = tables or load_tables(directory or os.path.join(ROOT, "dopolneniya_tables"))
+    dop_b, dop_p, dop_r = tables["dop_B"], tables["dop_P"], tables["dop_R"]
+    variants = sorted(set(dop_b["Вариант"]) & set(dop_r["Вариант задания"]))
+    V, P = len(variants), len(PROJECTS)
+
+    # --- Действующее производство (V,) ---
+    b = dop_b[dop_b["Изделие"] == item].set_index("Вариант").reindex(variants)
+    base = {f: np.full(V, float(template["base"][f])) for f in INPUT_FIELDS}
+    for field, column in (("steel_rolling", "Стальной_прокат"), ("steel_pipes", "Трубы_стальные"),
+                          ("castings_black", "Отливки_черных"), ("castings_color", "Отливки_цветных")):
+        base[f"{field}_consumption"] = b[f"{column}_кг"].to_numpy(dtype=float) / 1000
+        base[f"{field}_waste"] = base[f"{field}_consumption"] * b[f"{column}_%"].to_numpy(dtype=float) / 100
+    base["nonferrous_rolling"] = b["Прокат_цветных_руб"].to_numpy(dtype=float)
+    base["other_materials"] = b["Другие_материалы_руб"].to_numpy(dtype=float)
+    base["purchased_components"] = _by_variant(tables["dop_V"], "Вариант", "Сумма_руб", variants, Изделие=item)
+    base["labor_intensity"] = _by_variant(tables["dop_J_hours"], "Вариант", "Часы", variants, Изделие=item)
+
+    # --- Проекты (V, P): снижение норм из dop_P ---
+    p = dop_p.set_index(["Вариант задания", "Вариант проекта развития предприятия"])
+    p = p.reindex(pd.MultiIndex.from_product([variants, PROJECTS])).to_numpy(dtype=float).reshape(V, P, -1) / 100
+    r_steel, r_pipes, r_castings, r_other, r_labor = (p[..., k] for k in range(5))
+    proj = {f: np.repeat(base[f][:, None], P, axis=1) for f in INPUT_FIELDS}
+    for field, red in (("steel_rolling", r_steel), ("steel_pipes", r_pipes),
+                       ("castings_black", r_castings), ("castings_color", r_castings)):
+        proj[f"{field}_consumption"] = proj[f"{field}_consumption"] * (1 - red)
+        proj[f"{field}_waste"] = proj[f"{field}_waste"] * (1 - red)
+    for field in ("nonferrous_rolling", "other_materials", "purchased_components"):
+        proj[field] = proj[field] * (1 - r_other)
+    proj["labor_intensity"] = proj["labor_intensity"] * (1 - r_labor)
+    proj["annual_volume"] = np.broadcast_to(np.asarray(template["volumes"], dtype=float), (V, P)).copy()
+
+    if rounding is None:
+        base_out, out = cost_chain(base), cost_chain(proj)
+    else:
+        base_out = chain_from_kopecks(cost_chain_kopecks(base, rounding))
+        out = chain_from_kopecks(cost_chain_kopecks(proj, rounding))
+
+    # --- Оборотные средства (V, P): нормы dop_N_corrected по четности варианта (как в task3) ---
+    n = tables["dop_N_corrected"]
+    n = n[n["Наименование изделия"] == item].drop(columns="Наименование изделия")
+    n = n.set_index(["Вариант задания", "Вариант развития"])
+    stages = [f"{k} вариант развития" for k in PROJECTS]
+    parity = [1 if v % 2 else 2 for v in variants]
+    norms = n.reindex(pd.MultiIndex.from_tuples([(q, s) for q in parity for s in stages]))
+    if norms.isna().any().any():
+        raise ValueError("В dop_N_corrected нет норм оборотных средств для части вариантов развития.")
+    norms = norms.to_numpy(dtype=float).reshape(V, P, -1)
+    N_om, N_pok, S_vm, N_vm, OS_prz, T_c, N_gp, OS_rbp = (norms[..., k] for k in range(8))
+    volume = proj["annual_volume"]
+    materials = out["material_costs"] + out["semi_components"]
+    os_norm = working_capital(
+        S_om=out["material_costs"] * volume / 1000, S_pok=out["semi_components"] * volume / 1000,
+        S_vm=S_vm, N_om=N_om, N_pok=N_pok, N_vm=N_vm, OS_prz=OS_prz,
+        S=out["production_cost"], S_m=materials, S_r=out["production_cost"] * volume / 1000,
+        T_c=T_c, Q_t=out["commodity_output"], N_gp=N_gp, OS_rbp=OS_rbp)
+
+    # --- Капитальные вложения (V, P) ---
+    r = dop_r.set_index(["Вариант задания", "Вариант проекта развития"])
+    r = r.reindex(pd.MultiIndex.from_product([variants, PROJECTS])).to_numpy(dtype=float).reshape(V, P, -1)
+    K_pir, K_osn, K_osv, K_l = (r[..., k] for k in range(4))
+    dop_l = tables["dop_L"].set_index("Вариант").reindex(variants)
+    fixed_assets = dop_l["stoimost_rmo_nachalo"].to_numpy(dtype=float)[:, None]
+    capital = capital_investment(K_pir, K_osn, K_osv, K_l, fixed_assets, os_norm)
+
+    cmp = compare_projects(out["annual_full_cost"], capital, out["full_cost"], base_out["full_cost"], volume)
+
+    best = np.zeros((V, P), dtype=bool)
+    best[np.arange(V), cmp["best_project"]] = True
+    frame = pd.DataFrame({
+        "Вариант": np.repeat(variants, P),
+        "Проект": np.tile(PROJECTS, V),
+        "Сб, руб": np.repeat(base_out["full_cost"], P),
+        "Сj, руб": out["full_cost"].ravel(),
+        "Q, шт": volume.ravel(),
+        "С, тыс. руб": out["annual_full_cost"].ravel(),
+        "Кпир": K_pir.ravel(), "Косн": K_osn.ravel(), "Косв": K_osv.ravel(),
+        "Кл, тыс. руб": (K_l / 100 * fixed_assets).ravel(),
+        "ОС, тыс. руб": os_norm.ravel(),
+        "К, тыс. руб": capital.ravel(),
+        "Зпр, тыс. руб": cmp["reduced_costs"].ravel(),
+        "зпр, руб/шт": cmp["unit_reduced_costs"].ravel(),
+        "Э, тыс. руб": cmp["economic_effect"].ravel(),
+        "Ток, лет": cmp["payback_years"].ravel(),
+        "Лучший": best.ravel(),
+    })
+    if details:
+        return frame, {"variants": variants, "base": base_out, "projects": out, "inputs": proj}
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Приведенные затраты по всем вариантам и проектам")
+    parser.add_argument("-o", "--output", default=OUTPUT_FILE,
+                        help="Файл таблицы CSV (по умолчанию: приведенные_затраты.csv рядом с модулем)")
+    args = parser.parse_args()
+
+    from pract_part.task_21 import CostCalculator
+
+    calculator = CostCalculator()
+    template = {
+        "base": inputs_from_calculator(calculator, "project_1"),
+        "volumes": [calculator.projects_data[k]["annual_volume_corrected"] for k in ("project_1", "project_2")],
+    }
+    grid = variant_project_grid(template)
+
+    pd.set_option("display.width", 250)
+    pd.set_option("display.max_columns", 20)
+    print("ПРИВЕДЕННЫЕ ЗАТРАТЫ, ЭКОНОМИЧЕСКИЙ ЭФФЕКТ И ОКУПАЕМОСТЬ (Ен = 0.15)")
+    print(grid.round(2).to_string(index=False))
+
+    print("\nВыбор проекта по минимуму приведенных затрат на единицу продукции:")
+    for _, row in grid[grid["Лучший"]].iterrows():
+        print(f"  Вариант {int(row['Вариант'])}: проект {int(row['Проект'])} (зпр = {row['зпр, руб/шт']:,.2f} руб/шт, "
+              f"Зпр = {row['Зпр, тыс. руб']:,.2f} тыс. руб., Ток = {row['Ток, лет']:.2f} лет)")
+
+    grid.round(2).to_csv(args.output, index=False, encoding="utf-8-sig", sep=";")
+    print(f"\nТаблица сохранена в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,128 @@
 Этап 1: Расчет себестоимости продукции
 """
 
-import csv
 import math
 from typing import Dict, List, Tuple, Any
 import os
 import json
 from datetime import datetime
 
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+import instrumentation as instr
+from table_schema import Column, Row, TableSchema, item
+
+
+def _cost_input(key):
+    """Привязка строки таблицы 2.3 к исходным данным расчета себестоимости проекта."""
+    return lambda calc, project: calc.cost_calculation_data[project][key]
+
+
+def _project_value(project):
+    return lambda bind, calc: bind(calc, project)
+
+
+def _norm_rows(prefix, consumption_fmt, waste_fmt):
+    return [
+        item(" - расходы", unit="т", bind=_cost_input(f"{prefix}_consumption"), fmt=consumption_fmt),
+        item(" - отходы", unit="т", bind=_cost_input(f"{prefix}_waste"), fmt=waste_fmt),
+    ]
+
+
+# Таблица 2.3 - Данные для расчета себестоимости
+TABLE_2_3 = TableSchema("Данные для расчета себестоимости", [
+    Column("№", field="number"),
+    Column("Показатели", field="label", json_key="Показатель"),
+    Column("Ед. измерения", field="unit"),
+    Column("Проект 1", value=_project_value("project_1")),
+    Column("Проект 2", value=_project_value("project_2")),
+], [
+    Row("Основные материалы", children=[
+        Row("Стальной прокат:", children=_norm_rows(
+            "steel_rolling", "{:.4f}", {"Проект 1": "{:.5f}", "Проект 2": "{:.6f}"})),
+        Row("Трубы стальные:", children=_norm_rows(
+            "steel_pipes", "{:.4f}", {"Проект 1": "{:.5f}", "Проект 2": "{:.6f}"})),
+        Row("Прокат цветных металлов", unit="руб", bind=_cost_input("nonferrous_rolling"), fmt="{:.0f}"),
+        Row("Другие материалы", unit="руб", bind=_cost_input("other_materials"), fmt="{:.0f}"),
+    ]),
+    Row("Покупные полуфабрикаты (отливки):", children=[
+        Row("черных металлов", children=_norm_rows(
+            "castings_black", "{:.3f}", {"Проект 1": "{:.4f}", "Проект 2": "{:.5f}"})),
+        Row("цветных металлов", children=_norm_rows(
+            "castings_color", {"Проект 1": "{:.3f}", "Проект 2": "{:.4f}"},
+            {"Проект 1": "{:.5f}", "Проект 2": "{:.6f}"})),
+    ]),
+    Row("покупные комплектующие изделия", unit="руб", bind=_cost_input("purchased_components"), fmt="{:.0f}"),
+    Row("Цена стального проката", unit="руб/т", bind=_cost_input("price_steel_rolling"), fmt="{:.0f}"),
+    Row("Цена стальных труб", unit="руб/т", bind=_cost_input("price_steel_pipes"), fmt="{:.0f}"),
+    Row("Цена отливок:", children=[
+        item("-черных металлов", unit="руб/т", bind=_cost_input("price_castings_black"), fmt="{:.0f}"),
+        item("-цветных металлов", unit="руб/т", bind=_cost_input("price_castings_color"), fmt="{:.0f}"),
+    ]),
+    Row("Цена отходов:", children=[
+        item("-стального проката", unit="руб/т", bind=_cost_input("price_waste_steel_rolling"), fmt="{:.0f}"),
+        item("-труб стальных", unit="руб/т", bind=_cost_input("price_waste_steel_pipes"), fmt="{:.0f}"),
+        item("-отливок черных металлов", unit="руб/т", bind=_cost_input("price_waste_castings_black"), fmt="{:.0f}"),
+        item("-отливок цветных металлов", unit="руб/т", bind=_cost_input("price_waste_castings_color"), fmt="{:.0f}"),
+    ]),
+    Row("Топливо и энергия на технологические потребности", unit="%", bind=_cost_input("fuel_energy_percent"),
+        fmt="{:.1f}"),
+    Row("Суммарная трудоемкость изделия", unit="н-час", bind=_cost_input("labor_intensity"), fmt="{:.2f}"),
+    Row("Часовая тарифная ставка", unit="руб", bind=_cost_input("hourly_rate"), fmt="{:.2f}"),
+    Row("Дополнительная зарплата", unit="%", bind=_cost_input("additional_salary_percent"), fmt="{:.0f}"),
+    Row("Отчисление на социальное страхование", unit="%", bind=_cost_input("social_insurance_percent"), fmt="{:.0f}"),
+    Row("Расходы на содержание и эксплуатацию оборудования", unit="%",
+        bind=_cost_input("equipment_maintenance_percent"), fmt="{:.0f}"),
+    Row("Общепроизводственные расходы", unit="%", bind=_cost_input("overhead_production_percent"), fmt="{:.0f}"),
+    Row("Общехозяйственные расходы", unit="%", bind=_cost_input("general_business_percent"), fmt="{:.0f}"),
+    Row("Внепроизводственные расходы", unit="%", bind=_cost_input("non_production_percent"), fmt="{:.0f}"),
+    Row("Норматив рентабельности к себестоимости", unit="%", bind=_cost_input("profitability_percent"),
+        fmt="{:.0f}"),
+    Row("Годовой объем производства", unit="шт",
+        bind=lambda calc, project: calc.projects_data[project]["annual_volume_corrected"], fmt="{:.0f}"),
+], number="2.3")
+
+
+def _cost_column(project, annual):
+    """Столбец таблицы 2.4: статья на единицу (руб.) или на годовой выпуск (тыс. руб.)."""
+    def value(bind, calc):
+        unit_key, annual_key = bind
+        if annual:
+            return None if annual_key is None else calc.calculation_results[project]["annual_costs"][annual_key]
+        return calc.calculation_results[project][unit_key]
+    return value
+
+
+# Таблица 2.4 - Калькуляция себестоимости, прибыль и оптовая цена;
+# привязка строки - (ключ calculation_results, ключ annual_costs)
+TABLE_2_4 = TableSchema("Калькуляция себестоимости, прибыль и оптовая цена", [
+    Column("Наименование статей расходов", field="label", label_format="{number}.{label}"),
+    Column("Проект 1 на единицу, руб.", value=_cost_column("project_1", False), fmt="{:.2f}"),
+    Column("Проект 1 на годовой выпуск, тыс.руб.", value=_cost_column("project_1", True), fmt="{:.2f}"),
+    Column("Проект 2 на единицу, руб.", value=_cost_column("project_2", False), fmt="{:.2f}"),
+    Column("Проект 2 на годовой выпуск, тыс.руб.", value=_cost_column("project_2", True), fmt="{:.2f}"),
+], [
+    Row("Основные материалы за вычетом возвратных отходов", bind=("material_costs", "material")),
+    Row("Покупные полуфабрикаты и комплектующие изделия", bind=("semi_components", "semi_components")),
+    Row("Топливо и энергия на технологические потребности", bind=("fuel_energy", "fuel_energy")),
+    Row("Основная заработная плата производственных рабочих", bind=("basic_salary", "basic_salary")),
+    Row("Дополнительная заработная плата производственных рабочих", bind=("additional_salary", "additional_salary")),
+    Row("Отчисление в фонды социальных мероприятий", bind=("social_insurance", "social_insurance")),
+    Row("Расходы по содержанию и эксплуатации оборудования",
+        bind=("equipment_maintenance", "equipment_maintenance")),
+    Row("Общепроизводственные расходы", bind=("overhead_production", "overhead_production")),
+    Row("Общехозяйственные расходы", bind=("general_business", "general_business")),
+    item("ВСЕГО производственная себестоимость", bind=("production_cost", "production_cost")),
+    Row("Внепроизводственные расходы", bind=("non_production", "non_production")),
+    item("ВСЕГО полная себестоимость", bind=("full_cost", "full_cost")),
+    item("Прибыль", bind=("profit", "profit")),
+    item("Оптовая цена", bind=("wholesale_price", None)),
+], header_rows=[
+    ["Наименование статей расходов", "Проект 1", " ", "Проект 2", " "],
+    ["", "на единицу, руб.", "на годовой выпуск, тыс.руб.", "на единицу, руб.", "на годовой выпуск, тыс.руб."],
+], json_values="number", json_digits=2, number="2.4")
+
 
 class CostCalculator:
     """Класс для расчета себестоимости продукции"""
@@ -165,6 +280,7 @@ class CostCalculator:
             "project_2": {}
         }
 
+    @instr.traced()
     def calculate_material_costs(self, project: str) -> float:
         """Расчет основных материалов за вычетом возвратных отходов (пункт 1)"""
         data = self.cost_calculation_data[project]
@@ -201,6 +317,7 @@ class CostCalculator:
 
         return round(total_cost, 2)
 
+    @instr.traced()
     def calculate_purchased_semi_components(self, project: str) -> float:
         """Расчет покупных полуфабрикатов и комплектующих (пункт 2)"""
         data = self.cost_calculation_data[project]
@@ -236,6 +353,7 @@ class CostCalculator:
 
         return round(total_cost, 2)
 
+    @instr.traced()
     def calculate_fuel_energy(self, project: str, material_costs: float,
                             semi_components_costs: float) -> float:
         """Расчет топлива и энергии на технологические потребности (пункт 3)"""
@@ -264,6 +382,7 @@ class CostCalculator:
 
         return round(fuel_energy_cost, 2)
 
+    @instr.traced()
     def calculate_basic_salary(self, project: str) -> float:
         """Расчет основной заработной платы (пункт 4)"""
         data = self.cost_calculation_data[project]
@@ -282,6 +401,7 @@ class CostCalculator:
 
         return round(basic_salary, 2)
 
+    @instr.traced()
     def calculate_additional_salary(self, project: str, basic_salary: float) -> float:
         """Расчет дополнительной заработной платы (пункт 5)"""
         data = self.cost_calculation_data[project]
@@ -301,6 +421,7 @@ class CostCalculator:
 
         return round(additional_salary, 2)
 
+    @instr.traced()
     def calculate_social_insurance(self, project: str, basic_salary: float,
                                  additional_salary: float) -> float:
         """Расчет отчислений на социальное страхование (пункт 6)"""
@@ -323,6 +444,7 @@ class CostCalculator:
 
         return round(social_insurance, 2)
 
+    @instr.traced()
     def calculate_equipment_maintenance(self, project: str, basic_salary: float) -> float:
         """Расчет расходов на содержание и эксплуатацию оборудования (пункт 7)"""
         data = self.cost_calculation_data[project]
@@ -342,6 +464,7 @@ class CostCalculator:
 
         return round(equipment_cost, 2)
 
+    @instr.traced()
     def calculate_overhead_production(self, project: str, basic_salary: float) -> float:
         """Расчет общепроизводственных расходов (пункт 8)"""
         data = self.cost_calculation_data[project]
@@ -361,6 +484,7 @@ class CostCalculator:
 
         return round(overhead, 2)
 
+    @instr.traced()
     def calculate_general_business(self, project: str, basic_salary: float) -> float:
         """Расчет общехозяйственных расходы (пункт 9)"""
         data = self.cost_calculation_data[project]
@@ -380,6 +504,7 @@ class CostCalculator:
 
         return round(general_business, 2)
 
+    @instr.traced()
     def calculate_non_production(self, project: str, production_cost: float) -> float:
         """Расчет внепроизводственных расходов (пункт 11)"""
         data = self.cost_calculation_data[project]
@@ -399,6 +524,7 @@ class CostCalculator:
 
         return round(non_production, 2)
 
+    @instr.traced()
     def calculate_profit(self, project: str, full_cost: float) -> float:
         """Расчет прибыли (пункт 13)"""
         data = self.cost_calculation_data[project]
@@ -418,6 +544,7 @@ class CostCalculator:
 
         return round(profit, 2)
 
+    @instr.traced()
     def calculate_wholesale_price(self, full_cost: float, profit: float) -> float:
         """Расчет оптовой цены (пункт 14)"""
 
@@ -435,6 +562,7 @@ class CostCalculator:
 
         return round(wholesale_price, 2)
 
+    @instr.traced()
     def calculate_annual_costs(self, unit_cost: float, annual_volume: float, item_name: str = "") -> float:
         """Расчет годовых затрат (тыс. руб)"""
         annual_cost = (unit_cost * annual_volume) / 1000  # переводим в тыс. руб
@@ -446,6 +574,7 @@ class CostCalculator:
 
         return round(annual_cost, 2)
 
+    @instr.traced()
     def calculate_all_costs(self):
         """Основной метод расчета всех статей себестоимости для обоих проектов"""
 
@@ -623,296 +752,37 @@ class CostCalculator:
             print(f"  Годовая прибыль: {annual_profit:,.2f} тыс. руб.")
             print(f"  Объем товарной продукции: {commodity_output:,.2f} тыс. руб.")
 
-    def create_cost_table_2_4(self):
-        """Создание таблицы 2.4 - Калькуляция себестоимости, прибыль и оптовая цена"""
-
-        # Заголовки таблицы
-        headers = [
-            "Наименование статей расходов",
-            "Проект 1",
-            " ",
-            "Проект 2",
-            " "
-        ]
-
-        subheaders = [
-            "",
-            "на единицу, руб.",
-            "на годовой выпуск, тыс.руб.",
-            "на единицу, руб.",
-            "на годовой выпуск, тыс.руб."
-        ]
-
-        # Данные для таблицы
-        rows = []
-
-        # 1. Основные материалы
-        rows.append([
-            "1.Основные материалы за вычетом возвратных отходов",
-            f"{self.calculation_results['project_1']['material_costs']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['material']:.2f}",
-            f"{self.calculation_results['project_2']['material_costs']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['material']:.2f}"
-        ])
-
-        # 2. Покупные полуфабрикаты и комплектующие
-        rows.append([
-            "2.Покупные полуфабрикаты и комплектующие изделия",
-            f"{self.calculation_results['project_1']['semi_components']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['semi_components']:.2f}",
-            f"{self.calculation_results['project_2']['semi_components']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['semi_components']:.2f}"
-        ])
-
-        # 3. Топливо и энергия
-        rows.append([
-            "3.Топливо и энергия на технологические потребности",
-            f"{self.calculation_results['project_1']['fuel_energy']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['fuel_energy']:.2f}",
-            f"{self.calculation_results['project_2']['fuel_energy']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['fuel_energy']:.2f}"
-        ])
-
-        # 4. Основная зарплата
-        rows.append([
-            "4.Основная заработная плата производственных рабочих",
-            f"{self.calculation_results['project_1']['basic_salary']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['basic_salary']:.2f}",
-            f"{self.calculation_results['project_2']['basic_salary']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['basic_salary']:.2f}"
-        ])
-
-        # 5. Дополнительная зарплата
-        rows.append([
-            "5.Дополнительная заработная плата производственных рабочих",
-            f"{self.calculation_results['project_1']['additional_salary']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['additional_salary']:.2f}",
-            f"{self.calculation_results['project_2']['additional_salary']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['additional_salary']:.2f}"
-        ])
-
-        # 6. Отчисления на социальное страхование
-        rows.append([
-            "6.Отчисление в фонды социальных мероприятий",
-            f"{self.calculation_results['project_1']['social_insurance']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['social_insurance']:.2f}",
-            f"{self.calculation_results['project_2']['social_insurance']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['social_insurance']:.2f}"
-        ])
-
-        # 7. Расходы на содержание и эксплуатацию оборудования
-        rows.append([
-            "7.Расходы по содержанию и эксплуатации оборудования",
-            f"{self.calculation_results['project_1']['equipment_maintenance']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['equipment_maintenance']:.2f}",
-            f"{self.calculation_results['project_2']['equipment_maintenance']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['equipment_maintenance']:.2f}"
-        ])
-
-        # 8. Общепроизводственные расходы
-        rows.append([
-            "8.Общепроизводственные расходы",
-            f"{self.calculation_results['project_1']['overhead_production']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['overhead_production']:.2f}",
-            f"{self.calculation_results['project_2']['overhead_production']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['overhead_production']:.2f}"
-        ])
-
-        # 9. Общехозяйственные расходы
-        rows.append([
-            "9.Общехозяйственные расходы",
-            f"{self.calculation_results['project_1']['general_business']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['general_business']:.2f}",
-            f"{self.calculation_results['project_2']['general_business']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['general_business']:.2f}"
-        ])
-
-        # 10. ИТОГО производственная себестоимость
-        rows.append([
-            "ВСЕГО производственная себестоимость",
-            f"{self.calculation_results['project_1']['production_cost']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['production_cost']:.2f}",
-            f"{self.calculation_results['project_2']['production_cost']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['production_cost']:.2f}"
-        ])
-
-        # 11. Внепроизводственные расходы
-        rows.append([
-            "10.Внепроизводственные расходы",
-            f"{self.calculation_results['project_1']['non_production']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['non_production']:.2f}",
-            f"{self.calculation_results['project_2']['non_production']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['non_production']:.2f}"
-        ])
-
-        # 12. ИТОГО полная себестоимость
-        rows.append([
-            "ВСЕГО полная себестоимость",
-            f"{self.calculation_results['project_1']['full_cost']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['full_cost']:.2f}",
-            f"{self.calculation_results['project_2']['full_cost']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['full_cost']:.2f}"
-        ])
-
-        # 13. Прибыль
-        rows.append([
-            "Прибыль",
-            f"{self.calculation_results['project_1']['profit']:.2f}",
-            f"{self.calculation_results['project_1']['annual_costs']['profit']:.2f}",
-            f"{self.calculation_results['project_2']['profit']:.2f}",
-            f"{self.calculation_results['project_2']['annual_costs']['profit']:.2f}"
-        ])
-
-        # 14. Оптовая цена
-        rows.append([
-            "Оптовая цена",
-            f"{self.calculation_results['project_1']['wholesale_price']:.2f}",
-            "",
-            f"{self.calculation_results['project_2']['wholesale_price']:.2f}",
-            ""
-        ])
-
-        # Создаем CSV файл
-        filename = "таблица_2_4_себестоимость.csv"
-
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            writer = csv.writer(csvfile, delimiter=';')
-
-            # Записываем заголовки
-            writer.writerow(headers)
-            writer.writerow(subheaders)
+    @instr.traced()
+    def create_cost_table_2_4(self, json_file=None, docx_file=None):
+        """
+        Создание таблицы 2.4 - Калькуляция себестоимости, прибыль и оптовая цена (TABLE_2_4).
 
-            # Записываем данные
-            for row in rows:
-                writer.writerow(row)
+        Args:
+            json_file (str, optional): Сохранить таблицу также в JSON.
+            docx_file (str, optional): Сохранить таблицу также в DOCX.
+        """
+        filename = "таблица_2_4_себестоимость.csv"
+        TABLE_2_4.emit(self, csv_path=filename, json_path=json_file, docx_path=docx_file)
 
         print(f"\nТаблица 2.4 сохранена в файл: {filename}")
         return filename
 
-    def create_input_data_table_2_3(self):
-        """Создание таблицы 2.3 - Данные для расчета себестоимости"""
-
-        # Заголовки таблицы
-        headers = ["№", "Показатели", "Ед. измерения", "Проект 1", "Проект 2"]
-
-        # Данные для таблицы (основные показатели)
-        rows = [
-            ["1", "Основные материалы", "", "", ""],
-            ["1.1", "Стальной прокат:", "", "", ""],
-            ["", " - расходы", "т",
-             f"{self.cost_calculation_data['project_1']['steel_rolling_consumption']:.4f}",
-             f"{self.cost_calculation_data['project_2']['steel_rolling_consumption']:.4f}"],
-            ["", " - отходы", "т",
-             f"{self.cost_calculation_data['project_1']['steel_rolling_waste']:.5f}",
-             f"{self.cost_calculation_data['project_2']['steel_rolling_waste']:.6f}"],
-            ["1.2", "Трубы стальные:", "", "", ""],
-            ["", " - расходы", "т",
-             f"{self.cost_calculation_data['project_1']['steel_pipes_consumption']:.4f}",
-             f"{self.cost_calculation_data['project_2']['steel_pipes_consumption']:.4f}"],
-            ["", " - отходы", "т",
-             f"{self.cost_calculation_data['project_1']['steel_pipes_waste']:.5f}",
-             f"{self.cost_calculation_data['project_2']['steel_pipes_waste']:.6f}"],
-            ["1.3", "Прокат цветных металлов", "руб",
-             f"{self.cost_calculation_data['project_1']['nonferrous_rolling']:.0f}",
-             f"{self.cost_calculation_data['project_2']['nonferrous_rolling']:.0f}"],
-            ["1.4", "Другие материалы", "руб",
-             f"{self.cost_calculation_data['project_1']['other_materials']:.0f}",
-             f"{self.cost_calculation_data['project_2']['other_materials']:.0f}"],
-            ["2", "Покупные полуфабрикаты (отливки):", "", "", ""],
-            ["2.1", "черных металлов", "", "", ""],
-            ["", " - расходы", "т",
-             f"{self.cost_calculation_data['project_1']['castings_black_consumption']:.3f}",
-             f"{self.cost_calculation_data['project_2']['castings_black_consumption']:.3f}"],
-            ["", " - отходы", "т",
-             f"{self.cost_calculation_data['project_1']['castings_black_waste']:.4f}",
-             f"{self.cost_calculation_data['project_2']['castings_black_waste']:.5f}"],
-            ["2.2", "цветных металлов", "", "", ""],
-            ["", " - расходы", "т",
-             f"{self.cost_calculation_data['project_1']['castings_color_consumption']:.3f}",
-             f"{self.cost_calculation_data['project_2']['castings_color_consumption']:.4f}"],
-            ["", " - отходы", "т",
-             f"{self.cost_calculation_data['project_1']['castings_color_waste']:.5f}",
-             f"{self.cost_calculation_data['project_2']['castings_color_waste']:.6f}"],
-            ["3", "покупные комплектующие изделия", "руб",
-             f"{self.cost_calculation_data['project_1']['purchased_components']:.0f}",
-             f"{self.cost_calculation_data['project_2']['purchased_components']:.0f}"],
-            ["4", "Цена стального проката", "руб/т",
-             f"{self.cost_calculation_data['project_1']['price_steel_rolling']:.0f}",
-             f"{self.cost_calculation_data['project_2']['price_steel_rolling']:.0f}"],
-            ["5", "Цена стальных труб", "руб/т",
-             f"{self.cost_calculation_data['project_1']['price_steel_pipes']:.0f}",
-             f"{self.cost_calculation_data['project_2']['price_steel_pipes']:.0f}"],
-            ["6", "Цена отливок:", "", "", ""],
-            ["", "-черных металлов", "руб/т",
-             f"{self.cost_calculation_data['project_1']['price_castings_black']:.0f}",
-             f"{self.cost_calculation_data['project_2']['price_castings_black']:.0f}"],
-            ["", "-цветных металлов", "руб/т",
-             f"{self.cost_calculation_data['project_1']['price_castings_color']:.0f}",
-             f"{self.cost_calculation_data['project_2']['price_castings_color']:.0f}"],
-            ["7", "Цена отходов:", "", "", ""],
-            ["", "-стального проката", "руб/т",
-             f"{self.cost_calculation_data['project_1']['price_waste_steel_rolling']:.0f}",
-             f"{self.cost_calculation_data['project_2']['price_waste_steel_rolling']:.0f}"],
-            ["", "-труб стальных", "руб/т",
-             f"{self.cost_calculation_data['project_1']['price_waste_steel_pipes']:.0f}",
-             f"{self.cost_calculation_data['project_2']['price_waste_steel_pipes']:.0f}"],
-            ["", "-отливок черных металлов", "руб/т",
-             f"{self.cost_calculation_data['project_1']['price_waste_castings_black']:.0f}",
-             f"{self.cost_calculation_data['project_2']['price_waste_castings_black']:.0f}"],
-            ["", "-отливок цветных металлов", "руб/т",
-             f"{self.cost_calculation_data['project_1']['price_waste_castings_color']:.0f}",
-             f"{self.cost_calculation_data['project_2']['price_waste_castings_color']:.0f}"],
-            ["8", "Топливо и энергия на технологические потребности", "%",
-             f"{self.cost_calculation_data['project_1']['fuel_energy_percent']:.1f}",
-             f"{self.cost_calculation_data['project_2']['fuel_energy_percent']:.1f}"],
-            ["9", "Суммарная трудоемкость изделия", "н-час",
-             f"{self.cost_calculation_data['project_1']['labor_intensity']:.2f}",
-             f"{self.cost_calculation_data['project_2']['labor_intensity']:.2f}"],
-            ["10", "Часовая тарифная ставка", "руб",
-             f"{self.cost_calculation_data['project_1']['hourly_rate']:.2f}",
-             f"{self.cost_calculation_data['project_2']['hourly_rate']:.2f}"],
-            ["11", "Дополнительная зарплата", "%",
-             f"{self.cost_calculation_data['project_1']['additional_salary_percent']:.0f}",
-             f"{self.cost_calculation_data['project_2']['additional_salary_percent']:.0f}"],
-            ["12", "Отчисление на социальное страхование", "%",
-             f"{self.cost_calculation_data['project_1']['social_insurance_percent']:.0f}",
-             f"{self.cost_calculation_data['project_2']['social_insurance_percent']:.0f}"],
-            ["13", "Расходы на содержание и эксплуатацию оборудования", "%",
-             f"{self.cost_calculation_data['project_1']['equipment_maintenance_percent']:.0f}",
-             f"{self.cost_calculation_data['project_2']['equipment_maintenance_percent']:.0f}"],
-            ["14", "Общепроизводственные расходы", "%",
-             f"{self.cost_calculation_data['project_1']['overhead_production_percent']:.0f}",
-             f"{self.cost_calculation_data['project_2']['overhead_production_percent']:.0f}"],
-            ["15", "Общехозяйственные расходы", "%",
-             f"{self.cost_calculation_data['project_1']['general_business_percent']:.0f}",
-             f"{self.cost_calculation_data['project_2']['general_business_percent']:.0f}"],
-            ["16", "Внепроизводственные расходы", "%",
-             f"{self.cost_calculation_data['project_1']['non_production_percent']:.0f}",
-             f"{self.cost_calculation_data['project_2']['non_production_percent']:.0f}"],
-            ["17", "Норматив рентабельности к себестоимости", "%",
-             f"{self.cost_calculation_data['project_1']['profitability_percent']:.0f}",
-             f"{self.cost_calculation_data['project_2']['profitability_percent']:.0f}"],
-            ["18", "Годовой объем производства", "шт",
-             f"{self.projects_data['project_1']['annual_volume_corrected']:.0f}",
-             f"{self.projects_data['project_2']['annual_volume_corrected']:.0f}"]
-        ]
-
-        # Создаем CSV файл
-        filename = "таблица_2_3_данные_для_расчета.csv"
-
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            writer = csv.writer(csvfile, delimiter=';')
-
-            # Записываем заголовки
-            writer.writerow(headers)
+    @instr.traced()
+    def create_input_data_table_2_3(self, json_file=None, docx_file=None):
+        """
+        Создание таблицы 2.3 - Данные для расчета себестоимости (TABLE_2_3).
 
-            # Записываем данные
-            for row in rows:
-                writer.writerow(row)
+        Args:
+            json_file (str, optional): Сохранить таблицу также в JSON.
+            docx_file (str, optional): Сохранить таблицу также в DOCX.
+        """
+        filename = "таблица_2_3_данные_для_расчета.csv"
+        TABLE_2_3.emit(self, csv_path=filename, json_path=json_file, docx_path=docx_file)
 
         print(f"Таблица 2.3 сохранена в файл: {filename}")
         return filename
 
+    @instr.traced()
     def save_production_volumes_to_json(self, filename="объемы_продукции.json"):
         """
         Сохранение объемов товарной и реализованной продукции в JSON
@@ -947,6 +817,8 @@ class CostCalculator:
 
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        if instr.is_enabled():
+            instr.count("bytes_written", os.path.getsize(filename))
 
         print(f"Объемы продукции сохранены в JSON файл: {filename}")
         return data
@@ -1087,6 +959,7 @@ class CostCalculator:
 
 def main():
     """Основная функция"""
+    import profiling
 
     print("="*80)
     print("РАСЧЕТ ПРОЕКТНОЙ ЧАСТИ КУРСОВОЙ РАБОТЫ")
@@ -1098,14 +971,17 @@ def main():
     calculator = CostCalculator()
 
     # Выполняем расчеты с промежуточными выводами
-    calculator.calculate_all_costs()
+    with profiling.stage("Расчет себестоимости"):
+        calculator.calculate_all_costs()
 
     # Создаем таблицы CSV
-    calculator.create_input_data_table_2_3()
-    calculator.create_cost_table_2_4()
+    with profiling.stage("Таблицы 2.3 и 2.4"):
+        calculator.create_input_data_table_2_3()
+        calculator.create_cost_table_2_4()
 
     # Сохраняем объемы продукции в JSON
-    volumes_data = calculator.save_production_volumes_to_json()
+    with profiling.stage("Объемы продукции"):
+        volumes_data = calculator.save_production_volumes_to_json()
 
     # Проверяем расчеты
     #ismatches = calculator.create_verification_report()
@@ -1133,4 +1009,6 @@ def main():
     print("=" * 80)
 
 if __name__ == "__main__":
+    import profiling
+    profiling.setup("task_21")
     main()
\ No newline at end of file
@@ -4,6 +4,16 @@
 """
 
 import csv
+import os
+import random
+from types import SimpleNamespace
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+import instrumentation as instr
+import memo
+from table_schema import Column, Row, TableSchema
 
 
 class Project:
@@ -32,8 +42,30 @@ class Project:
         self.results = {}
 
 
+# Исходные данные проекта, от которых зависят результаты calculate_project
+PROJECT_INPUTS = ('Q_t', 'S_om', 'S_pok', 'S_vm', 'N_om', 'N_pok', 'N_vm', 'OS_prz',
+                  'S', 'S_m', 'T_c', 'N_gp', 'OS_rbp', 'S_r')
+
+
+@instr.traced("Норматив оборотных средств проекта")
 def calculate_project(project):
-    """Выполнение всех расчетов для проекта"""
+    """
+    Выполнение всех расчетов для проекта.
+
+    Расчет кешируется по исходным данным проекта (PROJECT_INPUTS): проекты
+    и варианты с одинаковыми данными считаются один раз.
+    """
+    inputs = tuple(getattr(project, name) for name in PROJECT_INPUTS)
+    results = dict(_calculate_norms(*inputs))
+    project.results = results
+    return results
+
+
+@memo.memoize(maxsize=1024)
+def _calculate_norms(Q_t, S_om, S_pok, S_vm, N_om, N_pok, N_vm, OS_prz, S, S_m, T_c, N_gp, OS_rbp, S_r):
+    """Расчет норматива оборотных средств по исходным данным проекта (без побочных эффектов)"""
+    project = SimpleNamespace(Q_t=Q_t, S_om=S_om, S_pok=S_pok, S_vm=S_vm, N_om=N_om, N_pok=N_pok, N_vm=N_vm,
+                              OS_prz=OS_prz, S=S, S_m=S_m, T_c=T_c, N_gp=N_gp, OS_rbp=OS_rbp, S_r=S_r)
 
     results = {}
 
@@ -85,10 +117,48 @@ def calculate_project(project):
     results['Itogo_calc'] = f"{results['OS_pz']:.3f} + {results['OS_np']:.3f} + {results['OS_gp']:.3f} + {results['OS_rbp']:.3f}"
     results['Itogo'] = round(Itogo_calc, 3)
 
-    project.results = results
+    instr.count("formulas_evaluated", 8)
     return results
 
 
+def calculate_norms_batch(**inputs):
+    """
+    Норматив оборотных средств для массивов проектов (векторный аналог calculate_project).
+
+    Промежуточные результаты округляются до 0.001, как в _calculate_norms.
+
+    Args:
+        **inputs: Поля PROJECT_INPUTS - скаляры или массивы NumPy одной длины.
+
+    Returns:
+        dict: Массивы OS_om, OS_pok, OS_vm, OS_prz, OS_pz, K_nz, OS_np, OS_gp, OS_rbp, Itogo.
+
+    Raises:
+        ValueError: Если не задано одно из полей PROJECT_INPUTS.
+    """
+    import numpy as np
+
+    missing = [name for name in PROJECT_INPUTS if name not in inputs]
+    if missing:
+        raise ValueError(f"Не заданы исходные данные проекта: {', '.join(missing)}")
+    p = SimpleNamespace(**{name: np.asarray(inputs[name], dtype=float) for name in PROJECT_INPUTS})
+
+    r = {}
+    r['OS_om'] = np.round(p.S_om / 360 * p.N_om, 3)
+    r['OS_pok'] = np.round(p.S_pok / 360 * p.N_pok, 3)
+    r['OS_vm'] = np.round(p.S_vm / 360 * p.N_vm, 3)
+    r['OS_prz'] = np.round(p.OS_prz, 3)
+    r['OS_pz'] = np.round(r['OS_om'] + r['OS_pok'] + r['OS_vm'] + r['OS_prz'], 3)
+    r['K_nz'] = np.round((p.S_m + 0.5 * (p.S - p.S_m)) / p.S, 3)
+    r['OS_np'] = np.round(p.S_r / 360 * p.T_c * r['K_nz'], 3)
+    r['OS_gp'] = np.round(p.Q_t * p.N_gp / 360, 3)
+    r['OS_rbp'] = np.round(p.OS_rbp, 3)
+    r['Itogo'] = np.round(r['OS_pz'] + r['OS_np'] + r['OS_gp'] + r['OS_rbp'], 3)
+
+    instr.count("formulas_evaluated", 8 * r['Itogo'].size)
+    return r
+
+
 def print_detailed_calculation(project):
     """Вывод подробного расчета для проекта"""
     print(f"\n{'='*60}")
@@ -111,55 +181,53 @@ def print_detailed_calculation(project):
     print(f"Итого = {project.results['Itogo_calc']} = {project.results['Itogo']:.3f} тыс.руб.")
 
 
-def generate_table_2_5_csv(project1, project2, filename="table_2_5_initial_data.csv"):
-    """Генерация CSV файла с таблицей 2.5 - Исходные данные"""
-
-    # Заголовки таблицы 2.5
-    headers = ["№", "Показатели", "Един. измерения", "Условные обозначения",
-               f"{project1.name}", f"{project2.name}"]
-
-    # Данные таблицы 2.5 (13 строк)
-    data = [
-        [1, "Годовой объем товарной продукции", "тыс.руб", "Qт",
-         f"{project1.Q_t:.3f}", f"{project2.Q_t:.3f}"],
-        [2, "Расходы основных материалов на годовой выпуск", "тыс.руб", "Сом",
-         f"{project1.S_om:.3f}", f"{project2.S_om:.3f}"],
-        [3, "Расходы покупных полуфабрикатов и комплектующих на годовой выпуск",
-         "тыс.руб", "Спок", f"{project1.S_pok:.3f}", f"{project2.S_pok:.3f}"],
-        [4, "Годовые расходы вспомогательных материалов", "тыс.руб", "Свм",
-         f"{project1.S_vm:.3f}", f"{project2.S_vm:.3f}"],
-        [5, "Норма запаса основных материалов", "дн", "Ном",
-         f"{project1.N_om}", f"{project2.N_om}"],
-        [6, "Норма запаса покупных полуфабрикатов и комплектующих", "дн", "Нпок",
-         f"{project1.N_pok}", f"{project2.N_pok}"],
-        [7, "Норма запаса вспомогательных материалов", "дн", "Нвм",
-         f"{project1.N_vm}", f"{project2.N_vm}"],
-        [8, "Норматив оборотных средств по прочим производственным запасам",
-         "тыс.руб", "ОСпрз", f"{project1.OS_prz:.3f}", f"{project2.OS_prz:.3f}"],
-        [9, "Производственная себестоимость одного изделия", "руб", "С",
-         f"{project1.S:.3f}", f"{project2.S:.3f}"],
-        [10, "Начальные материальные расходы (сумма расходов по первым двум статьям калькуляции)",
-         "руб", "См", f"{project1.S_m:.3f}", f"{project2.S_m:.3f}"],
-        [11, "Длительность производственного цикла", "дн", "Тц",
-         f"{project1.T_c}", f"{project2.T_c}"],
-        [12, "Норма запаса готовой продукции", "дн", "Нгп",
-         f"{project1.N_gp}", f"{project2.N_gp}"],
-        [13, "Норматив оборотных средств на расходы будущих периодов",
-         "тыс.руб", "ОСрбп", f"{project1.OS_rbp:.3f}", f"{project2.OS_rbp:.3f}"]
-    ]
-
-    # Запись в CSV файл
-    with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f, delimiter=';')
-        writer.writerow(headers)
-        for row in data:
-            writer.writerow(row)
+def _project_value(index):
+    return lambda bind, projects: bind(projects[index])
+
+
+# Таблица 2.5 - Исходные данные для расчета норматива оборотных средств; контекст - (проект 1, проект 2)
+TABLE_2_5 = TableSchema("Исходные данные", [
+    Column("№", field="number"),
+    Column("Показатели", field="label", json_key="Показатель"),
+    Column("Един. измерения", field="unit"),
+    Column("Условные обозначения", field="symbol"),
+    Column("Проект 1", value=_project_value(0), fmt="{:.3f}"),
+    Column("Проект 2", value=_project_value(1), fmt="{:.3f}"),
+], [
+    Row("Годовой объем товарной продукции", unit="тыс.руб", symbol="Qт", bind=lambda p: p.Q_t),
+    Row("Расходы основных материалов на годовой выпуск", unit="тыс.руб", symbol="Сом", bind=lambda p: p.S_om),
+    Row("Расходы покупных полуфабрикатов и комплектующих на годовой выпуск", unit="тыс.руб", symbol="Спок",
+        bind=lambda p: p.S_pok),
+    Row("Годовые расходы вспомогательных материалов", unit="тыс.руб", symbol="Свм", bind=lambda p: p.S_vm),
+    Row("Норма запаса основных материалов", unit="дн", symbol="Ном", bind=lambda p: p.N_om, fmt=str),
+    Row("Норма запаса покупных полуфабрикатов и комплектующих", unit="дн", symbol="Нпок",
+        bind=lambda p: p.N_pok, fmt=str),
+    Row("Норма запаса вспомогательных материалов", unit="дн", symbol="Нвм", bind=lambda p: p.N_vm, fmt=str),
+    Row("Норматив оборотных средств по прочим производственным запасам", unit="тыс.руб", symbol="ОСпрз",
+        bind=lambda p: p.OS_prz),
+    Row("Производственная себестоимость одного изделия", unit="руб", symbol="С", bind=lambda p: p.S),
+    Row("Начальные материальные расходы (сумма расходов по первым двум статьям калькуляции)", unit="руб",
+        symbol="См", bind=lambda p: p.S_m),
+    Row("Длительность производственного цикла", unit="дн", symbol="Тц", bind=lambda p: p.T_c, fmt=str),
+    Row("Норма запаса готовой продукции", unit="дн", symbol="Нгп", bind=lambda p: p.N_gp, fmt=str),
+    Row("Норматив оборотных средств на расходы будущих периодов", unit="тыс.руб", symbol="ОСрбп",
+        bind=lambda p: p.OS_rbp),
+], header_rows=lambda projects: [["№", "Показатели", "Един. измерения", "Условные обозначения",
+                                  *(f"{p.name}" for p in projects)]], number="2.5")
+
+
+@instr.traced("Таблица 2.5 (CSV)")
+def generate_table_2_5_csv(project1, project2, filename="table_2_5_initial_data.csv", json_file=None,
+                           docx_file=None):
+    """Генерация CSV файла с таблицей 2.5 - Исходные данные (TABLE_2_5; при необходимости также JSON и DOCX)"""
+    model = TABLE_2_5.emit((project1, project2), csv_path=filename, json_path=json_file, docx_path=docx_file)
 
     print(f"Таблица 2.5 сохранена в файл: {filename}")
 
-    return data
+    return [r.cells for r in model.rows]
 
 
+@instr.traced("Таблица 2.6 (CSV)")
 def generate_table_2_6_csv(project1, project2, filename="table_2_6_summary.csv"):
     """Генерация CSV файла с таблицей 2.6 - Сводный расчет"""
 
@@ -186,6 +254,9 @@ def generate_table_2_6_csv(project1, project2, filename="table_2_6_summary.csv")
         writer.writerow(headers)
         for row in data:
             writer.writerow(row)
+    if instr.is_enabled():
+        instr.count("rows_written", len(data) + 1)
+        instr.count("bytes_written", os.path.getsize(filename))
 
 
     print(f"Таблица 2.6 сохранена в файл: {filename}")
@@ -277,7 +348,34 @@ def create_custom_projects():
     return project1, project2
 
 
+def random_projects(n, seed=0, name="Проект"):
+    """
+    Генератор проектов со случайными исходными данными таблицы 2.5
+    (сценарии для потоковой выгрузки и бенчмарков). Детерминирован при заданном seed.
+    """
+    rnd = random.Random(seed)
+    for i in range(n):
+        project = Project(f"{name} {i + 1}")
+        project.Q_t = rnd.uniform(150000, 200000)
+        project.S_om = rnd.uniform(4000, 6000)
+        project.S_pok = rnd.uniform(70000, 90000)
+        project.S_vm = rnd.uniform(1000, 2000)
+        project.N_om = rnd.randint(10, 30)
+        project.N_pok = rnd.randint(3, 10)
+        project.N_vm = rnd.randint(5, 12)
+        project.OS_prz = rnd.uniform(300, 800)
+        project.S = rnd.uniform(300000, 350000)
+        project.S_m = project.S * rnd.uniform(0.5, 0.6)
+        project.T_c = rnd.randint(3, 10)
+        project.N_gp = rnd.randint(1, 3)
+        project.OS_rbp = rnd.uniform(300, 700)
+        project.S_r = rnd.uniform(120000, 160000)
+        yield project
+
+
 def main():
+    import profiling
+
     print("РАСЧЕТ НОРМАТИВА ОБОРОТНЫХ СРЕДСТВ")
     print("="*60)
     print("Версия 3.0 - с таблицами 2.5 и 2.6 в CSV")
@@ -300,8 +398,9 @@ def main():
 
     # Выполнение расчетов
 
-    calculate_project(project1)
-    calculate_project(project2)
+    with profiling.stage("Расчет норматива"):
+        calculate_project(project1)
+        calculate_project(project2)
 
     # Вывод подробных расчетов
     print_detailed_calculation(project1)
@@ -312,11 +411,12 @@ def main():
     print("СОЗДАНИЕ ТАБЛИЦ В CSV ФОРМАТЕ")
     print("="*60)
 
-    # Таблица 2.5 - Исходные данные
-    generate_table_2_5_csv(project1, project2, "table_2_5_initial_data.csv")
+    with profiling.stage("Таблицы 2.5 и 2.6"):
+        # Таблица 2.5 - Исходные данные
+        generate_table_2_5_csv(project1, project2, "table_2_5_initial_data.csv")
 
-    # Таблица 2.6 - Сводный расчет
-    generate_table_2_6_csv(project1, project2, "table_2_6_summary.csv")
+        # Таблица 2.6 - Сводный расчет
+        generate_table_2_6_csv(project1, project2, "table_2_6_summary.csv")
 
     print("\n" + "="*60)
     print("РАСЧЕТ ЗАВЕРШЕН!")
@@ -327,4 +427,6 @@ def main():
 
 
 if __name__ == "__main__":
+    import profiling
+    profiling.setup("task_22")
     main()
\ No newline at end of file
@@ -1,109 +1,67 @@
-import matplotlib.pyplot as plt
+import argparse
+
 import numpy as np
-from math import ceil
-
-
-#  KOSTYA
-# CF = 88532.68  # постоянные расходы, тыс. руб.
-# cv_total = 108206.63  # общие переменные расходы, тыс. руб.
-# price = 479.38  # цена единицы продукции, тыс. руб.
-# Q_max = 479  # годовой объем производства, шт.
-
-#  vova
-# CF = 33241.86   # постоянные расходы, тыс. руб.
-# cv_total = 77564.34 # общие переменные расходы, тыс. руб.
-# price = 322.73  # цена единицы продукции, тыс. руб.
-# Q_max = 412  # годовой объем производства, шт.
-
-CF = 47061.04   # постоянные расходы, тыс. руб.
-cv_total = 109809.11 # общие переменные расходы, тыс. руб.
-price = 394.64  # цена единицы продукции, тыс. руб.
-Q_max = 477  # годовой объем производства, шт.
-
-# Расчет переменных расходов на единицу продукции
-cv_unit = cv_total / Q_max
-
-# Расчет точки безубыточности
-Q_be = ceil(CF / (price - cv_unit))
-
-# Создание массива объемов производства
-Q = np.linspace(0, Q_max * 1.2, 100)
-
-# Расчет финансовых показателей
-revenue = price * Q  # выручка
-variable_costs = cv_unit * Q  # переменные затраты
-fixed_costs_line = np.ones_like(Q) * CF  # постоянные затраты
-total_costs = CF + variable_costs  # общие затраты
-
-# Создание графика
-plt.figure(figsize=(12, 8), facecolor='white')
-
-# Построение основных линий с различными стилями для Ч/Б печати
-plt.plot(Q, revenue, 'k-', linewidth=2.5)  # Выручка - сплошная линия
-plt.plot(Q, total_costs, 'k--', linewidth=2.5)  # Общие затраты - пунктир
-plt.plot(Q, variable_costs, 'k-.', linewidth=2)  # Переменные затраты - штрих-пунктир
-plt.plot(Q, fixed_costs_line, 'k:', linewidth=2)  # Постоянные затраты - точечная линия
-
-# Вертикальная линия в точке безубыточности
-plt.axvline(x=Q_be, color='k', linestyle='-', linewidth=1.5)
-
-# Точка безубыточности
-plt.plot(Q_be, price * Q_be, 'ko', markersize=8)
-plt.plot(Q_be, CF + cv_unit * Q_be, 'ko', markersize=8)
-
-fontsize = 9.4
-
-# Подписи на линиях
-plt.text(Q_max * 0.7, price * Q_max * 0.8, f'Выручка', fontsize=fontsize,
-         bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'))
-#plt.text(Q_max * 1.1, (CF + cv_unit * Q_max * 1.5) * 0.8, f'Общие затраты',
-#         fontsize=fontsize, bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'))
-plt.text(Q_max * 0.9, cv_unit * Q_max * 0.9, f'Переменные затраты',
-         fontsize=fontsize, bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'))
-plt.text(Q_max * 0.1, CF * 1.05, f'Постоянные затраты',
-         fontsize=fontsize, bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'))
-
-# Подпись точки безубыточности
-plt.text(Q_be + 5, price * Q_be + 10000, f'Точка безубыточности\n({Q_be:.1f} шт.; {(price * Q_be):.1f} тыс. руб.)',
-         fontsize=fontsize, bbox=dict(facecolor='white', alpha=0.9, edgecolor='gray'))
-
-# Подпись для линии себестоимости (общих затрат)
-plt.text(Q_max * 1.1, (CF + cv_unit * Q_max * 1.5) * 0.8, f'Себестоимость',
-         fontsize=fontsize, bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'))
-# Q_max * 0.3, CF + cv_unit * Q_max * 0.4
-
-
-# Отметка годового объема производства
-plt.axvline(x=Q_max, color='k', linestyle='-', linewidth=1, alpha=0.7)
-plt.text(Q_max + 5, 5000, f'Годовой объем\nпроизводства\n({Q_max} шт.)',
-         fontsize=fontsize, bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'))
-
-# Дополнительный расчет прибыли при максимальном объеме
-profit_at_max = price * Q_max - (CF + cv_unit * Q_max)
-plt.text(Q_max - 40, price * Q_max - 10000, f'Прибыль при Q={Q_max} шт.:\n{profit_at_max:.2f} тыс. руб.',
-         fontsize=fontsize, bbox=dict(facecolor='white', alpha=0.8, edgecolor='gray'))
-
-# Настройка графика
-plt.title('График безубыточности производства', fontsize=16, pad=20)
-plt.xlabel('Объем производства, шт.', fontsize=14, labelpad=10)
-plt.ylabel('Денежные средства, тыс. руб.', fontsize=14, labelpad=10)
-plt.grid(True, linestyle='--', alpha=0.7)
-plt.minorticks_on()
-plt.grid(which='minor', linestyle=':', alpha=0.4)
-
-# Установка пределов осей
-plt.xlim(0, Q_max * 1.2)
-plt.ylim(0, max(revenue[-1], total_costs[-1]) * 1.1)
-
-# Форматирование осей
-plt.xticks(np.arange(0, Q_max * 1.3, 50))
-plt.yticks(np.arange(0, max(revenue[-1], total_costs[-1]) * 1.2, 20000))
-
-# Убираем легенду согласно требованию
-plt.legend().set_visible(False)
-
-# Финальная настройка
-plt.tight_layout()
-
-# Отображение графика
-plt.show()
\ No newline at end of file
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from pract_part.breakeven import calculate_break_even, plot_break_even
+
+
+# Исходные данные по вариантам: постоянные расходы (тыс. руб.), общие переменные
+# расходы (тыс. руб.), цена единицы продукции (тыс. руб.), годовой объем производства (шт.)
+CASES = {
+    "kostya": {"CF": 88532.68, "cv_total": 108206.63, "price": 479.38, "Q_max": 479},
+    "vova": {"CF": 33241.86, "cv_total": 77564.34, "price": 322.73, "Q_max": 412},
+    "main": {"CF": 47061.04, "cv_total": 109809.11, "price": 394.64, "Q_max": 477},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Расчет и график точки безубыточности")
+    parser.add_argument("--case", default="main", choices=sorted(CASES),
+                        help="Вариант исходных данных для графика (по умолчанию: main)")
+    parser.add_argument("--no-plot", action="store_true", help="Только расчет, без графика")
+    parser.add_argument("--save", help="Сохранить график в файл вместо показа на экране")
+    args = parser.parse_args()
+
+    names = list(CASES)
+    CF = np.array([CASES[n]["CF"] for n in names])
+    cv_total = np.array([CASES[n]["cv_total"] for n in names])
+    price = np.array([CASES[n]["price"] for n in names])
+    Q_max = np.array([CASES[n]["Q_max"] for n in names])
+
+    # Расчет сразу по всем вариантам
+    result = calculate_break_even(CF, cv_total, price, Q_max)
+
+    for i, name in enumerate(names):
+        print(f"=== {name} ===")
+        print(f"Сv = {cv_total[i]} / {Q_max[i]} = {result['cv_unit'][i]:.3f} тыс. руб.")
+        print(f"Qбу = {CF[i]} / ({price[i]} - {result['cv_unit'][i]:.3f}) = {result['Q_be'][i]:.0f} шт.")
+        print(f"Прибыль при Q={Q_max[i]} шт.: {result['profit_at_capacity'][i]:.2f} тыс. руб.")
+        print(f"Запас финансовой прочности: {result['safety_margin_units'][i]:.0f} шт. "
+              f"({result['safety_margin_pct'][i]:.2f}%)")
+        print(f"Операционный рычаг: {result['operating_leverage'][i]:.3f}")
+        print()
+
+    if args.no_plot:
+        return
+
+    import matplotlib
+    if args.save:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    case = CASES[args.case]
+    plot_break_even(case["CF"], case["cv_total"], case["price"], case["Q_max"])
+    plt.tight_layout()
+
+    if args.save:
+        plt.savefig(args.save, dpi=150)
+        print(f"График сохранен в файл: {args.save}")
+    else:
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Общие опции профилирования для всех точек входа (скриптов заданий).
+
+    python task_21.py --profile              # cProfile -> ./profile/
+    python task_21.py --memprofile=out_dir   # tracemalloc -> out_dir/
+    python task_21.py --profile --memprofile
+
+setup() убирает эти опции из sys.argv (чтобы не мешать собственному разбору
+аргументов скрипта), запускает профилировщики и при завершении программы
+записывает результаты:
+  - <имя>.prof              - статистика cProfile всей программы (pstats / snakeviz);
+  - <имя>_hot.txt           - самые "горячие" функции (по собственному и суммарному времени);
+  - <имя>_mem.txt           - места наибольших выделений памяти (tracemalloc);
+  - <имя>__<этап>.prof/...  - то же для каждого этапа, отмеченного stage().
+
+Без опций setup() и stage() ничего не делают (кроме span инструментации).
+"""
+
+import atexit
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+import instrumentation as instr
+
+DEFAULT_DIR = "profile"
+TOP_N = 25
+
+_name = None
+_profile_dir = None
+_memprofile_dir = None
+_profiler = None
+_stage_active = False  # идет ли профилирование этапа (вложенные этапы не профилируются)
+_stage_results = []  # (имя этапа, pstats.Stats или None, строки tracemalloc или None)
+
+
+def _pop_option(argv, option):
+    """Удаляет из argv опцию вида --option или --option=DIR. Возвращает DIR, DEFAULT_DIR или None."""
+    value = None
+    for arg in list(argv):
+        if arg == option:
+            value = DEFAULT_DIR
+            argv.remove(arg)
+        elif arg.startswith(option + "="):
+            value = arg.split("=", 1)[1] or DEFAULT_DIR
+            argv.remove(arg)
+    return value
+
+
+def setup(name=None, argv=None):
+    """
+    Разбирает --profile/--memprofile и запускает профилирование.
+
+    Args:
+        name (str, optional): Имя точки входа для файлов результата
+                              (по умолчанию - имя запущенного скрипта).
+        argv (list, optional): Список аргументов (по умолчанию sys.argv, изменяется на месте).
+
+    Returns:
+        bool: True, если включено хотя бы одно профилирование.
+    """
+    global _name, _profile_dir, _memprofile_dir, _profiler
+    argv = sys.argv if argv is None else argv
+    _profile_dir = _pop_option(argv, "--profile")
+    _memprofile_dir = _pop_option(argv, "--memprofile")
+    # Абсолютные пути: скрипт может сменить текущий каталог до завершения
+    _profile_dir = os.path.abspath(_profile_dir) if _profile_dir else None
+    _memprofile_dir = os.path.abspath(_memprofile_dir) if _memprofile_dir else None
+    _name = name or os.path.splitext(os.path.basename(argv[0] if argv else "main"))[0]
+
+    if _memprofile_dir:
+        os.makedirs(_memprofile_dir, exist_ok=True)
+        tracemalloc.start(10)
+    if _profile_dir:
+        os.makedirs(_profile_dir, exist_ok=True)
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+    if _profile_dir or _memprofile_dir:
+        atexit.register(_finish)
+        return True
+    return False
+
+
+def _file_name(directory, stage_name, suffix):
+    if stage_name is None:
+        base = _name
+    else:
+        base = _name + "__" + re.sub(r'[^\w.-]+', '_', stage_name)
+    return os.path.join(directory, base + suffix)
+
+
+def _hot_functions(stats, limit=TOP_N):
+    """Текстовый отчет о самых горячих функциях (по tottime и по cumulative)."""
+    out = io.StringIO()
+    stats.stream = out
+    out.write("=== По собственному времени (tottime) ===\n")
+    stats.sort_stats("tottime").print_stats(limit)
+    out.write("\n=== По суммарному времени (cumulative) ===\n")
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+def _top_allocations(snapshot, baseline=None, limit=TOP_N):
+    """Строки отчета tracemalloc: наибольшие выделения (или прирост относительно baseline)."""
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                       tracemalloc.Filter(False, cProfile.__file__),
+                                       tracemalloc.Filter(False, pstats.__file__),
+                                       tracemalloc.Filter(False, __file__),
+                                       tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")])
+    if baseline is not None:
+        stats = snapshot.compare_to(baseline, "lineno")
+    else:
+        stats = snapshot.statistics("lineno")
+    return [str(stat) for stat in stats[:limit]]
+
+
+def _write_results(stage_name, stats, allocations):
+    if stats is not None:
+        stats.dump_stats(_file_name(_profile_dir, stage_name, ".prof"))
+        with open(_file_name(_profile_dir, stage_name, "_hot.txt"), 'w', encoding='utf-8') as f:
+            f.write(_hot_functions(stats))
+    if allocations is not None:
+        with open(_file_name(_memprofile_dir, stage_name, "_mem.txt"), 'w', encoding='utf-8') as f:
+            f.write("\n".join(allocations) + "\n")
+
+
+@contextmanager
+def stage(name, trace=True):
+    """
+    Этап программы: отдельные результаты cProfile/tracemalloc и span инструментации.
+
+    Во время этапа общий профилировщик приостанавливается, поэтому время этапа
+    не попадает в общую статистику дважды. Вложенный этап (профилировщик
+    внешнего этапа уже работает) ничего не профилирует: его время входит
+    в результаты внешнего этапа.
+
+    Args:
+        name (str): Имя этапа.
+        trace (bool): Открывать span инструментации с именем этапа
+                      (False - если вызывающий код уже открыл свой span).
+    """
+    global _stage_active
+    with instr.span(name) if trace else nullcontext():
+        if _stage_active or not (_profile_dir or _memprofile_dir):
+            yield
+            return
+
+        _stage_active = True
+        # Снимки памяти и запись отчетов не должны попадать в профиль
+        if _profiler is not None:
+            _profiler.disable()
+        baseline = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        stage_profiler = None
+        if _profiler is not None:
+            stage_profiler = cProfile.Profile()
+            stage_profiler.enable()
+        try:
+            yield
+        finally:
+            stats = None
+            if stage_profiler is not None:
+                stage_profiler.disable()
+                stats = pstats.Stats(stage_profiler)
+            allocations = None
+            if baseline is not None:
+                allocations = _top_allocations(tracemalloc.take_snapshot(), baseline)
+            _write_results(name, stats, allocations)
+            _stage_results.append((name, stats, allocations))
+            _stage_active = False
+            if _profiler is not None:
+                _profiler.enable()
+
+
+def _finish():
+    """Записывает итоговые результаты и краткую сводку (вызывается при завершении программы)."""
+    stats = None
+    if _profiler is not None:
+        _profiler.disable()
+        stats = pstats.Stats(_profiler)
+        for _, stage_stats, _ in _stage_results:
+            if stage_stats is not None:
+                stats.add(stage_stats)
+    allocations = None
+    if tracemalloc.is_tracing():
+        allocations = _top_allocations(tracemalloc.take_snapshot())
+        tracemalloc.stop()
+    _write_results(None, stats, allocations)
+
+    print(f"\n=== Профилирование: {_name} ===")
+    if stats is not None:
+        print(f"Самые горячие функции (собственное время), полный отчет: {_file_name(_profile_dir, None, '_hot.txt')}")
+        rows = sorted(stats.stats.items(), key=lambda kv: -kv[1][2])[:10]
+        for (file, line, func), (cc, nc, tt, ct, _) in rows:
+            print(f"  {tt:9.4f} с  {ct:9.4f} с  {nc:>8} выз.  {func} ({os.path.basename(file)}:{line})")
+    if allocations is not None:
+        print(f"Наибольшие выделения памяти, полный отчет: {_file_name(_memprofile_dir, None, '_mem.txt')}")
+        for line in allocations[:5]:
+            print(f"  {line}")
@@ -0,0 +1,803 @@
+"""
+Сборка полного отчета курсовой работы (DOCX) за один проход.
+
+Вместо отдельных *_table.docx (csv_to_docx) и текста, который скрипты
+заданий печатают в консоль, собирается один документ на вариант:
+нумерованные разделы, формулы с подставленными значениями, все таблицы
+и графики безубыточности.
+
+Порядок работы:
+  1. Шаблон стилей (Times New Roman, CsvTableText, Formula, подписи, поля A4)
+     строится через python-docx один раз на процесс; можно передать свой
+     шаблон .docx - его стили и содержимое (например, титульный лист) сохраняются.
+  2. Все расчеты выполняются один раз для всех вариантов сразу: себестоимость
+     и приведенные затраты (pract_part/reduced_costs), основные фонды (task2),
+     численность по видам работ (task4/routing), безубыточность (pract_part/breakeven).
+     Графики строятся параллельно с кешированием (charts.render_charts).
+  3. ReportWriter пишет word/document.xml потоком прямо в архив .docx,
+     без построения дерева документа в памяти; части шаблона копируются как есть.
+
+Запуск:
+    python report.py --variants 1-10 --output-dir reports
+    python report.py --variants 2 --csv task2/Исходные_данные_основные_фонды.csv --script task2/task2_course.py
+"""
+
+import argparse
+import os
+import re
+import struct
+import subprocess
+import sys
+import time
+import zipfile
+from contextlib import redirect_stdout
+from functools import lru_cache
+from io import BytesIO, StringIO
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+from pract_part.breakeven import FIXED_COST_ITEMS, calculate_break_even
+from pract_part.reduced_costs import EN, PROJECTS, variant_project_grid
+from task1.cost_chain import inputs_from_calculator
+from task2.task2_course import UDELNYE_VESY, average_annual_value
+from task4.routing import FCH, KVN, Routing, capacity_plan
+from dopolneniya_tables.shared_tables import load_tables
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+DOCUMENT = "word/document.xml"
+DOCUMENT_RELS = "word/_rels/document.xml.rels"
+CONTENT_TYPES = "[Content_Types].xml"
+BUFFER_SIZE = 64 * 1024
+EMU_PER_CM = 360000
+TWIPS_PER_CM = 567
+TEXT_WIDTH_CM = 16.5  # A4 без полей 3 и 1.5 см
+
+IMAGE_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+NS_WP = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+NS_A = "http://schemas.openxmlformats.org/drawingml/2006/main"
+NS_PIC = "http://schemas.openxmlformats.org/drawingml/2006/picture"
+NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+BASE_GROUP = "Рабочие машины и оборудование"
+
+# Статьи калькуляции cost_chain в порядке таблицы 2.4
+COST_ITEMS = (
+    ("material_costs", "Основные материалы за вычетом отходов"),
+    ("semi_components", "Покупные полуфабрикаты и комплектующие"),
+    ("fuel_energy", "Топливо и энергия на технологические цели"),
+    ("basic_salary", "Основная заработная плата"),
+    ("additional_salary", "Дополнительная заработная плата"),
+    ("social_insurance", "Отчисления на социальное страхование"),
+    ("equipment_maintenance", "Расходы на содержание и эксплуатацию оборудования"),
+    ("overhead_production", "Общепроизводственные расходы"),
+    ("general_business", "Общехозяйственные расходы"),
+    ("production_cost", "Производственная себестоимость"),
+    ("non_production", "Внепроизводственные расходы"),
+    ("full_cost", "Полная себестоимость"),
+    ("profit", "Прибыль"),
+    ("wholesale_price", "Оптовая цена"),
+)
+
+
+# --- Шаблон стилей ---
+
+def _apply_course_formatting(doc):
+    """Оформление по умолчанию: Times New Roman, поля A4, заголовки черным."""
+    from docx.shared import Cm, Pt, RGBColor
+
+    normal = doc.styles["Normal"]
+    normal.font.name = "Times New Roman"
+    normal.font.size = Pt(14)
+    normal.paragraph_format.first_line_indent = Cm(1.25)
+    normal.paragraph_format.space_after = Pt(0)
+    for level, size in ((1, 16), (2, 14), (3, 14)):
+        style = doc.styles[f"Heading {level}"]
+        style.font.name = "Times New Roman"
+        style.font.size = Pt(size)
+        style.font.bold = True
+        style.font.color.rgb = RGBColor(0, 0, 0)
+        style.paragraph_format.first_line_indent = Cm(0)
+        style.paragraph_format.space_before = Pt(12)
+        style.paragraph_format.space_after = Pt(6)
+    caption = doc.styles["Caption"]
+    caption.font.name = "Times New Roman"
+    caption.font.size = Pt(12)
+    caption.font.bold = False
+    caption.font.italic = False
+    caption.font.color.rgb = RGBColor(0, 0, 0)
+    caption.paragraph_format.first_line_indent = Cm(0)
+
+    section = doc.sections[0]
+    section.page_width, section.page_height = Cm(21), Cm(29.7)
+    section.left_margin, section.right_margin = Cm(3), Cm(1.5)
+    section.top_margin = section.bottom_margin = Cm(2)
+
+
+def _ensure_styles(doc):
+    """Добавляет стили отчета, которых нет в шаблоне (CsvTableText, Formula)."""
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Cm, Pt
+    from csv_to_docx import create_custom_style
+
+    names = {s.name for s in doc.styles}
+    if "CsvTableText" not in names:
+        create_custom_style(doc)
+        doc.styles["CsvTableText"].font.size = Pt(12)
+    if "Formula" not in names:
+        formula = doc.styles.add_style("Formula", WD_STYLE_TYPE.PARAGRAPH)
+        formula.base_style = doc.styles["Normal"]
+        formula.font.name = "Times New Roman"
+        formula.font.size = Pt(14)
+        formula.font.italic = True
+        formula.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        formula.paragraph_format.first_line_indent = Cm(0)
+        formula.paragraph_format.space_before = Pt(3)
+        formula.paragraph_format.space_after = Pt(3)
+
+
+@lru_cache(maxsize=None)
+def template_parts(path=None):
+    """
+    Части архива шаблона отчета (строится один раз на процесс для каждого пути).
+
+    Args:
+        path (str, optional): Свой шаблон .docx; по умолчанию - шаблон python-docx
+                              с оформлением курсовой работы.
+
+    Returns:
+        dict: {имя части: bytes}.
+    """
+    from docx import Document
+
+    doc = Document(path)
+    if path is None:
+        _apply_course_formatting(doc)
+    _ensure_styles(doc)
+    buffer = BytesIO()
+    doc.save(buffer)
+    with zipfile.ZipFile(buffer) as zf:
+        return {name: zf.read(name) for name in zf.namelist()}
+
+
+# --- Потоковая запись документа ---
+
+def _png_size(path):
+    """Ширина и высота PNG в пикселях (из заголовка IHDR)."""
+    with open(path, "rb") as f:
+        head = f.read(24)
+    if head[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"Файл {path} не является PNG.")
+    return struct.unpack(">II", head[16:24])
+
+
+def _run(text, bold=False):
+    props = "<w:rPr><w:b/></w:rPr>" if bold else ""
+    return f'<w:r>{props}<w:t xml:space="preserve">{escape(str(text))}</w:t></w:r>'
+
+
+def _paragraph(text="", style=None, bold=False, align=None):
+    props = ""
+    if style:
+        props += f'<w:pStyle w:val="{style}"/>'
+    if align:
+        props += f'<w:jc w:val="{align}"/>'
+    props = f"<w:pPr>{props}</w:pPr>" if props else ""
+    return f"<w:p>{props}{_run(text, bold) if text != '' else ''}</w:p>"
+
+
+class ReportWriter:
+    """
+    Запись документа .docx одним проходом.
+
+    Содержимое document.xml пишется в архив по мере вызова методов (через буфер
+    BUFFER_SIZE), остальные части берутся из шаблона template_parts(). Рисунки,
+    связи и типы содержимого дописываются в close().
+    """
+
+    def __init__(self, path, template=None, buffer_size=BUFFER_SIZE):
+        parts = template_parts(template)
+        document = parts[DOCUMENT].decode("utf-8")
+        body_end = document.rindex("</w:body>")
+        sect_start = document.rfind("<w:sectPr", 0, body_end)
+        if sect_start < 0:
+            sect_start = body_end
+        # Содержимое тела шаблона (например, титульный лист) идет перед отчетом
+        self._head = document[:sect_start]
+        self._tail = document[sect_start:]
+        self._rels = parts[DOCUMENT_RELS].decode("utf-8")
+        self._types = parts[CONTENT_TYPES].decode("utf-8")
+
+        self.path = path
+        self._zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        for name, data in parts.items():
+            if name not in (DOCUMENT, DOCUMENT_RELS, CONTENT_TYPES):
+                self._zip.writestr(name, data)
+        self._stream = self._zip.open(DOCUMENT, "w", force_zip64=True)
+        self._buffer = []
+        self._buffered = 0
+        self._buffer_size = buffer_size
+        self._images = []  # (имя части, путь к файлу)
+        self._after_table = False
+        self.numbers = []
+        self.tables = 0
+        self.figures = 0
+        self._write(self._head)
+
+    # --- запись ---
+
+    def _write(self, xml):
+        self._buffer.append(xml)
+        self._buffered += len(xml)
+        self._after_table = False
+        if self._buffered >= self._buffer_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._stream.write("".join(self._buffer).encode("utf-8"))
+            self._buffer = []
+            self._buffered = 0
+
+    # --- содержимое ---
+
+    def heading(self, text, level=1, numbered=True):
+        """
+        Заголовок раздела с автоматической нумерацией (1., 1.1., 1.1.1.).
+
+        Returns:
+            str: Номер раздела ('' для ненумерованного заголовка).
+        """
+        if not 1 <= level <= 3:
+            raise ValueError(f"Уровень заголовка должен быть от 1 до 3, получено {level}.")
+        number = ""
+        if numbered:
+            self.numbers = (self.numbers + [0] * level)[:level]
+            self.numbers[-1] += 1
+            number = ".".join(str(n) for n in self.numbers) + "."
+        self._write(_paragraph(f"{number} {text}" if number else text, style=f"Heading{level}"))
+        return number
+
+    def paragraph(self, text="", bold=False, align=None, style=None):
+        self._write(_paragraph(text, style=style, bold=bold, align=align))
+
+    def formula(self, text):
+        self._write(_paragraph(text, style="Formula"))
+
+    def text_block(self, text):
+        """
+        Текст, напечатанный скриптом задания: строки с расчетом (содержат '=' и цифры)
+        оформляются стилем Formula, строки-заголовки вида '--- ... ---' - полужирным.
+        """
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line.strip():
+                continue
+            stripped = line.strip()
+            if re.fullmatch(r"[-=\s]+", stripped):
+                continue
+            if re.match(r"^[-=]{3,}", stripped) or (stripped.isupper() and len(stripped) > 3):
+                self.paragraph(stripped.strip("-= "), bold=True)
+            elif "=" in stripped and re.search(r"\d", stripped):
+                self.formula(stripped)
+            else:
+                self.paragraph(stripped)
+
+    def table(self, rows, header=None, caption=None, widths=None, number=None):
+        """
+        Таблица со стилем TableGrid и текстом в стиле CsvTableText.
+
+        Args:
+            rows (iterable): Строки таблицы (значения приводятся к строке).
+            header (list, optional): Заголовки столбцов (повторяются на каждой странице).
+            caption (str, optional): Подпись; номер 'Таблица N' добавляется автоматически.
+            widths (list, optional): Ширины столбцов, см (по умолчанию - первый шире остальных).
+            number (str, optional): Номер таблицы по методичке ('2.4') вместо сквозного.
+
+        Returns:
+            int или str: Номер таблицы.
+        """
+        from csv_to_docx import value_to_string
+
+        rows = iter(rows)
+        first = None
+        if header is not None:
+            n_cols = len(header)
+        else:
+            # Без шапки число столбцов - по первой строке (строки не собираются в памяти)
+            first = next(rows, None)
+            n_cols = len(first) if first is not None else 0
+        if n_cols == 0:
+            raise ValueError("Таблица без столбцов.")
+        if widths is None:
+            first_width = min(6.0, TEXT_WIDTH_CM / 2) if n_cols > 1 else TEXT_WIDTH_CM
+            rest = (TEXT_WIDTH_CM - first_width) / max(n_cols - 1, 1)
+            widths = [first_width] + [rest] * (n_cols - 1)
+        twips = [int(w * TWIPS_PER_CM) for w in widths]
+
+        if number is None:
+            self.tables += 1
+            number = self.tables
+        title = f"Таблица {number}" + (f" – {caption}" if caption else "")
+        self._write(_paragraph(title, style="Caption"))
+
+        out = ['<w:tbl><w:tblPr><w:tblStyle w:val="TableGrid"/><w:tblW w:w="0" w:type="auto"/>'
+               '<w:tblLook w:val="04A0" w:firstRow="1" w:lastRow="0" w:firstColumn="1" w:lastColumn="0"'
+               ' w:noHBand="0" w:noVBand="1"/></w:tblPr><w:tblGrid>']
+        out.extend(f'<w:gridCol w:w="{w}"/>' for w in twips)
+        out.append("</w:tblGrid>")
+
+        def row_xml(values, bold):
+            values = list(values)
+            if len(values) > n_cols:
+                raise ValueError(f"В строке таблицы {len(values)} значений, столбцов {n_cols}.")
+            cells = [("<w:trPr><w:tblHeader/></w:trPr>" if bold else "")]
+            for i in range(n_cols):
+                value = values[i] if i < len(values) else ""
+                text = value if isinstance(value, str) else value_to_string(value)
+                cells.append(f'<w:tc><w:tcPr><w:tcW w:w="{twips[i]}" w:type="dxa"/></w:tcPr>'
+                             f'{_paragraph(text, style="CsvTableText", bold=bold)}</w:tc>')
+            return "<w:tr>" + "".join(cells) + "</w:tr>"
+
+        if header is not None:
+            out.append(row_xml([str(h) for h in header], True))
+        self._write("".join(out))
+        if first is not None:
+            self._write(row_xml(first, False))
+        for r in rows:
+            self._write(row_xml(r, False))
+        self._write("</w:tbl>")
+        self._after_table = True
+        return number
+
+    def dataframe(self, df, caption=None, widths=None):
+        return self.table(df.itertuples(index=False), [str(c) for c in df.columns], caption, widths)
+
+    def csv(self, path, caption=None):
+        """Таблица из CSV проекта (';', utf-8-sig), как create_docx_from_csv."""
+        df = pd.read_csv(path, sep=";", encoding="utf-8-sig")
+        return self.dataframe(df, caption or os.path.splitext(os.path.basename(path))[0])
+
+    def image(self, path, width_cm=TEXT_WIDTH_CM, caption=None):
+        """
+        Рисунок PNG по ширине width_cm с подписью 'Рисунок N'.
+
+        Returns:
+            int: Номер рисунка.
+        """
+        px_w, px_h = _png_size(path)
+        cx = int(width_cm * EMU_PER_CM)
+        cy = int(cx * px_h / px_w)
+        n = len(self._images) + 1
+        rid = f"rIdImg{n}"
+        name = f"image_report{n}.png"
+        self._images.append((f"word/media/{name}", path, rid))
+        self._write(
+            '<w:p><w:pPr><w:jc w:val="center"/></w:pPr><w:r><w:drawing>'
+            f'<wp:inline xmlns:wp="{NS_WP}" distT="0" distB="0" distL="0" distR="0">'
+            f'<wp:extent cx="{cx}" cy="{cy}"/><wp:docPr id="{1000 + n}" name="Рисунок {n}"/>'
+            f'<wp:cNvGraphicFramePr><a:graphicFrameLocks xmlns:a="{NS_A}" noChangeAspect="1"/></wp:cNvGraphicFramePr>'
+            f'<a:graphic xmlns:a="{NS_A}"><a:graphicData uri="{NS_PIC}">'
+            f'<pic:pic xmlns:pic="{NS_PIC}"><pic:nvPicPr><pic:cNvPr id="{1000 + n}" name="{name}"/><pic:cNvPicPr/>'
+            f'</pic:nvPicPr><pic:blipFill><a:blip xmlns:r="{NS_R}" r:embed="{rid}"/>'
+            '<a:stretch><a:fillRect/></a:stretch></pic:blipFill>'
+            f'<pic:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+            '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></pic:spPr></pic:pic>'
+            '</a:graphicData></a:graphic></wp:inline></w:drawing></w:r></w:p>'
+        )
+        self.figures += 1
+        self._write(_paragraph(f"Рисунок {self.figures}" + (f" – {caption}" if caption else ""),
+                               style="Caption", align="center"))
+        return self.figures
+
+    def page_break(self):
+        self._write('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+
+    # --- завершение ---
+
+    def close(self):
+        """Дописывает параметры раздела, рисунки, связи и типы содержимого; закрывает архив."""
+        if self._zip is None:
+            return
+        if self._after_table:
+            # Word требует абзац между таблицей и концом раздела
+            self._write(_paragraph())
+        self._write(self._tail)
+        self._flush()
+        self._stream.close()
+
+        rels = "".join(f'<Relationship Id="{rid}" Type="{IMAGE_REL}" Target="media/{part[len("word/media/"):]}"/>'
+                       for part, _, rid in self._images)
+        self._zip.writestr(DOCUMENT_RELS, self._rels.replace("</Relationships>", rels + "</Relationships>"))
+        types = self._types
+        if self._images and 'Extension="png"' not in types:
+            types = types.replace("<Default ", '<Default Extension="png" ContentType="image/png"/><Default ', 1)
+        self._zip.writestr(CONTENT_TYPES, types)
+        for part, path, _ in self._images:
+            self._zip.write(path, part, compress_type=zipfile.ZIP_STORED)
+        self._zip.close()
+        self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- Данные отчета ---
+
+def _fmt(value, digits=2):
+    """Число для текста отчета ('—' для бесконечности/NaN)."""
+    value = float(value)
+    if not np.isfinite(value):
+        return "—"
+    return f"{value:,.{digits}f}".replace(",", " ")
+
+
+def _load_plan():
+    """Программа выпуска изделий из задания 1 (individual_product_volumes.json)."""
+    import json
+
+    path = os.path.join(ROOT, "task1", "individual_product_volumes.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+        return {r["Изделие"]: float(r["Годовой_объем_выпуска"]) for r in records if "Изделие" in r}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def _match_group(name):
+    """
+    Группа Дополнения М по названию из dop_L ('рабочие машины' -> 'Рабочие машины и оборудование').
+
+    Raises:
+        ValueError: Если название не соответствует ровно одной группе.
+    """
+    name = name.strip().capitalize()
+    if name in UDELNYE_VESY:
+        return name
+    matches = [g for g in UDELNYE_VESY if g.startswith(name)]
+    if len(matches) != 1:
+        raise ValueError(f"Группа основных фондов '{name}' отсутствует в структуре (Дополнение М).")
+    return matches[0]
+
+
+def prepare(variants=None, tables=None):
+    """
+    Все расчеты отчета сразу для всех вариантов.
+
+    Args:
+        variants (list, optional): Варианты (по умолчанию - все варианты таблиц).
+        tables (dict, optional): Таблицы load_tables().
+
+    Returns:
+        dict: Исходные данные и результаты по вариантам (массивы по оси вариантов).
+
+    Raises:
+        ValueError: Если вариант отсутствует в таблицах дополнений.
+    """
+    with redirect_stdout(StringIO()):
+        from pract_part.task_21 import CostCalculator
+        calculator = CostCalculator()
+    template = {
+        "base": inputs_from_calculator(calculator, "project_1"),
+        "volumes": [calculator.projects_data[k]["annual_volume_corrected"] for k in ("project_1", "project_2")],
+    }
+    tables = tables or load_tables()
+    grid, details = variant_project_grid(template, tables=tables, details=True)
+    all_variants = list(details["variants"])
+    variants = all_variants if variants is None else list(variants)
+    missing = sorted(set(variants) - set(all_variants))
+    if missing:
+        raise ValueError(f"Нет исходных данных для вариантов {missing}.")
+    index = np.array([all_variants.index(v) for v in variants])
+
+    # Основные фонды (формулы 1.8, 1.9)
+    dop_l = tables["dop_L"].set_index("Вариант").reindex(variants)
+    if dop_l.isna().any().any():
+        raise ValueError("В dop_L нет данных для части вариантов.")
+    rmo = dop_l["stoimost_rmo_nachalo"].to_numpy(dtype=float)
+    groups = {g: rmo * w / UDELNYE_VESY[BASE_GROUP] for g, w in UDELNYE_VESY.items()}
+    gruppa_vvod = [_match_group(g) for g in dop_l["gruppa_vvod"]]
+    gruppa_vyvod = [_match_group(g) for g in dop_l["gruppa_vyvod"]]
+    rows = np.arange(len(variants))
+    group_matrix = np.array([groups[g] for g in UDELNYE_VESY])  # группы x варианты
+    names = list(UDELNYE_VESY)
+    F_n = group_matrix.sum(axis=0)
+    F_vv = group_matrix[[names.index(g) for g in gruppa_vvod], rows] * dop_l["procent_vvoda"].to_numpy() / 100
+    F_vyv = group_matrix[[names.index(g) for g in gruppa_vyvod], rows] * dop_l["procent_vyvoda"].to_numpy() / 100
+    F_sr_g = average_annual_value(F_n, F_vv, F_vyv, dop_l["mes_vvoda"].to_numpy(), dop_l["mes_vyvoda"].to_numpy())
+
+    # Безубыточность по проектам (постоянные - статьи FIXED_COST_ITEMS)
+    out, volume = details["projects"], details["inputs"]["annual_volume"]
+    fixed_unit = sum(out[item] for item in FIXED_COST_ITEMS)
+    be_inputs = {
+        "CF": fixed_unit * volume / 1000,
+        "cv_total": (out["full_cost"] - fixed_unit) * volume / 1000,
+        "price": out["wholesale_price"] / 1000,
+        "Q_max": volume,
+    }
+    break_even = calculate_break_even(**be_inputs)
+
+    routing = Routing.from_csv()
+    plan_volumes = _load_plan()
+    plan = np.array([plan_volumes.get(p, 0.0) for p in routing.products])
+
+    pick = lambda a: np.asarray(a)[index]
+    return {
+        "variants": variants,
+        "template": template,
+        "grid": grid.set_index("Вариант").loc[variants],
+        "base": {k: pick(v) for k, v in details["base"].items()},
+        "projects": {k: pick(v) for k, v in out.items()},
+        "inputs": {k: pick(v) for k, v in details["inputs"].items()},
+        "fixed_assets": {
+            "dop_L": dop_l, "groups": {g: v for g, v in groups.items()},
+            "gruppa_vvod": gruppa_vvod, "gruppa_vyvod": gruppa_vyvod,
+            "F_n": F_n, "F_vv": F_vv, "F_vyv": F_vyv, "F_sr_g": F_sr_g,
+        },
+        "break_even_inputs": {k: pick(v) for k, v in be_inputs.items()},
+        "break_even": {k: pick(v) for k, v in break_even.items()},
+        "routing": routing,
+        "plan": plan,
+    }
+
+
+def render_break_even_charts(data, output_dir, workers=None):
+    """
+    Графики безубыточности всех вариантов и проектов (charts.render_charts).
+
+    Returns:
+        dict: {(вариант, проект): путь к PNG}.
+    """
+    from charts import render_charts
+
+    be = data["break_even_inputs"]
+    jobs, keys = [], []
+    for i, v in enumerate(data["variants"]):
+        for j, p in enumerate(PROJECTS):
+            jobs.append({"name": f"break_even_v{v}_p{p}", "kind": "break_even",
+                         "data": {k: float(be[k][i, j]) for k in ("CF", "cv_total", "price", "Q_max")}})
+            keys.append((v, p))
+    result = render_charts(jobs, output_dir, formats=("png",), dpi=110, workers=workers)
+    return dict(zip(keys, result["files"]))
+
+
+# --- Разделы отчета ---
+
+def _section_costs(w, data, i):
+    x, base, out = data["inputs"], data["base"], data["projects"]
+    w.heading("Калькуляция себестоимости изделия А", 1)
+    w.paragraph("Себестоимость единицы изделия рассчитана по статьям калькуляции для действующего "
+                "производства и двух проектов развития с учетом снижения норм расхода (Дополнение П).")
+    w.table(
+        ([name, _fmt(base[key][i])] + [_fmt(out[key][i, j]) for j in range(len(PROJECTS))]
+         for key, name in COST_ITEMS),
+        ["Статья калькуляции", "Действующее производство"] + [f"Проект {p}" for p in PROJECTS],
+        "Калькуляция себестоимости единицы изделия А, руб.",
+        widths=[6.9, 3.2, 3.2, 3.2],
+    )
+    for j, p in enumerate(PROJECTS):
+        w.heading(f"Расчет по проекту {p}", 2)
+        t, rate = x["labor_intensity"][i, j], x["hourly_rate"][i, j]
+        beta = x["fuel_energy_percent"][i, j]
+        w.formula(f"Вом = {_fmt(out['material_costs'][i, j])} руб.; Впф = {_fmt(out['semi_components'][i, j])} руб.")
+        w.formula(f"Впер = (Вом + Впф) · β / (100 − β) = ({_fmt(out['material_costs'][i, j])} + "
+                  f"{_fmt(out['semi_components'][i, j])}) · {_fmt(beta, 1)} / (100 − {_fmt(beta, 1)}) = "
+                  f"{_fmt(out['fuel_energy'][i, j])} руб.")
+        w.formula(f"Зосн = t · Тч = {_fmt(t)} · {_fmt(rate)} = {_fmt(out['basic_salary'][i, j])} руб.")
+        w.formula(f"Здоп = Зосн · {_fmt(x['additional_salary_percent'][i, j], 0)} / 100 = "
+                  f"{_fmt(out['additional_salary'][i, j])} руб.")
+        w.formula(f"Осоц = (Зосн + Здоп) · {_fmt(x['social_insurance_percent'][i, j], 0)} / 100 = "
+                  f"{_fmt(out['social_insurance'][i, j])} руб.")
+        w.formula(f"Сп = Спр + Рвн = {_fmt(out['production_cost'][i, j])} + {_fmt(out['non_production'][i, j])} = "
+                  f"{_fmt(out['full_cost'][i, j])} руб.")
+        w.formula(f"Ц = Сп · (1 + R / 100) = {_fmt(out['full_cost'][i, j])} · (1 + "
+                  f"{_fmt(x['profitability_percent'][i, j], 0)} / 100) = {_fmt(out['wholesale_price'][i, j])} руб.")
+        w.formula(f"С = Сп · Q / 1000 = {_fmt(out['full_cost'][i, j])} · {_fmt(x['annual_volume'][i, j], 0)} / 1000 = "
+                  f"{_fmt(out['annual_full_cost'][i, j])} тыс. руб.")
+
+
+def _section_fixed_assets(w, data, i):
+    fa = data["fixed_assets"]
+    row = fa["dop_L"].iloc[i]
+    w.heading("Основные производственные фонды", 1)
+    w.table([
+        ["Стоимость рабочих машин и оборудования на начало года, тыс. руб.", _fmt(row["stoimost_rmo_nachalo"])],
+        ["Группа вводимых основных фондов", fa["gruppa_vvod"][i]],
+        ["Группа выбывающих основных фондов", fa["gruppa_vyvod"][i]],
+        ["Ввод, % к стоимости группы", _fmt(row["procent_vvoda"], 1)],
+        ["Выбытие, % к стоимости группы", _fmt(row["procent_vyvoda"], 1)],
+        ["Месяц ввода", int(row["mes_vvoda"])],
+        ["Месяц выбытия", int(row["mes_vyvoda"])],
+    ], ["Показатель", "Значение"], "Исходные данные (Дополнение Л)", widths=[12.5, 4.0])
+    w.paragraph("Стоимость групп основных фондов на начало года определяется по структуре "
+                "Дополнения М относительно рабочих машин и оборудования:")
+    w.formula(f"Фi = Фрм · αi / αрм, αрм = {_fmt(UDELNYE_VESY[BASE_GROUP], 1)} %")
+    w.table(([g, _fmt(ves, 1), _fmt(fa["groups"][g][i], 3)] for g, ves in UDELNYE_VESY.items()),
+            ["Группа основных фондов", "Удельный вес, %", "Стоимость на начало года, тыс. руб."],
+            "Структура и стоимость основных фондов", widths=[8.5, 3.5, 4.5])
+    w.formula(f"Фн = ΣФi = {_fmt(fa['F_n'][i], 3)} тыс. руб.")
+    w.formula(f"Фвв = Ф({fa['gruppa_vvod'][i]}) · {_fmt(row['procent_vvoda'], 1)} / 100 = {_fmt(fa['F_vv'][i], 3)} тыс. руб.")
+    w.formula(f"Фвыв = Ф({fa['gruppa_vyvod'][i]}) · {_fmt(row['procent_vyvoda'], 1)} / 100 = "
+              f"{_fmt(fa['F_vyv'][i], 3)} тыс. руб.")
+    w.formula(f"Фср.г = Фн + Фвв · (12 − {int(row['mes_vvoda'])}) / 12 − Фвыв · (12 − {int(row['mes_vyvoda'])}) / 12 = "
+              f"{_fmt(fa['F_sr_g'][i], 3)} тыс. руб.")
+
+
+def _section_labor(w, data, variant):
+    routing, plan = data["routing"], data["plan"]
+    w.heading("Трудоемкость программы и численность основных рабочих", 1)
+    if not plan.any():
+        w.paragraph("Программа выпуска задания 1 не найдена (task1/individual_product_volumes.json).")
+        return
+    load = routing.load(plan, variant)[0]
+    cap = capacity_plan(load)
+    try:
+        cost = routing.labor_cost(plan, variant)[0]
+    except ValueError:
+        cost = np.full(len(routing.operations), np.nan)
+    w.paragraph("Программа выпуска: " + ", ".join(f"изделие {p} – {q:.0f} шт." for p, q in zip(routing.products, plan))
+                + f". Годовой фонд времени рабочего Fч = {FCH} ч, коэффициент выполнения норм Квн = {KVN}.")
+    w.formula("Ч = Σ tij · Qj / (Fч · Квн)")
+    w.table(([op, _fmt(load[k], 0), _fmt(cap["workers_exact"][k]), cap["workers_needed"][k], _fmt(cost[k])]
+             for k, op in enumerate(routing.operations)),
+            ["Вид работ", "Нормо-ч", "Расчетная численность", "Принято, чел.", "Основная зарплата, руб."],
+            "Численность основных рабочих по видам работ", widths=[5.0, 2.6, 3.0, 2.4, 3.5])
+    w.paragraph(f"Итого основных рабочих: {cap['workers_total']} чел.")
+
+
+def _section_projects(w, data, i, variant):
+    grid = data["grid"].loc[[variant]]
+    w.heading("Капитальные вложения и выбор проекта", 1)
+    w.paragraph("Капитальные вложения включают норматив оборотных средств проекта; объемы выпуска проектов "
+                "различаются, поэтому проект выбирается по минимуму приведенных затрат на единицу продукции "
+                f"при Ен = {EN}.")
+    w.formula("К = Кпир + Косн + Косв + Кл% / 100 · Ф + ОС")
+    w.formula("Зпр = С + Ен · К;  зпр = Зпр / Q · 1000;  Э = (Сб − Сj) · Qj / 1000 − Ен · Кj;  "
+              "Ток = Кj / ((Сб − Сj) · Qj / 1000)")
+    w.table(([int(r["Проект"]), _fmt(r["Сj, руб"]), _fmt(r["К, тыс. руб"]), _fmt(r["Зпр, тыс. руб"]),
+              _fmt(r["зпр, руб/шт"]), _fmt(r["Э, тыс. руб"]), _fmt(r["Ток, лет"])]
+             for _, r in grid.iterrows()),
+            ["Проект", "Сj, руб.", "К, тыс. руб.", "Зпр, тыс. руб.", "зпр, руб./шт.", "Э, тыс. руб.", "Ток, лет"],
+            "Приведенные затраты, эффект и срок окупаемости", widths=[1.7, 2.6, 2.4, 2.6, 2.4, 2.4, 2.4])
+    for _, r in grid.iterrows():
+        w.formula(f"зпр{int(r['Проект'])} = ({_fmt(r['С, тыс. руб'])} + {EN} · {_fmt(r['К, тыс. руб'])}) / "
+                  f"{_fmt(r['Q, шт'], 0)} · 1000 = {_fmt(r['зпр, руб/шт'])} руб./шт.")
+    best = grid[grid["Лучший"]].iloc[0]
+    w.paragraph(f"Выбран проект {int(best['Проект'])}: приведенные затраты на единицу продукции "
+                f"{_fmt(best['зпр, руб/шт'])} руб. минимальны, годовой экономический эффект "
+                f"{_fmt(best['Э, тыс. руб'])} тыс. руб., срок окупаемости {_fmt(best['Ток, лет'])} лет.")
+
+
+def _section_break_even(w, data, i, variant, figures):
+    be, x = data["break_even"], data["break_even_inputs"]
+    w.heading("Анализ безубыточности", 1)
+    w.paragraph("К постоянным расходам отнесены расходы на содержание оборудования, общепроизводственные, "
+                "общехозяйственные и внепроизводственные расходы, остальные статьи – переменные.")
+    w.formula("Qбу = CF / (Ц − Сv)")
+    w.table(([p, _fmt(x["CF"][i, j]), _fmt(be["cv_unit"][i, j], 3), _fmt(x["price"][i, j], 3),
+              _fmt(x["Q_max"][i, j], 0), _fmt(be["Q_be"][i, j], 0), _fmt(be["safety_margin_pct"][i, j], 1)]
+             for j, p in enumerate(PROJECTS)),
+            ["Проект", "CF, тыс. руб.", "Сv, тыс. руб./шт.", "Ц, тыс. руб.", "Qmax, шт.", "Qбу, шт.", "Запас, %"],
+            "Точка безубыточности по проектам", widths=[1.7, 2.6, 2.6, 2.4, 2.4, 2.4, 2.4])
+    for j, p in enumerate(PROJECTS):
+        w.formula(f"Qбу{p} = {_fmt(x['CF'][i, j])} / ({_fmt(x['price'][i, j], 3)} − {_fmt(be['cv_unit'][i, j], 3)}) = "
+                  f"{_fmt(be['Q_be'][i, j], 0)} шт.")
+        path = figures.get((variant, p))
+        if path:
+            w.image(path, width_cm=15, caption=f"График безубыточности, проект {p}")
+
+
+def _run_script(script):
+    """Вывод скрипта задания (запуск в его каталоге; корень проекта скрипт добавляет сам через _bootstrap)."""
+    env = dict(os.environ, MPLBACKEND="Agg")
+    result = subprocess.run([sys.executable, os.path.basename(script)], cwd=os.path.dirname(os.path.abspath(script)),
+                            env=env, capture_output=True, text=True, encoding="utf-8", errors="replace")
+    if result.returncode != 0:
+        raise ValueError(f"Скрипт {script} завершился с ошибкой:\n{result.stderr.strip()}")
+    return result.stdout
+
+
+def write_report(path, data, variant, figures=None, template=None, csv_files=(), script_outputs=None):
+    """
+    Отчет по одному варианту.
+
+    Args:
+        path (str): Файл .docx.
+        data (dict): Результат prepare().
+        variant (int): Вариант.
+        figures (dict, optional): {(вариант, проект): PNG} из render_break_even_charts.
+        template (str, optional): Шаблон .docx.
+        csv_files (list): Таблицы CSV для приложения.
+        script_outputs (dict, optional): {скрипт: напечатанный текст} для приложения.
+
+    Returns:
+        str: Путь к файлу.
+    """
+    i = data["variants"].index(variant)
+    with ReportWriter(path, template) as w:
+        w.paragraph("КУРСОВАЯ РАБОТА", bold=True, align="center")
+        w.paragraph(f"Экономическое обоснование проекта развития предприятия. Вариант {variant}", align="center")
+        _section_costs(w, data, i)
+        _section_fixed_assets(w, data, i)
+        _section_labor(w, data, variant)
+        _section_projects(w, data, i, variant)
+        _section_break_even(w, data, i, variant, figures or {})
+        if csv_files or script_outputs:
+            w.page_break()
+            w.heading("Приложения", 1, numbered=False)
+            for csv_file in csv_files:
+                w.csv(csv_file)
+            for script, text in (script_outputs or {}).items():
+                w.heading(f"Расчеты {os.path.relpath(script, ROOT)}", 2, numbered=False)
+                w.text_block(text)
+    return path
+
+
+def parse_variants(spec):
+    """'1-5,8' -> [1, 2, 3, 4, 5, 8]."""
+    variants = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = (int(s) for s in part.split("-", 1))
+            variants.extend(range(lo, hi + 1))
+        else:
+            variants.append(int(part))
+    if not variants:
+        raise ValueError(f"Не задано ни одного варианта: {spec!r}")
+    return list(dict.fromkeys(variants))
+
+
+def build_reports(variants=None, output_dir="reports", template=None, charts=True, csv_files=(), scripts=(),
+                  workers=None):
+    """
+    Отчеты по вариантам: расчеты и графики один раз, затем по документу на вариант.
+
+    Returns:
+        list: Пути к файлам .docx.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    data = prepare(variants)
+    figures = render_break_even_charts(data, os.path.join(output_dir, "charts"), workers) if charts else {}
+    script_outputs = {s: _run_script(s) for s in scripts}
+    return [write_report(os.path.join(output_dir, f"Отчет_вариант_{v}.docx"), data, v, figures, template,
+                         csv_files, script_outputs)
+            for v in data["variants"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сборка отчетов курсовой работы (DOCX) по вариантам")
+    parser.add_argument("--variants", default="1-10", help="Варианты, например 1-10 или 2,5,7 (по умолчанию: 1-10)")
+    parser.add_argument("--output-dir", default="reports", help="Каталог отчетов (по умолчанию: reports)")
+    parser.add_argument("--template", help="Свой шаблон .docx (стили, титульный лист)")
+    parser.add_argument("--no-charts", action="store_true", help="Не строить графики безубыточности")
+    parser.add_argument("--csv", action="append", default=[], help="Таблица CSV в приложение (можно несколько)")
+    parser.add_argument("--script", action="append", default=[],
+                        help="Скрипт задания, вывод которого включается в приложение (можно несколько)")
+    parser.add_argument("--workers", type=int, help="Число процессов для графиков")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        paths = build_reports(parse_variants(args.variants), args.output_dir, args.template, not args.no_charts,
+                              args.csv, args.script, args.workers)
+    except ValueError as e:
+        print(f"Ошибка: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    for path in paths:
+        print(f"Отчет сохранен: {path}")
+    print(f"Отчетов: {len(paths)}, время: {elapsed:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Декларативное описание таблиц курсовой работы и выгрузка в CSV, JSON и DOCX.
+
+Таблица описывается один раз: столбцы, иерархия строк (разделы, подразделы,
+строки «- расходы» / «- отходы»), единицы измерения, условные обозначения,
+номера дополнений и привязка значений к исходным данным. Номера строк
+(1, 1.1, 2, ...) расставляются автоматически по иерархии.
+
+Из описания и данных строится модель таблицы в памяти (build), а emit за один
+проход по строкам пишет ее во все нужные форматы - без записи CSV и повторного
+чтения его для JSON и DOCX (create_docx_from_csv).
+
+Пример:
+    from table_schema import Column, Row, TableSchema
+
+    TABLE = TableSchema("Исходные данные", [
+        Column("№", field="number"),
+        Column("Показатели", field="label"),
+        Column("Един. измерения", field="unit"),
+        Column("Проект 1", value=lambda bind, ctx: bind(ctx[0]), fmt="{:.3f}"),
+    ], [
+        Row("Годовой объем товарной продукции", unit="тыс.руб", bind=lambda p: p.Q_t),
+    ], number="2.5")
+    TABLE.emit(projects, csv_path="table.csv", json_path="table.json", docx_path="table.docx")
+"""
+
+import csv
+import io
+import json
+import math
+import os
+
+import instrumentation as instr
+
+# Ключи записей JSON для строк, вложенных в разделы (раздел -> подраздел -> строка)
+JSON_SUBGROUP_KEY = "Подкатегория"
+JSON_LEAF_KEY = "Тип"
+
+STRUCTURAL_FIELDS = ("number", "label", "unit", "symbol", "source")
+
+
+class Row:
+    """
+    Строка таблицы (или раздел со вложенными строками).
+
+    Args:
+        label (str): Наименование показателя.
+        unit (str): Единица измерения.
+        symbol (str): Условное обозначение.
+        source (str): Номер дополнения (источник данных).
+        bind: Привязка значения; передается в Column.value вместе с контекстом.
+              None - строка без значений (заголовок раздела).
+        fmt: Формат значений строки: строка '{:.3f}', функция или словарь
+             {заголовок столбца: формат}; перекрывает формат столбца.
+        children (list): Вложенные строки.
+        numbered (bool): Участвует ли строка в автоматической нумерации.
+        number (str, optional): Явный номер вместо автоматического.
+    """
+
+    def __init__(self, label, unit="", symbol="", source="", bind=None, fmt=None, children=(), numbered=True,
+                 number=None):
+        self.label = label
+        self.unit = unit
+        self.symbol = symbol
+        self.source = source
+        self.bind = bind
+        self.fmt = fmt
+        self.children = list(children)
+        self.numbered = numbered
+        self.number = number
+
+
+def item(label, **kwargs):
+    """Ненумерованная вложенная строка (например, '- расходы')."""
+    return Row(label, numbered=False, **kwargs)
+
+
+class Column:
+    """
+    Столбец таблицы.
+
+    Args:
+        title (str): Заголовок (и ключ записи JSON, если не задан json_key).
+        field (str, optional): Структурное поле строки: 'number', 'label', 'unit', 'symbol', 'source'.
+        value (callable, optional): value(bind, context) -> значение ячейки для строк с привязкой.
+        fmt: Формат значений ('{:.2f}', функция или None - str(значение)).
+        json_key (str, optional): Ключ в записи JSON (None - title).
+        label_format (str, optional): Для field='label': шаблон с номером, например '{number}. {label}'.
+    """
+
+    def __init__(self, title, field=None, value=None, fmt=None, json_key=None, label_format=None):
+        if (field is None) == (value is None):
+            raise ValueError(f"Столбец '{title}': нужно задать либо field, либо value.")
+        if field is not None and field not in STRUCTURAL_FIELDS:
+            raise ValueError(f"Столбец '{title}': неизвестное поле {field!r}.")
+        self.title = title
+        self.field = field
+        self.value = value
+        self.fmt = fmt
+        self.json_key = json_key or title
+        self.label_format = label_format
+
+
+class RenderedRow:
+    """Строка модели таблицы: уровень, номер, ячейки (текст), значения и запись JSON."""
+
+    __slots__ = ("level", "number", "cells", "values", "record")
+
+    def __init__(self, level, number, cells, values, record):
+        self.level = level
+        self.number = number
+        self.cells = cells
+        self.values = values
+        self.record = record
+
+
+class TableModel:
+    """Таблица в памяти: строки заголовка и строки данных."""
+
+    def __init__(self, title, header_rows, rows):
+        self.title = title
+        self.header_rows = header_rows
+        self.rows = rows
+
+    def records(self):
+        return [r.record for r in self.rows if r.record is not None]
+
+
+def _format(value, fmt):
+    if value is None:
+        return ""
+    if isinstance(value, float) and not math.isfinite(value):
+        return ""
+    if fmt is None:
+        return str(value)
+    if callable(fmt):
+        return fmt(value)
+    return fmt.format(value)
+
+
+def _json_value(value, digits):
+    if value is None or isinstance(value, str) and value == "":
+        return None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) or hasattr(value, "dtype"):
+        if not math.isfinite(value):
+            return None
+        if digits is not None:
+            value = round(value, digits)  # для чисел NumPy round() округляет средствами NumPy
+        if hasattr(value, "item"):
+            value = value.item()
+    return value
+
+
+def _clean_label(label):
+    return label.strip().lstrip("-").strip().rstrip(":").strip()
+
+
+class TableSchema:
+    """
+    Описание таблицы.
+
+    Args:
+        title (str): Название таблицы (подпись в DOCX).
+        number (str, optional): Номер таблицы по методичке ('2.5') для подписи в DOCX.
+        columns (list): Столбцы Column.
+        rows (list): Строки Row (с вложенными).
+        header_rows (list или callable, optional): Строки заголовка (по умолчанию - заголовки
+                                      столбцов); для двухуровневой шапки - список списков;
+                                      функция header_rows(context) - шапка, зависящая от данных.
+        json_values (str): 'text' - значения в JSON как в CSV (строки),
+                           'number' - числа (с округлением до json_digits).
+        json_digits (int, optional): Знаков после запятой для json_values='number'.
+    """
+
+    def __init__(self, title, columns, rows, header_rows=None, json_values="text", json_digits=None, number=None):
+        if json_values not in ("text", "number"):
+            raise ValueError(f"json_values должен быть 'text' или 'number', получено {json_values!r}.")
+        self.title = title
+        self.number = number
+        self.columns = list(columns)
+        self.rows = list(rows)
+        self.header_rows = header_rows or [[c.title for c in self.columns]]
+        self.json_values = json_values
+        self.json_digits = json_digits
+
+    # --- модель ---
+
+    def _walk(self, rows, prefix=(), level=0, parents=()):
+        """Обход иерархии: (строка, номер, уровень, родители)."""
+        counter = 0
+        for row in rows:
+            if row.number is not None:
+                number = row.number
+            elif row.numbered:
+                counter += 1
+                number = ".".join(str(n) for n in (*prefix, counter))
+            else:
+                number = ""
+            yield row, number, level, parents
+            if row.children:
+                child_prefix = (*prefix, counter) if row.numbered and row.number is None else prefix
+                yield from self._walk(row.children, child_prefix, level + 1, (*parents, (row, number)))
+
+    def _row_format(self, row, column):
+        fmt = row.fmt
+        if isinstance(fmt, dict):
+            return fmt.get(column.title, column.fmt)
+        return column.fmt if fmt is None else fmt
+
+    def build(self, context):
+        """
+        Модель таблицы для исходных данных context.
+
+        Returns:
+            TableModel: Строки с отформатированными ячейками и записями JSON.
+        """
+        rendered = []
+        for row, number, level, parents in self._walk(self.rows):
+            cells, values = [], []
+            for column in self.columns:
+                if column.field == "number":
+                    value = number
+                elif column.field == "label":
+                    value = (column.label_format.format(number=number, label=row.label)
+                             if column.label_format and number else row.label)
+                elif column.field is not None:
+                    value = getattr(row, column.field)
+                else:
+                    value = None if row.bind is None else column.value(row.bind, context)
+                values.append(value)
+                cells.append(value if column.field else _format(value, self._row_format(row, column)))
+            rendered.append(RenderedRow(level, number, cells, values,
+                                        self._record(row, number, parents, cells, values)))
+        header_rows = self.header_rows(context) if callable(self.header_rows) else self.header_rows
+        return TableModel(self.title, [list(h) for h in header_rows], rendered)
+
+    def _record(self, row, number, parents, cells, values):
+        """Запись JSON для строки со значениями (разделы без значений не выгружаются)."""
+        if row.bind is None:
+            return None
+        record = {}
+        for column, cell, value in zip(self.columns, cells, values):
+            if column.field == "number":
+                record[column.json_key] = number or next((n for _, n in reversed(parents) if n), "")
+            elif column.field == "label":
+                if parents and not number:
+                    # Вложенная строка без номера: раздел, подразделы и сама строка
+                    record[column.json_key] = _clean_label(parents[0][0].label)
+                    if len(parents) > 1:
+                        record[JSON_SUBGROUP_KEY] = " / ".join(_clean_label(p.label) for p, _ in parents[1:])
+                    record[JSON_LEAF_KEY] = _clean_label(row.label)
+                else:
+                    record[column.json_key] = cell
+            elif column.field is not None:
+                record[column.json_key] = cell or None
+            elif self.json_values == "number":
+                record[column.json_key] = _json_value(value, self.json_digits)
+            else:
+                record[column.json_key] = cell or None
+        return record
+
+    # --- выгрузка ---
+
+    def emit(self, context, csv_path=None, json_path=None, docx_path=None, csv_encoding="utf-8-sig",
+             docx_template=None):
+        """
+        Выгрузка таблицы в несколько форматов за один проход по строкам модели.
+
+        Args:
+            context: Исходные данные для привязок значений.
+            csv_path (str, optional): Файл CSV (разделитель ';').
+            json_path (str, optional): Файл JSON (список записей по строкам со значениями).
+            docx_path (str, optional): Файл DOCX с таблицей (report.ReportWriter).
+            csv_encoding (str): Кодировка CSV.
+            docx_template (str, optional): Шаблон .docx.
+
+        Returns:
+            TableModel: Построенная модель таблицы.
+        """
+        model = self.build(context)
+        csv_file = open(csv_path, "w", encoding=csv_encoding, newline="") if csv_path else None
+        try:
+            writer = _csv_writer(csv_file) if csv_file else None
+            if writer:
+                writer.writerows(model.header_rows)
+            records = [] if json_path else None
+
+            def rows():
+                for r in model.rows:
+                    if writer:
+                        writer.writerow(r.cells)
+                    if records is not None and r.record is not None:
+                        records.append(r.record)
+                    yield r.cells
+
+            if docx_path:
+                from report import ReportWriter
+
+                with ReportWriter(docx_path, docx_template) as w:
+                    header = model.header_rows[-1] if len(model.header_rows) == 1 else [
+                        " ".join(dict.fromkeys(str(h[i]).strip() for h in model.header_rows if str(h[i]).strip()))
+                        for i in range(len(self.columns))]
+                    w.table(rows(), header, model.title, number=self.number)
+            else:
+                for _ in rows():
+                    pass
+        finally:
+            if csv_file:
+                csv_file.close()
+
+        if json_path:
+            _write_json(json_path, records)
+        if instr.is_enabled():
+            instr.count("rows_written", len(model.rows) + len(model.header_rows))
+            for path in (csv_path, json_path, docx_path):
+                if path:
+                    instr.count("bytes_written", os.path.getsize(path))
+        return model
+
+    def to_csv_string(self, context):
+        """CSV таблицы строкой (для функций, возвращающих содержимое CSV)."""
+        model = self.build(context)
+        output = io.StringIO()
+        writer = _csv_writer(output)
+        writer.writerows(model.header_rows)
+        writer.writerows(r.cells for r in model.rows)
+        return output.getvalue()
+
+    def records(self, context):
+        """Записи JSON без записи в файл."""
+        return self.build(context).records()
+
+
+def _csv_writer(f):
+    return csv.writer(f, delimiter=";", quoting=csv.QUOTE_MINIMAL)
+
+
+def _write_json(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=4, ensure_ascii=False)
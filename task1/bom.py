@@ -0,0 +1,276 @@
+"""
+Многоуровневая спецификация (bill of materials) изделий на разреженных матрицах.
+
+Изделия, сборочные единицы, покупные полуфабрикаты и материалы - узлы одной
+спецификации. Связь "родитель -> составная часть" задается нормой расхода
+на единицу родителя (брутто) и долей возвратных отходов. Полная потребность
+всех изделий во всех позициях получается разреженными матричными
+произведениями по уровням спецификации, а затраты на материалы - одним
+умножением на вектор цен:
+
+    Сi = Σ (Нmi * Цmi * Ктр - Н0i * Ц0i) + Σ фиксированные стоимости,
+
+что совпадает с calculate_total_material_costs для одноуровневой спецификации.
+
+Строковые ключи (наименования, ключи цен) разбираются только один раз при
+построении спецификации; расчеты идут по целочисленным индексам.
+"""
+
+import numpy as np
+from scipy import sparse
+
+# Позиции с ценой за единицу (т, шт.) и позиции, заданные суммой в рублях
+PRICED = "material"
+FIXED = "fixed"
+
+MAIN_MATERIALS = ("стальной прокат", "трубы стальные", "прокат цветных металлов", "другие материалы")
+
+
+class BillOfMaterials:
+    """Многоуровневая спецификация с разреженной матрицей норм расхода"""
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+        self.kind = []         # PRICED / FIXED / None (изделие или сборочная единица)
+        self.group = []        # группа статьи калькуляции (основные материалы, покупные и т.п.)
+        self.price = []        # цена материала, руб/ед.
+        self.waste_price = []  # цена возвратных отходов, руб/ед.
+        self._rows = []
+        self._cols = []
+        self._qty = []
+        self._scrap = []
+        self._built = None
+
+    def add_item(self, name, kind=None, price=0.0, waste_price=0.0, group=None):
+        """
+        Добавляет позицию спецификации.
+
+        Args:
+            name (str): Наименование позиции.
+            kind (str, optional): PRICED - материал/полуфабрикат с ценой за единицу,
+                                  FIXED - позиция, заданная стоимостью в рублях
+                                  (норма расхода = стоимость, цена = 1 руб.),
+                                  None - изделие или сборочная единица.
+            price (float): Цена материала, руб/ед.
+            waste_price (float): Цена возвратных отходов, руб/ед.
+            group (str, optional): Группа для разбивки затрат (например, 'основные материалы').
+
+        Returns:
+            int: Индекс позиции.
+        """
+        if name in self.index:
+            raise ValueError(f"Позиция '{name}' уже есть в спецификации.")
+        if kind == FIXED:
+            price, waste_price = 1.0, 0.0
+        self.index[name] = len(self.names)
+        self.names.append(name)
+        self.kind.append(kind)
+        self.group.append(group)
+        self.price.append(float(price))
+        self.waste_price.append(float(waste_price))
+        self._built = None
+        return self.index[name]
+
+    def add_component(self, parent, child, quantity, scrap=0.0):
+        """
+        Добавляет составную часть в состав родительской позиции.
+
+        Args:
+            parent (str): Изделие или сборочная единица.
+            child (str): Составная часть (материал, полуфабрикат, сборочная единица).
+            quantity (float): Норма расхода (брутто) на единицу родителя.
+            scrap (float): Доля возвратных отходов в норме расхода (Н0 = Нm * scrap).
+        """
+        self._rows.append(self.index[parent])
+        self._cols.append(self.index[child])
+        self._qty.append(float(quantity))
+        self._scrap.append(float(scrap))
+        self._built = None
+
+    def _build(self):
+        """Разреженные матрицы норм расхода A и норм отходов W (n x n, CSR)."""
+        if self._built is None:
+            n = len(self.names)
+            qty = np.asarray(self._qty, dtype=float)
+            A = sparse.csr_matrix((qty, (self._rows, self._cols)), shape=(n, n))
+            W = sparse.csr_matrix((qty * np.asarray(self._scrap, dtype=float), (self._rows, self._cols)),
+                                  shape=(n, n))
+            self._built = (A, W)
+        return self._built
+
+    def explode(self, products):
+        """
+        Разузлование спецификации: полная потребность в каждой позиции
+        на единицу каждого изделия (по всем уровням).
+
+        Полная потребность X = D (A + A^2 + A^3 + ...), где D - строки изделий;
+        отходы считаются по прямому вхождению: X0 = D (I + A + A^2 + ...) W.
+
+        Args:
+            products (list): Наименования изделий.
+
+        Returns:
+            tuple: (X, X_waste) - разреженные матрицы (изделия x позиции)
+                   потребности брутто и возвратных отходов.
+
+        Raises:
+            ValueError: Если спецификация содержит цикл.
+        """
+        A, W = self._build()
+        n = len(self.names)
+        rows = [self.index[p] for p in products]
+        level = sparse.csr_matrix((np.ones(len(rows)), (np.arange(len(rows)), rows)), shape=(len(rows), n))
+
+        # reach = D (I + A + A^2 + ...) - сколько раз каждая позиция входит в изделие
+        reach = level.copy()
+        for _ in range(n + 1):
+            level = level @ A
+            if level.nnz == 0:
+                break
+            reach = reach + level
+        else:
+            raise ValueError("Спецификация содержит цикл.")
+
+        return reach @ A, reach @ W
+
+    def material_costs(self, products, Ktr=1.0, by_group=False):
+        """
+        Затраты на материалы, полуфабрикаты и комплектующие на единицу изделий.
+
+        Args:
+            products (list): Наименования изделий.
+            Ktr (float): Коэффициент транспортно-заготовительных расходов
+                         (применяется к позициям PRICED).
+            by_group (bool): Вернуть также разбивку по группам позиций.
+
+        Returns:
+            np.ndarray или tuple: Затраты по изделиям, руб.; при by_group=True -
+                                  (затраты, {группа: массив затрат по изделиям}).
+        """
+        X, X_waste = self.explode(products)
+        kind = np.array(self.kind, dtype=object)
+        ktr = np.where(kind == PRICED, Ktr, 1.0)
+        gross_price = np.asarray(self.price) * ktr
+        waste_price = np.asarray(self.waste_price)
+
+        # Стоимость по позициям: (изделия x позиции), затем суммы
+        item_costs = X.multiply(gross_price).tocsr() - X_waste.multiply(waste_price).tocsr()
+        total = np.asarray(item_costs.sum(axis=1)).ravel()
+        if not by_group:
+            return total
+
+        groups = {}
+        group_arr = np.array(self.group, dtype=object)
+        for g in dict.fromkeys(g for g in self.group if g is not None):
+            mask = sparse.diags((group_arr == g).astype(float))
+            groups[g] = np.asarray((item_costs @ mask).sum(axis=1)).ravel()
+        return total, groups
+
+    def requirements(self, products, volumes):
+        """
+        Потребность в позициях на годовой выпуск.
+
+        Args:
+            products (list): Наименования изделий.
+            volumes (array_like): Годовые объемы выпуска изделий, шт.
+
+        Returns:
+            np.ndarray: Потребность брутто по всем позициям (в порядке self.names).
+        """
+        X, _ = self.explode(products)
+        return X.T @ np.asarray(volumes, dtype=float)
+
+
+def from_components(components_data, prices, products=("A", "B"), main_materials=MAIN_MATERIALS):
+    """
+    Строит одноуровневую спецификацию из словарей задания 1
+    (materials_main / materials_purchased, см. calculate_total_material_costs).
+
+    Args:
+        components_data (dict): {наименование: {'type': 'material'/'fixed', 'A': ..., 'B': ...}}.
+        prices (dict): Цены материалов и отходов ('<наименование>_материал', '<наименование>_отходы').
+        products (tuple): Изделия.
+        main_materials (tuple): Позиции статьи "Основные материалы" (остальные -
+                                "Покупные полуфабрикаты и комплектующие").
+
+    Returns:
+        BillOfMaterials: Спецификация.
+    """
+    bom = BillOfMaterials()
+    for product in products:
+        bom.add_item(product)
+
+    for name, info in components_data.items():
+        group = "Сом" if name in main_materials else "Спф_Ском"
+        if info.get("type", "fixed") == "material":
+            price_mat = prices.get(f"{name}_материал")
+            price_otxod = prices.get(f"{name}_отходы")
+            if price_mat is None or price_otxod is None:
+                print(f"Предупреждение: Цены для '{name}' не найдены в 'prices'.")
+                continue
+            bom.add_item(name, PRICED, price_mat, price_otxod, group=group)
+            for product in products:
+                norms = info.get(product)
+                if norms is None or not norms['rasxod']:
+                    continue
+                bom.add_component(product, name, norms['rasxod'], norms['otxod'] / norms['rasxod'])
+        else:
+            bom.add_item(name, FIXED, group=group)
+            for product in products:
+                value = info.get(product)
+                if value is None:
+                    print(f"Предупреждение: Фиксированная стоимость для '{name}' и изделия '{product}' не найдена.")
+                    continue
+                bom.add_component(product, name, value)
+    return bom
+
+
+def main():
+    # --- Пример: данные варианта 3 (как в task1/test.py) ---
+    materials_main = {
+        "стальной прокат": {"type": "material", "A": {"rasxod": 0.45, "otxod": 0.0675},
+                            "B": {"rasxod": 0.05, "otxod": 0.005}},
+        "трубы стальные": {"type": "material", "A": {"rasxod": 0.04, "otxod": 0.0028},
+                           "B": {"rasxod": 0.005, "otxod": 0.0003}},
+        "прокат цветных металлов": {"type": "fixed", "A": 2900, "B": 3000},
+        "другие материалы": {"type": "fixed", "A": 1800, "B": 1700},
+    }
+    materials_purchased = {
+        "отливки черных металлов": {"type": "material", "A": {"rasxod": 4.5, "otxod": 0.675},
+                                    "B": {"rasxod": 2.2, "otxod": 0.484}},
+        "отливки цветных металлов": {"type": "material", "A": {"rasxod": 0.3, "otxod": 0.075},
+                                     "B": {"rasxod": 0.25, "otxod": 0.05}},
+        "покупные комплектующие изделия": {"type": "fixed", "A": 142800, "B": 75800},
+    }
+    prices = {
+        "стальной прокат_материал": 12800, "стальной прокат_отходы": 7500,
+        "трубы стальные_материал": 18500, "трубы стальные_отходы": 6300,
+        "отливки черных металлов_материал": 10500, "отливки черных металлов_отходы": 7200,
+        "отливки цветных металлов_материал": 22600, "отливки цветных металлов_отходы": 16900,
+    }
+
+    bom = from_components({**materials_main, **materials_purchased}, prices)
+    total, groups = bom.material_costs(["A", "B"], Ktr=1.15, by_group=True)
+    for i, product in enumerate(["А", "Б"]):
+        print(f"Изделие {product}: Сом = {groups['Сом'][i]:.2f} руб., "
+              f"Спф+Ском = {groups['Спф_Ском'][i]:.2f} руб., всего {total[i]:.2f} руб.")
+
+    # Многоуровневая спецификация: сборочная единица "рама" входит в изделие А дважды
+    bom.add_item("рама")
+    bom.add_component("рама", "стальной прокат", 0.12, 0.1)
+    bom.add_component("рама", "трубы стальные", 0.03, 0.05)
+    bom.add_component("A", "рама", 2)
+    total = bom.material_costs(["A", "B"], Ktr=1.15)
+    print(f"С рамой: изделие А {total[0]:.2f} руб., изделие Б {total[1]:.2f} руб.")
+
+    volumes = [206, 63]
+    need = bom.requirements(["A", "B"], volumes)
+    print("Годовая потребность:")
+    for name, q in zip(bom.names, need):
+        if q and bom.kind[bom.index[name]] == PRICED:
+            print(f"  {name}: {q:.3f} т")
+
+
+if __name__ == "__main__":
+    main()
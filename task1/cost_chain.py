@@ -0,0 +1,276 @@
+"""
+Векторизованная цепочка калькуляции себестоимости, прибыли и цены изделия.
+
+Повторяет расчет CostCalculator.calculate_all_costs (pract_part/task_21.py)
+и generate_output_for_item (task1/funcs.py) по статьям калькуляции, но для
+массивов изделий/проектов сразу: каждое исходное данное - массив NumPy
+одинаковой длины (или скаляр). Промежуточные округления до копеек не
+выполняются, поэтому результаты могут отличаться от табличных на доли копейки.
+
+Исходные данные называются как в CostCalculator.cost_calculation_data
+(см. INPUT_FIELDS), дополнительно: Ktr - коэффициент транспортно-заготовительных
+расходов, annual_volume - годовой объем выпуска, шт.
+
+В отличие от generate_output_for_item, полуфабрикаты и комплектующие
+учитываются в производственной себестоимости один раз.
+
+cost_chain_kopecks - тот же расчет в копейках (int64, модуль money) с
+округлением каждой статьи до копейки, как в CostCalculator: итоги
+(себестоимость, цена, годовые суммы) складываются точно.
+"""
+
+
+import numpy as np
+
+import money
+
+# Нормы расхода и отходов (т) и стоимостные нормы (руб) на единицу изделия
+NORM_FIELDS = (
+    "steel_rolling_consumption", "steel_rolling_waste",
+    "steel_pipes_consumption", "steel_pipes_waste",
+    "nonferrous_rolling", "other_materials",
+    "castings_black_consumption", "castings_black_waste",
+    "castings_color_consumption", "castings_color_waste",
+    "purchased_components",
+)
+# Цены материалов, отходов и часовая тарифная ставка
+PRICE_FIELDS = (
+    "price_steel_rolling", "price_steel_pipes", "price_castings_black", "price_castings_color",
+    "price_waste_steel_rolling", "price_waste_steel_pipes",
+    "price_waste_castings_black", "price_waste_castings_color",
+    "Ktr", "hourly_rate",
+)
+LABOR_FIELDS = ("labor_intensity",)
+# Нормативы в процентах
+RATE_FIELDS = (
+    "fuel_energy_percent", "additional_salary_percent", "social_insurance_percent",
+    "equipment_maintenance_percent", "overhead_production_percent", "general_business_percent",
+    "non_production_percent", "profitability_percent",
+)
+VOLUME_FIELDS = ("annual_volume",)
+
+INPUT_FIELDS = NORM_FIELDS + PRICE_FIELDS + LABOR_FIELDS + RATE_FIELDS + VOLUME_FIELDS
+
+# Материалы задания 1 (task1/test.py) -> поля цепочки
+TASK1_MATERIALS = {
+    "стальной прокат": "steel_rolling",
+    "трубы стальные": "steel_pipes",
+    "отливки черных металлов": "castings_black",
+    "отливки цветных металлов": "castings_color",
+}
+TASK1_FIXED = {
+    "прокат цветных металлов": "nonferrous_rolling",
+    "другие материалы": "other_materials",
+}
+
+
+def stack_inputs(records):
+    """
+    Список словарей исходных данных (по изделиям/проектам) -> словарь массивов.
+
+    Raises:
+        ValueError: Если в записи нет одного из полей INPUT_FIELDS.
+    """
+    missing = [f for f in INPUT_FIELDS if any(f not in r for r in records)]
+    if missing:
+        raise ValueError(f"Не заданы исходные данные: {', '.join(missing)}")
+    return {f: np.array([r[f] for r in records], dtype=float) for f in INPUT_FIELDS}
+
+
+def cost_chain(x):
+    """
+    Расчет статей калькуляции для всех изделий сразу.
+
+    Args:
+        x (dict): {поле INPUT_FIELDS: массив или скаляр}. Допускаются комплексные
+                  массивы (используется для производных в factor_analysis).
+
+    Returns:
+        dict: Статьи на единицу (руб.): material_costs, semi_components, fuel_energy,
+              basic_salary, additional_salary, social_insurance, equipment_maintenance,
+              overhead_production, general_business, production_cost, non_production,
+              full_cost, profit, wholesale_price; на годовой выпуск (тыс. руб.):
+              annual_full_cost, annual_profit, commodity_output.
+    """
+    Ktr = x["Ktr"]
+    r = {}
+    # 1. Основные материалы за вычетом возвратных отходов
+    r["material_costs"] = (x["steel_rolling_consumption"] * x["price_steel_rolling"] * Ktr
+                           - x["steel_rolling_waste"] * x["price_waste_steel_rolling"]
+                           + x["steel_pipes_consumption"] * x["price_steel_pipes"] * Ktr
+                           - x["steel_pipes_waste"] * x["price_waste_steel_pipes"]
+                           + x["nonferrous_rolling"] + x["other_materials"])
+    # 2. Покупные полуфабрикаты и комплектующие
+    r["semi_components"] = (x["castings_black_consumption"] * x["price_castings_black"] * Ktr
+                            - x["castings_black_waste"] * x["price_waste_castings_black"]
+                            + x["castings_color_consumption"] * x["price_castings_color"] * Ktr
+                            - x["castings_color_waste"] * x["price_waste_castings_color"]
+                            + x["purchased_components"])
+    # 3. Топливо и энергия: Впер = (Вом + Впф) * β / (100 - β)
+    beta = x["fuel_energy_percent"]
+    r["fuel_energy"] = (r["material_costs"] + r["semi_components"]) * beta / (100 - beta)
+    # 4-9. Заработная плата и накладные расходы
+    basic = x["labor_intensity"] * x["hourly_rate"]
+    r["basic_salary"] = basic
+    r["additional_salary"] = basic * x["additional_salary_percent"] / 100
+    r["social_insurance"] = (basic + r["additional_salary"]) * x["social_insurance_percent"] / 100
+    r["equipment_maintenance"] = basic * x["equipment_maintenance_percent"] / 100
+    r["overhead_production"] = basic * x["overhead_production_percent"] / 100
+    r["general_business"] = basic * x["general_business_percent"] / 100
+    # 10-14. Себестоимость, прибыль, цена
+    r["production_cost"] = (r["material_costs"] + r["semi_components"] + r["fuel_energy"] + basic
+                            + r["additional_salary"] + r["social_insurance"] + r["equipment_maintenance"]
+                            + r["overhead_production"] + r["general_business"])
+    r["non_production"] = r["production_cost"] * x["non_production_percent"] / 100
+    r["full_cost"] = r["production_cost"] + r["non_production"]
+    r["profit"] = r["full_cost"] * x["profitability_percent"] / 100
+    r["wholesale_price"] = r["full_cost"] + r["profit"]
+    # Годовой выпуск, тыс. руб.
+    volume = x["annual_volume"]
+    r["annual_full_cost"] = r["full_cost"] * volume / 1000
+    r["annual_profit"] = r["profit"] * volume / 1000
+    r["commodity_output"] = r["wholesale_price"] * volume / 1000
+    return r
+
+
+def cost_chain_kopecks(x, rounding=money.HALF_UP):
+    """
+    Расчет статей калькуляции в копейках (int64) для всех изделий сразу.
+
+    Каждая статья округляется до копейки по правилу rounding там же, где
+    CostCalculator (pract_part/task_21.py) округляет до 0.01 руб.; следующие
+    статьи считаются от округленных, суммы - точные. Годовые суммы также
+    в копейках (один раз округляется произведение на объем выпуска); перевод
+    в тыс. руб. для таблиц - money.to_thousands с нужным числом знаков.
+
+    Args:
+        x (dict): {поле INPUT_FIELDS: массив или скаляр}.
+        rounding (str): Правило округления (money.HALF_UP, money.HALF_EVEN, ...).
+
+    Returns:
+        dict: Статьи с теми же ключами, что и cost_chain (копейки, int64).
+    """
+    Ktr = x["Ktr"]
+    r = {}
+    # 1-2. Материалы и полуфабрикаты: нормы и цены - float, итог статьи округляется
+    r["material_costs"] = money.to_kopecks(
+        x["steel_rolling_consumption"] * x["price_steel_rolling"] * Ktr
+        - x["steel_rolling_waste"] * x["price_waste_steel_rolling"]
+        + x["steel_pipes_consumption"] * x["price_steel_pipes"] * Ktr
+        - x["steel_pipes_waste"] * x["price_waste_steel_pipes"]
+        + x["nonferrous_rolling"] + x["other_materials"], rounding)
+    r["semi_components"] = money.to_kopecks(
+        x["castings_black_consumption"] * x["price_castings_black"] * Ktr
+        - x["castings_black_waste"] * x["price_waste_castings_black"]
+        + x["castings_color_consumption"] * x["price_castings_color"] * Ktr
+        - x["castings_color_waste"] * x["price_waste_castings_color"]
+        + x["purchased_components"], rounding)
+    # 3. Топливо и энергия: Впер = (Вом + Впф) * β / (100 - β)
+    beta = np.asarray(x["fuel_energy_percent"], dtype=float)
+    r["fuel_energy"] = money.mul_div(r["material_costs"] + r["semi_components"], beta, 100 - beta, rounding)
+    # 4-9. Заработная плата и накладные расходы (проценты от округленной основной зарплаты)
+    basic = money.to_kopecks(x["labor_intensity"] * x["hourly_rate"], rounding)
+    r["basic_salary"] = basic
+    r["additional_salary"] = money.percent_of(basic, x["additional_salary_percent"], rounding)
+    r["social_insurance"] = money.percent_of(basic + r["additional_salary"], x["social_insurance_percent"], rounding)
+    r["equipment_maintenance"] = money.percent_of(basic, x["equipment_maintenance_percent"], rounding)
+    r["overhead_production"] = money.percent_of(basic, x["overhead_production_percent"], rounding)
+    r["general_business"] = money.percent_of(basic, x["general_business_percent"], rounding)
+    # 10-14. Себестоимость, прибыль, цена
+    r["production_cost"] = (r["material_costs"] + r["semi_components"] + r["fuel_energy"] + basic
+                            + r["additional_salary"] + r["social_insurance"] + r["equipment_maintenance"]
+                            + r["overhead_production"] + r["general_business"])
+    r["non_production"] = money.percent_of(r["production_cost"], x["non_production_percent"], rounding)
+    r["full_cost"] = r["production_cost"] + r["non_production"]
+    r["profit"] = money.percent_of(r["full_cost"], x["profitability_percent"], rounding)
+    r["wholesale_price"] = r["full_cost"] + r["profit"]
+    # Годовой выпуск (копейки)
+    volume = x["annual_volume"]
+    r["annual_full_cost"] = money.scale(r["full_cost"], volume, rounding)
+    r["annual_profit"] = money.scale(r["profit"], volume, rounding)
+    r["commodity_output"] = money.scale(r["wholesale_price"], volume, rounding)
+    return r
+
+
+ANNUAL_FIELDS = ("annual_full_cost", "annual_profit", "commodity_output")
+
+
+def from_kopecks(result):
+    """
+    Результат cost_chain_kopecks -> единицы cost_chain: руб. на единицу, тыс. руб. за год.
+
+    Годовые суммы переводятся без округления: округление до нужного числа
+    знаков выполняется при выводе таблицы.
+    """
+    return {key: money.from_kopecks(value) / (1000 if key in ANNUAL_FIELDS else 1)
+            for key, value in result.items()}
+
+
+def inputs_from_calculator(calculator, project_key):
+    """
+    Исходные данные проекта CostCalculator (pract_part/task_21.py).
+
+    Args:
+        calculator: Экземпляр CostCalculator.
+        project_key (str): 'project_1' или 'project_2'.
+
+    Returns:
+        dict: Запись с полями INPUT_FIELDS.
+    """
+    record = dict(calculator.cost_calculation_data[project_key])
+    record["Ktr"] = calculator.Ktr
+    record["annual_volume"] = calculator.projects_data[project_key]["annual_volume_corrected"]
+    return record
+
+
+def inputs_from_task1(item, materials_main, materials_purchased, prices, fuel_energy, labor, rates,
+                      volume, Ktr):
+    """
+    Исходные данные изделия задания 1 (словари в формате task1/test.py).
+
+    Покупные позиции с фиксированной стоимостью суммируются в purchased_components,
+    основные - в other_materials (кроме проката цветных металлов).
+
+    Args:
+        item (str): 'A' или 'B'.
+        volume (float): Годовой объем выпуска (скорректированный), шт.
+
+    Returns:
+        dict: Запись с полями INPUT_FIELDS.
+
+    Raises:
+        ValueError: Если встречается материал с нормами расхода, не известный цепочке.
+    """
+    record = {f: 0.0 for f in NORM_FIELDS}
+    for field in ("steel_rolling", "steel_pipes", "castings_black", "castings_color"):
+        record[f"price_{field}"] = 0.0
+        record[f"price_waste_{field}"] = 0.0
+
+    for group, fixed_field in ((materials_main, "other_materials"), (materials_purchased, "purchased_components")):
+        for name, info in group.items():
+            if info.get("type", "fixed") == "material":
+                field = TASK1_MATERIALS.get(name)
+                if field is None:
+                    raise ValueError(f"Материал '{name}' не сопоставлен полям цепочки калькуляции.")
+                record[f"{field}_consumption"] = float(info[item]["rasxod"])
+                record[f"{field}_waste"] = float(info[item]["otxod"])
+                record[f"price_{field}"] = float(prices[f"{name}_материал"])
+                record[f"price_waste_{field}"] = float(prices[f"{name}_отходы"])
+            else:
+                record[TASK1_FIXED.get(name, fixed_field)] += float(info[item])
+
+    record.update({
+        "Ktr": Ktr,
+        "hourly_rate": labor["hourly_rate"][item],
+        "labor_intensity": labor["labor_hours"][item],
+        "fuel_energy_percent": fuel_energy[item],
+        "additional_salary_percent": rates["доп_зарплата"],
+        "social_insurance_percent": rates["отчисления"],
+        "equipment_maintenance_percent": rates["РСЭО"],
+        "overhead_production_percent": rates["ОПР"],
+        "general_business_percent": rates["ОХР"],
+        "non_production_percent": rates["ВПР"],
+        "profitability_percent": rates["рентабельность"],
+        "annual_volume": volume,
+    })
+    return record
@@ -1,7 +1,5 @@
-import csv
-import io
-import json
-from typing import List, Dict, Any
+import instrumentation as instr
+from table_schema import Column, Row, TableSchema, item as sub_row
 
 
 def calculate_material_costs(norma_rasxoda, norma_otxoda, price_mat, price_otxod, Ktr=1.0):
@@ -49,6 +47,7 @@ def calculate_total_material_costs(components_data, prices, Ktr=1.0, item='A'):
     Returns:
         float: Общие затраты на материалы и полуфабрикаты для одного изделия, руб.
     """
+    instr.count("formulas_evaluated", len(components_data))
     total_cost = 0.0
     for component_name, component_info in components_data.items():
         comp_type = component_info.get("type", "fixed")
@@ -243,6 +242,7 @@ def format_percentage(value):
 
 def calculate_costs_split(data_dict, prices_dict, ktr, item):
     """Вспомогательная функция для разделения расчетов материалов."""
+    instr.count("formulas_evaluated", len(data_dict))
     total_cost = 0.0
     breakdown_parts = []
     for comp_name, comp_info in data_dict.items():
@@ -268,6 +268,7 @@ def calculate_costs_split(data_dict, prices_dict, ktr, item):
     breakdown_str = " + ".join(breakdown_parts)
     return total_cost, breakdown_str
 
+@instr.traced("Расчет себестоимости изделия")
 def generate_output_for_item(item_name, Q_base, Ka, Ktr, data_materials, data_prices, data_fuel_energy, data_labor, data_rates):
     """
     Генерирует форматированный текстовый вывод для одного изделия (А или Б)
@@ -478,89 +479,56 @@ def generate_output_for_item(item_name, Q_base, Ka, Ktr, data_materials, data_pr
 
     return output, structure_data, details
 
+def _structure_percent(bind, ctx):
+    """Удельный вес статьи в полной себестоимости годового выпуска обоих изделий, %."""
+    if bind[1] is None:
+        return None
+    total = (ctx["A"]["Годовой_Сп"] + ctx["B"]["Годовой_Сп"]) / 1000
+    if total <= 0:
+        return 0
+    return calculate_structure_percentage((ctx["A"][bind[1]] + ctx["B"][bind[1]]) / 1000, total)
+
+
+def _annual(product):
+    """Значение статьи на годовой выпуск изделия, тыс.руб. (None для строк без годового значения)."""
+    return lambda bind, ctx: None if bind[1] is None else ctx[product][bind[1]] / 1000
+
+
+# Таблица структуры себестоимости: привязка строки - (ключ на единицу, ключ на годовой выпуск)
+STRUCTURE_TABLE = TableSchema("Структура себестоимости продукции", [
+    Column("Наименование статей расходов", field="label", label_format="{number}. {label}"),
+    Column("Изделие А на единицу, руб", value=lambda b, ctx: ctx["A"][b[0]], fmt="{:.2f}"),
+    Column("Изделие А на годовой выпуск, тыс.руб.", value=_annual("A"), fmt="{:.2f}"),
+    Column("Изделие Б на единицу, руб", value=lambda b, ctx: ctx["B"][b[0]], fmt="{:.2f}"),
+    Column("Изделие Б на годовой выпуск, тыс.руб.", value=_annual("B"), fmt="{:.2f}"),
+    Column("Себестоимость годового выпуска продукции, тыс.руб.",
+           value=lambda b, ctx: None if b[1] is None else (ctx["A"][b[1]] + ctx["B"][b[1]]) / 1000, fmt="{:.2f}"),
+    Column("Структура расходов,%", value=_structure_percent, fmt="{:.2f}%"),
+], [
+    Row("Основные материалы за вычетом возвратных отходов", bind=("Единица_Сом", "Годовой_Сом")),
+    Row("Покупные полуфабрикаты и комплектующие изделия", bind=("Единица_Спф_Ском", "Годовой_Спф_Ском")),
+    Row("Топливо и энергия на технологические потребности", bind=("Единица_Стэ", "Годовой_Стэ")),
+    Row("Основная заработная плата производственных рабочих", bind=("Единица_Сосн", "Годовой_Сосн")),
+    Row("Дополнительная заработная плата производственных рабочих", bind=("Единица_Сдоп", "Годовой_Сдоп")),
+    Row("Отчисление в фонды социальных мероприятий", bind=("Единица_Ссоц", "Годовой_Ссоц")),
+    Row("Расходы по содержанию и эксплуатации оборудования", bind=("Единица_Рсэо", "Годовой_Рсэо")),
+    Row("Общепроизводственные расходы", bind=("Единица_Роп", "Годовой_Роп")),
+    Row("Общехозяйственные расходы", bind=("Единица_Рох", "Годовой_Рох")),
+    sub_row("ВСЕГО производственная себестоимость", bind=("Единица_Спр", "Годовой_Спр")),
+    Row("Внепроизводственные расходы", bind=("Единица_Свп", "Годовой_Свп")),
+    sub_row("ВСЕГО полная (коммерческая) себестоимость", bind=("Единица_Сп", "Годовой_Сп")),
+    Row("Прибыль", bind=("Единица_Прибыль", "Годовой_Прибыль")),
+    Row("Оптовая (отпускная) цена", bind=("Оптовая_цена", None)),  # Для оптовой цены нет годового выпуска
+], json_values="number", json_digits=2)
+
+
+@instr.traced("Таблица структуры себестоимости (CSV)")
 def generate_structure_table_csv(structure_data_A, structure_data_B):
-    """Генерирует итоговую таблицу структуры себестоимости в формате CSV."""
-    output = io.StringIO() # Используем StringIO как "файл в памяти"
-    writer = csv.writer(output, delimiter=';', quoting=csv.QUOTE_MINIMAL)
-
-    # Определяем заголовки
-    headers = [
-        "Наименование статей расходов",
-        "Изделие А на единицу, руб",
-        "Изделие А на годовой выпуск, тыс.руб.",
-        "Изделие Б на единицу, руб",
-        "Изделие Б на годовой выпуск, тыс.руб.",
-        "Себестоимость годового выпуска продукции, тыс.руб.",
-        "Структура расходов,%"
-    ]
-
-    writer.writerow(headers)
-
-    # Общая годовая себестоимость для расчета структуры
-    total_A_annual = structure_data_A["Годовой_Сп"] / 1000 # в тыс.руб
-    total_B_annual = structure_data_B["Годовой_Сп"] / 1000 # в тыс.руб
-    total_combined_annual = total_A_annual + total_B_annual
-
-    # Данные для строк таблицы
-    rows = [
-        ("1. Основные материалы за вычетом возвратных отходов", "Единица_Сом", "Годовой_Сом"),
-        ("2. Покупные полуфабрикаты и комплектующие изделия", "Единица_Спф_Ском", "Годовой_Спф_Ском"),
-        ("3. Топливо и энергия на технологические потребности", "Единица_Стэ", "Годовой_Стэ"),
-        ("4. Основная заработная плата производственных рабочих", "Единица_Сосн", "Годовой_Сосн"),
-        ("5. Дополнительная заработная плата производственных рабочих", "Единица_Сдоп", "Годовой_Сдоп"),
-        ("6. Отчисление в фонды социальных мероприятий", "Единица_Ссоц", "Годовой_Ссоц"),
-        ("7. Расходы по содержанию и эксплуатации оборудования", "Единица_Рсэо", "Годовой_Рсэо"),
-        ("8. Общепроизводственные расходы", "Единица_Роп", "Годовой_Роп"),
-        ("9. Общехозяйственные расходы", "Единица_Рох", "Годовой_Рох"),
-        ("ВСЕГО производственная себестоимость", "Единица_Спр", "Годовой_Спр"),
-        ("10. Внепроизводственные расходы", "Единица_Свп", "Годовой_Свп"),
-        ("ВСЕГО полная (коммерческая) себестоимость", "Единица_Сп", "Годовой_Сп"),
-        ("11. Прибыль", "Единица_Прибыль", "Годовой_Прибыль"), # Добавляем строку "Прибыль"
-        ("12. Оптовая (отпускная) цена", "Оптовая_цена", None) # Для оптовой цены нет годового выпуска
-    ]
-
-    for row_name, unit_key, annual_key in rows:
-        # Значения для изделия А
-        a_unit_val = structure_data_A[unit_key]
-        if annual_key is not None:
-            a_annual_val = structure_data_A[annual_key] / 1000 # в тыс.руб
-        else:
-            a_annual_val = None
-
-        # Значения для изделия Б
-        b_unit_val = structure_data_B[unit_key]
-        if annual_key is not None:
-            b_annual_val = structure_data_B[annual_key] / 1000 # в тыс.руб
-        else:
-            b_annual_val = None
-
-        # Сумма годового выпуска для этой строки (А + Б)
-        combined_annual_val = None
-        if annual_key is not None:
-            combined_annual_val = (structure_data_A[annual_key] + structure_data_B[annual_key]) / 1000 # в тыс.руб
-
-        # Удельный вес (структура расходов) - рассчитывается от общей себестоимости ВСЕЙ НОМЕНКЛАТУРЫ
-        perc_combined = 0
-        if annual_key is not None and total_combined_annual > 0: # Только для статей с годовым значением и если общая себестоимость > 0
-            perc_combined = calculate_structure_percentage(combined_annual_val, total_combined_annual) # combined_annual_val уже в тыс.руб
-        elif annual_key is None: # Для строки "Оптовая цена" структура не рассчитывается
-             perc_combined = "" # или оставить пустым
-
-        # Формируем строку данных
-        row_data = [
-            row_name,
-            f"{a_unit_val:.2f}",
-            f"{a_annual_val:.2f}" if a_annual_val is not None else "",
-            f"{b_unit_val:.2f}",
-            f"{b_annual_val:.2f}" if b_annual_val is not None else "",
-            f"{combined_annual_val:.2f}" if combined_annual_val is not None else "",
-            f"{perc_combined:.2f}%" if isinstance(perc_combined, (int, float)) else perc_combined # Форматируем процент, если это число
-        ]
-
-        writer.writerow(row_data)
-
-    csv_content = output.getvalue()
-    output.close()
+    """Генерирует итоговую таблицу структуры себестоимости в формате CSV (STRUCTURE_TABLE)."""
+    csv_content = STRUCTURE_TABLE.to_csv_string({"A": structure_data_A, "B": structure_data_B})
+    if instr.is_enabled():
+        instr.count("rows_written", csv_content.count('\n'))
+        instr.count("bytes_written", len(csv_content.encode('utf-8')))
     return csv_content
 
 def prepare_data_with_coefficients(data_materials, data_labor, data_volume_base, Ka, Kj):
@@ -589,6 +557,7 @@ def prepare_data_with_coefficients(data_materials, data_labor, data_volume_base,
 
     return prepared_materials, prepared_labor, prepared_volume
 
+@instr.traced("Расчет себестоимости и цены изделий")
 def generate_full_output(Q_base_data, Ka, Kj, Ktr, materials_main, materials_purchased, prices, fuel_energy, labor, rates):
     """
     Основная функция для генерации полного вывода расчета для изделий А и Б.
@@ -687,253 +656,114 @@ def calculate_product_volumes(structure_data_A, structure_data_B):
     return Q_t, Q_p, Q_A, Q_B, price_A, price_B
 
 
+def _norm(name, kind):
+    """Норма расхода/отходов материала: привязка для строк '- расходы' / '- отходы'."""
+    return lambda ctx, p: ctx["materials"].get(name, {}).get(p, {}).get(kind, "")
+
+
+def _fixed(name):
+    return lambda ctx, p: ctx["materials"].get(name, {}).get(p)
+
+
+def _price(key):
+    return lambda ctx, p: ctx["prices"].get(key)
+
+
+def _rate(key):
+    return lambda ctx, p: ctx["rates"].get(key)
+
+
+def _input_value(product):
+    return lambda bind, ctx: bind(ctx, product)
+
+
+def _norm_rows(name):
+    return [sub_row("- расходы", unit="т", bind=_norm(name, "rasxod")),
+            sub_row("- отходы", unit="т", bind=_norm(name, "otxod"))]
+
+
+# Таблица 1 (исходные данные); привязка строки - функция (данные, изделие 'A'/'B') -> значение
+INPUT_TABLE = TableSchema("Исходные данные", [
+    Column("№", field="number"),
+    Column("Показатели", field="label", json_key="Показатель"),
+    Column("Номер дополнения", field="source", json_key="Дополнение"),
+    Column("Ед. измерения", field="unit"),
+    Column("Изделие А", value=_input_value("A")),
+    Column("Изделие Б", value=_input_value("B")),
+], [
+    Row("Основные материалы", source="2", children=[
+        Row("Стальной прокат:", children=_norm_rows("стальной прокат")),
+        Row("Трубы стальные:", children=_norm_rows("трубы стальные")),
+        Row("Прокат цветных металлов", unit="руб", bind=_fixed("прокат цветных металлов")),
+        Row("Другие материалы", unit="руб", bind=_fixed("другие материалы")),
+    ]),
+    Row("Покупные полуфабрикаты (отливки):", source="2", children=[
+        Row("черных металлов", children=_norm_rows("отливки черных металлов")),
+        Row("цветных металлов", children=_norm_rows("отливки цветных металлов")),
+    ]),
+    Row("покупные комплектующие изделия", source="3", unit="руб", bind=_fixed("покупные комплектующие изделия")),
+    Row("Цена стального проката", source="4", unit="руб /т", bind=_price("стальной прокат_материал")),
+    Row("Цена стальных труб", source="4", unit="руб /т", bind=_price("трубы стальные_материал")),
+    Row("Цена отливок:", source="4", children=[
+        sub_row("-черных металлов", unit="руб /т", bind=_price("отливки черных металлов_материал")),
+        sub_row("-цветных металлов", unit="руб /т", bind=_price("отливки цветных металлов_материал")),
+    ]),
+    Row("Цена отходов:", source="4", children=[
+        sub_row("-стального проката", unit="руб /т", bind=_price("стальной прокат_отходы")),
+        sub_row("-труб стальных", unit="руб /т", bind=_price("трубы стальные_отходы")),
+        sub_row("-отливок черных металлов", unit="руб /т", bind=_price("отливки черных металлов_отходы")),
+        sub_row("-отливок цветных металлов", unit="руб /т", bind=_price("отливки цветных металлов_отходы")),
+    ]),
+    Row("Топливо и энергия на технологические потребности", source="5", unit="%",
+        bind=lambda ctx, p: ctx["fuel_energy"].get(p)),
+    Row("Суммарная трудоемкость изделия", source="6", unit="н-час",
+        bind=lambda ctx, p: round(ctx["labor"]["labor_hours"][p] * ctx["Kj"], 3)),
+    Row("Часовая тарифная ставка", source="6", unit="руб", bind=lambda ctx, p: ctx["labor"]["hourly_rate"].get(p)),
+    Row("Дополнительная зарплата", source="7", unit="%", bind=_rate("доп_зарплата")),
+    Row("Отчисление на социальное страхование", source="7", unit="%", bind=_rate("отчисления")),
+    Row("Расходы на содержание и эксплуатацию оборудования", source="7", unit="%", bind=_rate("РСЭО")),
+    Row("Общепроизводственные расходы", source="7", unit="%", bind=_rate("ОПР")),
+    Row("Общехозяйственные расходы", source="7", unit="%", bind=_rate("ОХР")),
+    Row("Внепроизводственные расходы", source="7", unit="%", bind=_rate("ВПР")),
+    Row("Норматив рентабельности к себестоимости", source="7", unit="%", bind=_rate("рентабельность")),
+    Row("Годовой объем производства", source="1", unit="шт",
+        bind=lambda ctx, p: int(ctx["volume_base"][p] * ctx["Ka"])),
+])
+
+
+def input_table_context(materials_main, materials_purchased, prices, fuel_energy, labor, rates, volume_base, Ka, Kj):
+    """Исходные данные задания 1 в виде контекста для INPUT_TABLE."""
+    return {"materials": {**materials_main, **materials_purchased}, "prices": prices, "fuel_energy": fuel_energy,
+            "labor": labor, "rates": rates, "volume_base": volume_base, "Ka": Ka, "Kj": Kj}
+
+
+@instr.traced("Таблица исходных данных (CSV)")
 def generate_input_table_csv(materials_main, materials_purchased, prices, fuel_energy, labor, rates, volume_base, Ka, Kj, Ktr):
     """
-    Генерирует CSV строку для Таблицы 1 (Исходные данные)
+    Генерирует CSV строку для Таблицы 1 (Исходные данные) по описанию INPUT_TABLE.
     """
-    output = io.StringIO()
-    writer = csv.writer(output, delimiter=';', quoting=csv.QUOTE_MINIMAL)
-
-    # Заголовок таблицы
-    writer.writerow(["№", "Показатели", "Номер дополнения", "Ед. измерения", "Изделие А", "Изделие Б"])
-
-    # --- Структура данных для сопоставления ---
-    # Сопоставляем названия из ваших словарей с описанием из таблицы методички
-    # Формат: ("Описание из таблицы", "Ед. изм.", "Номер дополнения", "Ключ для A", "Ключ для B")
-    # Для материалов с типом "material", ключ - это кортеж (значение_расхода, значение_отходов)
-    # Для материалов с типом "fixed", ключ - это просто значение
-    # Цены, топливо/энергия, трудоемкость, ставки, проценты, объемы - отдельно
-
-    # 1. Основные материалы
-    writer.writerow(["1", "Основные материалы", "2", "", "", ""])
-    writer.writerow(["1.1", "Стальной прокат:", "", "", "", ""])
-    steel_data = materials_main.get("стальной прокат", {})
-    writer.writerow(["", "- расходы", "", "т", steel_data.get("A", {}).get("rasxod", ""), steel_data.get("B", {}).get("rasxod", "")])
-    writer.writerow(["", "- отходы", "", "т", steel_data.get("A", {}).get("otxod", ""), steel_data.get("B", {}).get("otxod", "")])
-
-    writer.writerow(["1.2", "Трубы стальные:", "", "", "", ""])
-    pipes_data = materials_main.get("трубы стальные", {})
-    writer.writerow(["", "- расходы", "", "т", pipes_data.get("A", {}).get("rasxod", ""), pipes_data.get("B", {}).get("rasxod", "")])
-    writer.writerow(["", "- отходы", "", "т", pipes_data.get("A", {}).get("otxod", ""), pipes_data.get("B", {}).get("otxod", "")])
-
-    writer.writerow(["1.3", "Прокат цветных металлов", "", "руб", materials_main.get("прокат цветных металлов", {}).get("A"), materials_main.get("прокат цветных металлов", {}).get("B")])
-    writer.writerow(["1.4", "Другие материалы", "", "руб", materials_main.get("другие материалы", {}).get("A"), materials_main.get("другие материалы", {}).get("B")])
-
-    # 2. Покупные полуфабрикаты (отливки)
-    writer.writerow(["2", "Покупные полуфабрикаты (отливки):", "2", "", "", ""])
-    writer.writerow(["2.1", "черных металлов", "", "", "", ""])
-    cast_iron_data = materials_purchased.get("отливки черных металлов", {})
-    writer.writerow(["", "- расходы", "", "т", cast_iron_data.get("A", {}).get("rasxod", ""), cast_iron_data.get("B", {}).get("rasxod", "")])
-    writer.writerow(["", "- отходы", "", "т", cast_iron_data.get("A", {}).get("otxod", ""), cast_iron_data.get("B", {}).get("otxod", "")])
-
-    writer.writerow(["2.2", "цветных металлов", "", "", "", ""])
-    cast_alloy_data = materials_purchased.get("отливки цветных металлов", {})
-    writer.writerow(["", "- расходы", "", "т", cast_alloy_data.get("A", {}).get("rasxod", ""), cast_alloy_data.get("B", {}).get("rasxod", "")])
-    writer.writerow(["", "- отходы", "", "т", cast_alloy_data.get("A", {}).get("otxod", ""), cast_alloy_data.get("B", {}).get("otxod", "")])
-
-    # 3. Покупные комплектующие изделия
-    writer.writerow(["3", "покупные комплектующие изделия", "3", "руб", materials_purchased.get("покупные комплектующие изделия", {}).get("A"), materials_purchased.get("покупные комплектующие изделия", {}).get("B")])
-
-    # 4. Цены
-    writer.writerow(["4", "Цена стального проката", "4", "руб /т", prices.get("стальной прокат_материал"), prices.get("стальной прокат_материал")])
-    writer.writerow(["5", "Цена стальных труб", "4", "руб /т", prices.get("трубы стальные_материал"), prices.get("трубы стальные_материал")])
-    writer.writerow(["6", "Цена отливок:", "4", "", "", ""])
-    writer.writerow(["", "-черных металлов", "", "руб /т", prices.get("отливки черных металлов_материал"), prices.get("отливки черных металлов_материал")])
-    writer.writerow(["", "-цветных металлов", "", "руб /т", prices.get("отливки цветных металлов_материал"), prices.get("отливки цветных металлов_материал")])
-
-    # 7. Цены отходов
-    writer.writerow(["7", "Цена отходов:", "4", "", "", ""])
-    writer.writerow(["", "-стального проката", "", "руб /т", prices.get("стальной прокат_отходы"), prices.get("стальной прокат_отходы")])
-    writer.writerow(["", "-труб стальных", "", "руб /т", prices.get("трубы стальные_отходы"), prices.get("трубы стальные_отходы")])
-    writer.writerow(["", "-отливок черных металлов", "", "руб /т", prices.get("отливки черных металлов_отходы"), prices.get("отливки черных металлов_отходы")])
-    writer.writerow(["", "-отливок цветных металлов", "", "руб /т", prices.get("отливки цветных металлов_отходы"), prices.get("отливки цветных металлов_отходы")])
-
-    # 8. Топливо и энергия
-    writer.writerow(["8", "Топливо и энергия на технологические потребности", "5", "%", fuel_energy.get("A"), fuel_energy.get("B")])
-
-    # 9. Суммарная трудоемкость
-    writer.writerow(["9", "Суммарная трудоемкость изделия", "6", "н-час", round(labor.get("labor_hours", {}).get("A") * Kj, 3), round(labor.get("labor_hours", {}).get("B") * Kj, 3)])
-
-    # 10. Часовая тарифная ставка
-    writer.writerow(["10", "Часовая тарифная ставка", "6", "руб", labor.get("hourly_rate", {}).get("A"), labor.get("hourly_rate", {}).get("B")])
-
-    # 11. Дополнительная зарплата
-    writer.writerow(["11", "Дополнительная зарплата", "7", "%", rates.get("доп_зарплата"), rates.get("доп_зарплата")])
-
-    # 12. Отчисление на социальное страхование
-    writer.writerow(["12", "Отчисление на социальное страхование", "7", "%", rates.get("отчисления"), rates.get("отчисления")])
-
-    # 13. РСЭО
-    writer.writerow(["13", "Расходы на содержание и эксплуатацию оборудования", "7", "%", rates.get("РСЭО"), rates.get("РСЭО")])
-
-    # 14. ОПР
-    writer.writerow(["14", "Общепроизводственные расходы", "7", "%", rates.get("ОПР"), rates.get("ОПР")])
-
-    # 15. ОХР
-    writer.writerow(["15", "Общехозяйственные расходы", "7", "%", rates.get("ОХР"), rates.get("ОХР")])
-
-    # 16. ВПР
-    writer.writerow(["16", "Внепроизводственные расходы", "7", "%", rates.get("ВПР"), rates.get("ВПР")])
-
-    # 17. Норматив рентабельности
-    writer.writerow(["17", "Норматив рентабельности к себестоимости", "7", "%", rates.get("рентабельность"), rates.get("рентабельность")])
-
-    # 18. Годовой объем производства (базовый)
-    writer.writerow(["18", "Годовой объем производства", "1", "шт", int(volume_base.get("A") * Ka), int(volume_base.get("B") * Ka)])
-
-    csv_content = output.getvalue()
-    output.close()
+    context = input_table_context(materials_main, materials_purchased, prices, fuel_energy, labor, rates,
+                                  volume_base, Ka, Kj)
+    csv_content = INPUT_TABLE.to_csv_string(context)
+    if instr.is_enabled():
+        instr.count("rows_written", csv_content.count('\n'))
+        instr.count("bytes_written", len(csv_content.encode('utf-8')))
     return csv_content
 
 
+@instr.traced("Сохранение структуры себестоимости (JSON)")
 def save_structure_table_to_json(structure_data_A, structure_data_B, filename="sebestoimost_structure.json"):
     """
-    Сохраняет итоговую таблицу структуры себестоимости в формате JSON.
+    Сохраняет итоговую таблицу структуры себестоимости в формате JSON (STRUCTURE_TABLE).
 
     Args:
         structure_data_A (dict): Словарь с данными для изделия А (из generate_output_for_item).
         structure_data_B (dict): Словарь с данными для изделия Б (из generate_output_for_item).
         filename (str): Имя файла для сохранения JSON (по умолчанию "sebestoimost_structure.json").
     """
-    # Общая годовая себестоимость для расчета структуры
-    total_A_annual = structure_data_A["Годовой_Сп"] / 1000 # в тыс.руб
-    total_B_annual = structure_data_B["Годовой_Сп"] / 1000 # в тыс.руб
-    total_combined_annual = total_A_annual + total_B_annual
-
-    # Данные для строк таблицы
-    rows = [
-        ("1. Основные материалы за вычетом возвратных отходов", "Единица_Сом", "Годовой_Сом"),
-        ("2. Покупные полуфабрикаты и комплектующие изделия", "Единица_Спф_Ском", "Годовой_Спф_Ском"),
-        ("3. Топливо и энергия на технологические потребности", "Единица_Стэ", "Годовой_Стэ"),
-        ("4. Основная заработная плата производственных рабочих", "Единица_Сосн", "Годовой_Сосн"),
-        ("5. Дополнительная заработная плата производственных рабочих", "Единица_Сдоп", "Годовой_Сдоп"),
-        ("6. Отчисление в фонды социальных мероприятий", "Единица_Ссоц", "Годовой_Ссоц"),
-        ("7. Расходы по содержанию и эксплуатации оборудования", "Единица_Рсэо", "Годовой_Рсэо"),
-        ("8. Общепроизводственные расходы", "Единица_Роп", "Годовой_Роп"),
-        ("9. Общехозяйственные расходы", "Единица_Рох", "Годовой_Рох"),
-        ("ВСЕГО производственная себестоимость", "Единица_Спр", "Годовой_Спр"),
-        ("10. Внепроизводственные расходы", "Единица_Свп", "Годовой_Свп"),
-        ("ВСЕГО полная (коммерческая) себестоимость", "Единица_Сп", "Годовой_Сп"),
-        ("11. Прибыль", "Единица_Прибыль", "Годовой_Прибыль"),
-        ("12. Оптовая (отпускная) цена", "Оптовая_цена", None) # Для оптовой цены нет годового выпуска
-    ]
-
-    # Список для хранения данных JSON
-    json_data = []
-
-    for row_name, unit_key, annual_key in rows:
-        # Значения для изделия А
-        a_unit_val = structure_data_A[unit_key]
-        if annual_key is not None:
-            a_annual_val = structure_data_A[annual_key] / 1000 # в тыс.руб
-        else:
-            a_annual_val = None
-
-        # Значения для изделия Б
-        b_unit_val = structure_data_B[unit_key]
-        if annual_key is not None:
-            b_annual_val = structure_data_B[annual_key] / 1000 # в тыс.руб
-        else:
-            b_annual_val = None
-
-        # Сумма годового выпуска для этой строки (А + Б)
-        combined_annual_val = None
-        if annual_key is not None:
-            combined_annual_val = (structure_data_A[annual_key] + structure_data_B[annual_key]) / 1000 # в тыс.руб
-
-        # Удельный вес (структура расходов) - рассчитывается от общей себестоимости ВСЕЙ НОМЕНКЛАТУРЫ
-        perc_combined = 0
-        if annual_key is not None and total_combined_annual > 0: # Только для статей с годовым значением и если общая себестоимость > 0
-            # Используем вашу функцию calculate_structure_percentage
-            perc_combined = calculate_structure_percentage(combined_annual_val, total_combined_annual) # combined_annual_val уже в тыс.руб
-        elif annual_key is None: # Для строки "Оптовая цена" структура не рассчитывается
-             perc_combined = None # или оставить пустым
-
-        # Формируем словарь данных JSON
-        row_data_json = {
-            "Наименование статей расходов": row_name,
-            "Изделие А на единицу, руб": round(a_unit_val, 2),
-            "Изделие А на годовой выпуск, тыс.руб.": round(a_annual_val, 2) if a_annual_val is not None else None,
-            "Изделие Б на единицу, руб": round(b_unit_val, 2),
-            "Изделие Б на годовой выпуск, тыс.руб.": round(b_annual_val, 2) if b_annual_val is not None else None,
-            "Себестоимость годового выпуска продукции, тыс.руб.": round(combined_annual_val, 2) if combined_annual_val is not None else None,
-            "Структура расходов,%": round(perc_combined, 2) if isinstance(perc_combined, (int, float)) else None
-        }
-        json_data.append(row_data_json)
-
-    # Сохранение JSON
-    with open(filename, 'w', encoding='utf-8') as jsonfile:
-        json.dump(json_data, jsonfile, indent=4, ensure_ascii=False) # indent для красивого форматирования, ensure_ascii=False для кириллицы
-
+    STRUCTURE_TABLE.emit({"A": structure_data_A, "B": structure_data_B}, json_path=filename)
     print(f"\nJSON таблица структуры себестоимости сохранена в файл: {filename}")
 
-
-def csv_to_json_structure(csv_path: str) -> List[Dict[str, Any]]:
-    """
-    Преобразует CSV-файл с иерархической таблицей в список словарей.
-    Каждая строка с данными → словарь с иерархическими ключами.
-    """
-    result = []
-    context = {}  # main, sub
-
-    with open(csv_path, encoding='utf-8') as f:
-        reader = csv.reader(f, delimiter=';')
-
-        for row in reader:
-            # Пропускаем полностью пустые строки
-            if not any(cell.strip() for cell in row):
-                continue
-
-            # Заполняем недостающие поля
-            row += [''] * (6 - len(row))
-            num, indicator, addition_num, unit, item_a, item_b = [cell.strip() for cell in row]
-
-            # Пропускаем пустые значения
-            if not indicator and not item_a and not item_b:
-                continue
-
-            # --- Определяем тип строки ---
-            if indicator.startswith('- '):
-                # Подпункт: расходы / отходы
-                if 'main' not in context or 'sub' not in context:
-                    continue  # защита от ошибок
-                sub_type = indicator[2:].strip()
-                entry = {
-                    "№": num,
-                    "Показатель": context['main'],
-                    "Подкатегория": context['sub'],
-                    "Тип": sub_type,
-                    "Дополнение": addition_num,
-                    "Ед. измерения": unit or None,
-                    "Изделие А": item_a or None,
-                    "Изделие Б": item_b or None
-                }
-                if item_a or item_b:
-                    result.append(entry)
-
-            elif '.' in num and num.strip().endswith('.'):
-                # Подраздел: 1.1, 1.2 и т.д.
-                context['sub'] = indicator
-            elif num.isdigit() or (num and not indicator.startswith('-')) and not num.endswith('.'):
-                # Основной раздел: 1, 2, 3...
-                if indicator:
-                    context['main'] = indicator
-                    context.pop('sub', None)
-                # Для строк верхнего уровня (например, покупные изделия)
-                if item_a or item_b:
-                    entry = {
-                        "№": num,
-                        "Показатель": indicator,
-                        "Дополнение": addition_num,
-                        "Ед. измерения": unit or None,
-                        "Изделие А": item_a or None,
-                        "Изделие Б": item_b or None
-                    }
-                    result.append(entry)
-            # Иначе — заголовок или пусто, пропускаем
-
-    return result
-
 # --- Пример вызова функции в конце вашего основного скрипта ---
 # (Предполагается, что structure_data_A и structure_data_B уже получены)
 # structure_data_A = ...
@@ -0,0 +1,239 @@
+"""
+Подбор параметра (обратная задача цепочки калькуляции) для массивов изделий.
+
+Прямой расчет (cost_chain) дает себестоимость, прибыль и цену по исходным
+данным. Здесь решается обратная задача: при каком значении одного исходного
+данного (цена материала, трудоемкость, процент накладных расходов и т.п.)
+показатель достигает целевого значения, например:
+  - максимальная цена стального проката, при которой оптовая цена не выше заданной;
+  - допустимая трудоемкость при заданной полной себестоимости;
+  - процент ОПР, при котором прибыль на годовой выпуск равна плану.
+
+Для всех полей, кроме fuel_energy_percent, каждый показатель cost_chain -
+линейная функция одного исходного данного, и решение находится в явном
+виде по двум точкам: x = x0 + (Y* - Y(x0)) / (Y(x0 + 1) - Y(x0)).
+В остальных случаях (нелинейное поле или произвольный показатель-функция)
+используется векторизованный метод хорд с модификацией Иллинойс на
+отрезке, содержащем корень, - для всех изделий одновременно.
+"""
+
+import time
+
+import numpy as np
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from task1.cost_chain import INPUT_FIELDS, cost_chain, inputs_from_task1, stack_inputs
+
+# Поля, от которых показатели цепочки зависят нелинейно: Впер = М * β / (100 - β)
+NONLINEAR_FIELDS = ("fuel_energy_percent",)
+# Полюса нелинейных полей: метод хорд ищет решение строго левее полюса
+POLES = {"fuel_energy_percent": 100.0}
+
+
+def _prepare(inputs):
+    if isinstance(inputs, (list, tuple)):
+        inputs = stack_inputs(inputs)
+    arrays = {f: np.asarray(inputs[f], dtype=float) for f in INPUT_FIELDS}
+    n = max(a.size for a in arrays.values())
+    return {f: np.broadcast_to(a, (n,)) for f, a in arrays.items()}, n
+
+
+def _evaluator(x, field, indicator):
+    """Функция value -> значение показателя при подстановке value в поле field."""
+    def evaluate(values):
+        point = dict(x)
+        point[field] = values
+        out = cost_chain(point)
+        return np.asarray(indicator(out) if callable(indicator) else out[indicator], dtype=float)
+    return evaluate
+
+
+def _linear(evaluate, x0, target):
+    y0 = evaluate(x0)
+    slope = evaluate(x0 + 1) - y0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(slope != 0, x0 + (target - y0) / slope, np.nan)
+
+
+def _bracket(evaluate, target, lo, hi, tol, max_iter, expandable=True, max_expand=60, hi_max=np.inf):
+    """
+    Метод хорд (Иллинойс) для всех элементов сразу.
+
+    Если на [lo, hi] нет смены знака, верхняя граница удваивается (до max_expand раз,
+    пока значение показателя конечно, expandable и граница не достигла hi_max).
+    Возвращает (решение, признак сходимости).
+    """
+    lo, hi = lo.astype(float).copy(), np.minimum(hi, hi_max).astype(float)
+    f_lo, f_hi = evaluate(lo) - target, evaluate(hi) - target
+    with np.errstate(invalid="ignore"):
+        for _ in range(max_expand):
+            missing = ~(np.sign(f_lo) * np.sign(f_hi) <= 0) & np.isfinite(f_hi) & expandable & (hi < hi_max)
+            if not missing.any():
+                break
+            hi = np.where(missing, np.minimum(lo + 2 * (hi - lo), hi_max), hi)
+            f_hi = np.where(missing, evaluate(hi) - target, f_hi)
+    bracketed = np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) * np.sign(f_hi) <= 0)
+
+    x = np.where(f_lo == 0, lo, hi)
+    done = ~bracketed | (f_lo == 0) | (f_hi == 0)
+    side = np.zeros(lo.size, dtype=int)
+    scale = np.maximum(1.0, np.abs(target))
+    for _ in range(max_iter):
+        if done.all():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_new = hi - f_hi * (hi - lo) / (f_hi - f_lo)
+        # При вырожденной хорде - шаг деления пополам
+        bad = ~np.isfinite(x_new) | (x_new <= np.minimum(lo, hi)) | (x_new >= np.maximum(lo, hi))
+        x_new = np.where(bad, (lo + hi) / 2, x_new)
+        x = np.where(done, x, x_new)
+        f_x = evaluate(x) - target
+
+        same_as_hi = np.sign(f_x) == np.sign(f_hi)
+        # Корень между lo и x: x заменяет hi; иначе - заменяет lo
+        new_lo = np.where(same_as_hi, lo, hi)
+        new_f_lo = np.where(same_as_hi, f_lo, f_hi)
+        # Иллинойс: если одна граница сохраняется второй раз подряд, ее значение делится пополам
+        keep_lo = same_as_hi & (side == -1)
+        keep_hi = ~same_as_hi & (side == 1)
+        new_f_lo = np.where(keep_lo | keep_hi, new_f_lo / 2, new_f_lo)
+        active = ~done
+        lo = np.where(active, new_lo, lo)
+        f_lo = np.where(active, new_f_lo, f_lo)
+        hi = np.where(active, x, hi)
+        f_hi = np.where(active, f_x, f_hi)
+        side = np.where(active, np.where(same_as_hi, -1, 1), side)
+        done |= (np.abs(f_x) <= tol * scale) | (np.abs(hi - lo) <= tol * np.maximum(1.0, np.abs(x)))
+    with np.errstate(invalid="ignore"):
+        converged = bracketed & (np.abs(evaluate(x) - target) <= np.sqrt(tol) * scale)
+    return np.where(bracketed, x, np.nan), converged
+
+
+def goal_seek(inputs, field, target, indicator="wholesale_price", bounds=None, method="auto",
+              tol=1e-10, max_iter=100):
+    """
+    Подбор значения исходного данного field, при котором показатель равен target.
+
+    Args:
+        inputs (dict или list): Исходные данные cost_chain ({поле: массив} или список записей).
+        field (str): Подбираемое поле INPUT_FIELDS.
+        target (array_like): Целевые значения показателя (скаляр или массив по изделиям).
+        indicator (str или callable): Ключ результата cost_chain или функция
+                                      результат -> массив (например, рентабельность продаж).
+        bounds (tuple, optional): Допустимый отрезок (lo, hi), концы могут быть None.
+                                  Решения вне отрезка считаются не найденными; для метода
+                                  хорд это начальный отрезок поиска (по умолчанию
+                                  (0, 2 * |x0| + 1), верхняя граница None - расширяется,
+                                  но для полей с полюсом (POLES) не переходит через полюс).
+        method (str): 'linear' - явное решение, 'bracket' - метод хорд,
+                      'auto' - явное решение, где цепочка линейна, иначе метод хорд.
+        tol (float): Относительная точность.
+        max_iter (int): Максимальное число итераций метода хорд.
+
+    Returns:
+        dict: {'value': массив решений (nan, если решение не найдено, т.е. converged=False),
+               'converged': массив bool,
+               'method': массив методов ('linear' / 'bracket')}.
+
+    Raises:
+        ValueError: Если поле или метод неизвестны.
+    """
+    if field not in INPUT_FIELDS:
+        raise ValueError(f"Неизвестное поле исходных данных: {field}")
+    if method not in ("auto", "linear", "bracket"):
+        raise ValueError(f"Неизвестный метод подбора: {method}")
+    x, n = _prepare(inputs)
+    target = np.broadcast_to(np.asarray(target, dtype=float), (n,))
+    evaluate = _evaluator(x, field, indicator)
+    x0 = np.array(x[field], dtype=float)
+    scale = np.maximum(1.0, np.abs(target))
+
+    lower, upper = bounds if bounds is not None else (None, None)
+    lower = np.broadcast_to(np.asarray(-np.inf if lower is None else lower, dtype=float), (n,))
+    upper = np.broadcast_to(np.asarray(np.inf if upper is None else upper, dtype=float), (n,))
+
+    value = np.full(n, np.nan)
+    used = np.full(n, "bracket", dtype=object)
+    pending = np.ones(n, dtype=bool)
+    converged = np.zeros(n, dtype=bool)
+    if method == "linear" or (method == "auto" and field not in NONLINEAR_FIELDS and not callable(indicator)):
+        value = _linear(evaluate, x0, target)
+        with np.errstate(invalid="ignore"):
+            exact = np.isfinite(value) & (np.abs(evaluate(np.nan_to_num(value)) - target) <= 1e-6 * scale)
+        converged = exact & (value >= lower) & (value <= upper)
+        used[:] = "linear"
+        # Явное решение вне допустимого отрезка окончательно; метод хорд - только там,
+        # где линейность не подтвердилась
+        pending = ~exact if method == "auto" else np.zeros(n, dtype=bool)
+
+    if pending.any():
+        lo = np.where(np.isfinite(lower), lower, 0.0)
+        hi = np.where(np.isfinite(upper), upper, np.maximum(lo, 0) + 2 * np.abs(x0) + 1)
+        # Для полей с полюсом (β = 100 %) верхняя граница - ближайшее число левее полюса
+        hi_max = np.nextafter(POLES[field], -np.inf) if field in POLES else np.inf
+        root, ok = _bracket(evaluate, target, lo, hi, tol, max_iter, expandable=~np.isfinite(upper), hi_max=hi_max)
+        value = np.where(pending, root, value)
+        converged = np.where(pending, ok, converged)
+        used[pending] = "bracket"
+    return {"value": np.where(converged, value, np.nan), "converged": converged, "method": used}
+
+
+def main():
+    materials_main = {
+        "стальной прокат": {"type": "material", "A": {"rasxod": 0.45, "otxod": 0.0675}},
+        "трубы стальные": {"type": "material", "A": {"rasxod": 0.04, "otxod": 0.0028}},
+        "прокат цветных металлов": {"type": "fixed", "A": 2900},
+        "другие материалы": {"type": "fixed", "A": 1800},
+    }
+    materials_purchased = {
+        "отливки черных металлов": {"type": "material", "A": {"rasxod": 4.5, "otxod": 0.675}},
+        "отливки цветных металлов": {"type": "material", "A": {"rasxod": 0.3, "otxod": 0.075}},
+        "покупные комплектующие изделия": {"type": "fixed", "A": 142800},
+    }
+    prices = {
+        "стальной прокат_материал": 12800, "стальной прокат_отходы": 7500,
+        "трубы стальные_материал": 18500, "трубы стальные_отходы": 6300,
+        "отливки черных металлов_материал": 10500, "отливки черных металлов_отходы": 7200,
+        "отливки цветных металлов_материал": 22600, "отливки цветных металлов_отходы": 16900,
+    }
+    rates = {"доп_зарплата": 40, "отчисления": 22, "РСЭО": 87, "ОПР": 85, "ОХР": 98, "ВПР": 5, "рентабельность": 20}
+    record = inputs_from_task1("A", materials_main, materials_purchased, prices, {"A": 1},
+                               {"labor_hours": {"A": 1000}, "hourly_rate": {"A": 41.50}}, rates,
+                               volume=int(195 * 1.06), Ktr=1.15)
+    price = float(cost_chain(record)["wholesale_price"])
+    target = round(price * 0.97, 2)
+    print(f"Изделие А: оптовая цена {price:,.2f} руб., цель - {target:,.2f} руб. (-3 %)")
+
+    for field, name in (("price_steel_rolling", "Цена стального проката, руб/т"),
+                        ("labor_intensity", "Трудоемкость, нормо-ч"),
+                        ("overhead_production_percent", "ОПР, %"),
+                        ("fuel_energy_percent", "Топливо и энергия, %")):
+        r = goal_seek(record, field, target, bounds=(0, None))
+        result = f"{r['value'][0]:,.4f}" if r["converged"][0] else "недостижимо при значении >= 0"
+        print(f"  {name}: {record[field]:,.2f} -> {result} ({r['method'][0]})")
+
+    # Нелинейный показатель: доля материальных затрат в оптовой цене не более 35 %
+    share = goal_seek(record, "purchased_components", 0.35, bounds=(0, None),
+                      indicator=lambda out: (out["material_costs"] + out["semi_components"]) / out["wholesale_price"])
+    print(f"  Комплектующие при доле материальных затрат 35 %: {share['value'][0]:,.2f} руб. "
+          f"({share['method'][0]})")
+
+    # Масштаб: 10 000 изделий/сценариев
+    rng = np.random.default_rng(0)
+    n = 10000
+    many = {f: np.full(n, record[f], dtype=float) for f in INPUT_FIELDS}
+    many["labor_intensity"] = many["labor_intensity"] * rng.uniform(0.8, 1.2, n)
+    many["purchased_components"] = many["purchased_components"] * rng.uniform(0.8, 1.2, n)
+    price = cost_chain(many)["wholesale_price"]
+    for field, targets, bounds in (("labor_intensity", price * rng.uniform(0.9, 1.0, n), (0, None)),
+                                   ("fuel_energy_percent", price * rng.uniform(1.0, 1.1, n), (0, 99))):
+        start = time.perf_counter()
+        r = goal_seek(many, field, targets, bounds=bounds)
+        elapsed = time.perf_counter() - start
+        print(f"{n:,} изделий, поле {field}: {elapsed:.3f} с, решено {int(r['converged'].sum()):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Оптимизация производственной программы: подбор годовых объемов выпуска
+изделий (А, Б, ... N), максимизирующих прибыль при ограничениях
+по ресурсам (фонд рабочего времени, оборотные средства и т.п.).
+
+В примере (main) ограничения строятся только из данных курсовой:
+  - фонд рабочего времени основных рабочих (Фч * Квн * Чосн) и трудоемкость изделий;
+    численность Чосн - как в задании 4 для плановых объемов (task4/routing.Routing.headcount);
+  - оборотные средства: переменная часть норматива на изделие
+    (working_capital_per_unit, нормы дополнения Н) не больше норматива
+    при плановых объемах.
+Мощность основных фондов не ограничивается: в исходных данных нет фонда
+времени оборудования и машиноемкости изделий. При наличии этих данных
+она добавляется еще одним ресурсом (машино-часы на изделие, фонд времени).
+
+Задача формулируется как задача линейного (или целочисленного) программирования
+с разреженной матрицей ограничений и решается через scipy.optimize (HiGHS).
+"""
+
+import json
+import os
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog, milp, LinearConstraint, Bounds
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+
+def product_arrays_from_structure(structure_list, details_list=None):
+    """
+    Собирает векторы показателей по изделиям из результатов generate_full_output.
+
+    Args:
+        structure_list (list): Список словарей structure_data (по одному на изделие).
+        details_list (list, optional): Список словарей details (для трудоемкости).
+
+    Returns:
+        dict: Массивы NumPy длиной N (число изделий):
+              'names', 'price', 'full_cost', 'unit_profit', 'production_cost',
+              'materials_main', 'materials_purchased', 'basic_wage', 'volume'
+              и, если переданы details, 'labor_hours'.
+    """
+    arrays = {
+        "names": np.array([s["Наименование"] for s in structure_list]),
+        "price": np.array([s["Оптовая_цена"] for s in structure_list], dtype=float),
+        "full_cost": np.array([s["Единица_Сп"] for s in structure_list], dtype=float),
+        "production_cost": np.array([s["Единица_Спр"] for s in structure_list], dtype=float),
+        "materials_main": np.array([s["Единица_Сом"] for s in structure_list], dtype=float),
+        "materials_purchased": np.array([s["Единица_Спф_Ском"] for s in structure_list], dtype=float),
+        "basic_wage": np.array([s["Единица_Сосн"] for s in structure_list], dtype=float),
+        "volume": np.array([s["Q"] for s in structure_list], dtype=float),
+    }
+    arrays["unit_profit"] = arrays["price"] - arrays["full_cost"]
+
+    if details_list is not None:
+        arrays["labor_hours"] = np.array([d["labor_hours"] for d in details_list], dtype=float)
+
+    return arrays
+
+
+def working_capital_per_unit(arrays, N_om, N_pok, T_c, N_gp):
+    """
+    Переменная (пропорциональная объему) часть норматива оборотных средств
+    на одно изделие по формулам задания 1.3, тыс. руб./шт.
+
+    ОСом = Сом * Ном / 360, ОСпок = Спок * Нпок / 360,
+    ОСнп = Спр * Тц * Кнз / 360, ОСгп = Цопт * Нгп / 360.
+    Постоянные составляющие (ОСвм, ОСпрз, ОСрбп) в расчет на единицу не входят
+    и должны быть вычтены из лимита оборотных средств.
+
+    Args:
+        arrays (dict): Результат product_arrays_from_structure.
+        N_om, N_pok, T_c, N_gp (array_like): Нормы запаса и длительность цикла по изделиям, дн.
+
+    Returns:
+        np.ndarray: Потребность в оборотных средствах на единицу изделия, тыс. руб.
+    """
+    C_m = arrays["materials_main"] + arrays["materials_purchased"]
+    C = arrays["production_cost"]
+    K_nz = (C_m + 0.5 * (C - C_m)) / C
+
+    per_unit = (arrays["materials_main"] * np.asarray(N_om, dtype=float)
+                + arrays["materials_purchased"] * np.asarray(N_pok, dtype=float)
+                + C * np.asarray(T_c, dtype=float) * K_nz
+                + arrays["price"] * np.asarray(N_gp, dtype=float)) / 360
+
+    return per_unit / 1000  # в тыс.руб
+
+
+def build_constraints(resources, n_products):
+    """
+    Формирует разреженную матрицу ограничений A_ub и вектор b_ub.
+
+    Args:
+        resources (dict): Словарь {имя_ресурса: (коэффициенты, лимит)}.
+                          Коэффициенты - расход ресурса на единицу изделия:
+                          массив длины N, либо разреженная строка (1 x N).
+        n_products (int): Число изделий N.
+
+    Returns:
+        tuple: (names, A_ub в формате CSR, b_ub)
+    """
+    names = list(resources.keys())
+    rows = []
+    limits = np.empty(len(names), dtype=float)
+
+    for i, name in enumerate(names):
+        coefs, limit = resources[name]
+        if sparse.issparse(coefs):
+            row = sparse.csr_matrix(coefs).reshape(1, n_products)
+        else:
+            coefs = np.broadcast_to(np.asarray(coefs, dtype=float), (n_products,))
+            row = sparse.csr_matrix(coefs.reshape(1, -1))
+        rows.append(row)
+        limits[i] = limit
+
+    A_ub = sparse.vstack(rows, format="csr") if rows else sparse.csr_matrix((0, n_products))
+    return names, A_ub, limits
+
+
+def optimize_product_mix(unit_profit, resources, q_min=None, q_max=None, integer=False):
+    """
+    Подбирает объемы выпуска, максимизирующие прибыль:
+
+        max Σ Пi * Qi
+        при Σ aki * Qi <= bk для каждого ресурса k,
+        Qmin_i <= Qi <= Qmax_i.
+
+    Args:
+        unit_profit (array_like): Прибыль на единицу изделия (Цопт - Сп), руб.
+        resources (dict): Ограничения {имя: (расход на единицу, лимит)},
+                          см. build_constraints.
+        q_min (array_like, optional): Минимальные объемы (договорные обязательства), шт.
+        q_max (array_like, optional): Максимальные объемы (емкость рынка), шт.
+        integer (bool): Если True, объемы ищутся в целых числах (MILP).
+
+    Returns:
+        dict: 'volumes' - оптимальные объемы, 'profit' - суммарная прибыль, руб.,
+              'usage' и 'slack' - расход и остаток ресурсов,
+              'shadow_prices' - двойственные оценки ресурсов (только для LP),
+              'resource_names', 'status', 'message'.
+
+    Raises:
+        ValueError: Если задача несовместна или не ограничена.
+    """
+    c = np.asarray(unit_profit, dtype=float)
+    n = c.size
+
+    lower = np.zeros(n) if q_min is None else np.broadcast_to(np.asarray(q_min, dtype=float), (n,))
+    upper = np.full(n, np.inf) if q_max is None else np.broadcast_to(np.asarray(q_max, dtype=float), (n,))
+
+    names, A_ub, b_ub = build_constraints(resources, n)
+
+    shadow_prices = None
+    if integer:
+        constraints = []
+        if A_ub.shape[0] > 0:
+            constraints.append(LinearConstraint(A_ub, -np.inf, b_ub))
+        res = milp(-c, constraints=constraints, integrality=np.ones(n),
+                   bounds=Bounds(lower, upper))
+        ok = res.status == 0
+    else:
+        res = linprog(-c, A_ub=A_ub if A_ub.shape[0] > 0 else None,
+                      b_ub=b_ub if A_ub.shape[0] > 0 else None,
+                      bounds=np.column_stack([lower, upper]), method="highs")
+        ok = res.status == 0
+        if ok and A_ub.shape[0] > 0:
+            # Маржинальные оценки HiGHS даны для задачи минимизации -> меняем знак
+            shadow_prices = -res.ineqlin.marginals
+
+    if not ok:
+        raise ValueError(f"Оптимизация не выполнена: {res.message}")
+
+    volumes = res.x
+    if integer:
+        volumes = np.round(volumes)
+
+    usage = A_ub @ volumes
+
+    return {
+        "volumes": volumes,
+        "profit": float(c @ volumes),
+        "usage": usage,
+        "slack": b_ub - usage,
+        "shadow_prices": shadow_prices,
+        "resource_names": names,
+        "status": res.status,
+        "message": res.message,
+    }
+
+
+def format_product_mix(result, product_names):
+    """Форматирует результат optimize_product_mix для вывода в консоль."""
+    output = "Оптимальная производственная программа\n"
+    for name, q in zip(product_names, result["volumes"]):
+        output += f"  Изделие {name}: Q = {q:.0f} шт.\n"
+    output += f"Прибыль: {result['profit']:.2f} руб. = {result['profit'] / 1000:.2f} тыс.руб.\n"
+    output += "Использование ресурсов:\n"
+    for i, name in enumerate(result["resource_names"]):
+        line = f"  {name}: {result['usage'][i]:.2f} (остаток {result['slack'][i]:.2f})"
+        if result["shadow_prices"] is not None:
+            line += f", двойственная оценка {result['shadow_prices'][i]:.2f} руб."
+        output += line + "\n"
+    return output
+
+
+VARIANT = 3  # вариант задания (исходные данные task1/test.py)
+HERE = os.path.dirname(os.path.abspath(__file__))
+TABLES_DIR = os.path.join(os.path.dirname(HERE), "dopolneniya_tables")
+
+
+def main():
+    # --- Пример: исходные данные из результатов задания 1.1 ---
+    with open(os.path.join(HERE, 'sebestoimost_structure.json'), 'r', encoding='utf-8') as f:
+        table = {row["Наименование статей расходов"]: row for row in json.load(f)}
+    with open(os.path.join(HERE, 'input_data_table.json'), 'r', encoding='utf-8') as f:
+        inputs = {row["Показатель"]: row for row in json.load(f)}
+    with open(os.path.join(HERE, 'individual_product_volumes.json'), 'r', encoding='utf-8') as f:
+        volumes = json.load(f)
+
+    def pair(name, key="на единицу, руб"):
+        row = table[name]
+        return np.array([row[f"Изделие А {key}"], row[f"Изделие Б {key}"]], dtype=float)
+
+    price = pair("12. Оптовая (отпускная) цена")
+    full_cost = pair("ВСЕГО полная (коммерческая) себестоимость")
+    labor_hours = np.array([float(inputs["Суммарная трудоемкость изделия"]["Изделие А"]),
+                            float(inputs["Суммарная трудоемкость изделия"]["Изделие Б"])])
+    Q_plan = np.array([volumes[0]["Годовой_объем_выпуска"], volumes[1]["Годовой_объем_выпуска"]], dtype=float)
+
+    # Нормы запаса и длительность цикла - дополнение Н (нечетные варианты -> 1, четные -> 2)
+    from dopolneniya_tables.shared_tables import load_table
+    norms = load_table('dop_N', os.path.join(TABLES_DIR, 'dop_N.csv'))
+    norms = norms[norms['Вариант задания'] == (1 if VARIANT % 2 else 2)].set_index('Изделие').loc[['А', 'Б']]
+    per_unit = working_capital_per_unit(
+        {"materials_main": pair("1. Основные материалы за вычетом возвратных отходов"),
+         "materials_purchased": pair("2. Покупные полуфабрикаты и комплектующие изделия"),
+         "production_cost": pair("ВСЕГО производственная себестоимость"),
+         "price": price},
+        norms['N_om'], norms['N_pok'], norms['T_c'], norms['N_gp'])
+
+    # Численность основных рабочих - расчет задания 4 (по dop_J_hours) для плановых объемов
+    from task4.routing import FCH, KVN, Routing
+    workers = Routing.from_csv().headcount(Q_plan, VARIANT)[0]
+    resources = {
+        "Фонд рабочего времени, н-час": (labor_hours, FCH * KVN * workers),
+        # Переменная часть норматива оборотных средств - не больше, чем при плановых объемах
+        "Оборотные средства, тыс.руб": (per_unit, float(per_unit @ Q_plan)),
+    }
+
+    result = optimize_product_mix(price - full_cost, resources,
+                                  q_min=Q_plan * 0.5, q_max=Q_plan * 1.5, integer=True)
+    print(format_product_mix(result, ["А", "Б"]))
+
+
+if __name__ == "__main__":
+    main()
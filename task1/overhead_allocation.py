@@ -0,0 +1,225 @@
+"""
+Распределение накладных расходов по носителям затрат (ABC) на разреженных матрицах.
+
+Вместо фиксированных процентов от основной заработной платы
+(calculate_overhead_costs: РСЭО, ОПР, ОХР = Сосн * %) накладные расходы
+собираются в пулы (цеха, виды деятельности) и распределяются на изделия
+пропорционально потреблению драйверов затрат: машино-часы, переналадки,
+нормо-часы по видам работ (dop_J_hours) и т.п.
+
+1. Взаимное распределение затрат обслуживающих подразделений (метод
+   взаимных услуг): полные затраты обслуживающих подразделений T находятся
+   из системы линейных уравнений
+       T = Tпрям + Rᵀ T,   т.е.   (I - Rᵀ) T = Tпрям,
+   где R[s, t] - доля услуг подразделения s, потребленная подразделением t.
+   Система решается разреженным методом (scipy.sparse.linalg.spsolve).
+2. Ставки драйверов: ставка пула = затраты пула / суммарный объем драйвера.
+3. Накладные расходы изделия = Σ ставка пула * объем драйвера изделия,
+   одно разреженное матричное произведение для всех изделий.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+TABLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dopolneniya_tables")
+
+
+def reciprocal_allocation(direct_costs, service_shares, n_service):
+    """
+    Метод взаимных услуг: распределение обслуживающих подразделений на основные.
+
+    Подразделения нумеруются так, что первые n_service - обслуживающие.
+
+    Args:
+        direct_costs (array_like): Прямые затраты всех подразделений (длина n).
+        service_shares (sparse или array_like): Доли потребления услуг (n_service x n):
+                                                строка s - как услуги подразделения s
+                                                распределяются между подразделениями (сумма <= 1).
+        n_service (int): Число обслуживающих подразделений.
+
+    Returns:
+        tuple: (затраты основных подразделений после распределения (n - n_service),
+                полные затраты обслуживающих подразделений (n_service)).
+
+    Raises:
+        ValueError: Если доли некорректны или система вырождена.
+    """
+    direct = np.asarray(direct_costs, dtype=float)
+    R = sparse.csr_matrix(service_shares, dtype=float)
+    if R.shape != (n_service, direct.size):
+        raise ValueError(f"Матрица долей должна иметь размер ({n_service}, {direct.size}), получено {R.shape}.")
+    if R.nnz and R.data.min() < 0:
+        raise ValueError("Доли потребления услуг не могут быть отрицательными.")
+    if np.any(np.asarray(R.sum(axis=1)).ravel() > 1 + 1e-9):
+        raise ValueError("Сумма долей услуг обслуживающего подразделения больше 1.")
+
+    R_ss = R[:, :n_service]
+    R_sp = R[:, n_service:]
+    A = (sparse.identity(n_service, format="csc") - R_ss.T).tocsc()
+    if n_service:
+        service_total = np.atleast_1d(spsolve(A, direct[:n_service]))
+        if not np.all(np.isfinite(service_total)):
+            raise ValueError("Система взаимных услуг вырождена (услуги замкнуты между подразделениями).")
+    else:
+        service_total = np.zeros(0)
+    production = direct[n_service:] + R_sp.T @ service_total
+    return production, service_total
+
+
+def activity_rates(pool_costs, drivers):
+    """
+    Ставки драйверов затрат.
+
+    Args:
+        pool_costs (array_like): Затраты пулов (длина m).
+        drivers (sparse или array_like): Объемы драйверов (пулы x изделия, m x N).
+
+    Returns:
+        np.ndarray: Ставка на единицу драйвера для каждого пула.
+
+    Raises:
+        ValueError: Если у пула с ненулевыми затратами нет потребителей.
+    """
+    pool_costs = np.asarray(pool_costs, dtype=float)
+    D = sparse.csr_matrix(drivers, dtype=float)
+    totals = np.asarray(D.sum(axis=1)).ravel()
+    empty = (totals == 0) & (pool_costs != 0)
+    if np.any(empty):
+        raise ValueError(f"Пулы {np.flatnonzero(empty).tolist()} имеют затраты, но нулевой объем драйвера.")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(totals > 0, pool_costs / totals, 0.0)
+
+
+def allocate(pool_costs, drivers, volumes=None, breakdown=False):
+    """
+    Распределение затрат пулов на изделия.
+
+    Args:
+        pool_costs (array_like): Затраты пулов за год.
+        drivers (sparse или array_like): Годовые объемы драйверов (пулы x изделия).
+        volumes (array_like, optional): Годовые объемы выпуска изделий; если заданы,
+                                        возвращаются затраты на единицу изделия.
+        breakdown (bool): Вернуть также разреженную матрицу затрат (пулы x изделия).
+
+    Returns:
+        np.ndarray или tuple: Накладные расходы изделий (на год или на единицу)
+                              [, разреженная матрица по пулам].
+    """
+    D = sparse.csr_matrix(drivers, dtype=float)
+    rates = activity_rates(pool_costs, D)
+    per_product = D.T @ rates
+    if volumes is not None:
+        per_product = per_product / np.asarray(volumes, dtype=float)
+    if not breakdown:
+        return per_product
+    by_pool = sparse.diags(rates) @ D
+    if volumes is not None:
+        by_pool = by_pool @ sparse.diags(1 / np.asarray(volumes, dtype=float))
+    return per_product, by_pool.tocsr()
+
+
+def percentage_allocation(basic_wage, percents):
+    """
+    Текущий метод для сравнения: накладные расходы = Сосн * % (calculate_overhead_costs).
+
+    Args:
+        basic_wage (array_like): Основная заработная плата изделий.
+        percents (dict): {статья: %}, например {'РСЭО': 87, 'ОПР': 85, 'ОХР': 98}.
+
+    Returns:
+        dict: {статья: массив затрат по изделиям}.
+    """
+    basic_wage = np.asarray(basic_wage, dtype=float)
+    return {name: basic_wage * pct / 100 for name, pct in percents.items()}
+
+
+def labor_hour_drivers(variant, volumes, file_path=None):
+    """
+    Драйверы "нормо-часы по видам работ" из dop_J_hours для изделий А и Б.
+
+    Args:
+        variant (int): Номер варианта.
+        volumes (dict): Годовые объемы выпуска {'А': Q, 'Б': Q}.
+        file_path (str, optional): Путь к dop_J_hours.csv.
+
+    Returns:
+        tuple: (виды работ, изделия, разреженная матрица годовых нормо-часов (работы x изделия)).
+    """
+    df = pd.read_csv(file_path or os.path.join(TABLES_DIR, "dop_J_hours.csv"))
+    column = str(variant)
+    if column not in df.columns:
+        raise ValueError(f"Вариант {variant} не найден в dop_J_hours.")
+    table = df.pivot(index="Вид_работ", columns="Изделие", values=column)
+    products = list(volumes)
+    table = table[products]
+    hours = table.to_numpy(dtype=float) * np.array([volumes[p] for p in products], dtype=float)
+    return list(table.index), products, sparse.csr_matrix(hours)
+
+
+def main():
+    import time
+
+    # --- Пример: вариант 3, изделия А и Б ---
+    volumes = {"А": 206, "Б": 63}
+    basic_wage = np.array([1000 * 41.50, 171 * 35.60])  # Сосн на единицу, руб.
+    percents = {"РСЭО": 87, "ОПР": 85, "ОХР": 98}
+    q = np.array(list(volumes.values()), dtype=float)
+    current = percentage_allocation(basic_wage, percents)
+    total_overhead = sum(float((v * q).sum()) for v in current.values())
+
+    works, products, labor = labor_hour_drivers(3, volumes)
+
+    # Подразделения: 2 обслуживающих (ремонтный, энергетический) и пулы:
+    # механообработка (машино-часы), сборка (нормо-часы сборки), подготовка (переналадки),
+    # заводоуправление (все нормо-часы)
+    departments = ["Ремонтный цех", "Энергоцех", "Механообработка", "Сборка", "Подготовка производства",
+                   "Заводоуправление"]
+    direct = np.array([0.12, 0.08, 0.30, 0.15, 0.10, 0.25]) * total_overhead
+    shares = sparse.csr_matrix(np.array([
+        [0.00, 0.10, 0.50, 0.20, 0.10, 0.10],   # услуги ремонтного цеха
+        [0.05, 0.00, 0.60, 0.20, 0.05, 0.10],   # услуги энергоцеха
+    ]))
+    pools, service_total = reciprocal_allocation(direct, shares, n_service=2)
+
+    machine = labor[works.index("1.2. Механообработка")]
+    assembly = labor[works.index("1.3. Сборочные")]
+    setups = sparse.csr_matrix([[12.0, 30.0]])  # переналадок в год
+    drivers = sparse.vstack([machine, assembly, setups, labor.sum(axis=0)]).tocsr()
+    per_unit, by_pool = allocate(pools, drivers, volumes=q, breakdown=True)
+
+    print("Полные затраты обслуживающих подразделений (метод взаимных услуг):")
+    for name, value in zip(departments[:2], service_total):
+        print(f"  {name}: {value:,.2f} руб.")
+    print("Затраты пулов после распределения:")
+    for name, value in zip(departments[2:], pools):
+        print(f"  {name}: {value:,.2f} руб.")
+    print(f"Всего: {pools.sum():,.2f} руб. (исходно {total_overhead:,.2f} руб.)")
+
+    print("\nНакладные расходы на единицу изделия, руб.:")
+    for j, product in enumerate(products):
+        old = sum(v[j] for v in current.values())
+        parts = ", ".join(f"{departments[2 + i]}: {by_pool[i, j]:,.2f}" for i in range(by_pool.shape[0]))
+        print(f"  Изделие {product}: {per_unit[j]:,.2f} (по % от Сосн: {old:,.2f}); {parts}")
+
+    # --- Масштаб: 5000 изделий, 200 пулов, 50 обслуживающих подразделений ---
+    rng = np.random.default_rng(0)
+    n_products, n_pools, n_service = 5000, 200, 50
+    n_depts = n_service + n_pools
+    shares = sparse.random(n_service, n_depts, density=0.05, random_state=0, format="csr")
+    shares = sparse.diags(0.9 / np.maximum(np.asarray(shares.sum(axis=1)).ravel(), 1e-12)) @ shares
+    drivers = sparse.random(n_pools, n_products, density=0.02, random_state=1, format="csr")
+    drivers = drivers + sparse.csr_matrix((np.ones(n_pools), (np.arange(n_pools), np.arange(n_pools))),
+                                          shape=(n_pools, n_products))
+    start = time.perf_counter()
+    pools, _ = reciprocal_allocation(rng.uniform(1e5, 1e6, n_depts), shares, n_service)
+    allocate(pools, drivers, volumes=rng.integers(10, 1000, n_products))
+    print(f"\n{n_products} изделий, {n_pools} пулов, {n_service} обслуживающих подразделений: "
+          f"{time.perf_counter() - start:.3f} с")
+
+
+if __name__ == "__main__":
+    main()
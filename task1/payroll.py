@@ -0,0 +1,232 @@
+"""
+Векторизованный расчет заработной платы по массивам записей "рабочий-месяц".
+
+В funcs.py заработная плата считается на изделие: Сосн = t * Т
+(calculate_basic_wage), Сдоп и Ссоц - фиксированные проценты, а ставка Т
+берется из GRADE_TO_RATE по разряду. Здесь исходные данные - массивы
+одинаковой длины (одна запись на рабочего за месяц):
+    grade  - разряд;
+    hours  - отработанные нормо-часы;
+    product - индекс изделия, на которое отнесены часы;
+    worker - табельный номер (для нарастающего итога отчислений);
+    month  - номер месяца;
+    bonus_percent (необязательно) - премия, % от тарифной заработной платы;
+    shift_coef (необязательно) - коэффициент за работу в вечерние/ночные смены.
+
+Расчет за один проход:
+  1. Тарифная заработная плата: hours * Т[grade] * shift_coef;
+  2. Основная заработная плата: тарифная + премия;
+  3. Дополнительная заработная плата: % от основной;
+  4. Отчисления по шкале ContributionScale от нарастающей с начала года
+     базы каждого рабочего (предельная величина базы, пониженные тарифы);
+  5. Распределение затрат на оплату труда по изделиям (np.bincount).
+"""
+
+import time
+
+import numpy as np
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from dopolneniya_tables.exstractor_J import GRADE_TO_RATE
+
+WORKER_FIELDS = ("grade", "hours", "product", "worker", "month")
+
+
+class TariffGrid:
+    """Тарифная сетка: часовая ставка по разряду (массив, индекс - разряд)"""
+
+    def __init__(self, rates):
+        """
+        Args:
+            rates (dict): {разряд: часовая тарифная ставка, руб/ч}.
+        """
+        if not rates:
+            raise ValueError("Тарифная сетка не задана.")
+        self.table = np.full(max(rates) + 1, np.nan)
+        for grade, rate in rates.items():
+            if grade < 1 or rate < 0:
+                raise ValueError(f"Некорректная ставка {rate} для разряда {grade}.")
+            self.table[grade] = rate
+
+    @classmethod
+    def from_coefficients(cls, first_grade_rate, coefficients):
+        """
+        Сетка по тарифным коэффициентам: Т_i = Т_1 * k_i.
+
+        Args:
+            first_grade_rate (float): Часовая ставка 1-го разряда, руб/ч.
+            coefficients (list): Тарифные коэффициенты разрядов 1, 2, ...
+        """
+        return cls({i + 1: first_grade_rate * k for i, k in enumerate(coefficients)})
+
+    def rates(self, grades):
+        """
+        Часовые ставки для массива разрядов.
+
+        Raises:
+            ValueError: Если разряд отсутствует в сетке.
+        """
+        grades = np.asarray(grades, dtype=int)
+        bad = (grades < 0) | (grades >= self.table.size)
+        rates = self.table[np.where(bad, 0, grades)]
+        bad |= np.isnan(rates)
+        if np.any(bad):
+            raise ValueError(f"Нет тарифной ставки для разрядов {sorted(set(grades[bad].tolist()))}.")
+        return rates
+
+
+# Сетка задания 1
+TASK1_GRID = TariffGrid(GRADE_TO_RATE)
+
+
+class ContributionScale:
+    """
+    Шкала отчислений от нарастающей с начала года базы рабочего.
+
+    Ставка rates[i] действует на интервале базы [thresholds[i], thresholds[i + 1]),
+    последняя - выше последнего порога. Например, 30 % до предельной величины
+    2 225 000 руб. и 15.1 % сверх нее: ContributionScale([0, 2225000], [30, 15.1]).
+    """
+
+    def __init__(self, thresholds, rates):
+        self.thresholds = np.asarray(thresholds, dtype=float)
+        self.rates = np.asarray(rates, dtype=float) / 100
+        if self.thresholds.size != self.rates.size or self.thresholds[0] != 0:
+            raise ValueError("Шкала отчислений: число порогов и ставок должно совпадать, первый порог - 0.")
+        if np.any(np.diff(self.thresholds) <= 0):
+            raise ValueError("Пороги шкалы отчислений должны возрастать.")
+        # Отчисления, накопленные к каждому порогу
+        self._accumulated = np.concatenate(([0.0], np.cumsum(np.diff(self.thresholds) * self.rates[:-1])))
+
+    @classmethod
+    def flat(cls, percent):
+        """Единая ставка без порогов (как rates['отчисления'] в задании 1)."""
+        return cls([0], [percent])
+
+    def accumulated(self, base):
+        """Отчисления с нарастающей базы base (кусочно-линейная функция)."""
+        base = np.asarray(base, dtype=float)
+        i = np.searchsorted(self.thresholds, base, side="right") - 1
+        return self._accumulated[i] + (base - self.thresholds[i]) * self.rates[i]
+
+
+def _cumulative_base(base, worker, month):
+    """Нарастающая с начала года база каждого рабочего до и после записи."""
+    if base.size == 0:
+        return base, base
+    order = np.lexsort((month, worker))
+    sorted_base = base[order]
+    sorted_worker = worker[order]
+    cumsum = np.cumsum(sorted_base)
+    starts = np.flatnonzero(np.r_[True, sorted_worker[1:] != sorted_worker[:-1]])
+    offsets = np.repeat(cumsum[starts] - sorted_base[starts], np.diff(np.r_[starts, sorted_base.size]))
+    after = np.empty_like(base)
+    after[order] = cumsum - offsets
+    return after - base, after
+
+
+def payroll(records, grid=TASK1_GRID, additional_percent=40, contributions=ContributionScale.flat(22),
+            n_products=None):
+    """
+    Заработная плата и отчисления по записям "рабочий-месяц".
+
+    Args:
+        records (dict): {поле: массив}; обязательные поля WORKER_FIELDS,
+                        необязательные bonus_percent и shift_coef.
+        grid (TariffGrid): Тарифная сетка.
+        additional_percent (float): Дополнительная заработная плата, % от основной.
+        contributions (ContributionScale): Шкала отчислений от (основной + дополнительной).
+        n_products (int, optional): Число изделий для распределения затрат.
+
+    Returns:
+        dict: Массивы по записям: tariff_wage, bonus, basic_wage, additional_wage,
+              contributions, labor_cost; по изделиям: by_product (dict тех же статей
+              и hours).
+
+    Raises:
+        ValueError: Если не задано поле, длины массивов различаются или часы отрицательны.
+    """
+    missing = [f for f in WORKER_FIELDS if f not in records]
+    if missing:
+        raise ValueError(f"Не заданы поля записей: {', '.join(missing)}")
+    hours = np.asarray(records["hours"], dtype=float)
+    n = hours.size
+    if hours.ndim != 1 or any(np.shape(records[f]) != (n,) for f in WORKER_FIELDS):
+        raise ValueError("Поля записей должны быть одномерными массивами одинаковой длины.")
+    if np.any(hours < 0):
+        raise ValueError("Отработанные часы не могут быть отрицательными.")
+
+    shift = np.asarray(records.get("shift_coef", 1.0), dtype=float)
+    bonus_percent = np.asarray(records.get("bonus_percent", 0.0), dtype=float)
+    product = np.asarray(records["product"], dtype=int)
+    worker = np.asarray(records["worker"])
+    month = np.asarray(records["month"])
+
+    r = {}
+    r["tariff_wage"] = hours * grid.rates(records["grade"]) * shift
+    r["bonus"] = r["tariff_wage"] * bonus_percent / 100
+    r["basic_wage"] = r["tariff_wage"] + r["bonus"]
+    r["additional_wage"] = r["basic_wage"] * additional_percent / 100
+    before, after = _cumulative_base(r["basic_wage"] + r["additional_wage"], worker, month)
+    r["contributions"] = contributions.accumulated(after) - contributions.accumulated(before)
+    r["labor_cost"] = r["basic_wage"] + r["additional_wage"] + r["contributions"]
+
+    n_products = n_products or (int(product.max()) + 1 if n else 0)
+    r["by_product"] = {key: np.bincount(product, weights=r[key], minlength=n_products)
+                       for key in ("tariff_wage", "bonus", "basic_wage", "additional_wage",
+                                   "contributions", "labor_cost")}
+    r["by_product"]["hours"] = np.bincount(product, weights=hours, minlength=n_products)
+    return r
+
+
+def main():
+    from task1.funcs import calculate_additional_wage, calculate_basic_wage, calculate_social_contributions
+
+    # --- Проверка: одна запись на изделие совпадает с расчетом задания 1 ---
+    records = {"grade": np.array([5, 4]), "hours": np.array([1000.0, 171.0]), "product": np.array([0, 1]),
+               "worker": np.array([0, 1]), "month": np.array([1, 1])}
+    result = payroll(records)
+    for j, (t, rate) in enumerate(((1000, 41.50), (171, 35.60))):
+        basic = calculate_basic_wage(t, rate)
+        additional = calculate_additional_wage(basic, 40)
+        social = calculate_social_contributions(basic, additional, 22)
+        print(f"Изделие {'АБ'[j]}: Сосн {result['basic_wage'][j]:,.2f} ({basic:,.2f}), "
+              f"Сдоп {result['additional_wage'][j]:,.2f} ({additional:,.2f}), "
+              f"Ссоц {result['contributions'][j]:,.2f} ({social:,.2f})")
+
+    # --- 12 000 рабочих x 12 месяцев, предельная база и пониженный тариф ---
+    rng = np.random.default_rng(0)
+    n_workers, months = 12000, 12
+    worker = np.repeat(np.arange(n_workers), months)
+    n = worker.size
+    records = {
+        "worker": worker,
+        "month": np.tile(np.arange(1, months + 1), n_workers),
+        "grade": np.repeat(rng.integers(1, 7, n_workers), months),
+        "hours": rng.uniform(120, 190, n),
+        "product": rng.integers(0, 2, n),
+        "bonus_percent": rng.choice([0, 10, 25, 40], n),
+        "shift_coef": rng.choice([1.0, 1.2, 1.4], n, p=[0.7, 0.2, 0.1]),
+    }
+    grid = TariffGrid.from_coefficients(25.0, [1.0, 1.09, 1.21, 1.42, 1.66, 1.9])
+    # Условная предельная база в ценах задания: 30 % до 150 000 руб. в год, 15.1 % сверх нее
+    scale = ContributionScale([0, 150000], [30, 15.1])
+
+    start = time.perf_counter()
+    result = payroll(records, grid, additional_percent=40, contributions=scale)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{n:,} записей рабочий-месяц рассчитаны за {elapsed:.3f} с")
+    for j, name in enumerate(("А", "Б")):
+        p = {k: v[j] for k, v in result["by_product"].items()}
+        print(f"Изделие {name}: {p['hours']:,.0f} нормо-ч, Сосн {p['basic_wage']:,.2f}, "
+              f"Сдоп {p['additional_wage']:,.2f}, отчисления {p['contributions']:,.2f}, "
+              f"всего {p['labor_cost']:,.2f} руб.")
+    base = result["basic_wage"] + result["additional_wage"]
+    print(f"Средняя ставка отчислений: {result['contributions'].sum() / base.sum() * 100:.2f} %")
+
+
+if __name__ == "__main__":
+    main()
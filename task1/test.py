@@ -1,3 +1,8 @@
+import json
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
 from funcs import *
 import pandas as pd
 import numpy as np
@@ -63,19 +68,13 @@ Ka_input = 1.06 # Коэффициент для корректировки об
 Kj_input = 0.92 # Пример
 Ktr_input = 1.15
 
-# --- Сохранение CSV ---
-csv_table_input = generate_input_table_csv(
-    materials_main_example, materials_purchased_example,
-    prices_example, fuel_energy_example, labor_example, rates_example,
-    volume_base_example, Ka_input, Kj_input, Ktr_input
+# --- Сохранение таблицы исходных данных (CSV и JSON за один проход) ---
+INPUT_TABLE.emit(
+    input_table_context(materials_main_example, materials_purchased_example,
+                        prices_example, fuel_energy_example, labor_example, rates_example,
+                        volume_base_example, Ka_input, Kj_input),
+    csv_path="input_data_table.csv", json_path="input_data_table.json", csv_encoding="utf-8"
 )
-csv_input_filename = "input_data_table.csv"
-with open(csv_input_filename, 'w', encoding='utf-8', newline='') as csvfile:
-    csvfile.write(csv_table_input)
-
-to_js = csv_to_json_structure(csv_input_filename)
-with open("input_data_table.json", "w", encoding="utf-8") as f:
-    json.dump(to_js, f, ensure_ascii=False, indent=4)
 
 
 # --- Выполнение основной логики ---
@@ -148,15 +147,14 @@ output_result = generate_output_by_punkt(structure_data_A, structure_data_B, det
 
 # --- Конец нового кода ---
 
-# Генерация CSV и сохранение в файл
-csv_table_content = generate_structure_table_csv(structure_data_A, structure_data_B)
-
-# Сохранение CSV в файл
+# Таблица структуры себестоимости: CSV и JSON за один проход
 csv_filename = "sebestoimost_structure.csv"
-with open(csv_filename, 'w', encoding='utf-8', newline='') as csvfile:
-    csvfile.write(csv_table_content)
+json_filename = "sebestoimost_structure.json"
+STRUCTURE_TABLE.emit({"A": structure_data_A, "B": structure_data_B},
+                     csv_path=csv_filename, json_path=json_filename, csv_encoding="utf-8")
 
 print(f"\nCSV таблица сохранена в файл: {csv_filename}")
+print(f"JSON таблица структуры себестоимости сохранена в файл: {json_filename}")
 
 
 Q_t, Q_p, Q_A, Q_B, price_A, price_B = calculate_product_volumes(structure_data_A, structure_data_B)
@@ -182,7 +180,6 @@ volumes_output += "Qк – остатки готовой продукции на
 volumes_output += f"Qр = {Q_t:.2f} * 0,02 + {Q_t:.2f} - {Q_t:.2f} * 0,015 = {Q_p:.2f} тыс. руб.\n"
 
 print(volumes_output)
-save_structure_table_to_json(structure_data_A, structure_data_B)
 
 
 individual_volumes_data = {
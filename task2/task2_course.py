@@ -1,7 +1,44 @@
 import json
+import numpy as np
 import pandas as pd
-from dopolneniya_tables.exstractor_L import get_variant_data
 
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from dopolneniya_tables.exstractor_L import get_variant_data
+import instrumentation as instr
+
+
+# Структура основных фондов из Дополнения М (удельные веса групп, %)
+UDELNYE_VESY = {
+    "Здания": 35.6,
+    "Сооружения": 6.2,
+    "Передаточные устройства": 3.5,
+    "Силовые машины": 2.3,
+    "Рабочие машины и оборудование": 41.5, # Базовая группа
+    "Измерительные приборы и устройства": 3.2,
+    "Вычислительная техника": 3.0,
+    "Другие машины и оборудование": 0.6,
+    "Транспортные средства": 2.1,
+    "Другие основные фонды": 2.0,
+}
+
+
+def average_annual_value(F_n, F_vv, F_vyv, mes_vvoda, mes_vyvoda):
+    """
+    Среднегодовая стоимость основных фондов по формуле (1.9):
+    Фср.г = Фн + (Фвв * tвв) / 12 - (Фвыв * tвыв) / 12, где tвв = 12 - мес. ввода, tвыв = 12 - мес. вывода.
+
+    Все аргументы - скаляры или массивы NumPy одной формы (расчет для многих вариантов сразу).
+
+    Returns:
+        float или np.ndarray: Среднегодовая стоимость, тыс. руб.
+    """
+    t_vvoda = 12 - np.asarray(mes_vvoda, dtype=float)
+    t_vyvoda = 12 - np.asarray(mes_vyvoda, dtype=float)
+    return np.asarray(F_n, dtype=float) + (F_vv * t_vvoda) / 12 - (F_vyv * t_vyvoda) / 12
+
+@instr.traced("Задание 2: основные производственные фонды")
 def main():
     # --- ПРИМЕР ИСПОЛЬЗОВАНИЯ ---
 
@@ -10,7 +47,8 @@ def main():
     current_variant = 2
 
     # 2. Получаем данные
-    data = get_variant_data(file_path, current_variant)
+    with instr.span("Чтение дополнения Л", file=file_path):
+        data = get_variant_data(file_path, current_variant)
 
     # 3. Присваиваем переменным (распаковка)
     stoimost_rmo_nachalo = data['stoimost_rmo_nachalo']
@@ -30,18 +68,7 @@ def main():
     print(f"- Месяц вывода: {mes_vyvoda}")
 
     # Структура из Дополнения М (%)
-    udelnye_vesy = {
-        "Здания": 35.6,
-        "Сооружения": 6.2,
-        "Передаточные устройства": 3.5,
-        "Силовые машины": 2.3,
-        "Рабочие машины и оборудование": 41.5, # Базовая группа
-        "Измерительные приборы и устройства": 3.2,
-        "Вычислительная техника": 3.0,
-        "Другие машины и оборудование": 0.6,
-        "Транспортные средства": 2.1,
-        "Другие основные фонды": 2.0,
-    }
+    udelnye_vesy = UDELNYE_VESY
 
     # --- 2. Создание таблицы "Исходные данные" ---
     data = {
@@ -368,7 +395,7 @@ def main():
     print(f"- tвв (месяцы функционирования вводимых фондов) = 12 - {mes_vvoda} = {t_vvoda}")
     print(f"- tвыв (месяцы после вывода) = 12 - {mes_vyvoda} = {t_vyvoda}")
 
-    F_sr_g = F_n + (F_vv * t_vvoda) / 12 - (F_vyv * t_vyvoda) / 12
+    F_sr_g = float(average_annual_value(F_n, F_vv, F_vyv, mes_vvoda, mes_vyvoda))
     print(f"Расчёт: {F_n:.3f} + ({F_vv:.3f} * {t_vvoda}) / 12 - ({F_vyv:.3f} * {t_vyvoda}) / 12 = {F_sr_g:.3f} тыс. руб.")
     print(f"\nСреднегодовая стоимость основных фондов: {F_sr_g:.3f} тыс. руб.")
 
@@ -380,4 +407,6 @@ def main():
 
 
 if __name__ == "__main__":
+    import profiling
+    profiling.setup("task2")
     main()
@@ -1,74 +1,97 @@
 import pandas as pd
 import json
 
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
 
+import instrumentation as instr
+from dopolneniya_tables.shared_tables import load_table
+import memo
+
+if __name__ == "__main__":
+    import profiling
+    profiling.setup("task3")
+
+
+def effective_variant(variant_task):
+    """Вариант задания в таблице дополнения Н: нечетные варианты -> 1, четные -> 2."""
+    return 1 if variant_task % 2 != 0 else 2
+
+
+@instr.traced("Загрузка данных дополнения Н")
+@memo.memoize(maxsize=64, key=lambda file_path, variant_task: (memo.file_key(file_path),
+                                                               effective_variant(variant_task)))
 def load_production_data(file_path, variant_task):
     """
     Загружает данные из CSV только для "действующего производства"
     для выбранного Варианта задания (1 или 2).
-    """
-    try:
-        # Читаем CSV с разделителем точка с запятой
-        df = pd.read_csv(file_path, sep=';')
 
-        variant_task = 1 if variant_task % 2 != 0 else 2
+    Результат кешируется по файлу и эффективному варианту (см. effective_variant),
+    поэтому варианты с одинаковыми исходными данными читают таблицу один раз.
+    Возвращаемый словарь общий для всех вызовов - не изменяйте его.
 
-        # Фильтруем таблицу: оставляем только нужный Вариант задания
-        df_variant = df[df['Вариант задания'] == variant_task]
+    Raises:
+        ValueError: Если файл не найден, вариант отсутствует или в таблице ошибки
+                    (validation.SCHEMAS['dop_N']).
+    """
+    # Проверенная таблица: у каждого варианта есть строки изделий А и Б
+    df = load_table('dop_N', file_path)
 
-        if df_variant.empty:
-            return f"Ошибка: Вариант задания {variant_task} не найден."
+    variant_task = effective_variant(variant_task)
 
-        # --- ИЗВЛЕКАЕМ ДАННЫЕ ДЛЯ ИЗДЕЛИЯ А ---
-        # Ищем строку, где Изделие == 'А'
-        row_a = df_variant[df_variant['Изделие'] == 'А'].iloc[0]
+    # Фильтруем таблицу: оставляем только нужный Вариант задания
+    df_variant = df[df['Вариант задания'] == variant_task]
 
-        C_vm_A = int(row_a['C_vm'])  # Годовые расходы вспомогательных материалов
-        N_om_A = int(row_a['N_om'])  # Норма запаса основных материалов
-        N_pok_A = int(row_a['N_pok'])  # Норма запаса покупных полуфабрикатов
-        N_vm_A = int(row_a['N_vm'])  # Норма запаса вспомогательных материалов
-        OS_prz_A = int(row_a['OS_prz'])  # Норматив оборотных средств прочих запасов
-        T_c_A = int(row_a['T_c'])  # Длительность производственного цикла
-        N_gp_A = int(row_a['N_gp'])  # Норма запаса готовой продукции
-        OS_rbp_A = int(row_a['OS_rbp'])  # Норматив расходов будущих периодов
+    if df_variant.empty:
+        raise ValueError(f"Вариант задания {variant_task} не найден.")
 
+    # --- ИЗВЛЕКАЕМ ДАННЫЕ ДЛЯ ИЗДЕЛИЯ А ---
+    # Ищем строку, где Изделие == 'А'
+    row_a = df_variant[df_variant['Изделие'] == 'А'].iloc[0]
 
-        # --- ИЗВЛЕКАЕМ ДАННЫЕ ДЛЯ ИЗДЕЛИЯ Б ---
-        # Ищем строку, где Изделие == 'Б'
-        row_b = df_variant[df_variant['Изделие'] == 'Б'].iloc[0]
+    C_vm_A = int(row_a['C_vm'])  # Годовые расходы вспомогательных материалов
+    N_om_A = int(row_a['N_om'])  # Норма запаса основных материалов
+    N_pok_A = int(row_a['N_pok'])  # Норма запаса покупных полуфабрикатов
+    N_vm_A = int(row_a['N_vm'])  # Норма запаса вспомогательных материалов
+    OS_prz_A = int(row_a['OS_prz'])  # Норматив оборотных средств прочих запасов
+    T_c_A = int(row_a['T_c'])  # Длительность производственного цикла
+    N_gp_A = int(row_a['N_gp'])  # Норма запаса готовой продукции
+    OS_rbp_A = int(row_a['OS_rbp'])  # Норматив расходов будущих периодов
 
-        C_vm_B = int(row_b['C_vm'])
-        N_om_B = int(row_b['N_om'])
-        N_pok_B = int(row_b['N_pok'])
-        N_vm_B = int(row_b['N_vm'])
-        OS_prz_B = int(row_b['OS_prz'])
-        T_c_B = int(row_b['T_c'])
-        N_gp_B = int(row_b['N_gp'])
-        OS_rbp_B = int(row_b['OS_rbp'])
 
-        # Возвращаем словарь со всеми переменными
-        return {
-            'C_vm_A': C_vm_A, 'N_om_A': N_om_A, 'N_pok_A': N_pok_A,
-            'N_vm_A': N_vm_A, 'OS_prz_A': OS_prz_A, 'T_c_A': T_c_A, 'N_gp_A': N_gp_A, 'OS_rbp_A': OS_rbp_A,
+    # --- ИЗВЛЕКАЕМ ДАННЫЕ ДЛЯ ИЗДЕЛИЯ Б ---
+    # Ищем строку, где Изделие == 'Б'
+    row_b = df_variant[df_variant['Изделие'] == 'Б'].iloc[0]
 
-            'C_vm_B': C_vm_B, 'N_om_B': N_om_B, 'N_pok_B': N_pok_B,
-            'N_vm_B': N_vm_B, 'OS_prz_B': OS_prz_B, 'T_c_B': T_c_B, 'N_gp_B': N_gp_B, 'OS_rbp_B': OS_rbp_B
-        }
+    C_vm_B = int(row_b['C_vm'])
+    N_om_B = int(row_b['N_om'])
+    N_pok_B = int(row_b['N_pok'])
+    N_vm_B = int(row_b['N_vm'])
+    OS_prz_B = int(row_b['OS_prz'])
+    T_c_B = int(row_b['T_c'])
+    N_gp_B = int(row_b['N_gp'])
+    OS_rbp_B = int(row_b['OS_rbp'])
 
-    except Exception as e:
-        return f"Ошибка обработки данных: {e}"
+    # Возвращаем словарь со всеми переменными
+    return {
+        'C_vm_A': C_vm_A, 'N_om_A': N_om_A, 'N_pok_A': N_pok_A,
+        'N_vm_A': N_vm_A, 'OS_prz_A': OS_prz_A, 'T_c_A': T_c_A, 'N_gp_A': N_gp_A, 'OS_rbp_A': OS_rbp_A,
 
+        'C_vm_B': C_vm_B, 'N_om_B': N_om_B, 'N_pok_B': N_pok_B,
+        'N_vm_B': N_vm_B, 'OS_prz_B': OS_prz_B, 'T_c_B': T_c_B, 'N_gp_B': N_gp_B, 'OS_rbp_B': OS_rbp_B
+    }
 
 
+@instr.traced()
 def print_full_variables(file_path, variant_task):
     """
     Считывает CSV и печатает готовый код с переменными для копирования.
     """
     try:
-        # Читаем CSV
-        df = pd.read_csv(file_path, sep=';')
+        # Проверенная таблица (та же, что в load_production_data)
+        df = load_table('dop_N', file_path)
 
-        variant_task = 1 if variant_task % 2 != 0 else 2
+        variant_task = effective_variant(variant_task)
 
         # Фильтруем по варианту задания
         df_var = df[df['Вариант задания'] == variant_task]
@@ -116,9 +139,8 @@ my_variant = 2
 
 data = load_production_data(file_name, my_variant)
 
-if isinstance(data, dict):
-    # Присваиваем переменным значения из словаря (глобально)
-    globals().update(data)
+# Присваиваем переменным значения из словаря (глобально)
+globals().update(data)
 
 current_variant = 2
 print_full_variables(file_name, current_variant)
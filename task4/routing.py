@@ -0,0 +1,237 @@
+"""
+Технологические маршруты по видам работ и загрузка рабочих мест.
+
+extract_labor_data суммирует трудоемкость изделия по всем видам работ,
+а task4 считает численность основных рабочих одним числом:
+    Росн = (tA * QA + tБ * QБ) / (Фч * Квн).
+Здесь трудоемкость хранится массивом (вид работ x изделие x вариант)
+из dop_J_hours, и для любого числа производственных программ сразу
+рассчитываются:
+  - загрузка каждого участка (вида работ), нормо-ч;
+  - необходимая численность рабочих и число единиц оборудования по участкам;
+  - коэффициенты загрузки при заданных рабочих местах и "узкое место" -
+    участок с наибольшей загрузкой;
+  - фонд оплаты по сдельным расценкам (разряд -> часовая тарифная ставка).
+
+Разряд задается по изделию (dop_J_grades: одна строка на изделие) или,
+если в таблице разрядов есть столбец 'Вид_работ', по виду работ и изделию -
+тогда каждый участок оплачивается по своему разряду.
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+from task1.payroll import TASK1_GRID
+
+TABLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dopolneniya_tables")
+
+# Годовой фонд рабочего времени одного рабочего и коэффициент выполнения норм (как в task4)
+FCH = 1860
+KVN = 1.1
+# Эффективный фонд времени единицы оборудования: 250 дн. * 2 смены * 8 ч * (1 - 5 % на ремонт)
+MACHINE_FUND = 250 * 2 * 8 * 0.95
+
+
+class Routing:
+    """
+    Трудоемкость по видам работ: массив hours[вид работ, изделие, вариант], нормо-ч на единицу.
+
+    Разряды grades - по изделиям (изделие, вариант) или по видам работ
+    (вид работ, изделие, вариант).
+    """
+
+    def __init__(self, operations, products, variants, hours, grades=None):
+        self.operations = list(operations)
+        self.products = list(products)
+        self.variants = list(variants)
+        self.hours = np.asarray(hours, dtype=float)
+        expected = (len(self.operations), len(self.products), len(self.variants))
+        if self.hours.shape != expected:
+            raise ValueError(f"Размер массива трудоемкости {self.hours.shape}, ожидается {expected}.")
+        self.grades = None if grades is None else np.asarray(grades, dtype=int)
+        if self.grades is not None and self.grades.shape not in (expected, expected[1:]):
+            raise ValueError(f"Размер массива разрядов {self.grades.shape}, ожидается {expected} или {expected[1:]}.")
+
+    @classmethod
+    def from_csv(cls, hours_path=None, grades_path=None):
+        """
+        Загружает dop_J_hours.csv (и dop_J_grades.csv, если есть).
+
+        В dop_J_grades.csv разряд задается по изделию, а при наличии столбца
+        'Вид_работ' - по виду работ и изделию.
+
+        Returns:
+            Routing: Маршруты всех вариантов.
+        """
+        hours_path = hours_path or os.path.join(TABLES_DIR, "dop_J_hours.csv")
+        grades_path = grades_path or os.path.join(TABLES_DIR, "dop_J_grades.csv")
+        df = pd.read_csv(hours_path)
+        variant_cols = [c for c in df.columns if c not in ("Вид_работ", "Изделие")]
+        operations = list(dict.fromkeys(df["Вид_работ"]))
+        products = list(dict.fromkeys(df["Изделие"]))
+        table = df.set_index(["Вид_работ", "Изделие"])[variant_cols]
+        table = table.reindex(pd.MultiIndex.from_product([operations, products]))
+        if table.isna().any().any():
+            raise ValueError("В dop_J_hours заданы не все сочетания вида работ и изделия.")
+        hours = table.to_numpy(dtype=float).reshape(len(operations), len(products), len(variant_cols))
+
+        grades = None
+        if os.path.exists(grades_path):
+            g = pd.read_csv(grades_path)
+            if "Вид_работ" in g.columns:
+                g = g.set_index(["Вид_работ", "Изделие"])[variant_cols]
+                g = g.reindex(pd.MultiIndex.from_product([operations, products]))
+                if g.isna().any().any():
+                    raise ValueError("В dop_J_grades заданы не все сочетания вида работ и изделия.")
+                grades = g.to_numpy(dtype=int).reshape(len(operations), len(products), len(variant_cols))
+            else:
+                grades = g.set_index("Изделие").reindex(products)[variant_cols].to_numpy(dtype=int)
+        return cls(operations, products, [int(c) for c in variant_cols], hours, grades)
+
+    def variant_index(self, variant):
+        try:
+            return self.variants.index(variant)
+        except ValueError:
+            raise ValueError(f"Вариант {variant} не найден в данных.") from None
+
+    def hourly_rates(self, variant):
+        """
+        Часовые тарифные ставки по разрядам варианта (тарифная сетка payroll.TASK1_GRID).
+
+        Returns:
+            np.ndarray: Ставки по изделиям или (виды работ x изделия) - по форме grades.
+        """
+        if self.grades is None:
+            raise ValueError("Разряды работ (dop_J_grades) не загружены.")
+        return TASK1_GRID.rates(self.grades[..., self.variant_index(variant)])
+
+    def load(self, plans, variant=None):
+        """
+        Загрузка участков по производственным программам.
+
+        Args:
+            plans (array_like): Годовые объемы выпуска (программы x изделия) или одна программа.
+            variant (int, optional): Вариант; если None - для всех вариантов.
+
+        Returns:
+            np.ndarray: Нормо-часы (программы x виды работ) или (программы x виды работ x варианты).
+        """
+        plans = np.atleast_2d(np.asarray(plans, dtype=float))
+        if plans.shape[1] != len(self.products):
+            raise ValueError(f"Программа должна задавать объемы {len(self.products)} изделий.")
+        if variant is None:
+            return np.einsum("opv,sp->sov", self.hours, plans)
+        return plans @ self.hours[:, :, self.variant_index(variant)].T
+
+    def headcount(self, plans, variant, fch=FCH, kvn=KVN):
+        """
+        Численность основных рабочих одним числом, как в task4:
+        Росн = Σ (трудоемкость изделия * объем) / (Фч * Квн), с округлением вверх.
+
+        Returns:
+            np.ndarray: Численность по программам, чел.
+        """
+        return np.ceil(self.load(plans, variant).sum(axis=-1) / (fch * kvn) - 1e-9).astype(int)
+
+    def labor_cost(self, plans, variant):
+        """Основная заработная плата по программам и видам работ (программы x виды работ), руб."""
+        plans = np.atleast_2d(np.asarray(plans, dtype=float))
+        h = self.hours[:, :, self.variant_index(variant)]
+        return plans @ (h * self.hourly_rates(variant)).T
+
+
+def capacity_plan(load, machine_ratio=None, fch=FCH, kvn=KVN, machine_fund=MACHINE_FUND,
+                  workers=None, machines=None):
+    """
+    Численность рабочих, оборудование и загрузка участков.
+
+    Args:
+        load (array_like): Нормо-часы (..., виды работ).
+        machine_ratio (array_like, optional): Машино-часы на нормо-час по видам работ
+                                              (0 - ручные работы).
+        fch (float): Годовой фонд времени рабочего, ч.
+        kvn (float): Коэффициент выполнения норм.
+        machine_fund (float): Эффективный фонд времени единицы оборудования, ч.
+        workers (array_like, optional): Имеющиеся рабочие места по видам работ.
+        machines (array_like, optional): Имеющееся оборудование по видам работ.
+
+    Returns:
+        dict: workers_needed, machines_needed (округление вверх по каждому участку),
+              workers_total, а при заданных workers/machines - utilization (наибольшая из
+              загрузки по рабочим и оборудованию), bottleneck (индекс участка) и
+              max_scale (во сколько раз можно увеличить программу без новых мест).
+    """
+    load = np.asarray(load, dtype=float)
+    n_ops = load.shape[-1]
+    ratio = np.zeros(n_ops) if machine_ratio is None else np.asarray(machine_ratio, dtype=float)
+
+    worker_hours = load / (fch * kvn)
+    machine_hours = load * ratio / machine_fund
+    result = {
+        "workers_exact": worker_hours,
+        "workers_needed": np.ceil(worker_hours - 1e-9).astype(int),
+        "machines_needed": np.ceil(machine_hours - 1e-9).astype(int),
+    }
+    result["workers_total"] = result["workers_needed"].sum(axis=-1)
+
+    if workers is not None or machines is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            util = np.zeros_like(load)
+            if workers is not None:
+                w = np.asarray(workers, dtype=float)
+                util = np.maximum(util, np.where(w > 0, worker_hours / w, np.where(worker_hours > 0, np.inf, 0)))
+            if machines is not None:
+                m = np.asarray(machines, dtype=float)
+                util = np.maximum(util, np.where(m > 0, machine_hours / m, np.where(machine_hours > 0, np.inf, 0)))
+        result["utilization"] = util
+        result["bottleneck"] = np.argmax(util, axis=-1)
+        peak = util.max(axis=-1)
+        with np.errstate(divide="ignore"):
+            result["max_scale"] = np.where(peak > 0, 1 / peak, np.inf)
+    return result
+
+
+def main():
+    routing = Routing.from_csv()
+    variant = 3
+    plan = np.array([206, 63])  # годовой выпуск изделий А и Б
+    # Оборудование: механообработка - 1 машино-ч на нормо-ч, заготовительные - 0.7, сборка - 0.2
+    machine_ratio = [0.7, 1.0, 0.2, 0.0]
+
+    load = routing.load(plan, variant)[0]
+    cap = capacity_plan(load, machine_ratio)
+    single = routing.headcount(plan, variant)[0]
+
+    print(f"Вариант {variant}, программа: " + ", ".join(f"{p} - {q} шт." for p, q in zip(routing.products, plan)))
+    print(f"{'Вид работ':<26}{'Нормо-ч':>12}{'Рабочих':>10}{'Станков':>10}")
+    for i, op in enumerate(routing.operations):
+        print(f"{op:<26}{load[i]:>12,.0f}{cap['workers_needed'][i]:>10}{cap['machines_needed'][i]:>10}")
+    print(f"Основных рабочих по участкам: {cap['workers_total']} чел. (одним числом, как в task4: {int(single)} чел.)")
+    labor_cost = routing.labor_cost(plan, variant)[0]
+    print(f"Основная заработная плата на программу: {labor_cost.sum():,.2f} руб.")
+
+    # Имеющиеся места - под текущую программу; оценка 10 000 программ
+    rng = np.random.default_rng(0)
+    plans = plan * rng.uniform(0.8, 1.6, size=(10000, len(plan)))
+    start = time.perf_counter()
+    result = capacity_plan(routing.load(plans, variant), machine_ratio,
+                           workers=cap["workers_needed"], machines=cap["machines_needed"])
+    elapsed = time.perf_counter() - start
+
+    bottlenecks = np.bincount(result["bottleneck"], minlength=len(routing.operations))
+    print(f"\n10 000 программ оценены за {elapsed:.3f} с")
+    print("Узкие места (число программ):")
+    for op, n in zip(routing.operations, bottlenecks):
+        print(f"  {op}: {n}")
+    feasible = (result["max_scale"] >= 1).sum()
+    print(f"Выполнимы без новых рабочих мест: {feasible} программ")
+
+
+if __name__ == "__main__":
+    main()
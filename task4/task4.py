@@ -7,10 +7,16 @@
 # Среднегодовая стоимость основных производственных фондов - из 1.2 Фссов
 # Суммарный норматив оборотных средств - из 1.3 ОС
 
+
 import pandas as pd
 import json
 from math import ceil
 
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+    import profiling
+    profiling.setup("task4")
+
 df = pd.read_json('../task1/sebestoimost_structure.json')
 C_god = df.loc[df['Наименование статей расходов'] == "ВСЕГО полная (коммерческая) себестоимость",
                 "Себестоимость годового выпуска продукции, тыс.руб."].iloc[0]
@@ -1,5 +1,11 @@
 import csv
 import math
+import os
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
+import instrumentation as instr
 
 
 class EnterpriseEconomicsCalculator:
@@ -28,6 +34,7 @@ class EnterpriseEconomicsCalculator:
             'C_tp': 50233.06,  # Себестоимость товарной продукции, тыс. руб
         }
 
+    @instr.traced()
     def calculate_all(self):
         """Выполняет все расчёты"""
         self._calculate_fixed_assets()  # Таблица 9
@@ -35,6 +42,7 @@ class EnterpriseEconomicsCalculator:
         self._calculate_labor_productivity()  # Таблица 11
         self._calculate_summary_indicators()  # Таблица 12
 
+    @instr.traced()
     def _calculate_fixed_assets(self):
         """Расчёт показателей использования основных фондов (Таблица 9)"""
         Q_t = self.data['Q_t']
@@ -67,6 +75,7 @@ class EnterpriseEconomicsCalculator:
         print(f"Прибыль на 1 руб ОФ = Пр / Фср = {P} / {F_sr} = {P_per_F} руб/руб")
         print()
 
+    @instr.traced()
     def _calculate_working_capital(self):
         Q_r = self.data['Q_r']
         OS_n = self.data['OS_n']
@@ -104,6 +113,7 @@ class EnterpriseEconomicsCalculator:
         print(f"Материалоемкость (МЕ) = МЗ / Qт = {mz_formula} / {Q_t} = {M_e} руб/руб")
         print()
 
+    @instr.traced()
     def _calculate_labor_productivity(self):
         """Расчёт показателей производительности труда (Таблица 11)"""
         Q_t = self.data['Q_t']
@@ -140,6 +150,7 @@ class EnterpriseEconomicsCalculator:
             f"Выработка на 1 основного рабочего = Qт / Росн = {Q_t} / {main_workers_count} = {V_main_worker} тыс.руб/чел (1.31)")
         print()
 
+    @instr.traced()
     def _calculate_summary_indicators(self):
         """Расчёт обобщающих показателей эффективности (Таблица 12)"""
         C_tp = self.data['C_tp']
@@ -178,6 +189,7 @@ class EnterpriseEconomicsCalculator:
         print(f"Рентабельность себестоимости = (Пр / Стп) * 100% = ({P} / {C_tp}) * 100% = {R_cost}% (1.35)")
         print()
 
+    @instr.traced()
     def save_to_csv(self):
         """Сохранение всех таблиц в CSV файлы"""
         for table_name, table_data in self.results.items():
@@ -189,8 +201,76 @@ class EnterpriseEconomicsCalculator:
                 # Записываем данные
                 for row in table_data['data']:
                     writer.writerow(row)
+            if instr.is_enabled():
+                instr.count("rows_written", len(table_data['data']) + 1)
+                instr.count("bytes_written", os.path.getsize(filename))
             print(f"Таблица сохранена в файл: {filename}")
 
+# Исходные данные показателей (как в set_input_data; MZ - итог материальных затрат)
+INDICATOR_INPUTS = ('Q_t', 'F_sr', 'P', 'Q_r', 'OS_n', 'MZ', 'PP_count', 'workers_count',
+                    'main_workers_count', 'C_tp')
+
+
+def _finite_or_nan(values):
+    """Заменяет inf (деление на ноль) на nan."""
+    import numpy as np
+
+    return np.where(np.isfinite(values), values, np.nan)
+
+
+def compute_indicators(data):
+    """
+    Показатели таблиц 9-12 для массивов предприятий/сценариев (векторный расчет).
+
+    Округления те же, что в EnterpriseEconomicsCalculator (до 0.001, Кз и ФЕ -
+    от округленных Коб и Фо, время оборота - вверх до целого дня).
+    Неопределенные показатели (деление на ноль, в том числе на Фо или Коб,
+    округленные до 0.000) возвращаются как nan, без предупреждений NumPy;
+    бесконечные Фо и Коб заменяются на nan до взятия обратных величин,
+    поэтому ФЕ, Кз и Тоб тоже nan, а не 0 или inf.
+
+    Args:
+        data (dict): {поле INDICATOR_INPUTS: скаляр или массив NumPy}.
+
+    Returns:
+        dict: Массивы F_o, F_e, P_per_F, K_ob, K_z, T_ob, M_e, V_ppp, V_worker,
+              V_main_worker, Z_1rub, R_total, R_sales, R_cost.
+
+    Raises:
+        ValueError: Если не задано одно из полей INDICATOR_INPUTS.
+    """
+    import numpy as np
+
+    missing = [name for name in INDICATOR_INPUTS if name not in data]
+    if missing:
+        raise ValueError(f"Не заданы исходные данные: {', '.join(missing)}")
+    d = {name: np.asarray(data[name], dtype=float) for name in INDICATOR_INPUTS}
+
+    f = _finite_or_nan
+    r = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Таблица 9
+        r['F_o'] = f(np.round(d['Q_t'] / d['F_sr'], 3))
+        r['F_e'] = f(np.round(1 / r['F_o'], 3))
+        r['P_per_F'] = f(np.round(d['P'] / d['F_sr'], 3))
+        # Таблица 10
+        r['K_ob'] = f(np.round(d['Q_r'] / d['OS_n'], 3))
+        r['K_z'] = f(np.round(1 / r['K_ob'], 3))
+        r['T_ob'] = f(np.ceil(np.round(360 / r['K_ob'], 3)))
+        r['M_e'] = f(np.round(d['MZ'] / d['Q_t'], 3))
+        # Таблица 11
+        r['V_ppp'] = f(np.round(d['Q_t'] / d['PP_count'], 3))
+        r['V_worker'] = f(np.round(d['Q_t'] / d['workers_count'], 3))
+        r['V_main_worker'] = f(np.round(d['Q_t'] / d['main_workers_count'], 3))
+        # Таблица 12
+        r['Z_1rub'] = f(np.round(d['C_tp'] / d['Q_t'], 3))
+        r['R_total'] = f(np.round(d['P'] / (d['F_sr'] + d['OS_n']) * 100, 3))
+        r['R_sales'] = f(np.round(d['P'] / d['Q_r'] * 100, 3))
+        r['R_cost'] = f(np.round(d['P'] / d['C_tp'] * 100, 3))
+    instr.count("formulas_evaluated", 14 * r['F_o'].size)
+    return r
+
+
 # Использование класса
 def main():
     calculator = EnterpriseEconomicsCalculator()
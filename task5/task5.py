@@ -1,8 +1,17 @@
 import pandas as pd
+
+if __name__ == "__main__":
+    import _bootstrap  # noqa: F401
+
 from funcs import EnterpriseEconomicsCalculator
 import json
 
 
+if __name__ == "__main__":
+    import profiling
+    profiling.setup("task5")
+
+
 df1 = pd.read_csv('../task2/Исходные_данные_основные_фонды.csv', delimiter=';')
 machines_begin_oty = float(df1.iloc[0, -1])
 
@@ -0,0 +1,8 @@
+"""Общая настройка тестов: модули проекта импортируются от корня репозитория (task1.cost_chain и т.п.)."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,56 @@
+"""Подбор параметра цепочки калькуляции (task1/goal_seek.py)."""
+
+import numpy as np
+import pytest
+
+from task1.cost_chain import cost_chain, inputs_from_task1, stack_inputs
+from task1.goal_seek import goal_seek
+
+
+@pytest.fixture
+def record():
+    materials_main = {
+        "стальной прокат": {"type": "material", "A": {"rasxod": 0.45, "otxod": 0.0675}},
+        "трубы стальные": {"type": "material", "A": {"rasxod": 0.04, "otxod": 0.0028}},
+        "прокат цветных металлов": {"type": "fixed", "A": 2900},
+        "другие материалы": {"type": "fixed", "A": 1800},
+    }
+    materials_purchased = {
+        "отливки черных металлов": {"type": "material", "A": {"rasxod": 4.5, "otxod": 0.675}},
+        "отливки цветных металлов": {"type": "material", "A": {"rasxod": 0.3, "otxod": 0.075}},
+        "покупные комплектующие изделия": {"type": "fixed", "A": 142800},
+    }
+    prices = {
+        "стальной прокат_материал": 12800, "стальной прокат_отходы": 7500,
+        "трубы стальные_материал": 18500, "трубы стальные_отходы": 6300,
+        "отливки черных металлов_материал": 10500, "отливки черных металлов_отходы": 7200,
+        "отливки цветных металлов_материал": 22600, "отливки цветных металлов_отходы": 16900,
+    }
+    rates = {"доп_зарплата": 40, "отчисления": 22, "РСЭО": 87, "ОПР": 85, "ОХР": 98, "ВПР": 5, "рентабельность": 20}
+    return inputs_from_task1("A", materials_main, materials_purchased, prices, {"A": 1},
+                             {"labor_hours": {"A": 1000}, "hourly_rate": {"A": 41.50}}, rates,
+                             volume=207, Ktr=1.15)
+
+
+def test_fuel_energy_open_upper_bound_stays_below_pole(record):
+    price = float(cost_chain(record)["wholesale_price"])
+    targets = price * np.array([1.5, 10.0, 1000.0])
+
+    records = [record] * len(targets)
+
+    r = goal_seek(records, "fuel_energy_percent", targets, bounds=(0, None))
+
+    assert r["converged"].all()
+    assert (r["value"] < 100).all()
+    point = dict(stack_inputs(records), fuel_energy_percent=r["value"])
+    np.testing.assert_allclose(cost_chain(point)["wholesale_price"], targets, rtol=1e-6)
+
+
+def test_value_is_nan_where_not_converged(record):
+    price = float(cost_chain(record)["wholesale_price"])
+
+    # Цена ниже достижимой при β >= 0 и решение вне допустимого отрезка
+    for field, target in (("fuel_energy_percent", price * 0.5), ("labor_intensity", price * 0.5)):
+        r = goal_seek(record, field, target, bounds=(0, None))
+        assert not r["converged"][0]
+        assert np.isnan(r["value"][0])
@@ -0,0 +1,40 @@
+"""Показатели использования ресурсов (task5/funcs.compute_indicators)."""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from task5.funcs import INDICATOR_INPUTS, compute_indicators
+
+
+def _inputs(**overrides):
+    data = {name: np.array([100.0]) for name in INDICATOR_INPUTS}
+    data.update({name: np.array([value]) for name, value in overrides.items()})
+    return data
+
+
+@pytest.mark.parametrize("overrides", [
+    {"F_sr": 0.0, "OS_n": 0.0},          # деление на ноль
+    {"Q_t": 1.0, "F_sr": 10000.0,        # Фо и Коб округляются до 0.000
+     "Q_r": 1.0, "OS_n": 10000.0},
+])
+def test_undefined_reciprocals_are_nan(overrides):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        r = compute_indicators(_inputs(**overrides))
+
+    for name in ("F_e", "K_z", "T_ob"):
+        assert np.isnan(r[name]).all(), name
+    for value in r.values():
+        assert not np.isinf(value).any()
+
+
+def test_regular_values():
+    r = compute_indicators(_inputs(F_sr=50.0, OS_n=25.0, Q_r=100.0))
+
+    assert r["F_o"][0] == 2.0
+    assert r["F_e"][0] == 0.5
+    assert r["K_ob"][0] == 4.0
+    assert r["K_z"][0] == 0.25
+    assert r["T_ob"][0] == 90.0
@@ -0,0 +1,64 @@
+"""Денежная арифметика в копейках (money.py): точность и границы int64."""
+
+from decimal import Decimal
+from fractions import Fraction
+import math
+
+import numpy as np
+import pytest
+
+import money
+
+
+def _reference(kopecks, numerator, denominator, rounding):
+    """Точный результат k * num / den через Fraction (коэффициенты - как десятичная запись float)."""
+    value = Fraction(kopecks) * Fraction(Decimal(repr(numerator))) / Fraction(Decimal(repr(denominator)))
+    floor = math.floor(value)
+    frac = value - floor
+    if rounding == money.FLOOR:
+        return floor
+    if rounding == money.CEILING:
+        return floor + (frac > 0)
+    if rounding == money.DOWN:
+        return floor + (frac > 0 and value < 0)
+    if frac != Fraction(1, 2):
+        return floor + (frac > Fraction(1, 2))
+    if rounding == money.HALF_UP:
+        return floor + (value > 0)
+    return floor + (floor % 2)
+
+
+def test_large_sums_do_not_overflow():
+    assert money.scale(money.to_kopecks(1e8), 1000) == 10 ** 13
+    assert money.percent_of(money.to_kopecks(5e10), 14.5) == 725 * 10 ** 9
+    # Предел to_kopecks (2**53 копеек), умноженный на объем выпуска
+    assert money.scale(2 ** 53 - 1, 1000) == (2 ** 53 - 1) * 1000
+
+
+def test_int64_boundary():
+    half = money.INT64_MAX // 2
+    assert money.scale(half, 2) == money.INT64_MAX - 1
+    assert money.mul_div(money.INT64_MAX, 3, 3) == money.INT64_MAX
+    with pytest.raises(ValueError):
+        money.scale(half + 1, 2)
+    with pytest.raises(ValueError):
+        money.mul_div(money.INT64_MAX - 1, 1.5, 1)
+    with pytest.raises(ValueError):
+        money.mul_div(100, 1, 0)
+
+
+@pytest.mark.parametrize("rounding", money.ROUNDING)
+def test_mul_div_matches_exact_fraction(rounding):
+    rng = np.random.default_rng(0)
+    kopecks = rng.integers(-10 ** 15, 10 ** 15, 200)
+    kopecks[:4] = [-25, 25, -35, 35]  # ровно половина копейки при 10 %
+    numerators = np.round(rng.uniform(0, 100, 200), 3)
+    numerators[:4] = 10
+    denominators = np.round(rng.uniform(0.5, 100, 200), 2)
+    denominators[:4] = 100
+
+    result = money.mul_div(kopecks, numerators, denominators, rounding)
+
+    expected = [_reference(int(k), float(n), float(d), rounding)
+                for k, n, d in zip(kopecks, numerators, denominators)]
+    assert result.tolist() == expected
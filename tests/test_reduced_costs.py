@@ -0,0 +1,31 @@
+"""Выбор проекта по приведенным затратам (pract_part/reduced_costs.py)."""
+
+import numpy as np
+
+from pract_part.reduced_costs import EN, compare_projects
+
+
+def test_best_project_by_unit_reduced_cost_with_different_volumes():
+    # Вариант 3 задания: годовые Зпр меньше у проекта 2 только из-за меньшего выпуска
+    annual_cost = np.array([[149063.03, 138928.79]])
+    capital = np.array([[27731.18, 28682.10]])
+    volume = np.array([[477.0, 435.0]])
+    unit_cost = annual_cost / volume * 1000
+
+    cmp = compare_projects(annual_cost, capital, unit_cost, [350000.0], volume)
+
+    assert cmp["reduced_costs"][0, 1] < cmp["reduced_costs"][0, 0]
+    expected = (annual_cost + EN * capital) / volume * 1000
+    np.testing.assert_allclose(cmp["unit_reduced_costs"], expected)
+    assert cmp["best_project"].tolist() == [0]
+    assert cmp["economic_effect"][0, 0] > cmp["economic_effect"][0, 1]
+
+
+def test_best_project_equal_volumes_matches_annual_reduced_cost():
+    annual_cost = np.array([[100.0, 90.0], [80.0, 95.0]])
+    capital = np.array([[10.0, 10.0], [10.0, 10.0]])
+    volume = np.full((2, 2), 500.0)
+
+    cmp = compare_projects(annual_cost, capital, annual_cost / volume * 1000, [300.0, 300.0], volume)
+
+    assert cmp["best_project"].tolist() == np.argmin(cmp["reduced_costs"], axis=-1).tolist() == [1, 0]